@@ -0,0 +1,303 @@
+"""
+Core character operations on synthetic characters of 10 to 10,000 entries.
+
+Run with: pytest benchmarks/bench_character.py [--max-size 1000]
+"""
+
+import copy
+import json
+import os
+from functools import lru_cache
+
+import pytest
+
+from benchmarks.synthetic import SIZES, synthetic_character
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "templates")
+
+@lru_cache(maxsize=None)
+def _cached_character(size):
+    return synthetic_character(size, seed=1)
+
+def _rounds(size):
+    # Keep the slow UI and PDF paths to a handful of rounds on large characters
+    return max(1, min(20, 2000 // size))
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"{size}")
+def size(request, max_size):
+    if request.param > max_size:
+        pytest.skip(f"size {request.param} is above --max-size {max_size}")
+    return request.param
+
+@pytest.fixture
+def character(size):
+    """A fresh copy of the seeded synthetic character for this size."""
+    return copy.deepcopy(_cached_character(size))
+
+def bench_calculate_derived_values(benchmark, app, character):
+    benchmark(app.calculate_derived_values, character)
+
+def bench_update_point_total(benchmark, app, character):
+    app.character_data = character
+    benchmark(app.update_point_total)
+
+def bench_template_application(benchmark, app, qapp, size):
+    from templates.template_manager import apply_template_to_character
+
+    with open(os.path.join(TEMPLATE_PATH, "races", "dwarf.json"), "r", encoding="utf-8") as f:
+        template = json.load(f)
+
+    def setup():
+        app.character_data = copy.deepcopy(_cached_character(size))
+        qapp.processEvents()
+        return (app, template, "race"), {}
+
+    benchmark.pedantic(apply_template_to_character, setup=setup, rounds=_rounds(size))
+
+def bench_save_load_round_trip(benchmark, character, tmp_path):
+    path = tmp_path / "character.json"
+
+    def round_trip():
+        # Same calls as save_character / load_character
+        with open(path, "w") as f:
+            json.dump(character, f, indent=4)
+        with open(path, "r") as f:
+            return json.load(f)
+
+    assert benchmark(round_trip) == character
+
+def bench_populate_attributes_ui(benchmark, app, qapp, character, size):
+    from tabs.attributes_tab import populate_attributes_ui
+
+    app.character_data = character
+
+    def setup():
+        # Let the previous round's card container be deleted first
+        qapp.processEvents()
+        return (app,), {}
+
+    benchmark.pedantic(populate_attributes_ui, setup=setup, rounds=_rounds(size))
+
+def bench_pdf_export(benchmark, size, tmp_path):
+    from tools.pdf_export import export_character_to_pdf
+
+    path = str(tmp_path / "character.pdf")
+
+    def setup():
+        return (copy.deepcopy(_cached_character(size)), path), {}
+
+    benchmark.pedantic(export_character_to_pdf, setup=setup, rounds=_rounds(size))
+
+def bench_pdf_renderer_setup_cold(benchmark):
+    """Per-export style setup before the shared renderer (stylesheet, custom styles, table styles)"""
+    from tools.pdf_export import PdfRenderer
+
+    benchmark(PdfRenderer)
+
+def bench_pdf_renderer_setup_cached(benchmark):
+    from tools.pdf_export import get_renderer
+
+    get_renderer()
+    benchmark(get_renderer)
+
+def bench_pdf_export_fresh_renderer(benchmark, tmp_path):
+    """10-entry export paying the style setup every time, to compare with bench_pdf_export[10]"""
+    from tools.pdf_export import PdfRenderer, export_character_to_pdf
+
+    path = str(tmp_path / "character.pdf")
+
+    def setup():
+        return (copy.deepcopy(_cached_character(10)), path), {"renderer": PdfRenderer()}
+
+    benchmark.pedantic(export_character_to_pdf, setup=setup, rounds=20)
+
+def bench_pdf_story_cold(benchmark, size):
+    """Building every section's flowables from scratch"""
+    from tools.pdf_export import PdfRenderer, build_character_story, prepare_export_data
+
+    character = prepare_export_data(_cached_character(size))
+    benchmark.pedantic(build_character_story, setup=lambda: ((character, PdfRenderer()), {}), rounds=_rounds(size))
+
+def bench_pdf_story_after_defect_edit(benchmark, size):
+    """Re-export after changing one defect: only the defects and CP sections rebuild"""
+    from tools.pdf_export import PdfRenderer, build_character_story, prepare_export_data
+
+    renderer = PdfRenderer()
+    character = copy.deepcopy(_cached_character(size))
+    build_character_story(prepare_export_data(character), renderer)
+
+    def setup():
+        character["defects"][0]["rank"] += 1
+        return (prepare_export_data(character), renderer), {}
+
+    benchmark.pedantic(build_character_story, setup=setup, rounds=_rounds(size))
+
+def _allocated(func, *args):
+    """Bytes still allocated by the value func returns"""
+    import tracemalloc
+
+    func(*args)  # One-off allocations (interned strings, caches) are not per call
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = func(*args)
+        return tracemalloc.get_traced_memory()[0] - before, result
+    finally:
+        tracemalloc.stop()
+
+def bench_snapshot_deepcopy(benchmark, size):
+    """The copy export_to_pdf used to take"""
+    character = _cached_character(size)
+    benchmark.extra_info["bytes"] = _allocated(copy.deepcopy, character)[0]
+    benchmark(copy.deepcopy, character)
+
+def bench_snapshot_freeze(benchmark, size):
+    """A first snapshot, with nothing to share yet"""
+    from tools.snapshot import freeze
+
+    character = _cached_character(size)
+    benchmark.extra_info["bytes"] = _allocated(freeze, character)[0]
+    benchmark(freeze, character)
+
+def bench_snapshot_after_edit(benchmark, size):
+    """Snapshot after one defect edit, sharing everything else with the previous one"""
+    from tools.snapshot import freeze
+
+    character = copy.deepcopy(_cached_character(size))
+    previous = freeze(character)
+    character["defects"][0]["rank"] += 1
+    benchmark.extra_info["bytes"] = _allocated(freeze, character, previous)[0]
+    benchmark(freeze, character, previous)
+
+def bench_rules_derived_values(benchmark, character):
+    """calculate_derived_values on a saved character dict"""
+    from tools.rules import calculate_derived_values
+
+    benchmark(calculate_derived_values, character)
+
+def bench_rules_point_total(benchmark, character):
+    """point_total (the sum behind update_point_total) on a saved character dict"""
+    from tools.rules import point_total
+
+    benchmark(point_total, character)
+
+def bench_size_ladder_compile(benchmark):
+    """Reading and compiling every size template (done once per process)"""
+    from tools.size_ladder import load_size_ladder
+
+    benchmark(load_size_ladder)
+
+def bench_size_ladder_find(benchmark):
+    from tools.size_ladder import get_size_ladder
+
+    ladder = get_size_ladder()
+    benchmark(ladder.find, None, "Monumental", None)
+
+def bench_template_impact_preview(benchmark, size):
+    """Dry run of the dwarf race on a snapshot, as the template dialog does per entry"""
+    from templates.template_effects import template_impact
+    from tools.snapshot import freeze
+
+    with open(os.path.join(TEMPLATE_PATH, "races", "dwarf.json"), "r", encoding="utf-8") as f:
+        template = json.load(f)
+    snapshot = freeze(_cached_character(size))
+    benchmark.pedantic(template_impact, args=(snapshot, template, "race"), rounds=_rounds(size) * 5)
+
+def bench_explorer_full(benchmark, tmp_path):
+    """Every race x class x size combination from scratch, in-process"""
+    from tools.explorer import explore
+
+    benchmark.pedantic(explore, kwargs={"cache_path": str(tmp_path / "explorer.zip"), "rebuild": True}, rounds=3)
+
+def bench_explorer_reload(benchmark, tmp_path):
+    """Reopening the explorer when no template changed (cache check and load)"""
+    from tools.explorer import explore
+
+    cache_path = str(tmp_path / "explorer.zip")
+    explore(cache_path=cache_path)
+    benchmark(explore, cache_path=cache_path)
+
+def bench_explorer_query(benchmark, tmp_path):
+    """The "best DCV for a 60 CP Adventurer" question over the whole table"""
+    from tools.explorer import explore
+
+    table = explore(cache_path=str(tmp_path / "explorer.zip"))
+    benchmark(table.query, fits="Adventurer", cp_range=(None, 60), sort_by="DCV", limit=10)
+
+@pytest.mark.parametrize("budget, benchmark_name", [(40, "Adventurer"), (90, "Heroic"), (200, "Superhuman")])
+def bench_optimizer(benchmark, budget, benchmark_name):
+    """Pareto builds for ACV and HP under a budget (the search is exact, so this is the full solve)"""
+    from tools.optimizer import optimize
+
+    benchmark.pedantic(optimize, args=(budget, benchmark_name, ("ACV", "HP")), rounds=3)
+
+@pytest.mark.parametrize("trials", [10_000, 100_000])
+def bench_combat_duel(benchmark, trials):
+    """Monte Carlo duel between two mid-range fighters"""
+    from tools.combat import Combatant, simulate_duel
+
+    hero = Combatant("Hero", acv=7, dcv=6, hp=60, dm=6, sv=12, armour=5)
+    ogre = Combatant("Ogre", acv=5, dcv=4, hp=100, dm=8, sv=20, weapon_damage=5)
+    benchmark.pedantic(simulate_duel, args=(hero, ogre, trials, 1), rounds=3)
+
+@pytest.mark.parametrize("minion_scale", ["low", "high"])
+def bench_encounter(benchmark, minion_scale):
+    """Four heroes against a warlord and two minion groups, uncached"""
+    from tools import encounter
+
+    def hero(body, mind, soul):
+        return {"name": f"Hero {body}{mind}{soul}", "stats": {"Body": body, "Mind": mind, "Soul": soul}}
+
+    party = [hero(7, 4, 5), hero(4, 8, 6), hero(6, 6, 6), hero(5, 5, 8)]
+    warlord = dict(hero(8, 5, 6), name="Warlord", minions=[
+        {"name": "Goblins", "level": 3, "count": "11-25", "stats": {"Body": 3, "Mind": 2, "Soul": 2}},
+        {"name": "Wolves", "level": 1, "count": "Up to 5", "cp": 12}])
+    benchmark.pedantic(encounter.analyze_encounter, args=(party, [warlord]),
+                       kwargs={"minion_scale": minion_scale, "cache_dir": None},
+                       setup=encounter._results.clear, rounds=3)
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def bench_npc_generator(benchmark, jobs):
+    """1000 random NPCs across every benchmark, in-process and over a pool"""
+    from tools.npc import generate_npcs
+
+    benchmark.pedantic(generate_npcs, args=(1000, 1), kwargs={"jobs": jobs}, rounds=3)
+
+@pytest.mark.parametrize("mode", ["one_edit", "rebuild"])
+def bench_rollup(benchmark, mode):
+    """One companion edit on a character with 60 sub-characters, against rebuilding the whole tree"""
+    from tools.rollup import RollupTree
+
+    def entry(i):
+        return {"name": f"Entry {i}", "level": 2, "cp_budget": 20, "cp": 20,
+                "stats": {"Body": 4, "Mind": 4, "Soul": 4},
+                "attributes": [{"name": "Flight", "cost": 2 + i % 3}], "defects": [{"name": "Ageism", "cost": 1, "value": 1}]}
+
+    character = {"name": "Patron", "stats": {"Body": 6, "Mind": 6, "Soul": 6}, "attributes": [], "defects": [],
+                 "companions": [entry(i) for i in range(20)], "minions": [entry(i) for i in range(10)],
+                 "items": [entry(i) for i in range(20)], "alternate_forms": [entry(i) for i in range(5)],
+                 "metamorphosis": [entry(i) for i in range(5)]}
+    tree = RollupTree(character)
+    companion = character["companions"][7]
+
+    def edit():
+        companion["attributes"][0]["cost"] += 1
+        tree.changed(companion)
+
+    benchmark(edit if mode == "one_edit" else lambda: RollupTree(character))
+
+def bench_form_sheets(benchmark):
+    """Base Body edit on a character with 50 alternate forms, then every form's effective sheet"""
+    from tools.rollup import RollupTree
+
+    character = {"name": "Shifter", "stats": {"Body": 5, "Mind": 5, "Soul": 5}, "attributes": [], "defects": [],
+                 "alternate_forms": [{"name": f"Form {i}", "stat_deltas": {"Body": i % 4, "Soul": -(i % 3)}}
+                                     for i in range(50)]}
+    tree = RollupTree(character)
+
+    def edit():
+        character["stats"]["Body"] = 11 - character["stats"]["Body"]
+        tree.changed(character)
+        return [tree.sheet(form) for form in character["alternate_forms"]]
+
+    benchmark(edit)
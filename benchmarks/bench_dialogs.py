@@ -0,0 +1,101 @@
+"""
+Time from clicking "Add Attribute" / "Add Defect" until the builder is on screen.
+
+Run with: pytest benchmarks/bench_dialogs.py
+"""
+
+import pytest
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QDialog, QWidget
+
+from dialogs.attribute_builder_dialog import AttributeBuilderDialog
+from dialogs.defect_builder_dialog import DefectBuilderDialog
+from dialogs.dialog_pool import DialogPool
+
+@pytest.fixture
+def pool(qapp):
+    owner = QWidget()
+    pool = DialogPool(owner)
+    pool._build_idle()
+    yield pool
+    owner.deleteLater()
+
+def _show(qapp, dialog):
+    dialog.show()
+    qapp.processEvents()
+    dialog.done(QDialog.Rejected)
+
+def bench_attribute_builder_cold(benchmark, qapp):
+    """Build a new AttributeBuilderDialog for every open (previous behaviour)."""
+    def open_dialog():
+        dialog = AttributeBuilderDialog()
+        _show(qapp, dialog)
+        dialog.deleteLater()
+    benchmark(open_dialog)
+
+def bench_attribute_builder_pooled(benchmark, qapp, pool):
+    """Reset and show the pooled AttributeBuilderDialog."""
+    benchmark(lambda: _show(qapp, pool.attribute_builder()))
+
+def bench_defect_builder_cold(benchmark, qapp):
+    """Build a new DefectBuilderDialog for every open (previous behaviour)."""
+    def open_dialog():
+        dialog = DefectBuilderDialog()
+        _show(qapp, dialog)
+        dialog.deleteLater()
+    benchmark(open_dialog)
+
+def bench_defect_builder_pooled(benchmark, qapp, pool):
+    """Reset and show the pooled DefectBuilderDialog."""
+    benchmark(lambda: _show(qapp, pool.defect_builder()))
+
+def bench_dynamic_powers_category_switch(benchmark, qapp):
+    """Cycle Category Type on Dynamic Powers; suggestions come from cached models."""
+    dialog = AttributeBuilderDialog()
+    dialog.set_attribute_by_name("Dynamic Powers")
+    category = dialog.custom_input_widgets["category_type"]
+
+    def switch():
+        for category_name in ("Minor", "Major", "Primal"):
+            category.setCurrentText(category_name)
+    benchmark(switch)
+    dialog.deleteLater()
+
+@pytest.fixture
+def busy_app(qapp):
+    """Main window holding a couple of hundred attributes."""
+    import uuid
+    from besm_app import BESMCharacterApp
+    from tabs.attributes_tab import sync_attributes
+
+    app = BESMCharacterApp()
+    special = {"Alternate Form", "Companion", "Items", "Metamorphosis", "Minions"}
+    names = [name for name in sorted(app.attributes) if name not in special]
+    for i in range(200):
+        name = names[i % len(names)]
+        app.character_data["attributes"].append({
+            "id": str(uuid.uuid4()), "name": name, "base_name": name, "level": 1,
+            "cost": app.attributes[name].get("cost_per_level") or 1,
+            "enhancements": [], "limiters": [], "custom_fields": {},
+        })
+    sync_attributes(app)
+    app.show()
+    qapp.processEvents()
+    yield app
+    app.close()
+    app.deleteLater()
+
+def bench_attribute_submit_busy_window(benchmark, qapp, busy_app):
+    """Read the builder's data while the main window has syncs queued."""
+    dialog = busy_app.dialog_pool.attribute_builder()
+    dialog.set_attribute_by_name("Dynamic Powers")
+    dialog.custom_input_widgets["controlled_category"].setEditText("Storms")
+
+    def queue_syncs():
+        # The kind of chained work the main window schedules after an edit
+        for _ in range(5):
+            QTimer.singleShot(0, busy_app.update_point_total)
+
+    benchmark.pedantic(dialog.get_attribute_data, setup=queue_syncs, rounds=50)
+    qapp.processEvents()
+    dialog.done(QDialog.Rejected)
@@ -0,0 +1,69 @@
+"""
+Compare two pytest-benchmark JSON runs and flag regressions
+
+Timings are only comparable on one machine, so baselines are not committed.
+Save one from the commit you started from, then a run of your change:
+
+    pytest benchmarks --benchmark-json=benchmarks/baselines/base.json
+    pytest benchmarks --benchmark-json=new.json
+
+then:
+
+    python -m benchmarks.compare benchmarks/baselines/base.json new.json --threshold 10
+"""
+
+import sys
+import json
+
+
+def load_means(path):
+    """Return {benchmark fullname: mean seconds} from a pytest-benchmark JSON file"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {bench["fullname"]: bench["stats"]["mean"] for bench in data.get("benchmarks", [])}
+
+
+def compare_runs(base, new, threshold=10.0):
+    """Return (printable lines, regressed benchmark names) for two {name: mean} dicts"""
+    header = f"{'benchmark':<70} {'base ms':>10} {'new ms':>10} {'change':>8}"
+    lines = [header]
+    regressions = []
+    for name in sorted(set(base) | set(new)):
+        if name not in base or name not in new:
+            status = "only in base" if name in base else "only in new"
+            lines.append(f"{name:<70} {status:>30}")
+            continue
+        before, after = base[name] * 1000, new[name] * 1000
+        percent = (after - before) / before * 100 if before else 0.0
+        flag = ""
+        if percent > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        lines.append(f"{name:<70} {before:>10.3f} {after:>10.3f} {percent:>+7.1f}%{flag}")
+    return lines, regressions
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare two pytest-benchmark JSON runs")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, metavar="PERCENT",
+                        help="Flag benchmarks whose mean grew by more than PERCENT (default 10)")
+    args = parser.parse_args(argv)
+
+    base, new = load_means(args.base), load_means(args.new)
+    lines, regressions = compare_runs(base, new, args.threshold)
+    print("\n".join(lines))
+    unchecked = len(set(new) - set(base))
+    if unchecked:
+        print(f"{unchecked} benchmark(s) have no baseline entry and were not checked; re-save the baseline")
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
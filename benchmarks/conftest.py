@@ -0,0 +1,41 @@
+import os
+import sys
+import pytest
+from PyQt5.QtWidgets import QApplication, QMessageBox
+
+# Add the parent directory to sys.path to allow imports from the main application
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def pytest_addoption(parser):
+    parser.addoption("--max-size", type=int, default=10000,
+                     help="Skip synthetic characters larger than this many attributes and defects")
+
+@pytest.fixture(scope='session')
+def qapp():
+    """Create a QApplication instance for the entire benchmark session."""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+@pytest.fixture(scope='module')
+def app(qapp):
+    """One main window shared by a benchmark module; message boxes are answered automatically."""
+    patches = {name: getattr(QMessageBox, name) for name in ("question", "information", "warning", "critical")}
+    QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.Yes)
+    for name in ("information", "warning", "critical"):
+        setattr(QMessageBox, name, staticmethod(lambda *args, **kwargs: QMessageBox.Ok))
+
+    from besm_app import BESMCharacterApp
+    window = BESMCharacterApp()
+    window.show()
+    yield window
+    window.close()
+    window.deleteLater()
+
+    for name, original in patches.items():
+        setattr(QMessageBox, name, original)
+
+@pytest.fixture
+def max_size(request):
+    return request.config.getoption("--max-size")
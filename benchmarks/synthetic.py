@@ -0,0 +1,109 @@
+"""
+Seeded synthetic characters for the benchmark suite
+
+Characters are drawn from the real catalog so cost, derived value and PDF code
+see realistic records. The same (size, seed) always produces the same
+character.
+"""
+
+import copy
+import random
+import uuid
+
+from tools.catalog import get_catalog
+
+# Attributes that spawn their own tabs and sub-records; kept out so every size
+# measures the same code paths
+SPECIAL_ATTRIBUTES = {"Alternate Form", "Companion", "Item", "Items", "Metamorphosis", "Minions"}
+
+SIZES = [10, 100, 1000, 10000]
+
+
+def _uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def synthetic_attribute(rng, attr, catalog):
+    level = rng.randint(1, 5)
+    key = attr.get("key", "")
+    enhancements = [e["name"] for e in catalog.compatible_enhancements(key)]
+    limiters = [l["name"] for l in catalog.compatible_limiters(key)]
+    record = {
+        "id": _uuid(rng),
+        "name": attr["name"],
+        "base_name": attr["name"],
+        "key": key,
+        "level": level,
+        "cost": (attr.get("cost_per_level") or 1) * level,
+        "enhancements": rng.sample(enhancements, min(len(enhancements), rng.randint(0, 2))),
+        "limiters": rng.sample(limiters, min(len(limiters), rng.randint(0, 2))),
+        "custom_fields": {},
+        "description": attr.get("description", ""),
+        "user_description": "",
+    }
+    if "stat_mods" in attr:
+        record["stat_mods"] = copy.deepcopy(attr["stat_mods"])
+    return record
+
+
+def synthetic_defect(rng, defect):
+    rank = rng.randint(1, defect.get("max_rank") or 3)
+    record = {
+        "id": _uuid(rng),
+        "name": defect["name"],
+        "base_name": defect["name"],
+        "rank": rank,
+        "cost": -rank * (defect.get("cp_refund") or 1),
+        "enhancements": [],
+        "limiters": [],
+        "custom_fields": {},
+        "notes": "",
+    }
+    if "stat_mods" in defect:
+        record["stat_mods"] = copy.deepcopy(defect["stat_mods"])
+    return record
+
+
+def synthetic_character(size, seed=0):
+    """Return a character with ``size`` attributes and defects combined (about 4:1)"""
+    rng = random.Random(f"{seed}:{size}")
+    catalog = get_catalog()
+    attributes = [a for a in catalog.raw_attributes if a["name"] not in SPECIAL_ATTRIBUTES]
+    defects = catalog.raw_defects
+
+    defect_count = size // 5
+    attribute_count = size - defect_count
+
+    return {
+        "name": f"Synthetic {size}",
+        "player": "Benchmark",
+        "gm": "",
+        "race": "",
+        "class": "",
+        "homeworld": "",
+        "size": "",
+        "background": {"origin": "", "faction": "", "goals": "", "personality": "", "history": ""},
+        "stats": {stat: rng.randint(2, 8) for stat in ("Body", "Mind", "Soul")},
+        "derived": {key: 0 for key in ("CV", "ACV", "DCV", "HP", "EP", "DM", "SV", "SP", "SCV", "SOP")},
+        "drama_points": {"current": 3, "max": 5},
+        "attributes": [synthetic_attribute(rng, rng.choice(attributes), catalog) for _ in range(attribute_count)],
+        "defects": [synthetic_defect(rng, rng.choice(defects)) for _ in range(defect_count)],
+        "skills": [],
+        "weapons": [],
+        "armor": [],
+        "items": [],
+        "techniques": [],
+        "templates": [],
+        "alternate_forms": [],
+        "metamorphosis": [],
+        "companions": [],
+        "minions": [],
+        "relationships": [],
+        "notes": "",
+        "custom_fields": {},
+        "custom_rules": [],
+        "saved_loadouts": [],
+        "benchmark": None,
+        "version": "1.0",
+        "totalPoints": 0,
+    }
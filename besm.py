@@ -0,0 +1,11 @@
+# BESM 4e Character Generator - headless command line
+# Copyright (c) 2025 Legendmasters
+# Licensed under the Creative Commons Attribution-NonCommercial-ShareAlike 4.0 International License (CC BY-NC-SA 4.0)
+# http://creativecommons.org/licenses/by-nc-sa/4.0/
+
+import sys
+
+from tools.besm_cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
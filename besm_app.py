@@ -8,14 +8,21 @@ import os
 import json
 import math
 import uuid
+
+# --profile-startup has to be armed before the heavy imports below
+from tools.startup_profiler import profiler as startup_profiler
+startup_profiler.start_from_argv(sys.argv)
+
 from tools.utils import (
     ClickableCard, create_card_widget, generate_auto_name,
     apply_text_shadow, cell, load_json_file
 )
-from tools.pdf_export import export_character_to_pdf
+from tools.catalog import get_catalog
+from tools.perf_monitor import monitor as perf_monitor, timed
+from tools.rules import calculate_derived_values, benchmark_warnings
 from tools.widgets import ClickableCard, AttributeListWidget, LabeledRowWithHelp
 import common_ui as ui
-from dialogs.attribute_builder_dialog import AttributeBuilderDialog
+from dialogs.dialog_pool import DialogPool
 
 from tabs.alternate_forms_tab import (
     init_alternate_forms_tab,
@@ -34,23 +41,29 @@ from tabs import (
     init_companions_tab,
     init_minions_tab,
 )
+from tabs.items_tab import populate_items_ui
+from tabs.metamorphosis_tab import populate_metamorphosis_ui
+from tabs.companions_tab import populate_companions_ui
+from tabs.minions_tab import populate_minions_ui
 
 from PyQt5.QtWidgets import (
     QScrollArea, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QTextEdit,
     QComboBox, QSpinBox, QPushButton, QToolButton, QTabWidget, QWidget, QGridLayout
 )
 
+startup_profiler.lap("imports")
+
 class BESMCharacterApp(ui.QMainWindow):
     def __init__(self):
         super().__init__()
         self.settings = ui.QSettings("Legendmasters", "BESMCharacterApp")
 
-        # Load attributes data
+        # Load attributes data (shared with the builder dialogs through the catalog)
         base_path = os.path.dirname(os.path.abspath(__file__))
-        with open(os.path.join(base_path, "data", "attributes.json"), "r", encoding="utf-8") as f:
-            raw_attributes = json.load(f)["attributes"]
-            self.attributes = {attr["name"]: attr for attr in raw_attributes}
-            self.attributes_by_key = {attr["key"]: attr for attr in raw_attributes if "key" in attr}
+        self.catalog = get_catalog()
+        self.attributes = self.catalog.attributes
+        self.attributes_by_key = self.catalog.attributes_by_key
+        startup_profiler.lap("catalog")
             
         # Initialize template manager as an object with properties
         class TemplateManager:
@@ -95,6 +108,7 @@ class BESMCharacterApp(ui.QMainWindow):
                         with open(class_path, "r", encoding="utf-8") as f:
                             class_data = json.load(f)
                             self.template_manager.class_templates.append(class_data)
+        startup_profiler.lap("templates")
 
         # Load last folder or default to ./characters
         self.last_directory = self.settings.value("last_directory", os.path.join(base_path, "characters"))
@@ -247,6 +261,9 @@ class BESMCharacterApp(ui.QMainWindow):
         btn_export.clicked.connect(self.export_to_pdf)
         # Options menu is not yet implemented
         options_menu = ui.QMenu()
+        options_menu.addAction("Batch Export to PDF...", self.batch_export_to_pdf)
+        options_menu.addAction("Encounter Balance...", self.show_encounter_dialog)
+        options_menu.addAction("Performance", self.show_performance_overlay)
         options_menu.addAction("Settings", lambda: ui.QMessageBox.information(self, "Settings", "Settings dialog not yet implemented."))
         options_menu.addAction("About", lambda: ui.QMessageBox.information(self, "About", "BESM 4e Character Generator\nVersion 0.1\n\nCreated for Legendmasters"))
         btn_options.setMenu(options_menu)
@@ -304,13 +321,13 @@ class BESMCharacterApp(ui.QMainWindow):
             "techniques": [],
             "templates": [],
             "alternate_forms": [
-                # Each entry will be something like:
+                # Each entry is an overlay on the base character (see tools/forms.py):
                 # {
+                #   "id": "<the Alternate Form attribute's id>",
                 #   "name": "Wolf Form",
                 #   "level": 3,
                 #   "cp_budget": 15,
-                #   "stats": { "Body": 4, "Mind": 3, "Soul": 4 },
-                #   "derived": {...},
+                #   "stat_deltas": { "Body": 2, "Mind": -1 },  # only the stats that differ
                 #   "attributes": [...],
                 #   "defects": [...]
                 # }
@@ -340,12 +357,12 @@ class BESMCharacterApp(ui.QMainWindow):
         self.starting_cp_input = ui.QSpinBox()
         self.starting_cp_input.setRange(0, 9999)
         self.starting_cp_input.setValue(0)
-        self.starting_cp_input.valueChanged.connect(self.update_point_total)
+        self.starting_cp_input.valueChanged.connect(lambda _: self.update_point_total())
 
         self.earned_cp_input = ui.QSpinBox()
         self.earned_cp_input.setRange(0, 9999)
         self.earned_cp_input.setValue(0)
-        self.earned_cp_input.valueChanged.connect(self.update_point_total)
+        self.earned_cp_input.valueChanged.connect(lambda _: self.update_point_total())
 
         self.spent_cp_display = ui.QLabel("0")
         self.spent_cp_display.setObjectName("spentCpDisplay")
@@ -401,6 +418,8 @@ class BESMCharacterApp(ui.QMainWindow):
         # Add directly to the main layout
         main_content_layout.addWidget(self.suggestion_label)
 
+        startup_profiler.lap("sidebar")
+
         self.tabs = ui.QTabWidget()
         # Set tab properties to ensure longer tab names aren't cut off
         self.tabs.setTabsClosable(False)
@@ -415,11 +434,6 @@ class BESMCharacterApp(ui.QMainWindow):
         main_content_layout.addWidget(self.tabs)
 
         init_stats_tab(self)
-        init_items_tab(self)
-        init_alternate_forms_tab(self)
-        init_metamorphosis_tab(self)
-        init_companions_tab(self)
-        init_minions_tab(self)
 
         # Calculate initial derived values
         self.update_derived_values()
@@ -459,30 +473,37 @@ class BESMCharacterApp(ui.QMainWindow):
         # Initialize the defects tab directly
         self.init_defects_tab()
 
+        # Dynamic tabs are built by their factory the first time they become visible
         self.dynamic_tabs = {
             "Alternate Form": {
-                "tab": self.alternate_forms_tab,
+                "tab": None,
+                "factory": lambda: self.build_dynamic_tab(init_alternate_forms_tab, populate_alternate_form_ui),
                 "index": -1
             },
             "Items": {
-                "tab": self.items_tab,
+                "tab": None,
+                "factory": lambda: self.build_dynamic_tab(init_items_tab, populate_items_ui),
                 "index": -1
             },
             "Metamorphosis": {
-                "tab": self.metamorphosis_tab,
+                "tab": None,
+                "factory": lambda: self.build_dynamic_tab(init_metamorphosis_tab, populate_metamorphosis_ui),
                 "index": -1
             },
             "Companions": {
-                "tab": self.companions_tab,
+                "tab": None,
+                "factory": lambda: self.build_dynamic_tab(init_companions_tab, populate_companions_ui),
                 "index": -1
             },
             "Minions": {
-                "tab": self.minions_tab,
+                "tab": None,
+                "factory": lambda: self.build_dynamic_tab(init_minions_tab, populate_minions_ui),
                 "index": -1
             }
         }
 
         self.update_dynamic_tabs_visibility()
+        startup_profiler.lap("tabs")
 
         self.suggested_benchmark_name = None
         self.user_selected_benchmark = False
@@ -500,10 +521,6 @@ class BESMCharacterApp(ui.QMainWindow):
         self.homeworld_input = ui.QLineEdit()
         self.size_input = ui.QLineEdit()
 
-        # Hide them all at start
-        for info in self.dynamic_tabs.values():
-            self.tabs.removeTab(info["index"])
-
         # Row 0
         info_grid.addWidget(ui.QLabel("Character Name:"), 0, 0)
         info_grid.addWidget(self.char_name_input, 0, 1)
@@ -531,6 +548,11 @@ class BESMCharacterApp(ui.QMainWindow):
         self.last_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "characters")
         os.makedirs(self.last_directory, exist_ok=True)
 
+        # Builder dialogs are built once the window is up and reused afterwards
+        self.dialog_pool = DialogPool(self)
+        self.dialog_pool.prewarm()
+        startup_profiler.lap("character_info")
+
     def add_labeled_row_with_help(self, layout, label_text, widget, help_text):
         row_layout = ui.QHBoxLayout()
         row_label = ui.QLabel(label_text)
@@ -554,7 +576,7 @@ class BESMCharacterApp(ui.QMainWindow):
     
     def add_attribute(self):
         """Open the attribute builder dialog to add a new attribute"""
-        dialog = AttributeBuilderDialog(self)
+        dialog = self.dialog_pool.attribute_builder()
         if dialog.exec_() == ui.QDialog.Accepted:
             print("Dialog accepted, getting attribute data...")
             attr = dialog.get_attribute_data()
@@ -706,43 +728,24 @@ class BESMCharacterApp(ui.QMainWindow):
         self.minions_list.addItem(f"{minion['name']} - {minion['description']} - {minion['cp']} CP")
         self.update_point_total()
 
+    @timed()
     def update_point_total(self):
-        total = 0
-        warnings = []
-
         # --- Calculate total CP from stats, attributes, defects, and weapons ---
         for stat in self.stat_spinners:
-            value = self.stat_spinners[stat].value()
-            self.character_data["stats"][stat] = value
-            total += value * 2  # Stats cost 2 CP per level in BESM 4e
-
-            # Validate stat max
-            if self.selected_benchmark:
-                try:
-                    max_stat = int(self.selected_benchmark["max_stat"])
-                    if value > max_stat:
-                        warnings.append(f"{stat} exceeds benchmark max ({value} > {max_stat})")
-                except ValueError:
-                    pass
-
-        for attr in self.character_data["attributes"]:
-            total += attr["cost"]
-            if self.selected_benchmark:
-                try:
-                    max_attr = int(self.selected_benchmark["max_attribute_level"])
-                    if attr["level"] > max_attr:  # Changed back to 'level'
-                        warnings.append(f"{attr['name']} level exceeds benchmark max")
-                except ValueError:
-                    pass
-                    
-        # Process defects - use 'cost' instead of 'points'
-        for defect in self.character_data["defects"]:
-            # Note: defect costs are already negative values
-            total += defect["cost"]
-        
-        # Process weapons
-        for weapon in self.character_data["weapons"]:
-            total += weapon["cost"]
+            self.character_data["stats"][stat] = self.stat_spinners[stat].value()
+
+        # The rollup tree recomputes the character and the forms that depend on it;
+        # sync() picks up entries added to the sub-character lists
+        rollup = self.character_rollup()
+        rollup.changed(self.character_data)
+        rollup.sync()
+        total = rollup.root.cost.spent
+
+        # Forms are overlays on the base stats, so their cards follow stat edits
+        if self.character_data.get("alternate_forms") and \
+                getattr(self, "alternate_forms_base_stats", None) != self.character_data["stats"]:
+            populate_alternate_form_ui(self)
+        warnings = benchmark_warnings(self.character_data, self.selected_benchmark)
 
         self.character_data["totalPoints"] = total
         self.spent_cp_display.setText(str(total))
@@ -763,9 +766,13 @@ class BESMCharacterApp(ui.QMainWindow):
         self.unspent_cp_display.style().polish(self.unspent_cp_display)
 
         if unspent < 0:
-            self.unspent_cp_display.setToolTip("You have spent more points than allowed.")
+            tooltip = "You have spent more points than allowed."
         else:
-            self.unspent_cp_display.setToolTip("Points remaining for upgrades.")
+            tooltip = "Points remaining for upgrades."
+        over_budget = rollup.over_budget()
+        if over_budget:
+            tooltip += "\nOver their CP budget: " + ", ".join(node.data.get("name", "Unnamed") for node in over_budget)
+        self.unspent_cp_display.setToolTip(tooltip)
 
     def update_stat(self, stat_name, value):
         """Update a base stat value and recalculate derived values"""
@@ -774,204 +781,10 @@ class BESMCharacterApp(ui.QMainWindow):
         self.update_point_total()
 
     def calculate_derived_values(self, character_data):
-        """Calculate derived values based on stats and modifiers from attributes/defects
-        
-        Args:
-            character_data (dict): The character data to calculate derived values for
-            
-        Returns:
-            dict: The updated derived values
-        """
-        import math
-        
-        # 1. Start with base stats
-        base_body = character_data["stats"]["Body"]
-        base_mind = character_data["stats"]["Mind"]
-        base_soul = character_data["stats"]["Soul"]
-        
-        # 2. Apply modifiers from attributes and defects
-        body_mods = 0
-        mind_mods = 0
-        soul_mods = 0
-        
-        # Track direct modifiers to derived values
-        derived_mods = {
-            "CV": 0, "ACV": 0, "DCV": 0, "HP": 0, "EP": 0, 
-            "DM": 0, "SV": 0, "SP": 0, "SCV": 0, "SOP": 0
-        }
-        
-        # Track multipliers for derived values
-        multipliers = {
-            "CV": 1, "ACV": 1, "DCV": 1, "HP": 1, "EP": 1, 
-            "DM": 1, "SV": 1, "SP": 1, "SCV": 1, "SOP": 1
-        }
-        
-        # Process attributes
-        for attr in character_data.get("attributes", []):
-            if "stat_mods" in attr:
-                level = attr.get("level", 1)
-                
-                # Handle dynamic modifiers (like Augmented where the stat is chosen by the user)
-                if attr["stat_mods"].get("dynamic", False):
-                    # For Augmented, we need to look at the user-selected stat
-                    if attr.get("key") == "augmented" and "user_input" in attr:
-                        target_stat = attr["user_input"].get("stat_target")
-                        if target_stat:
-                            if target_stat == "Body":
-                                body_mods += level
-                            elif target_stat == "Mind":
-                                mind_mods += level
-                            elif target_stat == "Soul":
-                                soul_mods += level
-                
-                # Apply base stat modifiers
-                if "base" in attr["stat_mods"]:
-                    for stat, value in attr["stat_mods"]["base"].items():
-                        if stat == "Body":
-                            body_mods += value * level
-                        elif stat == "Mind":
-                            mind_mods += value * level
-                        elif stat == "Soul":
-                            soul_mods += value * level
-                
-                # Apply direct derived value modifiers
-                if "derived" in attr["stat_mods"]:
-                    for key, value in attr["stat_mods"]["derived"].items():
-                        if key in derived_mods:
-                            derived_mods[key] += value * level
-                
-                # Apply multipliers
-                if "multipliers" in attr["stat_mods"]:
-                    for key, value in attr["stat_mods"]["multipliers"].items():
-                        if key in multipliers:
-                            multipliers[key] *= value
-                
-                # Apply level-based modifiers if present
-                if "level_based" in attr["stat_mods"] and str(level) in attr["stat_mods"]["level_based"]:
-                    level_mods = attr["stat_mods"]["level_based"][str(level)]
-                    
-                    # Apply level-specific base stat modifiers
-                    if "base" in level_mods:
-                        body_mods += level_mods["base"].get("Body", 0)
-                        mind_mods += level_mods["base"].get("Mind", 0)
-                        soul_mods += level_mods["base"].get("Soul", 0)
-                    
-                    # Apply level-specific derived value modifiers
-                    if "derived" in level_mods:
-                        for key, value in level_mods["derived"].items():
-                            if key in derived_mods:
-                                derived_mods[key] += value
-                    
-                    # Apply level-specific multipliers
-                    if "multipliers" in level_mods:
-                        for key, value in level_mods["multipliers"].items():
-                            if key in multipliers:
-                                multipliers[key] *= value
-        
-        # Process defects
-        for defect in character_data.get("defects", []):
-            if "stat_mods" in defect:
-                rank = defect.get("rank", 1)
-                
-                # Apply base stat modifiers
-                if "base" in defect["stat_mods"]:
-                    for stat, value in defect["stat_mods"]["base"].items():
-                        if stat == "Body":
-                            body_mods += value * rank
-                        elif stat == "Mind":
-                            mind_mods += value * rank
-                        elif stat == "Soul":
-                            soul_mods += value * rank
-                
-                # Apply direct derived value modifiers
-                if "derived" in defect["stat_mods"]:
-                    for key, value in defect["stat_mods"]["derived"].items():
-                        if key in derived_mods:
-                            derived_mods[key] += value * rank
-                
-                # Apply multipliers
-                if "multipliers" in defect["stat_mods"]:
-                    for key, value in defect["stat_mods"]["multipliers"].items():
-                        if key in multipliers:
-                            multipliers[key] *= value
-                
-                # Apply rank-based modifiers if present
-                if "rank_based" in defect["stat_mods"] and str(rank) in defect["stat_mods"]["rank_based"]:
-                    rank_mods = defect["stat_mods"]["rank_based"][str(rank)]
-                    
-                    # Apply rank-specific base stat modifiers
-                    if "base" in rank_mods:
-                        body_mods += rank_mods["base"].get("Body", 0)
-                        mind_mods += rank_mods["base"].get("Mind", 0)
-                        soul_mods += rank_mods["base"].get("Soul", 0)
-                    
-                    # Apply rank-specific derived value modifiers
-                    if "derived" in rank_mods:
-                        for key, value in rank_mods["derived"].items():
-                            if key in derived_mods:
-                                derived_mods[key] += value
-                    
-                    # Apply rank-specific multipliers
-                    if "multipliers" in rank_mods:
-                        for key, value in rank_mods["multipliers"].items():
-                            if key in multipliers:
-                                multipliers[key] *= value
-        
-        # 3. Calculate final stats
-        body = max(1, base_body + body_mods)  # Ensure minimum of 1
-        mind = max(1, base_mind + mind_mods)
-        soul = max(1, base_soul + soul_mods)
-        
-        # 4. Calculate derived values
-        cv = math.floor((body + mind + soul) / 3)
-        acv = cv
-        dcv = cv
-        hp = body * 10
-        ep = mind * 10
-        sv = body * 2
-        dm = math.floor((body + soul) / 2)
-        sp = soul * 10
-        sop = mind * 10
-        scv = math.floor((mind + soul) / 2)
-        
-        # 5. Apply direct modifiers to derived values
-        cv += derived_mods["CV"]
-        acv += derived_mods["ACV"] + derived_mods["CV"]  # CV mods affect both ACV and DCV
-        dcv += derived_mods["DCV"] + derived_mods["CV"]
-        hp += derived_mods["HP"]
-        ep += derived_mods["EP"]
-        sv += derived_mods["SV"]
-        dm += derived_mods["DM"]
-        sp += derived_mods["SP"]
-        sop += derived_mods["SOP"]
-        scv += derived_mods["SCV"]
-        
-        # 6. Apply multipliers
-        cv = math.floor(cv * multipliers["CV"])
-        acv = math.floor(acv * multipliers["ACV"])
-        dcv = math.floor(dcv * multipliers["DCV"])
-        hp = math.floor(hp * multipliers["HP"])
-        ep = math.floor(ep * multipliers["EP"])
-        sv = math.floor(sv * multipliers["SV"])
-        dm = math.floor(dm * multipliers["DM"])
-        sp = math.floor(sp * multipliers["SP"])
-        sop = math.floor(sop * multipliers["SOP"])
-        scv = math.floor(scv * multipliers["SCV"])
-        
-        # 7. Return the derived values
-        return {
-            "CV": cv,
-            "ACV": acv,
-            "DCV": dcv,
-            "HP": hp,
-            "EP": ep,
-            "SV": sv,
-            "DM": dm,
-            "SP": sp,
-            "SOP": sop,
-            "SCV": scv
-        }
+        """Calculate derived values for any character data (see tools.rules)"""
+        return calculate_derived_values(character_data)
     
+    @timed()
     def update_derived_values(self):
         """Calculate derived values for the main character and update the UI"""
         # Calculate the derived values
@@ -1133,7 +946,7 @@ class BESMCharacterApp(ui.QMainWindow):
                 if reply != ui.QMessageBox.Yes:
                     return
 
-            with open(path, 'w') as f:
+            with perf_monitor.span("save_character"), open(path, 'w') as f:
                 self.character_data["name"] = self.char_name_input.text()
                 self.character_data["player"] = self.player_name_input.text()
                 self.character_data["gm"] = self.gm_name_input.text()
@@ -1157,13 +970,14 @@ class BESMCharacterApp(ui.QMainWindow):
         )
 
         if path:
-            with open(path, 'r') as f:
-                self.character_data = json.load(f)
+            with perf_monitor.span("load_character"):
+                with open(path, 'r') as f:
+                    self.character_data = json.load(f)
 
-            self.last_directory = os.path.dirname(path)
-            self.settings.setValue("last_directory", self.last_directory)
-            self.load_character_into_ui()
-            self.update_point_total()
+                self.last_directory = os.path.dirname(path)
+                self.settings.setValue("last_directory", self.last_directory)
+                self.load_character_into_ui()
+                self.update_point_total()
             ui.QMessageBox.information(self, "Loaded", "Character loaded successfully.")
 
     def set_benchmark(self, label):
@@ -1275,13 +1089,22 @@ class BESMCharacterApp(ui.QMainWindow):
 
         for attr_name, info in self.dynamic_tabs.items():
             visible = attr_counts[attr_name] > 0
-            current_index = self.tabs.indexOf(info["tab"])
+            if visible and info["tab"] is None:
+                info["tab"] = info["factory"]()
+            current_index = self.tabs.indexOf(info["tab"]) if info["tab"] is not None else -1
 
             if visible and current_index == -1:
                 self.tabs.addTab(info["tab"], attr_name)
             elif not visible and current_index != -1:
                 self.tabs.removeTab(current_index)
                 
+    def build_dynamic_tab(self, init_tab, populate_ui):
+        """Construct a dynamic tab and fill it from the current character data"""
+        print(f"[DEBUG] Building tab with {init_tab.__name__}")
+        tab = init_tab(self)
+        populate_ui(self)
+        return tab
+
     def update_suggestion_label(self, total_cp):
         # Always calculate the suggested benchmark based on current CP
         self.suggested_benchmark_name = None
@@ -1339,9 +1162,7 @@ class BESMCharacterApp(ui.QMainWindow):
     
     def add_defect(self):
         """Open the defect builder dialog to add a new defect"""
-        from dialogs.defect_builder_dialog import DefectBuilderDialog
-        
-        dialog = DefectBuilderDialog(self)
+        dialog = self.dialog_pool.defect_builder()
         if dialog.exec_() == ui.QDialog.Accepted:
             print("Dialog accepted, getting defect data...")
             defect = dialog.get_defect_data()
@@ -1381,8 +1202,7 @@ class BESMCharacterApp(ui.QMainWindow):
         existing_defect = self.character_data["defects"][defect_index]
         
         # Open the defect builder dialog with the existing data
-        from dialogs.defect_builder_dialog import DefectBuilderDialog
-        dialog = DefectBuilderDialog(self, existing_defect)
+        dialog = self.dialog_pool.defect_builder(existing_defect)
         
         if dialog.exec_() == ui.QDialog.Accepted:
             updated_defect = dialog.get_defect_data()
@@ -1434,11 +1254,9 @@ class BESMCharacterApp(ui.QMainWindow):
             return
             
         # Directly edit the attribute using the attribute at the found index
-        from dialogs.attribute_builder_dialog import AttributeBuilderDialog
-        
         existing_attr = self.character_data["attributes"][attr_index]
         
-        dialog = AttributeBuilderDialog(self)
+        dialog = self.dialog_pool.attribute_builder()
         
         base_name = existing_attr.get("base_name", existing_attr["name"])
         dialog.attr_dropdown.setCurrentText(base_name)
@@ -1708,6 +1526,7 @@ class BESMCharacterApp(ui.QMainWindow):
             for i, existing in enumerate(self.character_data["alternate_forms"]):
                 if existing.get("id") == uid:
                     self.character_data["alternate_forms"][i] = updated_form
+                    self.character_rollup().replace(existing, updated_form)
                     break
 
             populate_alternate_form_ui(self)
@@ -1799,9 +1618,129 @@ class BESMCharacterApp(ui.QMainWindow):
         else:
             ui.QMessageBox.warning(self, "Error", f"Failed to apply {template_type} template.")
 
+    def batch_export_to_pdf(self):
+        """Export several saved characters, one PDF each or as a single campaign book"""
+        paths, _ = ui.QFileDialog.getOpenFileNames(
+            self,
+            "Select Characters to Export",
+            self.last_directory,
+            "JSON Files (*.json)"
+        )
+        if not paths:
+            return
+
+        choice = ui.QMessageBox(self)
+        choice.setWindowTitle("Batch Export")
+        choice.setText(f"Export {len(paths)} characters as:")
+        separate_button = choice.addButton("One PDF Each", ui.QMessageBox.AcceptRole)
+        book_button = choice.addButton("Campaign Book", ui.QMessageBox.AcceptRole)
+        choice.addButton(ui.QMessageBox.Cancel)
+        choice.exec_()
+
+        if choice.clickedButton() is book_button:
+            output_path, _ = ui.QFileDialog.getSaveFileName(
+                self,
+                "Save Campaign Book",
+                os.path.join(self.last_directory, "Campaign_Book.pdf"),
+                "PDF Files (*.pdf)"
+            )
+            if not output_path:
+                return
+            self.start_batch_pdf_export(paths, output_path, book=True)
+        elif choice.clickedButton() is separate_button:
+            output_dir = ui.QFileDialog.getExistingDirectory(self, "Export PDFs To", self.last_directory)
+            if not output_dir:
+                return
+            self.start_batch_pdf_export(paths, output_dir, book=False)
+
+    def start_batch_pdf_export(self, paths, output_path, book):
+        """Run a batch export on a BatchPdfExportThread with a cancellable progress dialog"""
+        if getattr(self, "pdf_export_thread", None) is not None:
+            ui.QMessageBox.information(self, "Export in Progress", "Please wait for the current PDF export to finish.")
+            return
+
+        from PyQt5.QtWidgets import QProgressDialog
+        from tools.pdf_export_thread import BatchPdfExportThread
+
+        label = "Building campaign book..." if book else "Exporting characters..."
+        progress = QProgressDialog(label, "Cancel", 0, 0, self)
+        progress.setWindowTitle("Batch Export")
+        progress.setWindowModality(ui.Qt.NonModal)
+        progress.setMinimumDuration(300)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+
+        thread = BatchPdfExportThread(paths, output_path, book, self)
+        progress.canceled.connect(thread.cancel)
+        def show_progress(done, total):
+            progress.setMaximum(total)
+            progress.setValue(done)
+        def show_result(output, exported, failures):
+            if book:
+                message = f"Campaign book exported to:\n{output}"
+            else:
+                message = f"{exported} of {len(paths)} characters exported to:\n{output}"
+            if failures:
+                details = "\n".join(f"{os.path.basename(path)}: {error}" for path, error in failures)
+                ui.QMessageBox.warning(self, "Batch Export", f"{message}\n\nSkipped:\n{details}")
+            else:
+                ui.QMessageBox.information(self, "Batch Export", message)
+        thread.progress.connect(show_progress)
+        thread.succeeded.connect(show_result)
+        thread.failed.connect(self.on_pdf_export_failed)
+        thread.finished.connect(progress.close)
+        thread.finished.connect(self._on_pdf_export_thread_finished)
+
+        self.pdf_export_thread = thread
+        self.pdf_export_progress = progress
+        thread.start()
+
+    def show_performance_overlay(self):
+        """Show the live timing overlay; timings are collected while it is open"""
+        if getattr(self, "performance_overlay", None) is None:
+            from dialogs.performance_overlay import PerformanceOverlay
+            self.performance_overlay = PerformanceOverlay(self)
+        self.performance_overlay.show()
+        self.performance_overlay.raise_()
+
+    def show_encounter_dialog(self):
+        """Show the party vs opposition balance panel"""
+        if getattr(self, "encounter_dialog", None) is None:
+            from dialogs.encounter_dialog import EncounterDialog
+            self.encounter_dialog = EncounterDialog(self)
+        self.encounter_dialog.show()
+        self.encounter_dialog.raise_()
+
     # Class variable to track unnamed character count
     _unnamed_character_count = 0
+
+    def character_rollup(self):
+        """Return the CP rollup tree of character_data, building it on first use
+
+        Tabs call replace() or changed() on it after an edit, so only the
+        edited entry and its ancestors are recomputed.
+        """
+        from tools.rollup import RollupTree
+        tree = getattr(self, "rollup_tree", None)
+        if tree is None or tree.root.data is not self.character_data:
+            tree = self.rollup_tree = RollupTree(self.character_data)
+        return tree
     
+    def snapshot_character(self):
+        """Return an immutable snapshot of character_data
+
+        Consecutive snapshots share every subtree that did not change, so
+        exports and previews no longer deep-copy the whole character.
+        character_revision counts the distinct snapshots taken.
+        """
+        from tools.snapshot import freeze
+        previous = getattr(self, "character_snapshot", None)
+        self.character_snapshot = freeze(self.character_data, previous)
+        # The revision only moves when the character actually changed
+        if self.character_snapshot is not previous:
+            self.character_revision = getattr(self, "character_revision", 0) + 1
+        return self.character_snapshot
+
     def export_to_pdf(self):
         """Export the current character to a PDF file"""
         try:
@@ -1832,56 +1771,91 @@ class BESMCharacterApp(ui.QMainWindow):
             if not file_path.lower().endswith(".pdf"):
                 file_path += ".pdf"
             
-            # Ensure all data is in the correct format before exporting
-            # Make a deep copy to avoid modifying the original data
-            import copy
-            export_data = copy.deepcopy(self.character_data)
-            
-            # Ensure stats is a dictionary
-            if "stats" not in export_data or not isinstance(export_data["stats"], dict):
-                export_data["stats"] = {"Body": 1, "Mind": 1, "Soul": 1}
-                
-            # Ensure attributes is a list
-            if "attributes" not in export_data or not isinstance(export_data["attributes"], list):
-                export_data["attributes"] = []
-                
-            # Ensure defects is a list
-            if "defects" not in export_data or not isinstance(export_data["defects"], list):
-                export_data["defects"] = []
-                
-            # Ensure skills is a list
-            if "skills" not in export_data or not isinstance(export_data["skills"], list):
-                export_data["skills"] = []
-            
-            # Export the character to PDF
-            output_path = export_character_to_pdf(export_data, file_path)
-            
-            # Show success message
-            ui.QMessageBox.information(
-                self,
-                "Export Successful",
-                f"Character exported to:\n{output_path}"
-            )
+            # Export from a snapshot on a worker thread so editing can continue
+            # (reportlab is only loaded on first export)
+            from tools.pdf_export import prepare_export_data
+            export_data = prepare_export_data(self.snapshot_character())
+            self.start_pdf_export(export_data, file_path)
             
         except Exception as e:
             # Show detailed error message with traceback
             import traceback
-            error_details = traceback.format_exc()
-            ui.QMessageBox.critical(
-                self,
-                "Export Failed",
-                f"Failed to export character to PDF:\n{str(e)}\n\nDetails:\n{error_details}"
-            )
+            self.on_pdf_export_failed(traceback.format_exc())
+
+    def start_pdf_export(self, snapshot, file_path):
+        """Run a PDF export on a PdfExportThread with a cancellable progress dialog"""
+        if getattr(self, "pdf_export_thread", None) is not None:
+            ui.QMessageBox.information(self, "Export in Progress", "Please wait for the current PDF export to finish.")
+            return
+
+        from PyQt5.QtWidgets import QProgressDialog
+        from tools.pdf_export_thread import PdfExportThread
+
+        progress = QProgressDialog(f"Exporting {os.path.basename(file_path)}...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Export to PDF")
+        progress.setWindowModality(ui.Qt.NonModal)
+        progress.setMinimumDuration(300)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+
+        thread = PdfExportThread(snapshot, file_path, self)
+        progress.canceled.connect(thread.cancel)
+        def show_progress(done, total):
+            progress.setMaximum(total)
+            progress.setValue(done)
+        thread.progress.connect(show_progress)
+        thread.succeeded.connect(self.on_pdf_export_succeeded)
+        thread.failed.connect(self.on_pdf_export_failed)
+        thread.finished.connect(progress.close)
+        thread.finished.connect(self._on_pdf_export_thread_finished)
+
+        self.pdf_export_thread = thread
+        self.pdf_export_progress = progress
+        thread.start()
+
+    def closeEvent(self, event):
+        # A running QThread must not be destroyed with the window
+        if getattr(self, "pdf_export_thread", None) is not None:
+            self.pdf_export_thread.cancel()
+            self.pdf_export_thread.wait()
+        super().closeEvent(event)
+
+    def _on_pdf_export_thread_finished(self):
+        self.pdf_export_thread.deleteLater()
+        self.pdf_export_progress.deleteLater()
+        self.pdf_export_thread = None
+        self.pdf_export_progress = None
+
+    def on_pdf_export_succeeded(self, output_path):
+        ui.QMessageBox.information(
+            self,
+            "Export Successful",
+            f"Character exported to:\n{output_path}"
+        )
+
+    def on_pdf_export_failed(self, error_details):
+        # Show detailed error message with traceback
+        last_line = error_details.strip().splitlines()[-1] if error_details.strip() else ""
+        ui.QMessageBox.critical(
+            self,
+            "Export Failed",
+            f"Failed to export character to PDF:\n{last_line}\n\nDetails:\n{error_details}"
+        )
 
 if __name__ == "__main__":
     app = ui.QApplication(sys.argv)
+    startup_profiler.lap("qapplication")
 
     try:
         with open("style.qss", "r") as f:
             app.setStyleSheet(f.read())
     except Exception as e:
         print(f"Failed to load stylesheet: {e}")
+    startup_profiler.lap("stylesheet")
 
     window = BESMCharacterApp()
     window.show()
+
+    # In profiling mode, write the report and quit once the window has painted
+    startup_profiler.finish_after_first_paint(window, on_done=app.quit)
     sys.exit(app.exec_())
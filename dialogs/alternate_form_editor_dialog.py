@@ -8,8 +8,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt, QFile, QTextStream
 from tools.utils import create_card_widget, format_attribute_display
-from dialogs.attribute_builder_dialog import AttributeBuilderDialog
-from dialogs.defect_builder_dialog import DefectBuilderDialog
+from dialogs.dialog_pool import acquire_attribute_builder, acquire_defect_builder
 
 class AlternateFormEditorDialog(QDialog):
     def __init__(self, parent=None, form_data=None):
@@ -28,6 +27,9 @@ class AlternateFormEditorDialog(QDialog):
         if "defects" not in self.form_data:
             self.form_data["defects"] = []
         
+        # Forms are stored as overlays on the base character's stats
+        self.base_stats = dict(getattr(parent, "character_data", None) and parent.character_data.get("stats") or {})
+        
         # Calculate total CP spent and remaining
         self.total_cp_spent = 0
         self.remaining_cp = self.form_data.get("cp_budget", 5)
@@ -110,11 +112,13 @@ class AlternateFormEditorDialog(QDialog):
         form.addRow(description)
         
         # Stats
+        from tools.forms import FORM_STAT_RANGE, form_stats
+        stats = form_stats(self.form_data, self.base_stats)
         self.stat_inputs = {}
         for stat in ["Body", "Mind", "Soul"]:
             spin = QSpinBox()
-            spin.setRange(1, 20)
-            spin.setValue(self.form_data.get("stats", {}).get(stat, 4))
+            spin.setRange(*FORM_STAT_RANGE)
+            spin.setValue(stats[stat])
             # Connect valueChanged to update both derived values and CP totals
             spin.valueChanged.connect(self.update_derived_values)
             spin.valueChanged.connect(self.calculate_cp_totals)
@@ -227,35 +231,15 @@ class AlternateFormEditorDialog(QDialog):
         self.calculate_cp_totals()
         
     def calculate_cp_totals(self):
-        # Get base stats from parent character (if available)
-        base_stats = {}
-        if hasattr(self.parent, 'character_data') and 'stats' in self.parent.character_data:
-            base_stats = self.parent.character_data['stats']
-        else:
-            # Default base stats if parent data not available
-            base_stats = {"Body": 4, "Mind": 4, "Soul": 4}
-        
-        # Calculate CP spent on stats (only count points above base stats)
-        stats_cp = 0
-        for stat, spin in self.stat_inputs.items():
-            current_value = spin.value()
-            base_value = base_stats.get(stat, 4)  # Default to 4 if not found
-            # Only count CP if the stat is higher than the base form
-            if current_value > base_value:
-                stats_cp += (current_value - base_value)
-        
-        # Calculate CP spent on attributes
-        attr_cp = sum(attr.get("cost", 0) for attr in self.form_data["attributes"])
-        
-        # Calculate CP gained from defects
-        defect_cp = sum(defect.get("cost", 0) for defect in self.form_data["defects"])
-        
-        # Calculate total CP spent and remaining
-        self.total_cp_spent = stats_cp + attr_cp - defect_cp
-        self.remaining_cp = self.form_data["cp_budget"] - self.total_cp_spent
+        from tools.rollup import alternate_form_cost
+
+        # Only stat points above the parent character's base stats cost CP
+        cost = alternate_form_cost(self.current_overlay(), {"stats": self.base_stats})
+        self.total_cp_spent = cost.spent
+        self.remaining_cp = cost.remaining
         
         # Update labels
-        self.cp_spent_label.setText(f"CP Spent: {self.total_cp_spent} (Stats: {stats_cp}, Attrs: {attr_cp}, Defects: {defect_cp})")
+        self.cp_spent_label.setText(f"CP Spent: {cost.spent} (Stats: {cost.stats}, Attrs: {cost.attributes}, Defects: {cost.defects})")
         
         # Set color based on remaining CP
         if self.remaining_cp < 0:
@@ -288,7 +272,7 @@ class AlternateFormEditorDialog(QDialog):
             self.add_defect_card(defect)
     
     def add_attribute(self):
-        dialog = AttributeBuilderDialog(self.parent)
+        dialog = acquire_attribute_builder(self.parent)
         if dialog.exec_() == QDialog.Accepted:
             attr = dialog.get_attribute_data()
             # Add ID if not present
@@ -299,7 +283,7 @@ class AlternateFormEditorDialog(QDialog):
             self.calculate_cp_totals()
     
     def add_defect(self):
-        dialog = DefectBuilderDialog(self.parent)
+        dialog = acquire_defect_builder(self.parent)
         if dialog.exec_() == QDialog.Accepted:
             defect = dialog.get_defect_data()
             # Add ID if not present
@@ -369,63 +353,34 @@ class AlternateFormEditorDialog(QDialog):
         self.populate_defects()
         self.calculate_cp_totals()
     
+    def current_overlay(self):
+        """The form as edited so far, stored as differences from the base stats"""
+        from tools.forms import stat_deltas
+        stats = {stat: spin.value() for stat, spin in self.stat_inputs.items()}
+        overlay = {key: value for key, value in self.form_data.items() if key not in ("stats", "derived", "stat_deltas")}
+        deltas = stat_deltas(stats, self.base_stats)
+        if deltas:
+            overlay["stat_deltas"] = deltas
+        return overlay
+
     def update_derived_values(self):
-        # Get current stats
-        body = self.stat_inputs["Body"].value()
-        mind = self.stat_inputs["Mind"].value()
-        soul = self.stat_inputs["Soul"].value()
-        
-        # Calculate derived values
-        cv = (body + mind + soul) // 3
-        acv = cv
-        dcv = cv
-        hp = body * 10
-        ep = mind * 10
-        sv = body * 2
-        dm = (body + soul) // 2
-        sp = soul * 10
-        sop = mind * 10
+        # Derived values of the form's effective sheet, same rules as the main sheet
+        from tools.forms import form_sheet
+        derived = form_sheet(self.current_overlay(), {"stats": self.base_stats})["derived"]
         
         # Update labels
-        self.derived_labels["Combat Value"].setText(str(cv))
-        self.derived_labels["Attack Combat Value"].setText(str(acv))
-        self.derived_labels["Defense Combat Value"].setText(str(dcv))
-        self.derived_labels["Health Points"].setText(str(hp))
-        self.derived_labels["Energy Points"].setText(str(ep))
-        self.derived_labels["Shock Value"].setText(str(sv))
-        self.derived_labels["Damage Multiplier"].setText(str(dm))
-        self.derived_labels["Sanity Points"].setText(str(sp))
-        self.derived_labels["Society Points"].setText(str(sop))
+        for label, key in (("Combat Value", "CV"), ("Attack Combat Value", "ACV"), ("Defense Combat Value", "DCV"),
+                           ("Health Points", "HP"), ("Energy Points", "EP"), ("Shock Value", "SV"),
+                           ("Damage Multiplier", "DM"), ("Sanity Points", "SP"), ("Society Points", "SOP")):
+            self.derived_labels[label].setText(str(derived.get(key, 0)))
 
     def get_form_data(self):
-        # Update stats from inputs
-        stats = {stat: spin.value() for stat, spin in self.stat_inputs.items()}
-        
-        # Update derived values based on stats
-        body = stats["Body"]
-        mind = stats["Mind"]
-        soul = stats["Soul"]
-        
-        derived = {
-            "CV": (body + mind + soul) // 3,
-            "ACV": (body + mind + soul) // 3,
-            "DCV": (body + mind + soul) // 3,
-            "HP": body * 10,
-            "EP": mind * 10,
-            "SV": body * 2,
-            "DM": (body + soul) // 2,
-            "SP": soul * 10,
-            "SOP": mind * 10
-        }
-        
         level = self.level_input.value()
-        return {
+        return dict(self.current_overlay(), **{
             "id": self.original_id or str(uuid.uuid4()),
             "name": self.name_input.text(),
             "level": level,
             "cp_budget": level * 5,
-            "stats": stats,
-            "derived": derived,
             "attributes": self.form_data["attributes"],
             "defects": self.form_data["defects"]
-        }
\ No newline at end of file
+        })
\ No newline at end of file
@@ -1,29 +1,35 @@
-import json
-import os
-
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QTextEdit,
     QComboBox, QSpinBox, QPushButton, QScrollArea, QWidget, QFormLayout,
     QGroupBox, QListWidget, QListWidgetItem, QCompleter
 )
 from PyQt5.QtCore import Qt, QStringListModel, QEvent, QTimer
+from functools import lru_cache
+
+from tools.catalog import get_catalog
+
+# Upper bound on cached suggestion models, one per (attribute, field, controller value)
+COMPLETER_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=COMPLETER_CACHE_SIZE)
+def completer_model(attr_name, field_key, controller_value):
+    """Shared suggestion model for a dependent field, built once per controller value"""
+    fields = get_catalog().attributes.get(attr_name, {}).get("user_input_required", [])
+    field = next((f for f in fields if f.get("key") == field_key), {})
+    options = field.get("autocomplete_by_category", {}).get(controller_value, [])
+    return QStringListModel(options)
+
 
 class AttributeBuilderDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         
-        # Load attribute, enhancement, limiter data
-        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Adjust base path
-
-        with open(os.path.join(base_path, "data", "attributes.json"), "r", encoding="utf-8") as f:  # Correct path to data folder
-            raw_attributes = json.load(f)["attributes"]
-            self.attributes = {attr["name"]: attr for attr in raw_attributes}
-
-        with open(os.path.join(base_path, "data", "enhancements.json"), "r", encoding="utf-8") as f:
-            self.raw_enhancements = json.load(f)["enhancements"]
-
-        with open(os.path.join(base_path, "data", "limiters.json"), "r", encoding="utf-8") as f:
-            self.raw_limiters = json.load(f)["limiters"]
+        # Attribute, enhancement and limiter data come from the shared catalog
+        self.catalog = get_catalog()
+        self.attributes = self.catalog.attributes
+        self.raw_enhancements = self.catalog.enhancements
+        self.raw_limiters = self.catalog.limiters
         
         self.setWindowTitle("Attribute Builder")
         self.setMinimumWidth(500)
@@ -112,8 +118,9 @@ class AttributeBuilderDialog(QDialog):
         button_layout.addWidget(self.cancel_button)
         self.layout.addLayout(button_layout)
 
+        # Only user typing counts as a manual name; programmatic updates do not
         self._custom_name_edited = False
-        self.custom_name_input.textChanged.connect(self._track_custom_name_edit)
+        self.custom_name_input.textEdited.connect(self._track_custom_name_edit)
 
         self.dynamic_cost_map = {}  # Holds the current attribute's dynamic cost mapping
         self.dynamic_cost_category_key = None  # Key in custom fields (e.g., "category")
@@ -135,7 +142,19 @@ class AttributeBuilderDialog(QDialog):
             self._set_dynamic_custom_name(self.attr_dropdown.currentText())
 
         self.accept()
-        
+
+    def reset(self):
+        """Return the dialog to its freshly constructed state so it can be reused"""
+        self.existing_attribute_id = None
+        self.existing_attribute_index = None
+        self.user_description.clear()
+        self.level_spin.setValue(1)
+
+        self.attr_dropdown.blockSignals(True)
+        self.attr_dropdown.setCurrentIndex(0)
+        self.attr_dropdown.blockSignals(False)
+        self.update_attribute_info()
+
     def get_attribute_data(self):
         """Return the attribute data based on the dialog inputs"""
         attr_name = self.attr_dropdown.currentText()
@@ -209,6 +228,8 @@ class AttributeBuilderDialog(QDialog):
 
     def clear_custom_fields(self):
         self.custom_input_widgets.clear()
+        self.autocomplete_links = {}
+        self.autocomplete_data = {}
         while self.custom_field_form.rowCount() > 0:
             self.custom_field_form.removeRow(0)
             
@@ -224,7 +245,7 @@ class AttributeBuilderDialog(QDialog):
         
         widget = None
         
-        if field_type == "dropdown":
+        if field_type in ("dropdown", "select"):
             widget = QComboBox()
             widget.addItems(options)
             widget.view().setMinimumHeight(100)  # Make dropdown list taller
@@ -290,16 +311,10 @@ class AttributeBuilderDialog(QDialog):
                 widget.setToolTip(tooltip)
         
         # If a widget was created, add it to the form and tracking
-        if widget:
+        if widget is not None:
             self.custom_input_widgets[key] = widget
             self.custom_field_form.addRow(label + ":", widget)
-            
-            # Add dynamic name update for certain fields
-            if not self._custom_name_edited:
-                if isinstance(widget, QLineEdit):
-                    widget.textChanged.connect(lambda _: self._set_dynamic_custom_name(self.attr_dropdown.currentText()))
-                elif isinstance(widget, QComboBox):
-                    widget.currentTextChanged.connect(lambda _: self._set_dynamic_custom_name(self.attr_dropdown.currentText()))
+            self._watch_field(key, widget)
 
     def update_attribute_info(self):
         self._custom_name_edited = False
@@ -340,110 +355,11 @@ class AttributeBuilderDialog(QDialog):
         # First, get the attribute key for compatibility checking
         attr_key = attribute_data.get("key", "").lower()
         
-        # Enhancements
-        self.enhancement_list.clear()
-        
-        # Debug counter for compatible enhancements
-        enhancement_count = 0
-        
-        # Store compatible enhancements for later use
-        self.compatible_enhancements = []
-        
-        for enhancement in self.raw_enhancements:
-            # Handle both direct objects and nested arrays
-            if isinstance(enhancement, list):
-                # Skip nested arrays for now - we'll handle them separately
-                continue
-            
-            # Get the compatible_with list or empty list if not present
-            compatible_with = enhancement.get("compatible_with", [])
-            
-            # If compatible_with is None or empty, this enhancement is compatible with all attributes
-            # Otherwise, check if our attribute key is in the compatible_with list
-            is_compatible = (not compatible_with) or (attr_key and any(attr_key == key.lower() for key in compatible_with))
-            
-            if is_compatible:
-                enhancement_count += 1
-                self.compatible_enhancements.append(enhancement)
-                item = QListWidgetItem(enhancement["name"])
-                tooltip = enhancement.get("description", "") + "\n+1 CP"
-                item.setToolTip(tooltip)
-                item.setData(Qt.UserRole, enhancement)
-                self.enhancement_list.addItem(item)
-        
-        print(f"DEBUG: Found {enhancement_count} compatible enhancements for {attr_name}")
+        self.populate_enhancements_and_limiters(attr_name, attr_key)
 
-        # Limiters
-        self.limiter_list.clear()
-        # We already have the attribute key from above
-        
-        # Debug counter for compatible limiters
-        limiter_count = 0
-        
-        # Store compatible limiters for later use
-        self.compatible_limiters = []
-        
-        for limiter in self.raw_limiters:
-            # Handle both direct objects and nested arrays
-            if isinstance(limiter, list):
-                # Skip nested arrays for now
-                continue
-        
-            # Get the compatible_with list or empty list if not present
-            compatible_with = limiter.get("compatible_with", [])
-            
-            # If compatible_with is None or empty, this limiter is compatible with all attributes
-            # Otherwise, check if our attribute key is in the compatible_with list
-            is_compatible = (not compatible_with) or (attr_key and any(attr_key == key.lower() for key in compatible_with))
-            
-            if is_compatible:
-                limiter_count += 1
-                self.compatible_limiters.append(limiter)
-                item = QListWidgetItem(limiter["name"])
-                tooltip = limiter.get("description", "") + "\n−1 CP"
-                item.setToolTip(tooltip)
-                item.setData(Qt.UserRole, limiter)
-                self.limiter_list.addItem(item)
-        
-        print(f"DEBUG: Found {limiter_count} compatible limiters for {attr_name}")
-
-        # Trigger dependent category population
+        # Trigger dependent category population; later changes go through on_custom_field_changed
         if "category_type" in self.custom_input_widgets:
-            current_type = self.custom_input_widgets["category_type"].currentText()
-            self.on_category_type_changed(current_type)
-
-        # If the dynamic field is a dropdown, hook it to cost updates
-        if self.dynamic_cost_category_key:
-            widget = self.custom_input_widgets.get(self.dynamic_cost_category_key)
-            if isinstance(widget, QComboBox):
-                try:
-                    widget.currentTextChanged.disconnect()
-                except Exception:
-                    pass
-                widget.currentTextChanged.connect(self.update_cp_cost)
-
-        self.update_cp_cost()
-
-        # Trigger custom name update for Skill Group after all fields are populated
-        if attr_name == "Skill Group" and not self._custom_name_edited:
-            self._update_skill_group_name()
-
-        if not self._custom_name_edited and attr_name in {
-            "Skill Group", "Enemy Attack", "Enemy Defence",
-            "Melee Attack", "Melee Defence", "Ranged Attack",
-            "Power Flux", "Dynamic Powers", "Metamorphosis"
-        }:
-            for key, widget in self.custom_input_widgets.items():
-                try:
-                    if isinstance(widget, QComboBox):
-                        widget.currentTextChanged.disconnect()
-                        widget.currentTextChanged.connect(lambda _: self._set_dynamic_custom_name(attr_name))
-                    elif isinstance(widget, QLineEdit):
-                        widget.textChanged.disconnect()
-                        widget.textChanged.connect(lambda _: self._set_dynamic_custom_name(attr_name))
-                except Exception:
-                    # Skip if wasn't connected yet
-                    pass
+            self.on_category_type_changed(self.custom_input_widgets["category_type"].currentText())
 
         self.update_cp_cost()
 
@@ -460,6 +376,34 @@ class AttributeBuilderDialog(QDialog):
             print("[DEBUG INIT] Found widget for key")
             print("[DEBUG INIT] Initial category value:", self.custom_input_widgets[self.dynamic_cost_category_key].currentText())
 
+    def populate_enhancements_and_limiters(self, attr_name, attr_key):
+        """Fill the enhancement and limiter lists from the catalog's compatibility index"""
+        # Enhancements
+        self.enhancement_list.clear()
+        self.compatible_enhancements = self.catalog.compatible_enhancements(attr_key)
+
+        for enhancement in self.compatible_enhancements:
+            item = QListWidgetItem(enhancement["name"])
+            tooltip = enhancement.get("description", "") + "\n+1 CP"
+            item.setToolTip(tooltip)
+            item.setData(Qt.UserRole, enhancement)
+            self.enhancement_list.addItem(item)
+
+        print(f"DEBUG: Found {len(self.compatible_enhancements)} compatible enhancements for {attr_name}")
+
+        # Limiters
+        self.limiter_list.clear()
+        self.compatible_limiters = self.catalog.compatible_limiters(attr_key)
+
+        for limiter in self.compatible_limiters:
+            item = QListWidgetItem(limiter["name"])
+            tooltip = limiter.get("description", "") + "\n−1 CP"
+            item.setToolTip(tooltip)
+            item.setData(Qt.UserRole, limiter)
+            self.limiter_list.addItem(item)
+
+        print(f"DEBUG: Found {len(self.compatible_limiters)} compatible limiters for {attr_name}")
+
     def load_existing_enhancements_and_limiters(self, existing_attr):
         """Load existing enhancements and limiters for an attribute being edited"""
         try:
@@ -545,126 +489,15 @@ class AttributeBuilderDialog(QDialog):
                     elif isinstance(widget, QTextEdit):
                         widget.setPlainText(value)
 
-        # For Skill Group, hook dropdowns to update custom name
-        if attr_name == "Skill Group" and not self._custom_name_edited:
-            cat_widget = self.custom_input_widgets.get("category")
-            name_widget = self.custom_input_widgets.get("skill_group_name")
-
-            if cat_widget:
-                cat_widget.currentTextChanged.connect(self._update_skill_group_name)
-            if name_widget:
-                name_widget.currentTextChanged.connect(self._update_skill_group_name)
-
         self.custom_field_group.setVisible(bool(user_fields))
 
-        # enhancements
-        self.enhancement_list.clear()
         # Get the attribute key for compatibility checking
         attr_key = self.attributes[attr_name].get("key", "").lower()
         print(f"DEBUG: Current attribute: {attr_name}, key: {attr_key}")
-        
-        # Debug counter for compatible enhancements
-        enhancement_count = 0
-        
-        # Store compatible enhancements for later use
-        self.compatible_enhancements = []
-        
-        for enhancement in self.raw_enhancements:
-            # Handle both direct objects and nested arrays
-            if isinstance(enhancement, list):
-                # Skip nested arrays for now - we'll handle them separately
-                continue
-            
-            # Get the compatible_with list or empty list if not present
-            compatible_with = enhancement.get("compatible_with", [])
-            
-            # If compatible_with is None or empty, this enhancement is compatible with all attributes
-            # Otherwise, check if our attribute key is in the compatible_with list
-            is_compatible = (not compatible_with) or (attr_key and any(attr_key == key.lower() for key in compatible_with))
-            
-            if is_compatible:
-                enhancement_count += 1
-                self.compatible_enhancements.append(enhancement)
-                item = QListWidgetItem(enhancement["name"])
-                tooltip = enhancement.get("description", "") + "\n+1 CP"
-                item.setToolTip(tooltip)
-                item.setData(Qt.UserRole, enhancement)
-                self.enhancement_list.addItem(item)
-        
-        print(f"DEBUG: Found {enhancement_count} compatible enhancements for {attr_name}")
 
-        # Limiters
-        self.limiter_list.clear()
-        # We already have the attribute key from above
-        
-        # Debug counter for compatible limiters
-        limiter_count = 0
-        
-        # Store compatible limiters for later use
-        self.compatible_limiters = []
-        
-        for limiter in self.raw_limiters:
-            # Handle both direct objects and nested arrays
-            if isinstance(limiter, list):
-                # Skip nested arrays for now
-                continue
-            
-            # Get the compatible_with list or empty list if not present
-            compatible_with = limiter.get("compatible_with", [])
-            
-            # If compatible_with is None or empty, this limiter is compatible with all attributes
-            # Otherwise, check if our attribute key is in the compatible_with list
-            is_compatible = (not compatible_with) or (attr_key and any(attr_key == key.lower() for key in compatible_with))
-            
-            if is_compatible:
-                limiter_count += 1
-                self.compatible_limiters.append(limiter)
-                item = QListWidgetItem(limiter["name"])
-                tooltip = limiter.get("description", "") + "\n−1 CP"
-                item.setToolTip(tooltip)
-                item.setData(Qt.UserRole, limiter)
-                self.limiter_list.addItem(item)
-        
-        print(f"DEBUG: Found {limiter_count} compatible limiters for {attr_name}")
-
-        # Trigger dependent category population
-        if "category_type" in self.custom_input_widgets:
-            current_type = self.custom_input_widgets["category_type"].currentText()
-            self.on_category_type_changed(current_type)
-
-        # If the dynamic field is a dropdown, hook it to cost updates
-        if self.dynamic_cost_category_key:
-            widget = self.custom_input_widgets.get(self.dynamic_cost_category_key)
-            if isinstance(widget, QComboBox):
-                try:
-                    widget.currentTextChanged.disconnect()
-                except Exception:
-                    pass
-                widget.currentTextChanged.connect(self.update_cp_cost)
-
-        self.update_cp_cost()
-
-        # Trigger custom name update for Skill Group after all fields are populated
-        if attr_name == "Skill Group" and not self._custom_name_edited:
-            self._update_skill_group_name()
-
-        if not self._custom_name_edited and attr_name in {
-            "Skill Group", "Enemy Attack", "Enemy Defence",
-            "Melee Attack", "Melee Defence", "Ranged Attack",
-            "Power Flux", "Dynamic Powers", "Metamorphosis"
-        }:
-            for key, widget in self.custom_input_widgets.items():
-                try:
-                    if isinstance(widget, QComboBox):
-                        widget.currentTextChanged.disconnect()
-                        widget.currentTextChanged.connect(lambda _: self._set_dynamic_custom_name(attr_name))
-                    elif isinstance(widget, QLineEdit):
-                        widget.textChanged.disconnect()
-                        widget.textChanged.connect(lambda _: self._set_dynamic_custom_name(attr_name))
-                except Exception:
-                    # Skip if wasn't connected yet
-                    pass
+        self.populate_enhancements_and_limiters(attr_name, attr_key)
 
+        # Dependent fields were already refreshed by on_custom_field_changed while the values were set
         self.update_cp_cost()
 
         # If name hasn't been custom edited, try to smart-name it again now
@@ -680,16 +513,31 @@ class AttributeBuilderDialog(QDialog):
             print("[DEBUG INIT] Found widget for key")
             print("[DEBUG INIT] Initial category value:", self.custom_input_widgets[self.dynamic_cost_category_key].currentText())
 
-    def on_category_type_changed(self, selected_type):
-        controller_key = "category_type"
-        for dependent_key in self.autocomplete_links.get("category_type", []):
-            options = self.autocomplete_data.get(dependent_key, {}).get(selected_type, [])
-            widget = self.custom_input_widgets.get(dependent_key)
+    def _watch_field(self, key, widget):
+        """Route every change of a custom field through on_custom_field_changed"""
+        if isinstance(widget, QComboBox):
+            widget.currentTextChanged.connect(lambda _: self.on_custom_field_changed(key))
+        elif isinstance(widget, QLineEdit):
+            widget.textChanged.connect(lambda _: self.on_custom_field_changed(key))
+        elif isinstance(widget, QSpinBox):
+            widget.valueChanged.connect(lambda _: self.on_custom_field_changed(key))
+        elif isinstance(widget, QTextEdit):
+            widget.textChanged.connect(lambda: self.on_custom_field_changed(key))
+
+    def on_custom_field_changed(self, key):
+        """Refresh dependent suggestions and the generated name after a custom field changes"""
+        widget = self.custom_input_widgets.get(key)
+        if widget is None:
+            return
 
-            if isinstance(widget, QComboBox):
-                widget.clear()
-                widget.addItems(options)
-                widget.setCurrentIndex(-1)
+        if key in self.autocomplete_links and isinstance(widget, QComboBox):
+            self.on_controller_field_changed(key, widget.currentText())
+
+        if not self._custom_name_edited:
+            self._set_dynamic_custom_name(self.attr_dropdown.currentText())
+
+    def on_category_type_changed(self, selected_type):
+        self.on_controller_field_changed("category_type", selected_type)
 
     def update_cp_cost(self):
         name = self.attr_dropdown.currentText()
@@ -723,27 +571,28 @@ class AttributeBuilderDialog(QDialog):
         print(f"[DEBUG] Attribute: {name}, Level: {level}, Base Cost: {base_cost}, Total CP: {total_cp}, Effective Level: {effective_level}")
 
     def on_controller_field_changed(self, controller_key, selected_value):
-        if controller_key not in self.autocomplete_links:
-            return
-
-        for dependent_key in self.autocomplete_links[controller_key]:
-            data = self.autocomplete_data.get(dependent_key)
-            if not data or data["controller"] != controller_key:
-                continue
+        """Swap the cached suggestions for selected_value into every field that depends on controller_key"""
+        attr_name = self.attr_dropdown.currentText()
+        for dependent_key in self.autocomplete_links.get(controller_key, []):
+            widget = self.custom_input_widgets.get(dependent_key)
+            model = completer_model(attr_name, dependent_key, selected_value)
 
-            options = data["options_map"].get(selected_value, [])
-            widget = self.custom_fields_widgets.get(dependent_key)
-            if isinstance(widget, QLineEdit):
-                completer = QCompleter(options)
-                completer.setCaseSensitivity(Qt.CaseInsensitive)
-                completer.setFilterMode(Qt.MatchContains)
-                widget.setCompleter(completer)
+            if isinstance(widget, QComboBox):
+                # The model is shared, so typed text must not be inserted into it
+                widget.setInsertPolicy(QComboBox.NoInsert)
+                widget.setModel(model)
+                widget.setCurrentIndex(-1)
+            elif isinstance(widget, QLineEdit):
+                completer = widget.completer()
+                if completer is None:
+                    completer = QCompleter(widget)
+                    completer.setCaseSensitivity(Qt.CaseInsensitive)
+                    completer.setFilterMode(Qt.MatchContains)
+                    widget.setCompleter(completer)
+                completer.setModel(model)
 
     def get_attribute_data(self):
-        # Make sure name reflects the latest field values
-        if not self._custom_name_edited:
-            self._set_dynamic_custom_name(self.attr_dropdown.currentText())
-        
+        # The custom name is kept current by on_custom_field_changed, so this only reads widgets
         custom_fields = {}
         for key, widget in self.custom_input_widgets.items():
             if isinstance(widget, QLineEdit):
@@ -775,15 +624,6 @@ class AttributeBuilderDialog(QDialog):
         total_cp = base_cost * level
         effective_level = max(1, level - enhancement_count + limiter_count)
 
-        # Force dynamic name update if user hasn't manually edited it
-        from PyQt5.QtWidgets import QApplication  # (already imported at top)
-
-        # Make sure all text/selection changes are processed
-        QApplication.processEvents()
-
-        if not self._custom_name_edited:
-            self._set_dynamic_custom_name(self.attr_dropdown.currentText())
-
         print("[DEBUG SUBMIT] Final Name:", self.custom_name_input.text())
         print("[DEBUG SUBMIT] Custom Fields:", custom_fields)
         return {
@@ -857,15 +697,10 @@ class AttributeBuilderDialog(QDialog):
                 widget.setToolTip(tooltip)
 
         # If a widget was created, add it to the form and tracking
-        if widget:
+        if widget is not None:
             self.custom_input_widgets[key] = widget
             self.custom_field_form.addRow(label + ":", widget)
-
-        if not self._custom_name_edited:
-            if isinstance(widget, QLineEdit):
-                widget.textChanged.connect(lambda _: self._set_dynamic_custom_name(self.attr_dropdown.currentText()))
-            elif isinstance(widget, QComboBox):
-                widget.currentTextChanged.connect(lambda _: self._set_dynamic_custom_name(self.attr_dropdown.currentText()))
+            self._watch_field(key, widget)
 
     def eventFilter(self, source, event):
         if event.type() == QEvent.MouseButtonPress:
@@ -879,19 +714,6 @@ class AttributeBuilderDialog(QDialog):
         print(f"[DYNAMIC NAME] Setting name for {attr_name}")
         return lambda _: self._set_dynamic_custom_name(attr_name)
 
-    def _update_skill_group_name(self):
-        if self._custom_name_edited:
-            return  # don't overwrite user input
-
-        cat_widget = self.custom_input_widgets.get("category")
-        name_widget = self.custom_input_widgets.get("skill_group_name")
-
-        if cat_widget and name_widget:
-            category = cat_widget.currentText()
-            group_name = name_widget.currentText()
-            if category and group_name:
-                self.custom_name_input.setText(f"Skill Group: {group_name} ({category})")
-
     def _set_dynamic_custom_name(self, attr_name):
         # Fallback
         fallback_name = attr_name
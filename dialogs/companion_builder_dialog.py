@@ -10,8 +10,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 from tools.utils import create_card_widget, format_attribute_display
-from dialogs.attribute_builder_dialog import AttributeBuilderDialog
-from dialogs.defect_builder_dialog import DefectBuilderDialog
+from dialogs.dialog_pool import acquire_attribute_builder, acquire_defect_builder
 
 class CompanionBuilderDialog(QDialog):
     def __init__(self, parent=None, companion_data=None):
@@ -255,21 +254,16 @@ class CompanionBuilderDialog(QDialog):
         self.calculate_cp_totals()
         
     def calculate_cp_totals(self):
-        # Calculate CP spent on stats (1 CP per point)
-        stats_cp = sum(spin.value() for spin in self.stat_inputs.values())
-        
-        # Calculate CP spent on attributes
-        attr_cp = sum(attr.get("cost", 0) for attr in self.companion_data["attributes"])
-        
-        # Calculate CP gained from defects
-        defect_cp = sum(defect.get("cost", 0) for defect in self.companion_data["defects"])
-        
-        # Calculate total CP spent and remaining
-        self.total_cp_spent = stats_cp + attr_cp - defect_cp
-        self.remaining_cp = self.companion_data["cp_budget"] - self.total_cp_spent
+        from tools.rollup import companion_cost
+
+        # 1 CP per stat point, plus attributes, minus defects
+        stats = {stat: spin.value() for stat, spin in self.stat_inputs.items()}
+        cost = companion_cost(dict(self.companion_data, stats=stats))
+        self.total_cp_spent = cost.spent
+        self.remaining_cp = cost.remaining
         
         # Update labels
-        self.cp_spent_label.setText(f"CP Spent: {self.total_cp_spent} (Stats: {stats_cp}, Attrs: {attr_cp}, Defects: {defect_cp})")
+        self.cp_spent_label.setText(f"CP Spent: {cost.spent} (Stats: {cost.stats}, Attrs: {cost.attributes}, Defects: {cost.defects})")
         
         # Set color based on remaining CP
         if self.remaining_cp < 0:
@@ -302,7 +296,7 @@ class CompanionBuilderDialog(QDialog):
             self.add_defect_card(defect)
     
     def add_attribute(self):
-        dialog = AttributeBuilderDialog(self.parent)
+        dialog = acquire_attribute_builder(self.parent)
         if dialog.exec_() == QDialog.Accepted:
             attr = dialog.get_attribute_data()
             # Add ID if not present
@@ -313,7 +307,7 @@ class CompanionBuilderDialog(QDialog):
             self.calculate_cp_totals()
     
     def add_defect(self):
-        dialog = DefectBuilderDialog(self.parent)
+        dialog = acquire_defect_builder(self.parent)
         if dialog.exec_() == QDialog.Accepted:
             defect = dialog.get_defect_data()
             # Add ID if not present
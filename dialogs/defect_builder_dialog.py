@@ -1,6 +1,3 @@
-import os
-import json
-
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QTextEdit,
     QComboBox, QSpinBox, QPushButton, QScrollArea, QWidget, QFormLayout,
@@ -8,6 +5,8 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt, QStringListModel, QEvent, QTimer
 
+from tools.catalog import get_catalog
+
 class DefectBuilderDialog(QDialog):
     def __init__(self, parent=None, existing_defect=None):
         super().__init__(parent)
@@ -15,18 +14,11 @@ class DefectBuilderDialog(QDialog):
         # Store the existing defect data if provided
         self.existing_defect = existing_defect
         
-        # Load defect, enhancement, limiter data
-        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Adjust base path
-
-        with open(os.path.join(base_path, "data", "defects.json"), "r", encoding="utf-8") as f:  # Correct path to data folder
-            raw_defects = json.load(f)["defects"]
-            self.defects = {defect["name"]: defect for defect in raw_defects}
-
-        with open(os.path.join(base_path, "data", "enhancements.json"), "r", encoding="utf-8") as f:
-            self.raw_enhancements = json.load(f)["enhancements"]
-
-        with open(os.path.join(base_path, "data", "limiters.json"), "r", encoding="utf-8") as f:
-            self.raw_limiters = json.load(f)["limiters"]
+        # Defect, enhancement and limiter data come from the shared catalog
+        self.catalog = get_catalog()
+        self.defects = self.catalog.defects
+        self.raw_enhancements = self.catalog.enhancements
+        self.raw_limiters = self.catalog.limiters
         
         self.setWindowTitle("Defect Builder")
         self.setMinimumWidth(500)
@@ -105,41 +97,12 @@ class DefectBuilderDialog(QDialog):
         self.layout.addWidget(QLabel("Your Notes:"))
         self.layout.addWidget(self.user_description)
         
-        # Store whether we're in edit mode for later use
-        self.edit_mode = self.existing_defect is not None
-        
-        # If we have an existing defect, populate the fields
-        if self.edit_mode:
-            # Set the base defect type
-            base_name = self.existing_defect.get("base_name", self.existing_defect.get("name", ""))
-            if base_name in self.defects:
-                self.defect_dropdown.setCurrentText(base_name)
-            
-            # Set the custom name
-            custom_name = self.existing_defect.get("name", "")
-            self.custom_name_input.setText(custom_name)
-            
-            # Set the rank
-            self.existing_rank = self.existing_defect.get("rank", 1)
-            self.rank_spin.setValue(self.existing_rank)
-            
-            # Set the user description
-            notes = self.existing_defect.get("notes", "")
-            self.user_description.setPlainText(notes)
-            
-            # We need to wait until after update_defect_info is called to set enhancements and limiters
-            QTimer.singleShot(100, self.populate_existing_enhancements_and_limiters)
-
-        # Initialize with first defect
         self._custom_name_edited = False
         self.custom_name_input.textEdited.connect(self._track_custom_name_edit)
         
-        # Update defect info before adding buttons to ensure all fields are properly initialized
-        self.update_defect_info()
-        
         # Buttons
         button_layout = QHBoxLayout()
-        self.add_button = QPushButton("Add Defect" if not self.existing_defect else "Update Defect")
+        self.add_button = QPushButton("Add Defect")
         self.add_button.clicked.connect(self.finalize_and_accept)
         self.cancel_button = QPushButton("Cancel")
         self.cancel_button.clicked.connect(self.reject)
@@ -149,6 +112,37 @@ class DefectBuilderDialog(QDialog):
         
         self.layout.addLayout(button_layout)
 
+        # Select the first defect, or populate the fields from the existing one
+        self.reset(existing_defect)
+
+    def reset(self, existing_defect=None):
+        """Return the dialog to its freshly constructed state, optionally editing a defect"""
+        self.existing_defect = existing_defect
+        self.edit_mode = existing_defect is not None
+        self._custom_name_edited = False
+        self.user_description.clear()
+
+        self.defect_dropdown.blockSignals(True)
+        self.defect_dropdown.setCurrentIndex(0)
+        if self.edit_mode:
+            # Set the base defect type
+            base_name = existing_defect.get("base_name", existing_defect.get("name", ""))
+            if base_name in self.defects:
+                self.defect_dropdown.setCurrentText(base_name)
+        self.defect_dropdown.blockSignals(False)
+
+        # Rebuild ranges, lists and custom fields for the selected defect
+        self.update_defect_info()
+
+        if self.edit_mode:
+            self.custom_name_input.setText(existing_defect.get("name", ""))
+            self.existing_rank = existing_defect.get("rank", 1)
+            self.rank_spin.setValue(self.existing_rank)
+            self.user_description.setPlainText(existing_defect.get("notes", ""))
+            self.populate_existing_enhancements_and_limiters()
+
+        self.add_button.setText("Update Defect" if self.edit_mode else "Add Defect")
+
     def finalize_and_accept(self):
         # Validate any required fields
         # (Add validation logic here if needed)
@@ -197,19 +191,17 @@ class DefectBuilderDialog(QDialog):
         
         # Clear and rebuild enhancements list
         self.enhancement_list.clear()
-        for enhancement in self.raw_enhancements:
-            if defect_name in enhancement.get("applicable_to", []) or "All" in enhancement.get("applicable_to", []):
-                item = QListWidgetItem(enhancement["name"])
-                item.setToolTip(enhancement.get("description", ""))
-                self.enhancement_list.addItem(item)
+        for enhancement in self.catalog.defect_enhancements(defect_name):
+            item = QListWidgetItem(enhancement["name"])
+            item.setToolTip(enhancement.get("description", ""))
+            self.enhancement_list.addItem(item)
         
         # Clear and rebuild limiters list
         self.limiter_list.clear()
-        for limiter in self.raw_limiters:
-            if defect_name in limiter.get("applicable_to", []) or "All" in limiter.get("applicable_to", []):
-                item = QListWidgetItem(limiter["name"])
-                item.setToolTip(limiter.get("description", ""))
-                self.limiter_list.addItem(item)
+        for limiter in self.catalog.defect_limiters(defect_name):
+            item = QListWidgetItem(limiter["name"])
+            item.setToolTip(limiter.get("description", ""))
+            self.limiter_list.addItem(item)
         
         # Handle custom fields
         self.clear_custom_fields()
@@ -257,7 +249,7 @@ class DefectBuilderDialog(QDialog):
             item = self.enhancement_list.item(i)
             if item.isSelected():
                 enhancement_name = item.text()
-                enhancement = next((e for e in self.raw_enhancements if e["name"] == enhancement_name), None)
+                enhancement = self.catalog.enhancements_by_name.get(enhancement_name)
                 if enhancement:
                     enhancement_multiplier += enhancement.get("cost_multiplier", 0)
         
@@ -269,7 +261,7 @@ class DefectBuilderDialog(QDialog):
             item = self.limiter_list.item(i)
             if item.isSelected():
                 limiter_name = item.text()
-                limiter = next((l for l in self.raw_limiters if l["name"] == limiter_name), None)
+                limiter = self.catalog.limiters_by_name.get(limiter_name)
                 if limiter:
                     limiter_multiplier -= limiter.get("cost_reduction", 0)
         
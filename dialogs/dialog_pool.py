@@ -0,0 +1,109 @@
+"""
+Reusable builder dialogs for BESM Character Generator
+
+Building an AttributeBuilderDialog or DefectBuilderDialog means creating a few
+hundred widgets, which made every "Add Attribute" / "Add Defect" click stall.
+The pool keeps one hidden instance of each builder, creates it right after
+startup, and resets it instead of rebuilding on every use.
+"""
+
+from PyQt5.QtCore import QObject, QTimer, Qt
+from PyQt5.QtWidgets import QApplication
+
+from dialogs import attribute_builder_dialog, defect_builder_dialog
+
+
+class DialogPool(QObject):
+    """Keeps one idle, pre-built instance of each builder dialog.
+
+    Dialogs go back to the pool when they finish. If a dialog of the same type
+    is requested while the pooled one is still open (a builder launched from a
+    nested editor), a fresh instance is created instead.
+    """
+
+    def __init__(self, owner):
+        super().__init__(owner)
+        self.owner = owner
+        self._idle = {}  # dialog class -> idle instance
+
+        # Qt5 widgets get no low-memory notification; drop the idle dialogs
+        # when the application is hidden or suspended instead
+        app = QApplication.instance()
+        if app is not None:
+            app.applicationStateChanged.connect(self._on_application_state_changed)
+
+    def prewarm(self):
+        """Build the idle dialogs once the event loop is free"""
+        QTimer.singleShot(0, self._build_idle)
+
+    def _build_idle(self):
+        for cls in self._dialog_classes():
+            if cls not in self._idle:
+                print(f"[DEBUG] Prewarming {cls.__name__}")
+                self._idle[cls] = self._create(cls)
+
+    def _dialog_classes(self):
+        # Looked up on every call so a replaced class is picked up
+        return (
+            attribute_builder_dialog.AttributeBuilderDialog,
+            defect_builder_dialog.DefectBuilderDialog,
+        )
+
+    def _create(self, cls, *args):
+        dialog = cls(self.owner, *args)
+        dialog.finished.connect(lambda _result, d=dialog: self._release(d))
+        return dialog
+
+    def attribute_builder(self):
+        """Return an AttributeBuilderDialog ready for a new attribute"""
+        cls = attribute_builder_dialog.AttributeBuilderDialog
+        dialog = self._idle.pop(cls, None)
+        if dialog is None:
+            return self._create(cls)
+        dialog.reset()
+        return dialog
+
+    def defect_builder(self, existing_defect=None):
+        """Return a DefectBuilderDialog, populated from existing_defect when editing"""
+        cls = defect_builder_dialog.DefectBuilderDialog
+        dialog = self._idle.pop(cls, None)
+        if dialog is None:
+            return self._create(cls, existing_defect)
+        dialog.reset(existing_defect)
+        return dialog
+
+    def _release(self, dialog):
+        cls = type(dialog)
+        if cls in self._dialog_classes() and cls not in self._idle:
+            self._idle[cls] = dialog
+        else:
+            dialog.deleteLater()
+
+    def clear(self):
+        """Destroy the idle dialogs; they are rebuilt on next use"""
+        for dialog in self._idle.values():
+            dialog.deleteLater()
+        self._idle = {}
+
+    def _on_application_state_changed(self, state):
+        if state in (Qt.ApplicationHidden, Qt.ApplicationSuspended):
+            print("[DEBUG] Application hidden, releasing pooled dialogs")
+            self.clear()
+        elif state == Qt.ApplicationActive and not self._idle:
+            self.prewarm()
+
+
+def acquire_attribute_builder(parent):
+    """Get an attribute builder from the parent's pool, or build one if it has none"""
+    pool = getattr(parent, "dialog_pool", None)
+    if pool is not None:
+        return pool.attribute_builder()
+    return attribute_builder_dialog.AttributeBuilderDialog(parent)
+
+
+def acquire_defect_builder(parent, existing_defect=None):
+    """Get a defect builder from the parent's pool, or build one if it has none"""
+    pool = getattr(parent, "dialog_pool", None)
+    if pool is not None:
+        return pool.defect_builder(existing_defect)
+    return defect_builder_dialog.DefectBuilderDialog(parent, existing_defect)
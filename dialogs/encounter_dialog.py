@@ -0,0 +1,184 @@
+# encounter_dialog.py
+
+import os
+import json
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QPushButton, QListWidget,
+    QListWidgetItem, QComboBox, QSpinBox, QCheckBox, QPlainTextEdit, QFileDialog, QMessageBox
+)
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+
+from tools.encounter import MINION_SCALES, analyze_encounter
+
+
+class EncounterSignals(QObject):
+    finished = pyqtSignal(object)  # EncounterResult
+    failed = pyqtSignal(str)
+
+
+class EncounterTask(QRunnable):
+    """Runs one encounter analysis on the dialog's thread pool"""
+
+    def __init__(self, party, group, options):
+        super().__init__()
+        self.party = party
+        self.group = group
+        self.options = options
+        self.signals = EncounterSignals()
+
+    def run(self):
+        try:
+            result = analyze_encounter(self.party, self.group, **self.options)
+        except Exception as e:
+            print(f"[DEBUG] Encounter analysis failed: {e!r}")
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+
+class EncounterDialog(QDialog):
+    """Options → Encounter Balance: a party against an opposing group and their minions"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Encounter Balance")
+        self.setMinimumWidth(640)
+        self.setMinimumHeight(480)
+        self.setModal(False)
+        self.parent = parent
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+        layout = QVBoxLayout(self)
+        sides = QHBoxLayout()
+        self.party_list = self._add_side(sides, "Party", add_current=True)
+        self.group_list = self._add_side(sides, "Opposition")
+        layout.addLayout(sides)
+
+        options = QGridLayout()
+        self.minion_combo = QComboBox()
+        self.minion_combo.addItems(MINION_SCALES)
+        self.minion_combo.setCurrentText("mid")
+        self.minion_combo.setToolTip("Where in each minion entry's count range to take its numbers")
+        self.minions_check = QCheckBox("Include minions")
+        self.minions_check.setChecked(True)
+        self.trials_spin = QSpinBox()
+        self.trials_spin.setRange(100, 100000)
+        self.trials_spin.setSingleStep(500)
+        self.trials_spin.setValue(2000)
+        self.seed_spin = QSpinBox()
+        self.seed_spin.setRange(0, 999999)
+        options.addWidget(QLabel("Minion numbers:"), 0, 0)
+        options.addWidget(self.minion_combo, 0, 1)
+        options.addWidget(self.minions_check, 0, 2)
+        options.addWidget(QLabel("Battles:"), 1, 0)
+        options.addWidget(self.trials_spin, 1, 1)
+        options.addWidget(QLabel("Seed:"), 1, 2)
+        options.addWidget(self.seed_spin, 1, 3)
+        layout.addLayout(options)
+
+        self.results_view = QPlainTextEdit()
+        self.results_view.setReadOnly(True)
+        self.results_view.setPlaceholderText("Add characters to both sides and press Analyze.")
+        layout.addWidget(self.results_view)
+
+        button_layout = QHBoxLayout()
+        self.analyze_button = QPushButton("Analyze")
+        self.analyze_button.clicked.connect(self.analyze)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.close)
+        button_layout.addStretch()
+        button_layout.addWidget(self.analyze_button)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        # Every change is a new what-if; cached ones come back at once
+        self.minion_combo.currentTextChanged.connect(lambda _: self.analyze())
+        self.minions_check.toggled.connect(lambda _: self.analyze())
+
+    def _add_side(self, parent_layout, title, add_current=False):
+        column = QVBoxLayout()
+        column.addWidget(QLabel(title))
+        side_list = QListWidget()
+        side_list.setSelectionMode(QListWidget.ExtendedSelection)
+        column.addWidget(side_list)
+
+        buttons = QHBoxLayout()
+        add_button = QPushButton("Add Files...")
+        add_button.clicked.connect(lambda: self.add_files(side_list))
+        buttons.addWidget(add_button)
+        if add_current:
+            current_button = QPushButton("Add Current Character")
+            current_button.clicked.connect(self.add_current_character)
+            buttons.addWidget(current_button)
+        remove_button = QPushButton("Remove")
+        remove_button.clicked.connect(lambda: self.remove_selected(side_list))
+        buttons.addWidget(remove_button)
+        column.addLayout(buttons)
+        parent_layout.addLayout(column)
+        return side_list
+
+    def add_character(self, side_list, data, label=None):
+        """Add character data to a side's list"""
+        minions = len(data.get("minions", []))
+        text = label or data.get("name") or "Unnamed"
+        if minions:
+            text += f" (+{minions} minion group{'s' if minions > 1 else ''})"
+        item = QListWidgetItem(text)
+        item.setData(Qt.UserRole, data)
+        side_list.addItem(item)
+
+    def add_files(self, side_list):
+        directory = getattr(self.parent, "last_directory", "") or os.path.expanduser("~")
+        paths, _ = QFileDialog.getOpenFileNames(self, "Add Characters", directory, "Character Files (*.json)")
+        failed = []
+        for path in paths:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.add_character(side_list, json.load(f))
+            except (OSError, ValueError) as e:
+                failed.append(f"{os.path.basename(path)}: {e}")
+        if failed:
+            QMessageBox.warning(self, "Encounter Balance", "Could not read:\n" + "\n".join(failed))
+
+    def add_current_character(self):
+        if self.parent is None or not hasattr(self.parent, "snapshot_character"):
+            return
+        self.add_character(self.party_list, self.parent.snapshot_character())
+
+    def remove_selected(self, side_list):
+        for item in side_list.selectedItems():
+            side_list.takeItem(side_list.row(item))
+
+    def side_characters(self, side_list):
+        return [side_list.item(row).data(Qt.UserRole) for row in range(side_list.count())]
+
+    def analyze(self):
+        """Queue an analysis of the current sides and options"""
+        party = self.side_characters(self.party_list)
+        group = self.side_characters(self.group_list)
+        if not party or not group:
+            self.results_view.setPlainText("Both sides need at least one character.")
+            return
+        options = {"trials": self.trials_spin.value(), "seed": self.seed_spin.value(),
+                   "minion_scale": self.minion_combo.currentText(),
+                   "include_minions": self.minions_check.isChecked()}
+        self.analyze_button.setEnabled(False)
+        self.results_view.setPlainText("Simulating...")
+        task = EncounterTask(party, group, options)
+        task.signals.finished.connect(self.on_result)
+        task.signals.failed.connect(self.on_failed)
+        self.pool.start(task)
+
+    def on_result(self, result):
+        self.analyze_button.setEnabled(True)
+        self.last_result = result
+        self.results_view.setPlainText(result.summary())
+
+    def on_failed(self, message):
+        self.analyze_button.setEnabled(True)
+        self.results_view.setPlainText(f"Analysis failed: {message}")
+
+    def closeEvent(self, event):
+        self.pool.clear()
+        super().closeEvent(event)
@@ -10,8 +10,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 from tools.utils import create_card_widget, format_attribute_display
-from dialogs.attribute_builder_dialog import AttributeBuilderDialog
-from dialogs.defect_builder_dialog import DefectBuilderDialog
+from dialogs.dialog_pool import acquire_attribute_builder, acquire_defect_builder
 
 class ItemBuilderDialog(QDialog):
     def __init__(self, parent=None, item_data=None):
@@ -241,18 +240,15 @@ class ItemBuilderDialog(QDialog):
         self.tabs.addTab(tab, "Examples")
 
     def calculate_cp_totals(self):
-        # Calculate CP spent on attributes
-        attr_cp = sum(attr.get("cost", 0) for attr in self.item_data["attributes"])
-        
-        # Calculate CP gained from defects
-        defect_cp = sum(defect.get("cost", 0) for defect in self.item_data["defects"])
-        
-        # Calculate total CP spent and item cost (half of total, rounded down)
-        self.total_cp_spent = max(0, attr_cp - defect_cp)
-        self.item_cost = self.total_cp_spent // 2  # Integer division to round down
+        from tools.rollup import item_cost, item_price
+
+        # Item cost is half of the total, rounded down
+        cost = item_cost(self.item_data)
+        self.total_cp_spent = cost.spent
+        self.item_cost = item_price(cost.spent)
         
         # Update labels
-        self.cp_spent_label.setText(f"{self.total_cp_spent} CP (Attributes: {attr_cp}, Defects: {defect_cp})")
+        self.cp_spent_label.setText(f"{self.total_cp_spent} CP (Attributes: {cost.attributes}, Defects: {cost.defects})")
         self.item_cost_label.setText(f"{self.item_cost} CP")
     
     def populate_attributes(self):
@@ -278,7 +274,7 @@ class ItemBuilderDialog(QDialog):
             self.add_defect_card(defect)
     
     def add_attribute(self):
-        dialog = AttributeBuilderDialog(self.parent)
+        dialog = acquire_attribute_builder(self.parent)
         if dialog.exec_() == QDialog.Accepted:
             attr = dialog.get_attribute_data()
             # Add ID if not present
@@ -289,7 +285,7 @@ class ItemBuilderDialog(QDialog):
             self.calculate_cp_totals()
     
     def add_defect(self):
-        dialog = DefectBuilderDialog(self.parent)
+        dialog = acquire_defect_builder(self.parent)
         if dialog.exec_() == QDialog.Accepted:
             defect = dialog.get_defect_data()
             # Add ID if not present
@@ -6,8 +6,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 from tools.utils import create_card_widget
-from dialogs.attribute_builder_dialog import AttributeBuilderDialog
-from dialogs.defect_builder_dialog import DefectBuilderDialog
+from dialogs.dialog_pool import acquire_attribute_builder, acquire_defect_builder
 
 class MetamorphosisEditorDialog(QDialog):
     def __init__(self, parent, metamorphosis_data=None):
@@ -156,7 +155,7 @@ class MetamorphosisEditorDialog(QDialog):
             self.add_defect_card(defect)
     
     def add_attribute(self):
-        dialog = AttributeBuilderDialog(self.parent)
+        dialog = acquire_attribute_builder(self.parent)
         if dialog.exec_() == QDialog.Accepted:
             attr_data = dialog.get_attribute_data()
             
@@ -229,7 +228,7 @@ class MetamorphosisEditorDialog(QDialog):
         
         existing_attr = self.metamorphosis_data["attributes"][attr_index]
         
-        dialog = AttributeBuilderDialog(self.parent)
+        dialog = acquire_attribute_builder(self.parent)
         dialog.load_attribute_data(existing_attr)
         
         if dialog.exec_() == QDialog.Accepted:
@@ -259,7 +258,7 @@ class MetamorphosisEditorDialog(QDialog):
             self.add_attribute_card(attr)
     
     def add_defect(self):
-        dialog = DefectBuilderDialog(self.parent)
+        dialog = acquire_defect_builder(self.parent)
         if dialog.exec_() == QDialog.Accepted:
             defect_data = dialog.get_defect_data()
             
@@ -332,8 +331,7 @@ class MetamorphosisEditorDialog(QDialog):
         
         existing_defect = self.metamorphosis_data["defects"][defect_index]
         
-        dialog = DefectBuilderDialog(self.parent)
-        dialog.load_defect_data(existing_defect)
+        dialog = acquire_defect_builder(self.parent, existing_defect)
         
         if dialog.exec_() == QDialog.Accepted:
             updated_defect = dialog.get_defect_data()
@@ -362,12 +360,10 @@ class MetamorphosisEditorDialog(QDialog):
             self.add_defect_card(defect)
     
     def update_cp_display(self):
-        # Calculate total CP used
-        attr_cp = sum(attr.get("cost", 0) for attr in self.metamorphosis_data["attributes"])
-        defect_cp = sum(defect.get("value", 0) for defect in self.metamorphosis_data["defects"])
-        
+        from tools.rollup import metamorphosis_cost
+
         # Defects provide CP back (negative cost)
-        self.total_cp_used = attr_cp - defect_cp
+        self.total_cp_used = metamorphosis_cost(self.metamorphosis_data).spent
         
         # Update the display
         self.cp_used_display.setText(f"{self.total_cp_used} CP")
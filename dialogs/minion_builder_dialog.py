@@ -10,8 +10,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 from tools.utils import create_card_widget, format_attribute_display
-from dialogs.attribute_builder_dialog import AttributeBuilderDialog
-from dialogs.defect_builder_dialog import DefectBuilderDialog
+from dialogs.dialog_pool import acquire_attribute_builder, acquire_defect_builder
 
 class MinionBuilderDialog(QDialog):
     def __init__(self, parent=None, minion_data=None):
@@ -273,22 +272,17 @@ class MinionBuilderDialog(QDialog):
         self.calculate_cp_totals()
 
     def calculate_cp_totals(self):
-        # Calculate CP from stats
-        stat_cp = sum(spin.value() * 2 for spin in self.stat_inputs.values())
-        
-        # Calculate CP from attributes
-        attr_cp = sum(attr.get("cost", 0) for attr in self.minion_data["attributes"])
-        
-        # Calculate CP from defects (negative)
-        defect_cp = sum(defect.get("cost", 0) for defect in self.minion_data["defects"])
-        
-        # Total CP spent
-        self.total_cp_spent = stat_cp + attr_cp + defect_cp
+        from tools.rollup import minion_cost
+
+        # 2 CP per stat level, plus attributes and defects
+        stats = {stat: spin.value() for stat, spin in self.stat_inputs.items()}
+        cost = minion_cost(dict(self.minion_data, stats=stats, cp=self.max_cp))
+        self.total_cp_spent = cost.spent
         
         # Update labels
         self.cp_spent_label.setText(f"CP Spent: {self.total_cp_spent}")
         
-        remaining = self.max_cp - self.total_cp_spent
+        remaining = cost.remaining
         self.cp_remaining_label.setText(f"CP Remaining: {remaining}")
         
         # Highlight if over budget
@@ -320,7 +314,7 @@ class MinionBuilderDialog(QDialog):
             self.add_defect_card(defect)
     
     def add_attribute(self):
-        dialog = AttributeBuilderDialog(self.parent)
+        dialog = acquire_attribute_builder(self.parent)
         if dialog.exec_() == QDialog.Accepted:
             attr = dialog.get_attribute_data()
             # Add ID if not present
@@ -331,7 +325,7 @@ class MinionBuilderDialog(QDialog):
             self.calculate_cp_totals()
     
     def add_defect(self):
-        dialog = DefectBuilderDialog(self.parent)
+        dialog = acquire_defect_builder(self.parent)
         if dialog.exec_() == QDialog.Accepted:
             defect = dialog.get_defect_data()
             # Add ID if not present
@@ -0,0 +1,95 @@
+# performance_overlay.py
+
+import os
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QHeaderView, QFileDialog
+)
+from PyQt5.QtCore import Qt, QTimer
+
+from tools.perf_monitor import monitor
+
+COLUMNS = [("Action", None), ("Count", "count"), ("Total ms", "total_ms"),
+           ("Mean ms", "mean_ms"), ("p95 ms", "p95_ms"), ("Max ms", "max_ms")]
+
+class PerformanceOverlay(QDialog):
+    """Live per-action timings. Timing is only collected while this window is open."""
+
+    REFRESH_MS = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Performance")
+        self.setMinimumWidth(560)
+        self.setMinimumHeight(360)
+        self.setModal(False)
+        self.parent = parent
+
+        layout = QVBoxLayout(self)
+        self.status_label = QLabel("No actions recorded yet.")
+        layout.addWidget(self.status_label)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        dump_button = QPushButton("Dump JSON...")
+        dump_button.clicked.connect(self.dump_json)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(reset_button)
+        button_layout.addWidget(dump_button)
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        monitor.enable()
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        monitor.disable()
+        super().hideEvent(event)
+
+    def refresh(self):
+        snapshot = monitor.snapshot()
+        self.table.setRowCount(len(snapshot))
+        for row, (name, stats) in enumerate(snapshot.items()):
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            for column, (_, key) in enumerate(COLUMNS[1:], start=1):
+                value = stats[key]
+                item = QTableWidgetItem(str(value) if key == "count" else f"{value:.2f}")
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+        if snapshot:
+            self.status_label.setText(f"{sum(s['count'] for s in snapshot.values())} calls across {len(snapshot)} actions")
+        else:
+            self.status_label.setText("No actions recorded yet.")
+
+    def reset(self):
+        monitor.reset()
+        self.refresh()
+
+    def dump_json(self):
+        directory = getattr(self.parent, "last_directory", "") or os.path.expanduser("~")
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Performance Timings",
+            os.path.join(directory, "performance.json"),
+            "JSON Files (*.json)"
+        )
+        if path:
+            monitor.dump(path)
@@ -7,6 +7,9 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QPushButton, QScrollArea, QLabel
 )
 from tools.utils import create_card_widget
+from tools.perf_monitor import timed
+from tools.forms import encode_form
+from tools.rollup import reconcile_children, updated
 
 def init_alternate_forms_tab(self):
     # Create the tab
@@ -41,25 +44,26 @@ def init_alternate_forms_tab(self):
 
     return tab
 
+@timed()
 def sync_alternate_forms_from_attributes(self):
-    # Clear existing forms
-    self.character_data["alternate_forms"].clear()
-
-    # Find all Alternate Form attributes
-    for attr in self.character_data["attributes"]:
-        if attr.get("base_name") == "Alternate Form":
-            form_data = {
-                "id": attr["id"],
-                "name": attr["name"],
-                "description": attr.get("description", ""),
-                "cp": attr["cost"]
-            }
-            self.character_data["alternate_forms"].append(form_data)
+    # Find all Alternate Form attributes; each form shares its attribute's id
+    owners = [attr for attr in self.character_data["attributes"] if attr.get("base_name") == "Alternate Form"]
+    base_stats = self.character_data["stats"]
 
-    # Update the UI
-    populate_alternate_form_ui(self)
+    def form_for(attr, current):
+        fields = {"id": attr["id"], "name": attr["name"], "description": attr.get("description", ""), "cp": attr["cost"]}
+        # An edited form keeps its stat changes, attributes and defects; forms
+        # saved with full stat copies become overlays on the base stats
+        return [updated(encode_form(current[0], base_stats), **fields) if current else fields]
+
+    forms = self.character_data["alternate_forms"]
+    if reconcile_children(forms, owners, form_for, owner_key="id") \
+            or getattr(self, "alternate_forms_rendered", None) is not forms:
+        populate_alternate_form_ui(self)
 
 def clear_alternate_form_ui(self):
+    if getattr(self, "alternate_forms_tab", None) is None:
+        return  # Tab not built yet
     # Clear existing widgets from the layout
     if hasattr(self, 'alternate_form_layout'):
         while self.alternate_form_layout.count():
@@ -68,15 +72,23 @@ def clear_alternate_form_ui(self):
                 child.widget().deleteLater()
 
 def populate_alternate_form_ui(self):
+    if getattr(self, "alternate_forms_tab", None) is None:
+        return  # Tab not built yet
     # Clear existing cards
     clear_alternate_form_ui(self)
+    self.alternate_forms_rendered = self.character_data["alternate_forms"]
+    self.alternate_forms_base_stats = dict(self.character_data["stats"])
 
     # Add new cards
+    rollup = self.character_rollup()
+    rollup.sync()
     for form in self.character_data["alternate_forms"]:
+        stats = rollup.sheet(form)["stats"]
         card = create_card_widget(
             title=form["name"],
             lines=[
                 f"Description: {form['description']}",
+                f"Body {stats['Body']}, Mind {stats['Mind']}, Soul {stats['Soul']}",
                 f"Cost: {form['cp']} CP"
             ],
             on_remove=lambda uid=form["id"]: self.remove_alternate_form(uid),
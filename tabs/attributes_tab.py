@@ -6,6 +6,7 @@ from PyQt5.QtWidgets import (
 )
 
 from tools.utils import create_card_widget
+from tools.perf_monitor import timed
 
 def init_attributes_tab(app, layout):
     """
@@ -37,6 +38,7 @@ def init_attributes_tab(app, layout):
     app.attributes_tab = tab
     app.tabs.addTab(tab, "Attributes")
 
+@timed()
 def sync_attributes(self):
     """
     Calls populate_attributes_ui to rebuild the attribute cards from
@@ -7,6 +7,8 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QScrollArea, QMessageBox
 )
 from tools.utils import create_card_widget
+from tools.perf_monitor import timed
+from tools.rollup import reconcile_children, updated
 from dialogs.companion_builder_dialog import CompanionBuilderDialog
 
 def init_companions_tab(self):
@@ -28,38 +30,47 @@ def init_companions_tab(self):
     self.companions_scroll_area.setWidget(self.companions_card_container)
 
     self.companions_tab = tab
-    self.tabs.addTab(tab, "Companions")
 
+    return tab
+
+@timed()
 def sync_companions_from_attributes(self):
     print("[DEBUG] Starting sync_companions_from_attributes")
-    self.character_data["companions"].clear()
-    clear_companions_ui(self)
-
-    for attr in self.character_data["attributes"]:
-        # Check for both singular and plural forms of the attribute name
-        base_name = attr.get("base_name", attr["name"])
-        print(f"[DEBUG] Checking attribute: {base_name}")
-        
-        if base_name in ["Companion", "Companions"]:
-            print(f"[DEBUG] Found Companion attribute with level {attr['level']}")
-            companion_id = str(uuid4())
-            companion_data = {
-                "id": companion_id,
-                "name": f"Companion ({attr['level']} CP)",
-                "level": attr["level"],
-                "cp_budget": attr["level"] * 10,  # Companion gets 10 CP per level
+    # Check for both singular and plural forms of the attribute name
+    owners = [attr for attr in self.character_data["attributes"]
+              if attr.get("base_name", attr["name"]) in ["Companion", "Companions"]]
+
+    def companion_for(attr, current):
+        level = attr["level"]
+        if not current:
+            print(f"[DEBUG] Found new Companion attribute with level {level}")
+            return [{
+                "id": str(uuid4()),
+                "name": f"Companion ({level} CP)",
+                "level": level,
+                "cp_budget": level * 10,  # Companion gets 10 CP per level
                 "stats": self.character_data["stats"].copy(),
                 "derived": self.character_data["derived"].copy(),
                 "attributes": [],
-                "defects": []
-            }
-            self.character_data["companions"].append(companion_data)
-            print(f"[DEBUG] Added companion: {companion_data['name']}")
-
-    print(f"[DEBUG] Total companions: {len(self.character_data['companions'])}")
-    populate_companions_ui(self)
+                "defects": [],
+                "parent_attribute_id": attr["id"]
+            }]
+        # Keep the companion's build; a re-level only moves its budget (and default name)
+        companion = current[0]
+        name = companion.get("name")
+        if name == f"Companion ({companion.get('level')} CP)":
+            name = f"Companion ({level} CP)"
+        return [updated(companion, name=name, level=level, cp_budget=level * 10, parent_attribute_id=attr["id"])]
+
+    companions = self.character_data["companions"]
+    changed = reconcile_children(companions, owners, companion_for)
+    print(f"[DEBUG] Total companions: {len(companions)} (changed: {changed})")
+    if changed or getattr(self, "companions_rendered", None) is not companions:
+        populate_companions_ui(self)
 
 def clear_companions_ui(self):
+    if getattr(self, "companions_tab", None) is None:
+        return  # Tab not built yet
     # Delete old layout by replacing the card container entirely
     if hasattr(self, "companions_card_container"):
         self.companions_card_container.deleteLater()
@@ -76,9 +87,14 @@ def clear_companions_ui(self):
     self.companions_scroll_area.setWidget(self.companions_card_container)
 
 def populate_companions_ui(self):
+    if getattr(self, "companions_tab", None) is None:
+        return  # Tab not built yet
     print("[DEBUG] Starting populate_companions_ui")
     clear_companions_ui(self)
+    self.companions_rendered = self.character_data["companions"]
     print(f"[DEBUG] Number of companions to display: {len(self.character_data['companions'])}")
+    rollup = self.character_rollup()
+    rollup.sync()
     
     for companion in self.character_data["companions"]:
         print(f"[DEBUG] Creating card for companion: {companion['name']}")
@@ -89,6 +105,8 @@ def populate_companions_ui(self):
 
         # Basic stats
         lines.append(f"Body {stats.get('Body', 0)}, Mind {stats.get('Mind', 0)}, Soul {stats.get('Soul', 0)}")
+        cost = rollup.node(companion).cost
+        lines.append(f"CP Spent: {cost.spent} / {cost.budget} CP")
 
         # Derived stats
         lines.append(
@@ -145,6 +163,7 @@ def edit_companion(self, companion_id):
         for i, companion in enumerate(self.character_data["companions"]):
             if companion["id"] == companion_id:
                 self.character_data["companions"][i] = updated_data
+                self.character_rollup().replace(companion, updated_data)
                 break
         
         # Refresh the UI
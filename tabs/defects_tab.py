@@ -6,6 +6,7 @@ from PyQt5.QtWidgets import (
 )
 
 from tools.utils import create_card_widget
+from tools.perf_monitor import timed
 
 def init_defects_tab(app, layout):
     """
@@ -30,6 +31,7 @@ def init_defects_tab(app, layout):
     if not hasattr(app, 'character_data') or 'defects' not in app.character_data:
         app.character_data['defects'] = []
 
+@timed()
 def sync_defects(self):
     """
     Calls populate_defects_ui to rebuild the defect cards from
@@ -7,6 +7,8 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QPushButton, QScrollArea, QSizePolicy, QMessageBox
 )
 from tools.utils import create_card_widget
+from tools.perf_monitor import timed
+from tools.rollup import item_price, reconcile_children, updated
 from dialogs.item_builder_dialog import ItemBuilderDialog
 
 def init_items_tab(self):
@@ -30,60 +32,61 @@ def init_items_tab(self):
     # No Add button - items are created when the Item attribute is added
 
     self.items_tab = tab
-    self.tabs.addTab(tab, "Items")
 
+    return tab
+
+@timed()
 def sync_items_from_attributes(self):
-    self.character_data["items"].clear()
-    clear_items_ui(self)
+    # Check for both singular and plural forms of the attribute name
+    owners = [attr for attr in self.character_data["attributes"]
+              if attr.get("base_name", attr["name"]) in ["Item", "Items"]]
 
-    for attr in self.character_data["attributes"]:
-        # Check for both singular and plural forms of the attribute name
-        if attr.get("base_name", attr["name"]) in ["Item", "Items"]:
-            # Ensure the attribute has an ID
-            if "id" not in attr:
-                attr["id"] = str(uuid4())
-                
-            attr_id = attr["id"]
+    def items_for(attr, current):
+        attr_id = attr["id"]
+        
+        # Get all items from the attribute's custom fields
+        stored_items = attr.get("custom_fields", {}).get("items", [])
+        
+        # If there are no stored items yet, keep (or create) a default one
+        if not stored_items:
+            if current:
+                return current[:1]
+            return [{
+                "id": str(uuid4()),
+                "name": attr.get("custom_fields", {}).get("item_name", "New Item"),
+                "description": attr.get("custom_fields", {}).get("item_description", ""),
+                "cost": 0,  # Initial cost is 0
+                "attributes": [],
+                "defects": [],
+                "total_cp": 0,
+                "parent_attribute_id": attr_id  # Connect to parent attribute
+            }]
+
+        existing = {item.get("id"): item for item in current}
+        items = []
+        for item in stored_items:
+            # Ensure the item has an ID
+            if "id" not in item:
+                item["id"] = str(uuid4())
             
-            # Get all items from the attribute's custom fields
-            stored_items = attr.get("custom_fields", {}).get("items", [])
+            # Calculate the item cost (half of total CP, rounded down)
+            fields = {"cost": item_price(item.get("total_cp", 0)), "parent_attribute_id": attr_id}
             
-            # If there are no stored items yet, create a default one
-            if not stored_items:
-                item_name = attr.get("custom_fields", {}).get("item_name", "New Item")
-                item_id = str(uuid4())
-                item_data = {
-                    "id": item_id,
-                    "name": item_name,
-                    "description": attr.get("custom_fields", {}).get("item_description", ""),
-                    "cost": 0,  # Initial cost is 0
-                    "attributes": [],
-                    "defects": [],
-                    "total_cp": 0,
-                    "parent_attribute_id": attr_id  # Connect to parent attribute
-                }
-                self.character_data["items"].append(item_data)
+            # Keep the entry while it still matches the stored item
+            entry = existing.get(item["id"])
+            if entry is not None and all(entry.get(key) == value for key, value in item.items() if key != "cost"):
+                items.append(updated(entry, **fields))
             else:
-                # Add all stored items to the character data
-                for item in stored_items:
-                    # Ensure the item has an ID
-                    if "id" not in item:
-                        item["id"] = str(uuid4())
-                    
-                    # Calculate the item cost (half of total CP, rounded down)
-                    total_cp = item.get("total_cp", 0)
-                    item_cost = max(0, total_cp // 2)  # Integer division to round down
-                    
-                    # Create a copy of the item with the calculated cost
-                    item_data = item.copy()
-                    item_data["cost"] = item_cost
-                    item_data["parent_attribute_id"] = attr_id  # Connect to parent attribute
-                    
-                    self.character_data["items"].append(item_data)
-
-    populate_items_ui(self)
+                items.append(dict(item, **fields))
+        return items
+
+    items = self.character_data["items"]
+    if reconcile_children(items, owners, items_for) or getattr(self, "items_rendered", None) is not items:
+        populate_items_ui(self)
 
 def clear_items_ui(self):
+    if getattr(self, "items_tab", None) is None:
+        return  # Tab not built yet
     # Delete old layout by replacing the card container entirely
     if hasattr(self, "items_card_container"):
         self.items_card_container.deleteLater()
@@ -100,13 +103,15 @@ def clear_items_ui(self):
     self.items_scroll_area.setWidget(self.items_card_container)
 
 def populate_items_ui(self):
+    if getattr(self, "items_tab", None) is None:
+        return  # Tab not built yet
     clear_items_ui(self)
+    self.items_rendered = self.character_data["items"]
     for item in self.character_data["items"]:
         lines = []
 
         # Basic info - show the final CP cost (half of total CP, rounded down)
-        total_cp = item.get('total_cp', 0)
-        item_cost = max(0, total_cp // 2)  # Integer division to round down, minimum 0
+        item_cost = item_price(item.get('total_cp', 0))
         lines.append(f"Item Cost: {item_cost} CP")
         
         if item.get("description"):
@@ -149,12 +154,30 @@ def edit_item(self, item_id):
         # Update the item in character data
         for i, item in enumerate(self.character_data["items"]):
             if item["id"] == item_id:
+                if item.get("parent_attribute_id"):
+                    updated_data["parent_attribute_id"] = item["parent_attribute_id"]
+                    store_item_in_attribute(self, updated_data)
                 self.character_data["items"][i] = updated_data
+                self.character_rollup().replace(item, updated_data)
                 break
         
         # Refresh the UI
         populate_items_ui(self)
 
+def store_item_in_attribute(self, item_data):
+    """Write an edited item back to its Item attribute, so the next sync keeps it"""
+    attr = next((a for a in self.character_data["attributes"]
+                 if a.get("id") == item_data["parent_attribute_id"]), None)
+    if attr is None:
+        return
+    stored = {key: value for key, value in item_data.items() if key not in ("cost", "parent_attribute_id")}
+    stored_items = attr.setdefault("custom_fields", {}).setdefault("items", [])
+    for i, item in enumerate(stored_items):
+        if item.get("id") == stored["id"]:
+            stored_items[i] = stored
+            return
+    stored_items.append(stored)
+
 __all__ = [
     "init_items_tab",
     "sync_items_from_attributes",
@@ -7,6 +7,8 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QPushButton, QScrollArea, QSizePolicy
 )
 from tools.utils import create_card_widget
+from tools.perf_monitor import timed
+from tools.rollup import reconcile_children, updated
 
 def init_metamorphosis_tab(self):
     tab = QWidget()
@@ -30,29 +32,43 @@ def init_metamorphosis_tab(self):
     # This follows the pattern for special attribute tabs
 
     self.metamorphosis_tab = tab
-    self.tabs.addTab(tab, "Metamorphosis")
 
-def sync_metamorphosis_from_attributes(self):
-    self.character_data["metamorphosis"].clear()
-    clear_metamorphosis_ui(self)
+    return tab
+
+def _default_description(level):
+    return f"Transforms into a new form with {level * 5} CP of changes"
 
-    for attr in self.character_data["attributes"]:
-        if attr.get("base_name", attr["name"]) == "Metamorphosis":
-            meta_id = str(uuid4())
-            meta_data = {
-                "id": meta_id,
+@timed()
+def sync_metamorphosis_from_attributes(self):
+    owners = [attr for attr in self.character_data["attributes"]
+              if attr.get("base_name", attr["name"]) == "Metamorphosis"]
+
+    def form_for(attr, current):
+        level = attr["level"]
+        if not current:
+            return [{
+                "id": str(uuid4()),
                 "name": attr.get("custom_fields", {}).get("template_name", "Unnamed Form"),
-                "level": attr["level"],
-                "description": f"Transforms into a new form with {attr['level'] * 5} CP of changes",
-                "cp": attr["level"] * 5,  # Metamorphosis CP budget scales with level
+                "level": level,
+                "description": _default_description(level),
+                "cp": level * 5,  # Metamorphosis CP budget scales with level
                 "attributes": [],
-                "defects": []
-            }
-            self.character_data["metamorphosis"].append(meta_data)
-
-    populate_metamorphosis_ui(self)
+                "defects": [],
+                "parent_attribute_id": attr["id"]
+            }]
+        meta = current[0]
+        description = meta.get("description")
+        if description == _default_description(meta.get("level", 0)):
+            description = _default_description(level)
+        return [updated(meta, level=level, cp=level * 5, description=description, parent_attribute_id=attr["id"])]
+
+    forms = self.character_data["metamorphosis"]
+    if reconcile_children(forms, owners, form_for) or getattr(self, "metamorphosis_rendered", None) is not forms:
+        populate_metamorphosis_ui(self)
 
 def clear_metamorphosis_ui(self):
+    if getattr(self, "metamorphosis_tab", None) is None:
+        return  # Tab not built yet
     # Delete old layout by replacing the card container entirely
     if hasattr(self, "metamorphosis_card_container"):
         self.metamorphosis_card_container.deleteLater()
@@ -69,13 +85,19 @@ def clear_metamorphosis_ui(self):
     self.metamorphosis_scroll_area.setWidget(self.metamorphosis_card_container)
 
 def populate_metamorphosis_ui(self):
+    if getattr(self, "metamorphosis_tab", None) is None:
+        return  # Tab not built yet
     clear_metamorphosis_ui(self)
+    self.metamorphosis_rendered = self.character_data["metamorphosis"]
+    rollup = self.character_rollup()
+    rollup.sync()
     for meta in self.character_data["metamorphosis"]:
         lines = []
 
         # Basic info
         lines.append(f"Level: {meta.get('level', 0)}")
         lines.append(f"CP Budget: {meta.get('cp', 0)} CP")
+        lines.append(f"CP Used: {rollup.node(meta).cost.spent} CP")
         
         if meta.get("description"):
             lines.append(f"Description: {meta['description']}")
@@ -122,6 +144,7 @@ def edit_metamorphosis(self, uid):
         for i, existing in enumerate(self.character_data["metamorphosis"]):
             if existing.get("id") == uid:
                 self.character_data["metamorphosis"][i] = updated_form
+                self.character_rollup().replace(existing, updated_form)
                 break
                 
         # Update the UI
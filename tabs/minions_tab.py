@@ -7,6 +7,8 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QPushButton, QScrollArea, QSizePolicy
 )
 from tools.utils import create_card_widget
+from tools.perf_monitor import timed
+from tools.rollup import reconcile_children, updated
 
 def init_minions_tab(self):
     tab = QWidget()
@@ -33,45 +35,62 @@ def init_minions_tab(self):
     outer_layout.addWidget(add_button)
 
     self.minions_tab = tab
-    self.tabs.addTab(tab, "Minions")
 
+    return tab
+
+@timed()
 def sync_minions_from_attributes(self):
-    self.character_data["minions"].clear()
-    clear_minions_ui(self)
+    owners = [attr for attr in self.character_data["attributes"]
+              if attr.get("base_name", attr["name"]) == "Minions"]
+
+    def budget():
+        return int(self.character_data["totalPoints"] * 0.2)  # 1/5 of character's total points
 
-    for attr in self.character_data["attributes"]:
-        if attr.get("base_name", attr["name"]) == "Minions":
-            minion_id = str(uuid4())
-            # Calculate the number of minions based on level
-            num_minions = 5  # Default for level 1
-            level = attr.get("level", 1)
-            
-            if level == 2:
-                num_minions = 10
-            elif level == 3:
-                num_minions = 25
-            elif level == 4:
-                num_minions = 50
-            elif level == 5:
-                num_minions = 100
-            elif level == 6:
-                num_minions = 200
-                
-            minion_data = {
-                "id": minion_id,
+    def minions_for(attr, current):
+        # Calculate the number of minions based on level
+        num_minions = 5  # Default for level 1
+        level = attr.get("level", 1)
+        
+        if level == 2:
+            num_minions = 10
+        elif level == 3:
+            num_minions = 25
+        elif level == 4:
+            num_minions = 50
+        elif level == 5:
+            num_minions = 100
+        elif level == 6:
+            num_minions = 200
+
+        if not current:
+            return [{
+                "id": str(uuid4()),
                 "name": attr.get("custom_fields", {}).get("minion_type", "Unnamed Minions"),
                 "level": attr["level"],
                 "description": f"Group of {num_minions} minions",
                 "count": num_minions,
-                "cp": int(self.character_data["totalPoints"] * 0.2),  # 1/5 of character's total points
+                "cp": budget(),
                 "attributes": [],
-                "defects": []
-            }
-            self.character_data["minions"].append(minion_data)
-
-    populate_minions_ui(self)
+                "defects": [],
+                "parent_attribute_id": attr["id"]
+            }]
+        minion = current[0]
+        # The budget is set when the minions are added or re-levelled, not on
+        # every CP change elsewhere on the sheet
+        cp = minion["cp"] if minion.get("level") == attr["level"] and "cp" in minion else budget()
+        description = minion.get("description")
+        if description == f"Group of {minion.get('count')} minions":
+            description = f"Group of {num_minions} minions"
+        return [updated(minion, level=attr["level"], count=num_minions, description=description, cp=cp,
+                        parent_attribute_id=attr["id"])]
+
+    minions = self.character_data["minions"]
+    if reconcile_children(minions, owners, minions_for) or getattr(self, "minions_rendered", None) is not minions:
+        populate_minions_ui(self)
 
 def clear_minions_ui(self):
+    if getattr(self, "minions_tab", None) is None:
+        return  # Tab not built yet
     # Delete old layout by replacing the card container entirely
     if hasattr(self, "minions_card_container"):
         self.minions_card_container.deleteLater()
@@ -88,7 +107,12 @@ def clear_minions_ui(self):
     self.minions_scroll_area.setWidget(self.minions_card_container)
 
 def populate_minions_ui(self):
+    if getattr(self, "minions_tab", None) is None:
+        return  # Tab not built yet
     clear_minions_ui(self)
+    self.minions_rendered = self.character_data["minions"]
+    rollup = self.character_rollup()
+    rollup.sync()
     for minion in self.character_data["minions"]:
         lines = []
 
@@ -96,6 +120,7 @@ def populate_minions_ui(self):
         lines.append(f"Level: {minion.get('level', 0)}")
         lines.append(f"Count: {minion.get('count', 0)} minions")
         lines.append(f"CP Budget per minion: {minion.get('cp', 0)} CP")
+        lines.append(f"CP Spent per minion: {rollup.node(minion).cost.spent} CP")
         
         if minion.get("description"):
             lines.append(f"Description: {minion['description']}")
@@ -1,4 +1,5 @@
 from tools.widgets import LabeledRowWithHelp
+from tools.rules import STAT_RANGE
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QSpinBox, QFormLayout
 )
@@ -16,8 +17,8 @@ def init_stats_tab(self):
 
     for stat in ["Body", "Mind", "Soul"]:
         spin = QSpinBox()
-        spin.setMinimum(1)
-        spin.setMaximum(12)
+        spin.setMinimum(STAT_RANGE[0])
+        spin.setMaximum(STAT_RANGE[1])
         spin.setValue(self.character_data["stats"][stat])
         
         # Connect to update_stat method which will handle derived values
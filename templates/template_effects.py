@@ -0,0 +1,300 @@
+"""
+Template effects for BESM Character Generator
+
+The parts of applying a race, class or size template that do not touch the
+GUI: building the attribute and defect records a template adds, matching them
+against what the character already has, and the stat adjustments. The real
+apply in template_manager and the dry-run previews shown in TemplateDialog both
+use these, so a preview is exactly what applying would do.
+
+Nothing here imports PyQt5; previews run on worker threads over an immutable
+character snapshot (see tools/snapshot.py).
+"""
+
+import uuid
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import NamedTuple
+
+from tools.catalog import get_catalog
+from tools.snapshot import freeze
+from tools.rules import STAT_RANGE, calculate_derived_values, point_total, benchmark_warnings
+
+# Fields copied from the template entry over the catalog record when set
+_ENTRY_FIELDS = ("user_description", "enhancements", "limiters", "options", "user_input")
+
+_STAT_FIELDS = {"body_adj": "Body", "mind_adj": "Mind", "soul_adj": "Soul"}
+
+
+class TemplateLookups(NamedTuple):
+    """Where template entries find their full attribute and defect records"""
+
+    attributes_by_key: dict
+    attributes: dict
+    defects_by_key: dict
+    defects: dict
+
+
+def lookups_for(source):
+    """The lookups an app (or the catalog) provides; missing ones are empty, as in apply"""
+    return TemplateLookups(*(getattr(source, name, None) or {} for name in TemplateLookups._fields))
+
+
+def entry_name(entry):
+    # Support both old format (name) and new format (custom_name + key)
+    return entry.get("custom_name", entry.get("name", ""))
+
+
+def template_stat_changes(template_data):
+    """Return the (stat, amount) pairs a template adds to the base stats"""
+    stats = template_data.get("stats")
+    if not stats:
+        return []
+    if isinstance(stats, dict):
+        # New format: object with body_adj, mind_adj, soul_adj
+        return [(stat, stats[field]) for field, stat in _STAT_FIELDS.items() if stats.get(field, 0)]
+    # Old format: list of {"stat": ..., "value": ...}
+    return [(entry.get("stat"), entry.get("value")) for entry in stats]
+
+
+def _copy_entry_fields(record, entry):
+    for field in _ENTRY_FIELDS:
+        if field in entry and entry[field]:
+            record[field] = entry[field]
+    if "options_source" in entry:
+        record["options_source"] = entry["options_source"]
+
+
+def build_attribute(entry, attributes_by_key, attributes, catalog=None):
+    """Return the character attribute a template entry adds (no sources yet)
+
+    The catalog record is shared through its frozen copy, so only the top
+    level is new.
+    """
+    catalog = catalog or get_catalog()
+    name = entry_name(entry)
+    key = entry.get("key", "")
+    level = entry.get("level", 1)
+
+    # Fetch full attribute details using the key if available
+    if key and key in attributes_by_key:
+        full_attr = attributes_by_key.get(key, {})
+    else:
+        full_attr = attributes.get(name, {})
+
+    new_attr = dict(catalog.frozen(full_attr)) if full_attr else {}
+    new_attr["id"] = str(uuid.uuid4())
+    new_attr["name"] = name
+    new_attr["key"] = key or full_attr.get("key", "")
+    new_attr["level"] = level
+    _copy_entry_fields(new_attr, entry)
+
+    # Calculate cost if not present
+    cost_per_level = new_attr.get("cost_per_level")
+    if cost_per_level is None:
+        cost_per_level = 0  # Provide a default value if None
+    new_attr["cost"] = cost_per_level * level
+    return new_attr
+
+
+def find_matching_attribute(attributes, new_attr):
+    """Return the attribute already on the character with the same name and details, or None"""
+    dedup_key = (new_attr.get("name", "").strip().lower(), str(new_attr.get("details", "")).strip().lower())
+    for existing in attributes:
+        if (existing.get("name", "").strip().lower(), str(existing.get("details", "")).strip().lower()) == dedup_key:
+            return existing
+    return None
+
+
+def build_defect(entry, defects_by_key, defects, catalog=None):
+    """Return the character defect a template entry adds (no sources yet)"""
+    catalog = catalog or get_catalog()
+    name = entry_name(entry)
+    key = entry.get("key", "")
+    rank = entry.get("rank", entry.get("level", 1))  # Use rank for defects as per BESM 4e terminology
+
+    # Fetch full defect details using the key if available
+    if key and key in defects_by_key:
+        full_defect = defects_by_key.get(key, {})
+    else:
+        full_defect = defects.get(name, {})
+
+    new_defect = dict(catalog.frozen(full_defect) if full_defect else freeze(entry))
+    new_defect["id"] = str(uuid.uuid4())
+    new_defect["name"] = name
+    new_defect["key"] = key or full_defect.get("key", "")
+    new_defect["rank"] = rank
+    _copy_entry_fields(new_defect, entry)
+
+    if "cost" not in new_defect:
+        if "cp_refund" in new_defect and new_defect["cp_refund"] is not None:
+            # cp_refund is positive magnitude, subtract it
+            new_defect["cost"] = -abs(new_defect["cp_refund"])
+        elif "points" in new_defect and new_defect["points"] is not None:
+            # legacy 'points' field treated as cp_refund
+            new_defect["cost"] = -abs(new_defect["points"])
+        elif "rank" in new_defect and "cost_per_rank" in new_defect:
+            new_defect["cost"] = -abs(new_defect["rank"] * new_defect["cost_per_rank"])
+        else:
+            # default refund per rank
+            new_defect["cost"] = -abs(new_defect.get("rank", 1))
+            print(f"[DEBUG] Warning: No cost info for defect {new_defect.get('name', 'Unknown')}. Using default refund.")
+
+    if new_defect.get("name", "").lower() == "unique defect":
+        if "details" in new_defect and new_defect["details"]:
+            details_text = new_defect["details"].strip("()").strip()
+            if ":" in details_text:
+                new_defect["name"] = details_text.split(":")[0].strip()
+            elif "÷" in details_text or "-" in details_text:
+                parts = details_text.split(" ")
+                if len(parts) >= 2:
+                    new_defect["name"] = " ".join(parts[:-1]).strip()
+            else:
+                new_defect["name"] = details_text
+            if not new_defect.get("details_original"):
+                new_defect["details_original"] = new_defect["details"]
+    return new_defect
+
+
+def find_matching_defect(defects, new_defect):
+    """Return the defect already on the character that this one duplicates, or None
+
+    Defects match by key when both have one, otherwise by name and description.
+    """
+    key = new_defect.get("key", "").strip().lower()
+    name = new_defect.get("name", "").strip().lower()
+    desc = str(new_defect.get("user_description", new_defect.get("details", ""))).strip().lower()
+    for existing in defects:
+        existing_key = existing.get("key", "").strip().lower()
+        if (key and existing_key and key == existing_key) or (
+                name == existing.get("name", "").strip().lower()
+                and desc == str(existing.get("user_description", existing.get("details", ""))).strip().lower()):
+            return existing
+    return None
+
+
+def find_base_size(size_info, ladder=None):
+    """Return the SizeTemplate a race or class baseSize refers to, or None"""
+    from tools.size_ladder import get_size_ladder
+
+    size_name = size_info.get("name", "")
+    size_key = size_info.get("key", "")
+    if not (size_name or size_key):
+        return None
+    ladder = ladder or get_size_ladder()
+    return ladder.find(key=size_key, name=size_name, rank=size_info.get("size_rank", size_info.get("rank", 0)))
+
+
+def dry_run(snapshot, template_data, template_type, lookups=None, ladder=None):
+    """Return the character as it would be after applying the template
+
+    ``snapshot`` is not modified; the result shares every record the template
+    does not add. ``lookups`` defaults to the whole catalog; pass
+    lookups_for(app) to match what applying in that app does.
+    """
+    catalog = get_catalog()
+    lookups = lookups or lookups_for(catalog)
+    template = template_data.get("data", template_data)
+    stats = dict(snapshot.get("stats", {}))
+    attributes = list(snapshot.get("attributes", []))
+    defects = list(snapshot.get("defects", []))
+    low, high = STAT_RANGE
+
+    def add(part, with_stats):
+        if with_stats:
+            for stat, amount in template_stat_changes(part):
+                if stat in stats:
+                    stats[stat] = min(high, max(low, stats[stat] + amount))
+        for entry in part.get("attributes", []):
+            new_attr = build_attribute(entry, lookups.attributes_by_key, lookups.attributes, catalog)
+            if find_matching_attribute(attributes, new_attr) is None:
+                attributes.append(new_attr)
+        for entry in part.get("defects", []):
+            new_defect = build_defect(entry, lookups.defects_by_key, lookups.defects, catalog)
+            if find_matching_defect(defects, new_defect) is None:
+                defects.append(new_defect)
+
+    # Same order as apply_template_to_character: base size, stats, attributes, defects
+    if template_type in ("race", "class") and "baseSize" in template:
+        size = find_base_size(template["baseSize"], ladder)
+        if size is not None:
+            add(size.template, True)
+    # Class templates do not adjust stats
+    add(template, template_type != "class")
+
+    result = dict(snapshot)
+    result.update(stats=stats, attributes=attributes, defects=defects)
+    return result
+
+
+@dataclass(frozen=True, slots=True)
+class TemplateImpact:
+    """What applying a template would change: CP, derived values and new benchmark warnings"""
+
+    cp_delta: int
+    derived_delta: dict
+    warnings: tuple
+
+    def summary(self):
+        """Short text for a template list entry, e.g. "+24 CP  HP +10  CV -1  ⚠ 1" """
+        parts = [f"{self.cp_delta:+d} CP"]
+        parts.extend(f"{key} {delta:+d}" for key, delta in self.derived_delta.items())
+        if self.warnings:
+            parts.append(f"⚠ {len(self.warnings)}")
+        return "  ".join(parts)
+
+
+def template_impact(snapshot, template_data, template_type, benchmark=None, lookups=None, ladder=None):
+    """Dry-run a template on a snapshot and return its TemplateImpact"""
+    after = dry_run(snapshot, template_data, template_type, lookups, ladder)
+    before_derived = calculate_derived_values(snapshot)
+    after_derived = calculate_derived_values(after)
+    before_warnings = set(benchmark_warnings(snapshot, benchmark, before_derived))
+    return TemplateImpact(
+        cp_delta=point_total(after) - point_total(snapshot),
+        derived_delta={key: after_derived[key] - before_derived[key]
+                       for key in after_derived if after_derived[key] != before_derived[key]},
+        warnings=tuple(w for w in benchmark_warnings(after, benchmark, after_derived) if w not in before_warnings),
+    )
+
+
+def template_id(template_data):
+    """A stable identifier for a template list entry"""
+    template = template_data.get("data", template_data)
+    return template.get("key") or template_data.get("name") or template.get("name", "")
+
+
+# Previews kept per process
+IMPACT_CACHE_SIZE = 512
+
+
+class ImpactCache:
+    """TemplateImpact results by (template type, template id, character revision, benchmark)"""
+
+    def __init__(self, size=IMPACT_CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            impact = self.entries.get(key)
+            if impact is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return impact
+
+    def put(self, key, impact):
+        with self._lock:
+            self.entries[key] = impact
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+
+impact_cache = ImpactCache()
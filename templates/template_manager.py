@@ -1,10 +1,46 @@
 import os
 import json
+import threading
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QPushButton,
     QTabWidget, QWidget, QMessageBox, QListWidgetItem
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+
+from tools.perf_monitor import timed
+from templates.template_effects import impact_cache, lookups_for, template_id, template_impact
+
+
+class TemplateImpactSignals(QObject):
+    finished = pyqtSignal(object, object)  # cache key, TemplateImpact
+
+
+class TemplateImpactTask(QRunnable):
+    """Dry-runs one template on a character snapshot on the dialog's thread pool"""
+
+    def __init__(self, key, snapshot, template, template_type, benchmark, lookups, cancelled):
+        super().__init__()
+        self.key = key
+        self.snapshot = snapshot
+        self.template = template
+        self.template_type = template_type
+        self.benchmark = benchmark
+        self.lookups = lookups
+        self.cancelled = cancelled
+        self.signals = TemplateImpactSignals()
+
+    def run(self):
+        if self.cancelled.is_set():
+            return
+        try:
+            impact = template_impact(self.snapshot, self.template, self.template_type, self.benchmark, self.lookups)
+        except Exception as e:
+            print(f"[DEBUG] Template preview failed for {self.key[1]}: {e!r}")
+            return
+        impact_cache.put(self.key, impact)
+        if not self.cancelled.is_set():
+            self.signals.finished.emit(self.key, impact)
+
 
 class TemplateDialog(QDialog):
     def __init__(self, parent=None, template_type="race"):
@@ -29,6 +65,7 @@ class TemplateDialog(QDialog):
         self.templates = self.load_templates()
         
         # Create a tab for each template category
+        self.preview_items = {}  # template id -> list items showing it
         self.create_template_tabs()
         
         # Buttons
@@ -43,6 +80,11 @@ class TemplateDialog(QDialog):
         button_layout.addWidget(self.apply_button)
         button_layout.addWidget(self.cancel_button)
         layout.addLayout(button_layout)
+
+        # Fill in what each template would do to the current character
+        self.preview_pool = QThreadPool(self)
+        self._preview_cancelled = threading.Event()
+        self.start_impact_previews()
     
     def load_templates(self):
         """Load templates from JSON files"""
@@ -205,6 +247,7 @@ class TemplateDialog(QDialog):
                 item = QListWidgetItem(template.get("name", "Unnamed Template"))
                 item.setData(Qt.UserRole, template)
                 list_widget.addItem(item)
+                self.preview_items.setdefault(template_id(template), []).append(item)
             
             tab_layout.addWidget(list_widget)
             self.tabs.addTab(tab, category)
@@ -222,6 +265,7 @@ class TemplateDialog(QDialog):
                 item = QListWidgetItem(template.get("name", "Unnamed Template"))
                 item.setData(Qt.UserRole, template)
                 all_list.addItem(item)
+                self.preview_items.setdefault(template_id(template), []).append(item)
             
             all_layout.addWidget(all_list)
             self.tabs.insertTab(0, all_tab, "All")
@@ -236,6 +280,46 @@ class TemplateDialog(QDialog):
             no_templates_layout.addWidget(no_templates_label)
             self.tabs.addTab(no_templates_tab, "No Templates")
     
+    def start_impact_previews(self):
+        """Queue a dry run of every listed template against the current character
+
+        Results are cached per (template, character revision, benchmark), so
+        reopening the dialog on an unchanged character fills in at once.
+        """
+        app = self.parent
+        if app is None or not hasattr(app, "snapshot_character"):
+            return
+        snapshot = app.snapshot_character()
+        benchmark = getattr(app, "selected_benchmark", None)
+        benchmark_name = benchmark.get("name") if benchmark else None
+        lookups = lookups_for(app)
+
+        for template in self.templates.get("templates", []):
+            key = (self.template_type, template_id(template), app.character_revision, benchmark_name)
+            impact = impact_cache.get(key)
+            if impact is not None:
+                self.on_impact_ready(key, impact)
+                continue
+            task = TemplateImpactTask(key, snapshot, template, self.template_type, benchmark, lookups, self._preview_cancelled)
+            task.signals.finished.connect(self.on_impact_ready)
+            self.preview_pool.start(task)
+
+    def on_impact_ready(self, key, impact):
+        """Show a template's CP and derived value changes next to its name"""
+        for item in self.preview_items.get(key[1], []):
+            template = item.data(Qt.UserRole)
+            item.setText(f"{template.get('name', 'Unnamed Template')}    {impact.summary()}")
+            details = [f"CP: {impact.cp_delta:+d}"]
+            details.extend(f"{derived}: {delta:+d}" for derived, delta in impact.derived_delta.items())
+            details.extend(f"Benchmark: {warning}" for warning in impact.warnings)
+            item.setToolTip("\n".join(details))
+
+    def done(self, result):
+        # Drop queued previews; running ones finish on their own and are not shown
+        self._preview_cancelled.set()
+        self.preview_pool.clear()
+        super().done(result)
+
     def on_template_selected(self, item):
         """Handle template selection"""
         self.selected_template = item.data(Qt.UserRole)
@@ -254,6 +338,7 @@ class TemplateDialog(QDialog):
         return self.selected_template
 
 
+@timed()
 def apply_template_to_character(app, template_data, template_type):
     """Apply a template to the character data"""
     if not template_data:
@@ -321,46 +406,18 @@ def apply_size_template(app, template_data, template_changes):
         })
     
     # Apply stat changes by adding to existing stats
-    if "stats" in template_data:
-        # Handle new stats structure (object with body_adj, mind_adj, soul_adj)
-        if isinstance(template_data["stats"], dict):
-            # New format
-            stats_dict = template_data["stats"]
-            
-            # Map the new field names to the old ones
-            stat_mapping = {
-                "body_adj": "Body",
-                "mind_adj": "Mind",
-                "soul_adj": "Soul"
-            }
-            
-            for new_field, old_field in stat_mapping.items():
-                value = stats_dict.get(new_field, 0)
-                if value and old_field in app.stat_spinners:
-                    old_value = app.stat_spinners[old_field].value()
-                    new_value = old_value + value
-                    app.stat_spinners[old_field].setValue(new_value)
-                    template_changes["changes"].append({
-                        "field": f"stat_{old_field}",
-                        "old_value": old_value,
-                        "new_value": new_value,
-                        "modifier": f"+{value}"  # Record that this was an addition
-                    })
-        else:
-            # Old format - list of stat entries
-            for stat_entry in template_data["stats"]:
-                stat = stat_entry.get("stat")
-                value = stat_entry.get("value")
-                if stat in app.stat_spinners:
-                    old_value = app.stat_spinners[stat].value()
-                    new_value = old_value + value  # Add instead of replace
-                    app.stat_spinners[stat].setValue(new_value)
-                    template_changes["changes"].append({
-                        "field": f"stat_{stat}",
-                        "old_value": old_value,
-                        "new_value": new_value,
-                        "modifier": f"+{value}"  # Record that this was an addition
-                    })
+    from templates.template_effects import template_stat_changes
+    for stat, value in template_stat_changes(template_data):
+        if stat in app.stat_spinners:
+            old_value = app.stat_spinners[stat].value()
+            new_value = old_value + value  # Add instead of replace
+            app.stat_spinners[stat].setValue(new_value)
+            template_changes["changes"].append({
+                "field": f"stat_{stat}",
+                "old_value": old_value,
+                "new_value": new_value,
+                "modifier": f"+{value}"  # Record that this was an addition
+            })
     
     # Apply attribute changes
     apply_attributes(app, template_data, template_changes)
@@ -398,46 +455,18 @@ def apply_race_template(app, template_data, template_changes):
         apply_size_from_template(app, template_data["baseSize"], template_changes)
     
     # Apply stat changes by adding to existing stats
-    if "stats" in template_data:
-        # Handle new stats structure (object with body_adj, mind_adj, soul_adj)
-        if isinstance(template_data["stats"], dict):
-            # New format
-            stats_dict = template_data["stats"]
-            
-            # Map the new field names to the old ones
-            stat_mapping = {
-                "body_adj": "Body",
-                "mind_adj": "Mind",
-                "soul_adj": "Soul"
-            }
-            
-            for new_field, old_field in stat_mapping.items():
-                value = stats_dict.get(new_field, 0)
-                if value and old_field in app.stat_spinners:
-                    old_value = app.stat_spinners[old_field].value()
-                    new_value = old_value + value
-                    app.stat_spinners[old_field].setValue(new_value)
-                    template_changes["changes"].append({
-                        "field": f"stat_{old_field}",
-                        "old_value": old_value,
-                        "new_value": new_value,
-                        "modifier": f"+{value}"  # Record that this was an addition
-                    })
-        else:
-            # Old format - list of stat entries
-            for stat_entry in template_data["stats"]:
-                stat = stat_entry.get("stat")
-                value = stat_entry.get("value")
-                if stat in app.stat_spinners:
-                    old_value = app.stat_spinners[stat].value()
-                    new_value = old_value + value  # Add instead of replace
-                    app.stat_spinners[stat].setValue(new_value)
-                    template_changes["changes"].append({
-                        "field": f"stat_{stat}",
-                        "old_value": old_value,
-                        "new_value": new_value,
-                        "modifier": f"+{value}"  # Record that this was an addition
-                    })
+    from templates.template_effects import template_stat_changes
+    for stat, value in template_stat_changes(template_data):
+        if stat in app.stat_spinners:
+            old_value = app.stat_spinners[stat].value()
+            new_value = old_value + value  # Add instead of replace
+            app.stat_spinners[stat].setValue(new_value)
+            template_changes["changes"].append({
+                "field": f"stat_{stat}",
+                "old_value": old_value,
+                "new_value": new_value,
+                "modifier": f"+{value}"  # Record that this was an addition
+            })
     
     # Apply attribute changes
     apply_attributes(app, template_data, template_changes)
@@ -484,68 +513,29 @@ def apply_class_template(app, template_data, template_changes):
 def apply_attributes(app, template_data, template_changes):
     """Apply attribute changes from a template with deduplication and provenance tracking"""
     if "attributes" in template_data:
-        import copy
-        import uuid
+        from tools.catalog import get_catalog
+        from tools.snapshot import freeze
+        from templates.template_effects import build_attribute, find_matching_attribute, lookups_for
+        catalog = get_catalog()
+        lookups = lookups_for(app)
         template_id = template_changes.get("id") or template_changes.get("template_id") or template_changes.get("name")
         for attr in template_data["attributes"]:
-            # Use the attribute name and level from the template
-            # Support both old format (name) and new format (custom_name + key)
-            attr_name = attr.get("custom_name", attr.get("name", ""))
-            attr_key = attr.get("key", "")
-            attr_level = attr.get("level", 1)
+            new_attr = build_attribute(attr, lookups.attributes_by_key, lookups.attributes, catalog)
 
-            # Fetch full attribute details from attributes.json using key if available
-            full_attr = None
-            if attr_key and attr_key in app.attributes_by_key:
-                full_attr = app.attributes_by_key.get(attr_key, {})
+            # Deduplicate by name+details, recording this template as another source
+            attr_existing = find_matching_attribute(app.character_data.get("attributes", []), new_attr)
+            if attr_existing is not None:
+                if "sources" not in attr_existing:
+                    attr_existing["sources"] = []
+                if template_id not in attr_existing["sources"]:
+                    attr_existing["sources"].append(template_id)
             else:
-                full_attr = app.attributes.get(attr_name, {})
-                
-            new_attr = copy.deepcopy(full_attr)
-            new_attr["id"] = str(uuid.uuid4())
-            new_attr["name"] = attr_name
-            new_attr["key"] = attr_key or full_attr.get("key", "")
-            new_attr["level"] = attr_level
-            
-            # Copy additional fields from the template attribute
-            if "user_description" in attr and attr["user_description"]:
-                new_attr["user_description"] = attr["user_description"]
-            if "enhancements" in attr and attr["enhancements"]:
-                new_attr["enhancements"] = attr["enhancements"]
-            if "limiters" in attr and attr["limiters"]:
-                new_attr["limiters"] = attr["limiters"]
-            if "options" in attr and attr["options"]:
-                new_attr["options"] = attr["options"]
-            if "user_input" in attr and attr["user_input"]:
-                new_attr["user_input"] = attr["user_input"]
-            if "options_source" in attr:
-                new_attr["options_source"] = attr["options_source"]
-
-            # Calculate cost if not present
-            cost_per_level = new_attr.get("cost_per_level")
-            if cost_per_level is None:
-                cost_per_level = 0  # Provide a default value if None
-            new_attr["cost"] = cost_per_level * attr_level
-
-            # Deduplication key: name+details
-            dedup_key = (new_attr.get("name", "").strip().lower(), str(new_attr.get("details", "")).strip().lower())
-            found = False
-            for attr_existing in app.character_data.get("attributes", []):
-                key_existing = (attr_existing.get("name", "").strip().lower(), str(attr_existing.get("details", "")).strip().lower())
-                if dedup_key == key_existing:
-                    if "sources" not in attr_existing:
-                        attr_existing["sources"] = []
-                    if template_id not in attr_existing["sources"]:
-                        attr_existing["sources"].append(template_id)
-                    found = True
-                    break
-            if not found:
                 new_attr["sources"] = [template_id]
                 app.character_data["attributes"].append(new_attr)
                 template_changes["changes"].append({
                     "field": "attribute_add",
                     "attribute_id": new_attr["id"],
-                    "attribute_data": new_attr
+                    "attribute_data": freeze(new_attr)
                 })
             # Sync special attributes if needed
             from tabs.attributes_tab import sync_attributes
@@ -570,105 +560,33 @@ def apply_attributes(app, template_data, template_changes):
 def apply_defects(app, template_data, template_changes):
     """Apply defect changes from a template with deduplication and provenance tracking, with detailed debugging output."""
     if "defects" in template_data:
-        import copy
-        import uuid
+        from tools.catalog import get_catalog
+        from tools.snapshot import freeze
+        from templates.template_effects import build_defect, find_matching_defect, lookups_for
+        catalog = get_catalog()
+        lookups = lookups_for(app)
         template_id = template_changes.get("id") or template_changes.get("template_id") or template_changes.get("name")
         print(f"[DEBUG] Applying defects from template: {template_id}")
         for defect in template_data["defects"]:
-            # Support both old format (name) and new format (custom_name + key)
-            defect_name = defect.get("custom_name", defect.get("name", ""))
-            defect_key = defect.get("key", "")
-            defect_rank = defect.get("rank", defect.get("level", 1))  # Use rank for defects as per BESM 4e terminology
-            
-            print(f"[DEBUG] Processing defect: {defect_name} key: {defect_key} rank: {defect_rank}")
-            
-            # Fetch full defect details from defects.json using key if available
-            full_defect = None
-            if defect_key and hasattr(app, 'defects_by_key') and defect_key in app.defects_by_key:
-                full_defect = app.defects_by_key.get(defect_key, {})
+            new_defect = build_defect(defect, lookups.defects_by_key, lookups.defects, catalog)
+            print(f"[DEBUG] Processing defect: {new_defect['name']} key: {new_defect['key']} rank: {new_defect['rank']}")
+
+            # Match by key if both have keys, otherwise by name and description
+            defect_existing = find_matching_defect(app.character_data.get("defects", []), new_defect)
+            if defect_existing is not None:
+                print(f"[DEBUG] Found existing defect, updating sources")
+                if "sources" not in defect_existing:
+                    defect_existing["sources"] = []
+                if template_id not in defect_existing["sources"]:
+                    defect_existing["sources"].append(template_id)
             else:
-                full_defect = app.defects.get(defect_name, {}) if hasattr(app, 'defects') else {}
-            
-            new_defect = copy.deepcopy(full_defect) if full_defect else copy.deepcopy(defect)
-            new_defect["id"] = str(uuid.uuid4())
-            new_defect["name"] = defect_name
-            new_defect["key"] = defect_key or full_defect.get("key", "")
-            new_defect["rank"] = defect_rank  # Use rank for defects as per BESM 4e terminology
-            
-            # Copy additional fields from the template defect
-            if "user_description" in defect and defect["user_description"]:
-                new_defect["user_description"] = defect["user_description"]
-            if "enhancements" in defect and defect["enhancements"]:
-                new_defect["enhancements"] = defect["enhancements"]
-            if "limiters" in defect and defect["limiters"]:
-                new_defect["limiters"] = defect["limiters"]
-            if "options" in defect and defect["options"]:
-                new_defect["options"] = defect["options"]
-            if "user_input" in defect and defect["user_input"]:
-                new_defect["user_input"] = defect["user_input"]
-            if "options_source" in defect:
-                new_defect["options_source"] = defect["options_source"]
-            if "cost" not in new_defect:
-                if "cp_refund" in new_defect and new_defect["cp_refund"] is not None:
-                    # cp_refund is positive magnitude, subtract it
-                    new_defect["cost"] = -abs(new_defect["cp_refund"])
-                elif "points" in new_defect and new_defect["points"] is not None:
-                    # legacy 'points' field treated as cp_refund
-                    new_defect["cost"] = -abs(new_defect["points"])
-                elif "rank" in new_defect and "cost_per_rank" in new_defect:
-                    new_defect["cost"] = -abs(new_defect["rank"] * new_defect["cost_per_rank"])
-                # Defects use rank in BESM 4e, not level
-                else:
-                    # default refund per rank
-                    rank = new_defect.get("rank", 1)
-                    new_defect["cost"] = -abs(rank)
-                    print(f"[DEBUG] Warning: No cost info for defect {new_defect.get('name', 'Unknown')}. Using default refund.")
-            if new_defect.get("name", "").lower() == "unique defect":
-                if "details" in new_defect and new_defect["details"]:
-                    details_text = new_defect["details"].strip("()").strip()
-                    if ":" in details_text:
-                        new_defect["name"] = details_text.split(":")[0].strip()
-                    elif "÷" in details_text or "-" in details_text:
-                        parts = details_text.split(" ")
-                        if len(parts) >= 2:
-                            new_defect["name"] = " ".join(parts[:-1]).strip()
-                    else:
-                        new_defect["name"] = details_text
-                    if not new_defect.get("details_original"):
-                        new_defect["details_original"] = new_defect["details"]
-            # Deduplication key: key+name+user_description
-            # First try to match by key if available
-            dedup_key = new_defect.get("key", "").strip().lower()
-            dedup_name = new_defect.get("name", "").strip().lower()
-            dedup_desc = str(new_defect.get("user_description", new_defect.get("details", ""))).strip().lower()
-            
-            print(f"[DEBUG] Defect deduplication key: {dedup_key}, name: {dedup_name}, desc: {dedup_desc}")
-            found = False
-            for defect_existing in app.character_data.get("defects", []):
-                # Try to match by key first, then by name+description
-                existing_key = defect_existing.get("key", "").strip().lower()
-                existing_name = defect_existing.get("name", "").strip().lower()
-                existing_desc = str(defect_existing.get("user_description", defect_existing.get("details", ""))).strip().lower()
-                
-                print(f"[DEBUG] Comparing against existing: key: {existing_key}, name: {existing_name}, desc: {existing_desc}")
-                # Match by key if both have keys, otherwise match by name and description
-                if (dedup_key and existing_key and dedup_key == existing_key) or \
-                   (dedup_name == existing_name and dedup_desc == existing_desc):
-                    print(f"[DEBUG] Found existing defect, updating sources")
-                    if "sources" not in defect_existing:
-                        defect_existing["sources"] = []
-                    if template_id not in defect_existing["sources"]:
-                        defect_existing["sources"].append(template_id)
-                    found = True
-                    break
-            if not found:
-                print(f"[DEBUG] Adding new defect: {dedup_key} with sources [{template_id}]")
+                print(f"[DEBUG] Adding new defect: {new_defect['key']} with sources [{template_id}]")
                 new_defect["sources"] = [template_id]
                 app.character_data["defects"].append(new_defect)
                 template_changes["changes"].append({
                     "field": "defect_add",
                     "defect_id": new_defect["id"],
-                    "defect_data": new_defect
+                    "defect_data": freeze(new_defect)
                 })
         print(f"[DEBUG] Defects in character after processing:")
         for i, d in enumerate(app.character_data["defects"], 1):
@@ -691,56 +609,21 @@ def apply_size_from_template(app, size_info, template_changes):
         print(f"[DEBUG] No size name or key found in size_info")
         return
     
-    # Load the size templates
+    # Look the size up on the compiled ladder (by key, name, then rank)
     import os
     import json
-    
+    from templates.template_effects import find_base_size
+
     base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    
-    # Try to load from the new directory structure first
-    sizes_dir = os.path.join(base_path, "data", "templates", "sizes")
-    index_path = os.path.join(base_path, "data", "templates", "index.json")
-    
-    print(f"[DEBUG] Checking for sizes directory: {sizes_dir}, exists={os.path.exists(sizes_dir)}")
-    print(f"[DEBUG] Checking for index file: {index_path}, exists={os.path.exists(index_path)}")
-    
     matching_template = None
-    
-    # Try to find the size template in the new directory structure
-    if os.path.exists(sizes_dir) and os.path.exists(index_path):
-        try:
-            # Load the index file to get the list of size templates
-            with open(index_path, 'r') as f:
-                index_data = json.load(f)
-                size_template_names = index_data.get("sizes", [])
-            
-            print(f"[DEBUG] Found {len(size_template_names)} size templates in index")
-            
-            # Try to find a matching size template by key or name
-            for size_template_name in size_template_names:
-                size_template_path = os.path.join(sizes_dir, f"{size_template_name}.json")
-                
-                if os.path.exists(size_template_path):
-                    with open(size_template_path, 'r') as f:
-                        template = json.load(f)
-                        
-                        # Match by key if available
-                        if size_key and template.get("key") == size_key:
-                            matching_template = template
-                            print(f"[DEBUG] Found matching size template by key: {size_key}")
-                            break
-                        # Match by name if key not available
-                        elif size_name and template.get("name") == size_name:
-                            matching_template = template
-                            print(f"[DEBUG] Found matching size template by name: {size_name}")
-                            break
-                        # Match by rank as a last resort
-                        elif size_rank is not None and template.get("rank") == size_rank:
-                            matching_template = template
-                            print(f"[DEBUG] Found matching size template by rank: {size_rank}")
-                            break
-        except Exception as e:
-            print(f"[DEBUG] Error loading size template from new structure: {e}")
+
+    try:
+        size = find_base_size(size_info)
+        if size is not None:
+            matching_template = size.template
+            print(f"[DEBUG] Found matching size template on the size ladder: {size.key} (rank {size.rank})")
+    except (OSError, ValueError) as e:
+        print(f"[DEBUG] Error loading the size ladder: {e}")
     
     # Fall back to the old method if no matching template found
     if matching_template is None:
@@ -810,46 +693,18 @@ def apply_size_template(app, template_data, template_changes):
         })
     
     # Apply stat changes by adding to existing stats
-    if "stats" in template_data:
-        # Handle new stats structure (object with body_adj, mind_adj, soul_adj)
-        if isinstance(template_data["stats"], dict):
-            # New format
-            stats_dict = template_data["stats"]
-            
-            # Map the new field names to the old ones
-            stat_mapping = {
-                "body_adj": "Body",
-                "mind_adj": "Mind",
-                "soul_adj": "Soul"
-            }
-            
-            for new_field, old_field in stat_mapping.items():
-                value = stats_dict.get(new_field, 0)
-                if value and old_field in app.stat_spinners:
-                    old_value = app.stat_spinners[old_field].value()
-                    new_value = old_value + value
-                    app.stat_spinners[old_field].setValue(new_value)
-                    template_changes["changes"].append({
-                        "field": f"stat_{old_field}",
-                        "old_value": old_value,
-                        "new_value": new_value,
-                        "modifier": f"+{value}"  # Record that this was an addition
-                    })
-        else:
-            # Old format - list of stat entries
-            for stat_entry in template_data["stats"]:
-                stat = stat_entry.get("stat")
-                value = stat_entry.get("value")
-                if stat in app.stat_spinners:
-                    old_value = app.stat_spinners[stat].value()
-                    new_value = old_value + value  # Add instead of replace
-                    app.stat_spinners[stat].setValue(new_value)
-                    template_changes["changes"].append({
-                        "field": f"stat_{stat}",
-                        "old_value": old_value,
-                        "new_value": new_value,
-                        "modifier": f"+{value}"  # Record that this was an addition
-                    })
+    from templates.template_effects import template_stat_changes
+    for stat, value in template_stat_changes(template_data):
+        if stat in app.stat_spinners:
+            old_value = app.stat_spinners[stat].value()
+            new_value = old_value + value  # Add instead of replace
+            app.stat_spinners[stat].setValue(new_value)
+            template_changes["changes"].append({
+                "field": f"stat_{stat}",
+                "old_value": old_value,
+                "new_value": new_value,
+                "modifier": f"+{value}"  # Record that this was an addition
+            })
     
     # Apply attribute changes
     apply_attributes(app, template_data, template_changes)
@@ -858,6 +713,7 @@ def apply_size_template(app, template_data, template_changes):
     apply_defects(app, template_data, template_changes)
 
 
+@timed()
 def remove_template_from_character(app, template_id):
     """Remove a template from the character"""
     if "applied_templates" not in app.character_data:
@@ -0,0 +1,81 @@
+import pytest
+from PyQt5.QtWidgets import QComboBox
+
+from dialogs.attribute_builder_dialog import AttributeBuilderDialog, completer_model
+from tools.catalog import get_catalog
+
+@pytest.fixture
+def dialog(qapp):
+    dialog = AttributeBuilderDialog()
+    yield dialog
+    dialog.deleteLater()
+
+def _category_options(category):
+    fields = get_catalog().attributes["Dynamic Powers"]["user_input_required"]
+    field = next(f for f in fields if f["key"] == "controlled_category")
+    return field["autocomplete_by_category"][category]
+
+def test_dependent_field_follows_controller(dialog):
+    """Test that changing Category Type swaps the Controlled Category suggestions."""
+    dialog.set_attribute_by_name("Dynamic Powers")
+    category = dialog.custom_input_widgets["category_type"]
+    controlled = dialog.custom_input_widgets["controlled_category"]
+
+    for category_name in ("Minor", "Major", "Primal"):
+        category.setCurrentText(category_name)
+        items = [controlled.itemText(i) for i in range(controlled.count())]
+        assert items == _category_options(category_name)
+        assert controlled.model() is completer_model("Dynamic Powers", "controlled_category", category_name)
+
+def test_completer_models_are_reused(dialog):
+    """Test that switching back and forth does not build new models."""
+    dialog.set_attribute_by_name("Dynamic Powers")
+    category = dialog.custom_input_widgets["category_type"]
+    controlled = dialog.custom_input_widgets["controlled_category"]
+
+    category.setCurrentText("Major")
+    major_model = controlled.model()
+    category.setCurrentText("Minor")
+    category.setCurrentText("Major")
+    assert controlled.model() is major_model
+
+    # Typed text must not leak into the shared model
+    controlled.setEditText("Something New")
+    controlled.lineEdit().returnPressed.emit()
+    assert major_model.stringList() == _category_options("Major")
+
+def test_autocomplete_links_do_not_accumulate(dialog):
+    """Test that reopening the same attribute keeps one link per dependent field."""
+    dialog.set_attribute_by_name("Dynamic Powers")
+    dialog.set_attribute_by_name("Armour")
+    dialog.set_attribute_by_name("Dynamic Powers")
+    assert dialog.autocomplete_links["category_type"] == ["controlled_category"]
+
+def test_dynamic_name_follows_fields(dialog):
+    """Test that the generated name is updated as soon as a field changes."""
+    dialog.set_attribute_by_name("Dynamic Powers")
+    dialog.custom_input_widgets["category_type"].setCurrentText("Major")
+    dialog.custom_input_widgets["controlled_category"].setEditText("Storms")
+    assert dialog.custom_name_input.text() == "Dynamic Powers: Storms (Major)"
+
+def test_typed_name_is_kept(dialog, qtbot):
+    """Test that a name typed by the user is not replaced by the generated one."""
+    dialog.set_attribute_by_name("Dynamic Powers")
+    dialog.custom_name_input.clear()
+    qtbot.keyClicks(dialog.custom_name_input, "Weather Witch")
+    dialog.custom_input_widgets["controlled_category"].setEditText("Storms")
+    assert dialog.get_attribute_data()["name"] == "Weather Witch"
+
+def test_submit_does_not_process_events(dialog, monkeypatch):
+    """Test that reading the dialog data does not re-enter the event loop."""
+    from PyQt5.QtWidgets import QApplication
+
+    def fail(*args):
+        raise AssertionError("processEvents called during submit")
+
+    dialog.set_attribute_by_name("Dynamic Powers")
+    dialog.custom_input_widgets["controlled_category"].setEditText("Storms")
+    with monkeypatch.context() as patch:
+        patch.setattr(QApplication, "processEvents", fail)
+        data = dialog.get_attribute_data()
+    assert data["name"].startswith("Dynamic Powers: Storms")
@@ -0,0 +1,17 @@
+from benchmarks.compare import compare_runs
+from benchmarks.synthetic import synthetic_character
+
+def test_synthetic_character_is_seeded():
+    """Test that the same size and seed always give the same character."""
+    first = synthetic_character(50, seed=3)
+    assert first == synthetic_character(50, seed=3)
+    assert first != synthetic_character(50, seed=4)
+    assert len(first["attributes"]) + len(first["defects"]) == 50
+
+def test_compare_flags_regressions():
+    """Test that only benchmarks slower than the threshold are flagged."""
+    base = {"fast": 0.010, "slow": 0.010}
+    new = {"fast": 0.0105, "slow": 0.015}
+    lines, regressions = compare_runs(base, new, threshold=10)
+    assert regressions == ["slow"]
+    assert any("REGRESSION" in line and line.startswith("slow") for line in lines)
@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+
+from tools.besm_cli import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _character(name, body=4, cost=10, defect_cost=-2):
+    return {
+        "name": name, "race": "Human", "class": "Fighter",
+        "stats": {"Body": body, "Mind": 4, "Soul": 4},
+        "attributes": [{"name": "Armour", "base_name": "Armour", "level": 2, "cost": cost}],
+        "defects": [{"name": "Bane", "base_name": "Bane", "rank": 1, "cost": defect_cost}],
+        "weapons": [],
+    }
+
+def _write(directory, name, data):
+    path = directory / f"{name}.json"
+    path.write_text(json.dumps(data))
+    return str(path)
+
+def _run(*argv):
+    out = io.StringIO()
+    code = main(list(argv), out=out)
+    return code, out.getvalue()
+
+def test_cli_does_not_import_pyqt(tmp_path):
+    """Test that the headless command never loads PyQt5."""
+    path = _write(tmp_path, "hero", _character("Hero"))
+    script = ("import sys; from tools.besm_cli import main; main(['derive', '-j', '1', sys.argv[1]]); "
+              "assert not any(m.startswith('PyQt5') for m in sys.modules), 'PyQt5 imported'")
+    result = subprocess.run([sys.executable, "-c", script, path], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+def test_derive_reports_cp_and_derived(tmp_path):
+    """Test that derive prints the same numbers the rules compute."""
+    path = _write(tmp_path, "hero", _character("Hero"))
+    code, output = _run("derive", "--format", "json", "-j", "1", path)
+    record = json.loads(output)
+    assert code == 0
+    assert record["cp"] == 12 * 2 + 10 - 2
+    assert record["derived"]["HP"] == 40
+
+def test_validate_flags_schema_and_benchmark_problems(tmp_path):
+    """Test that validate fails on schema errors and, with --strict, on benchmark limits."""
+    good = _write(tmp_path, "good", _character("Good"))
+    broken = _character("Broken")
+    del broken["defects"][0]["cost"]
+    bad = _write(tmp_path, "bad", broken)
+
+    code, output = _run("validate", "-j", "1", good, bad)
+    assert code == 1
+    assert "missing required field 'cost'" in output
+    assert "1 failed" in output
+
+    strong = _write(tmp_path, "strong", _character("Strong", body=12))
+    code, output = _run("validate", "--strict", "--benchmark", "Human", "-j", "1", strong)
+    assert code == 1
+    assert "Body exceeds benchmark max" in output
+
+def test_summarize_directory_with_process_pool(tmp_path):
+    """Test that a pooled summary matches the in-process one, in file order."""
+    for index in range(6):
+        _write(tmp_path, f"npc_{index}", _character(f"NPC {index}", cost=index))
+    (tmp_path / "notes.txt").write_text("not a character")
+
+    _, serial = _run("summarize", "-j", "1", str(tmp_path))
+    _, pooled = _run("summarize", "-j", "2", str(tmp_path))
+    assert serial == pooled
+    rows = list(csv.DictReader(io.StringIO(pooled)))
+    assert [row["name"] for row in rows] == [f"NPC {index}" for index in range(6)]
+    assert rows[0]["race"] == "Human"
@@ -0,0 +1,50 @@
+import pytest
+from tools.catalog import Catalog, get_catalog
+
+def _scan(modifiers, attr_key):
+    """The linear compatibility scan the builder dialogs used to run."""
+    return [
+        m for m in modifiers
+        if (not m.get("compatible_with")) or (attr_key and any(attr_key == key.lower() for key in m["compatible_with"]))
+    ]
+
+def test_catalog_is_shared():
+    """Test that the catalog is loaded once and reused."""
+    assert get_catalog() is get_catalog()
+
+def test_compatibility_index_matches_scan():
+    """Test that the precomputed index gives the same lists as a full scan for every attribute."""
+    catalog = Catalog()
+    for attr in catalog.raw_attributes:
+        attr_key = attr.get("key", "").lower()
+        assert catalog.compatible_enhancements(attr_key) == _scan(catalog.enhancements, attr_key), attr["name"]
+        assert catalog.compatible_limiters(attr_key) == _scan(catalog.limiters, attr_key), attr["name"]
+
+    # Unknown or missing keys only get the universal modifiers
+    assert catalog.compatible_enhancements("not_a_real_key") == _scan(catalog.enhancements, "not_a_real_key")
+    assert catalog.compatible_limiters("") == _scan(catalog.limiters, "")
+
+def test_name_lookups():
+    """Test the name -> record dictionaries used for cost calculations."""
+    catalog = get_catalog()
+    for enhancement in catalog.enhancements:
+        assert catalog.enhancements_by_name[enhancement["name"]]["name"] == enhancement["name"]
+    for limiter in catalog.limiters:
+        assert catalog.limiters_by_name[limiter["name"]]["name"] == limiter["name"]
+    assert "Absorption" in catalog.attributes
+    assert catalog.attributes_by_key["absorption"] is catalog.attributes["Absorption"]
+
+def test_attribute_dialog_uses_index(qapp):
+    """Test that switching attributes in the builder fills the lists from the index."""
+    from dialogs.attribute_builder_dialog import AttributeBuilderDialog
+
+    dialog = AttributeBuilderDialog()
+    catalog = get_catalog()
+    for name in ["Armour", "Ranged Attack", "Force Field"]:
+        if name not in catalog.attributes:
+            continue
+        dialog.set_attribute_by_name(name)
+        attr_key = catalog.attributes[name].get("key", "")
+        assert dialog.enhancement_list.count() == len(catalog.compatible_enhancements(attr_key))
+        assert dialog.limiter_list.count() == len(catalog.compatible_limiters(attr_key))
+    dialog.deleteLater()
@@ -0,0 +1,67 @@
+import pytest
+
+from tools.combat import TWO_D6, Combatant, damage_distribution, simulate, simulate_duel
+
+HERO = Combatant("Hero", acv=7, dcv=6, hp=60, dm=6, sv=12, armour=5)
+OGRE = Combatant("Ogre", acv=5, dcv=4, hp=100, dm=8, sv=20, weapon_damage=5)
+
+def test_damage_distribution_is_exact():
+    """Test the one-attack distribution against the 2d6 table."""
+    even = Combatant("A", acv=5, dcv=5, hp=50, dm=4, sv=10)
+    distribution = damage_distribution(even, even)
+    assert sum(distribution.values()) == pytest.approx(1)
+
+    # Equal totals miss, and each side is as likely to roll higher as lower
+    tie = sum(p * p for p in TWO_D6.values())
+    assert distribution[0] == pytest.approx(tie + (1 - tie) / 2)
+    assert distribution[4] == pytest.approx(sum(TWO_D6[t] * TWO_D6[t - 1] for t in range(3, 13)))
+
+    # Armour soaks small hits into 0 damage
+    armoured = damage_distribution(even, Combatant("B", acv=5, dcv=5, hp=50, dm=4, sv=10, armour=8))
+    assert min(value for value in armoured if value) == 4 and armoured[0] > distribution[0]
+
+def test_same_seed_same_results():
+    """Test that a fixed seed reproduces a run exactly."""
+    first = simulate_duel(HERO, OGRE, 2000, seed=5)
+    again = simulate_duel(HERO, OGRE, 2000, seed=5)
+    other = simulate_duel(HERO, OGRE, 2000, seed=6)
+    assert (first.wins, first.draws, first.rounds, first.damage) == (again.wins, again.draws, again.rounds, again.damage)
+    assert first.damage != other.damage
+
+def test_outcomes_add_up_and_match_the_odds():
+    """Test outcome totals, sampled damage against the exact mean, and symmetry."""
+    result = simulate_duel(HERO, OGRE, 20000, seed=1)
+    assert sum(result.wins) + result.draws == sum(result.rounds.values()) == 20000
+    for side in (0, 1):
+        counts = result.damage[side]
+        mean = sum(value * count for value, count in counts.items()) / sum(counts.values())
+        assert mean == pytest.approx(result.exact_mean_damage[side], rel=0.03)
+    assert result.rounds_percentile(0.5) <= result.rounds_percentile(0.9)
+
+    mirror = simulate_duel(HERO, HERO, 20000, seed=1)
+    assert mirror.win_probability(0) == pytest.approx(mirror.win_probability(1), abs=0.02)
+
+def test_shock_value_costs_attacks():
+    """Test that a low Shock Value loses fights a high one wins."""
+    steady = Combatant("Steady", acv=6, dcv=6, hp=80, dm=5, sv=100)
+    shaky = Combatant("Shaky", acv=6, dcv=6, hp=80, dm=5, sv=1)
+    result = simulate_duel(steady, shaky, 5000, seed=2)
+    assert result.win_probability(0) > 0.7 > result.win_probability(1) * 3
+
+def test_round_limit_and_pairs():
+    """Test that fights nobody can win are draws, and that every pair is simulated."""
+    turtle = Combatant("Turtle", acv=1, dcv=20, hp=50, dm=1, sv=10, armour=100)
+    stalemate = simulate_duel(turtle, turtle, 100, seed=0, max_rounds=5)
+    assert stalemate.draws == 100 and stalemate.rounds == {5: 100}
+
+    results = simulate([HERO, OGRE, turtle], trials=200, seed=3)
+    assert [(r.first.name, r.second.name) for r in results] == [("Hero", "Ogre"), ("Hero", "Turtle"), ("Ogre", "Turtle")]
+
+def test_combatant_from_character():
+    """Test reading derived values, Armour levels and plain-number weapon and armour values."""
+    character = {"name": "Aria", "stats": {"Body": 5, "Mind": 4, "Soul": 6}, "defects": [],
+                 "attributes": [{"name": "Armour", "key": "armour", "level": 2, "stat_mods": {"derived": {"Armour Rating": 5}}}],
+                 "weapons": [{"name": "Wand", "damage": "25"}, {"name": "Knife", "damage": "special"}],
+                 "armor": [{"name": "Robe", "protection": "10 vs Magic"}]}
+    combatant = Combatant.from_character(character)
+    assert (combatant.name, combatant.hp, combatant.armour, combatant.weapon_damage) == ("Aria", 50, 10, 25)
@@ -0,0 +1,68 @@
+import pytest
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QDialog
+
+from dialogs.attribute_builder_dialog import AttributeBuilderDialog
+from dialogs.defect_builder_dialog import DefectBuilderDialog
+
+def test_pool_prewarms_builders(besm_app, qtbot):
+    """Test that both builder dialogs are built after startup."""
+    qtbot.waitUntil(lambda: len(besm_app.dialog_pool._idle) == 2)
+    attr_dialog = besm_app.dialog_pool._idle[AttributeBuilderDialog]
+    assert besm_app.dialog_pool.attribute_builder() is attr_dialog
+
+def test_attribute_builder_is_reused_and_reset(besm_app):
+    """Test that a finished attribute builder comes back in a fresh state."""
+    pool = besm_app.dialog_pool
+    dialog = pool.attribute_builder()
+    dialog.set_attribute_by_name("Armour")
+    dialog.level_spin.setValue(3)
+    dialog.user_description.setPlainText("Old notes")
+    dialog.existing_attribute_id = "abc"
+    dialog.done(QDialog.Accepted)
+
+    reused = pool.attribute_builder()
+    assert reused is dialog
+    assert reused.attr_dropdown.currentIndex() == 0
+    assert reused.level_spin.value() == 1
+    assert reused.user_description.toPlainText() == ""
+    assert "id" not in reused.get_attribute_data()
+
+def test_busy_builder_is_not_shared(besm_app):
+    """Test that a second request while the pooled dialog is open gets its own instance."""
+    pool = besm_app.dialog_pool
+    first = pool.attribute_builder()
+    second = pool.attribute_builder()
+    assert first is not second
+    second.done(QDialog.Rejected)
+    first.done(QDialog.Rejected)
+    assert pool._idle[AttributeBuilderDialog] is second
+
+def test_defect_builder_reset_for_edit(besm_app):
+    """Test that the pooled defect builder switches between add and edit mode."""
+    pool = besm_app.dialog_pool
+    dialog = pool.defect_builder()
+    assert dialog.add_button.text() == "Add Defect"
+    dialog.done(QDialog.Rejected)
+
+    defect_name = sorted(dialog.defects.keys())[-1]
+    existing = {"name": "My Defect", "base_name": defect_name, "rank": 1, "notes": "Some notes"}
+    edit_dialog = pool.defect_builder(existing)
+    assert edit_dialog is dialog
+    assert edit_dialog.add_button.text() == "Update Defect"
+    assert edit_dialog.defect_dropdown.currentText() == defect_name
+    assert edit_dialog.custom_name_input.text() == "My Defect"
+    assert edit_dialog.user_description.toPlainText() == "Some notes"
+    edit_dialog.done(QDialog.Rejected)
+
+    assert pool.defect_builder().edit_mode is False
+
+def test_pool_released_when_hidden(besm_app):
+    """Test that idle dialogs are dropped when the application is hidden."""
+    pool = besm_app.dialog_pool
+    pool.attribute_builder().done(QDialog.Rejected)
+    assert pool._idle
+    pool._on_application_state_changed(Qt.ApplicationHidden)
+    assert pool._idle == {}
+    # Still usable afterwards
+    assert isinstance(pool.attribute_builder(), AttributeBuilderDialog)
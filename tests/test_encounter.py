@@ -0,0 +1,88 @@
+import pytest
+
+from tools import encounter
+from tools.combat import Combatant, damage_distribution
+from tools.encounter import analyze_encounter, minion_count_range, side_units
+
+def _character(name, body, mind, soul, **extra):
+    return dict({"name": name, "stats": {"Body": body, "Mind": mind, "Soul": soul}, "attributes": [], "defects": []}, **extra)
+
+PARTY = [_character("Fighter", 7, 4, 5), _character("Mage", 4, 8, 6)]
+WARLORD = _character("Warlord", 8, 5, 6, minions=[
+    {"name": "Goblins", "level": 3, "count": "11-25", "stats": {"Body": 3, "Mind": 2, "Soul": 2}},
+    {"name": "Wolves", "level": 1, "count": "Up to 5", "cp": 12},
+])
+
+@pytest.mark.parametrize("minion, expected", [
+    ({"count": 10}, (10, 10)),
+    ({"count": "6-10"}, (6, 10)),
+    ({"count": "Up to 5"}, (1, 5)),
+    ({"count": "Group of 25 minions"}, (25, 25)),
+    ({"level": 4}, (26, 50)),
+])
+def test_minion_count_range(minion, expected):
+    """Test reading both the builder's count strings and the synced counts."""
+    assert minion_count_range(minion) == expected
+
+def test_minions_become_scaled_units():
+    """Test that minion entries join their side, sized from their count range."""
+    for scale, goblins, wolves in (("low", 11, 1), ("mid", 18, 3), ("high", 25, 5)):
+        units = side_units([WARLORD], scale)
+        counts = {unit.combatant.name: unit.count for unit in units}
+        assert counts == {"Warlord": 1, "Goblins": goblins, "Wolves": wolves}
+    wolf = next(unit for unit in side_units([WARLORD]) if unit.combatant.name == "Wolves")
+    assert wolf.combatant.hp == 20  # 12 CP spread over the stats: 2/2/2
+    assert [unit.combatant.name for unit in side_units([WARLORD], include_minions=False)] == ["Warlord"]
+
+def test_metrics_are_exact(tmp_path):
+    """Test one-on-one metrics against the per-attack damage distributions."""
+    fighter, warlord = PARTY[0], _character("Warlord", 8, 5, 6)
+    result = analyze_encounter([fighter], [warlord], trials=200, cache_dir=None)
+    attack = damage_distribution(Combatant.from_character(fighter), Combatant.from_character(warlord))
+    defend = damage_distribution(Combatant.from_character(warlord), Combatant.from_character(fighter))
+    assert result.party.offence == pytest.approx(sum(d * p for d, p in attack.items()))
+    assert result.party.defence == pytest.approx(defend[0])
+    assert result.party.endurance == 70 and result.group.endurance == 80
+    assert result.party_wins + result.group_wins + result.draws == 200
+
+def test_results_are_cached_by_content(tmp_path):
+    """Test that repeating a what-if is served from the cache, in memory and on disk."""
+    first = analyze_encounter(PARTY, [WARLORD], trials=300, seed=4, cache_dir=str(tmp_path))
+    assert not first.cached
+
+    # Listing the party the other way round is the same encounter
+    again = analyze_encounter(list(reversed(PARTY)), [WARLORD], trials=300, seed=4, cache_dir=str(tmp_path))
+    assert again.cached and again.to_dict() == first.to_dict()
+
+    encounter._results.clear()
+    from_disk = analyze_encounter(PARTY, [WARLORD], trials=300, seed=4, cache_dir=str(tmp_path))
+    assert from_disk.cached and from_disk.to_dict() == first.to_dict()
+
+    # Any change to a participant is a new encounter
+    stronger = [_character("Fighter", 8, 4, 5), PARTY[1]]
+    assert not analyze_encounter(stronger, [WARLORD], trials=300, seed=4, cache_dir=str(tmp_path)).cached
+
+def test_more_minions_favour_the_group():
+    """Test that taking the top of the minion count ranges makes the group stronger."""
+    low = analyze_encounter(PARTY, [WARLORD], trials=500, seed=1, minion_scale="low", cache_dir=None)
+    high = analyze_encounter(PARTY, [WARLORD], trials=500, seed=1, minion_scale="high", cache_dir=None)
+    assert high.group.combatants > low.group.combatants
+    assert high.group_wins > low.group_wins and high.group.offence > low.group.offence
+
+def test_encounter_dialog(besm_app, qtbot, monkeypatch, tmp_path):
+    """Test analyzing the current character against a loaded group from the Options panel."""
+    from functools import partial
+    from dialogs import encounter_dialog
+    monkeypatch.setattr(encounter_dialog, "analyze_encounter", partial(analyze_encounter, cache_dir=str(tmp_path)))
+    besm_app.show_encounter_dialog()
+    dialog = besm_app.encounter_dialog
+    dialog.trials_spin.setValue(200)
+    dialog.add_current_character()
+    dialog.add_character(dialog.group_list, WARLORD)
+    assert dialog.group_list.item(0).text() == "Warlord (+2 minion groups)"
+    assert dialog.side_characters(dialog.group_list) == [WARLORD]
+
+    dialog.analyze()
+    qtbot.waitUntil(lambda: dialog.results_view.toPlainText().startswith("Party wins"), timeout=10000)
+    assert dialog.last_result.group.combatants == 1 + 18 + 3
+    dialog.close()
@@ -0,0 +1,80 @@
+import json
+import os
+import shutil
+
+from templates.template_effects import dry_run
+from tools.explorer import BASE_CHARACTER, ComboTable, _engine_lookups, explore
+from tools.rules import calculate_derived_values, point_total
+from tools.size_ladder import TEMPLATES_PATH, load_size_ladder
+
+SUBSET = {"races": ["dwarf", "fairy"], "classes": ["adventurer", "ninja"], "sizes": ["medium", "huge", "tiny"]}
+
+def _templates(tmp_path):
+    """A copy of a few templates, so tests can edit them"""
+    path = tmp_path / "templates"
+    for kind, names in SUBSET.items():
+        os.makedirs(path / kind)
+        for name in names:
+            shutil.copy(os.path.join(TEMPLATES_PATH, kind, f"{name}.json"), path / kind)
+    (path / "index.json").write_text(json.dumps(SUBSET))
+    return str(path)
+
+def test_rows_match_applying_each_template(tmp_path):
+    """Test that every combination is listed and its row matches a dry run of its templates."""
+    templates_path = _templates(tmp_path)
+    table = explore(templates_path=templates_path, cache_path=str(tmp_path / "cache.zip"))
+    assert len(table) == 3 * 3 * 4 and table.recomputed == len(table)
+
+    [index] = table.query(race="fairy", class_="ninja", size="huge")
+    row = table.row(index)
+    ladder = load_size_ladder(templates_path)
+    character = BASE_CHARACTER
+    for kind, name, template_type in (("races", "fairy", "race"), ("classes", "ninja", "class"), ("sizes", "huge", "size")):
+        with open(os.path.join(templates_path, kind, f"{name}.json"), encoding="utf-8") as f:
+            character = dry_run(character, json.load(f), template_type, _engine_lookups(), ladder)
+    assert row["cp"] == point_total(character)
+    assert all(row[key] == value for key, value in calculate_derived_values(character).items())
+
+    base = table.row(table.query(race="", class_="", size="")[0])
+    assert base["cp"] == point_total(BASE_CHARACTER) and base["benchmark"] == "Sub-Human"
+
+def test_query_filters_and_sorts(tmp_path):
+    """Test benchmark, CP and name filters and sorting on a column."""
+    table = explore(templates_path=_templates(tmp_path), cache_path=None)
+    indexes = table.query(fits="Human", cp_range=(None, 45), sort_by="DCV")
+    rows = table.rows(indexes)
+    assert rows and all("Human" in row["fits"] and row["cp"] <= 45 for row in rows)
+    assert [row["DCV"] for row in rows] == sorted((row["DCV"] for row in rows), reverse=True)
+    assert table.query(race="not_a_race") == []
+    assert len(table.query(size="tiny", limit=2)) == 2
+
+def test_only_changed_templates_are_recomputed(tmp_path):
+    """Test that the saved table is reused and one edited template only redoes its rows."""
+    templates_path = _templates(tmp_path)
+    cache_path = str(tmp_path / "cache.zip")
+    first = explore(templates_path=templates_path, cache_path=cache_path)
+
+    loaded = ComboTable.load(cache_path)
+    assert all(loaded.columns[column] == first.columns[column] for column in first.columns)
+    assert explore(templates_path=templates_path, cache_path=cache_path).recomputed == 0
+
+    ninja_path = os.path.join(templates_path, "classes", "ninja.json")
+    with open(ninja_path, encoding="utf-8") as f:
+        ninja = json.load(f)
+    ninja["attributes"] = ninja["attributes"][:1]
+    with open(ninja_path, "w", encoding="utf-8") as f:
+        json.dump(ninja, f)
+
+    table = explore(templates_path=templates_path, cache_path=cache_path)
+    assert table.recomputed == 3 * 4
+    changed = [i for i in range(len(table)) if table.columns["cp"][i] != first.columns["cp"][i]]
+    assert changed and all(table.row(i)["class"] == "ninja" for i in changed)
+
+def test_explore_keeps_stdout_clean(tmp_path, capsys):
+    """Test that exploring prints nothing to stdout, so CSV output can be redirected to a file."""
+    cache_path = str(tmp_path / "cache.zip")
+    with open(cache_path, "w") as f:
+        f.write("not a zip")
+    explore(templates_path=_templates(tmp_path), cache_path=cache_path)
+    captured = capsys.readouterr()
+    assert captured.out == "" and "not used" in captured.err
@@ -0,0 +1,80 @@
+import json
+
+from tools import forms
+from tools.forms import encode_form, form_sheet, form_stats
+from tools.rollup import RollupTree, alternate_form_cost
+from tools.rules import calculate_derived_values
+
+BASE = {"name": "Aria", "stats": {"Body": 5, "Mind": 6, "Soul": 4}, "attributes": [], "defects": []}
+
+def test_forms_are_stored_as_differences():
+    """Test encoding a full form copy as an overlay, and reading both forms back."""
+    legacy = {"id": "wolf", "name": "Wolf", "stats": {"Body": 8, "Mind": 6, "Soul": 3},
+              "derived": calculate_derived_values({"stats": {"Body": 8, "Mind": 6, "Soul": 3}}), "attributes": []}
+    overlay = encode_form(legacy, BASE["stats"])
+    assert overlay == {"id": "wolf", "name": "Wolf", "stat_deltas": {"Body": 3, "Soul": -1}, "attributes": []}
+    assert encode_form(overlay, BASE["stats"]) is overlay
+    assert len(json.dumps(overlay)) < len(json.dumps(legacy)) / 2
+    assert form_stats(legacy, BASE["stats"]) == form_stats(overlay, BASE["stats"]) == legacy["stats"]
+
+    # Base edits carry over to the form, within the editor's stat range
+    assert form_stats(overlay, {"Body": 7, "Mind": 6, "Soul": 1}) == {"Body": 10, "Mind": 6, "Soul": 1}
+    assert alternate_form_cost(overlay, BASE).stats == 3
+
+def test_form_sheets_are_derived_once():
+    """Test that effective sheets use the rules' derivation and are shared between identical forms."""
+    forms._sheets.clear()
+    armoured = {"stat_deltas": {"Body": 2}, "attributes": [
+        {"name": "Tough", "key": "tough", "level": 2, "stat_mods": {"HP": 10}}]}
+    sheet = form_sheet(armoured, BASE)
+    assert sheet["stats"] == {"Body": 7, "Mind": 6, "Soul": 4}
+    assert sheet["derived"] == calculate_derived_values(dict(armoured, stats=sheet["stats"]))
+    assert form_sheet(dict(armoured), BASE) == sheet and len(forms._sheets) == 1
+    sheet["derived"]["HP"] = 0
+    assert form_sheet(armoured, BASE)["derived"]["HP"] != 0
+
+def test_rollup_sheets_follow_the_base_character():
+    """Test that form sheets are built lazily and rebuilt after a base edit."""
+    character = dict(BASE, stats=dict(BASE["stats"]), alternate_forms=[{"name": "Wolf", "stat_deltas": {"Body": 3}}])
+    tree = RollupTree(character)
+    wolf = character["alternate_forms"][0]
+    assert tree.node(wolf).derived is None
+    assert tree.sheet(wolf)["stats"]["Body"] == 8
+
+    # The sheet follows the parent even before the tree hears of the edit
+    character["stats"]["Body"] = 6
+    sheet = tree.sheet(wolf)
+    assert sheet["stats"]["Body"] == 9 and sheet["derived"] == calculate_derived_values(sheet)
+
+def test_editor_saves_an_overlay(besm_app):
+    """Test that the alternate form editor opens a legacy form and saves only its differences."""
+    from dialogs.alternate_form_editor_dialog import AlternateFormEditorDialog
+    besm_app.character_data["stats"] = {"Body": 5, "Mind": 6, "Soul": 4}
+    dialog = AlternateFormEditorDialog(besm_app, form_data={
+        "id": "wolf", "name": "Wolf", "stats": {"Body": 8, "Mind": 6, "Soul": 4}, "derived": {"HP": 80}})
+    assert dialog.stat_inputs["Body"].value() == 8
+    dialog.stat_inputs["Mind"].setValue(7)
+    data = dialog.get_form_data()
+    assert data["stat_deltas"] == {"Body": 3, "Mind": 1} and "stats" not in data and "derived" not in data
+    assert dialog.derived_labels["Health Points"].text() == str(form_sheet(data, besm_app.character_data)["derived"]["HP"])
+    dialog.close()
+
+def test_form_cards_follow_base_stat_edits(besm_app):
+    """Test that raising a base stat updates the alternate form cards and the form's cost."""
+    from PyQt5.QtWidgets import QLabel
+    from tabs.alternate_forms_tab import sync_alternate_forms_from_attributes
+    besm_app.character_data["attributes"].append({"id": "wolf", "name": "Wolf Form", "base_name": "Alternate Form",
+                                                  "level": 1, "cost": 5, "description": ""})
+    besm_app.update_dynamic_tabs_visibility()
+    besm_app.stat_spinners["Body"].setValue(4)
+    sync_alternate_forms_from_attributes(besm_app)
+    besm_app.character_data["alternate_forms"][0]["stat_deltas"] = {"Body": 2}
+
+    besm_app.update_stat("Body", 8)
+    besm_app.stat_spinners["Body"].setValue(8)
+    texts = [label.text() for label in besm_app.alternate_forms_tab.findChildren(QLabel)]
+    assert "Body 10, Mind 4, Soul 4" in texts[-1]
+    rollup = besm_app.character_rollup()
+    wolf = besm_app.character_data["alternate_forms"][0]
+    assert rollup.sheet(wolf)["derived"]["HP"] == calculate_derived_values(rollup.sheet(wolf))["HP"]
+    assert rollup.node(wolf).cost.stats == 2
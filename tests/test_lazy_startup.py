@@ -0,0 +1,43 @@
+import os
+import sys
+import subprocess
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def test_startup_does_not_import_reportlab():
+    """Test that reportlab and the hidden dynamic tabs are left for later."""
+    script = (
+        "import sys\n"
+        "from PyQt5.QtWidgets import QApplication\n"
+        "app = QApplication([])\n"
+        "from besm_app import BESMCharacterApp\n"
+        "window = BESMCharacterApp()\n"
+        "window.show()\n"
+        "app.processEvents()\n"
+        "print('REPORTLAB', any(name.split('.')[0] == 'reportlab' for name in sys.modules))\n"
+        "print('BUILT', sorted(n for n, info in window.dynamic_tabs.items() if info['tab'] is not None))\n"
+    )
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert "REPORTLAB False" in result.stdout
+    assert "BUILT []" in result.stdout
+
+def test_dynamic_tab_built_on_first_show(besm_app, setup_alternate_form):
+    """Test that adding a matching attribute builds and shows its tab."""
+    assert besm_app.dynamic_tabs["Alternate Form"]["tab"] is None
+
+    besm_app.character_data["attributes"].append(setup_alternate_form)
+    besm_app.update_dynamic_tabs_visibility()
+
+    tab = besm_app.dynamic_tabs["Alternate Form"]["tab"]
+    assert tab is not None
+    assert besm_app.tabs.indexOf(tab) != -1
+
+    # Removing the attribute hides the tab but keeps it for reuse
+    besm_app.character_data["attributes"].clear()
+    besm_app.update_dynamic_tabs_visibility()
+    assert besm_app.tabs.indexOf(tab) == -1
+    assert besm_app.dynamic_tabs["Alternate Form"]["tab"] is tab
@@ -0,0 +1,64 @@
+import io
+import json
+
+import pytest
+
+from tools.besm_cli import main
+from tools.npc import GenerationError, NPCOptions, generate_npc, generate_npcs, iter_npcs
+from tools.rules import benchmark_warnings, calculate_derived_values, load_benchmarks, point_total
+from tools.schema import load_schema, validate
+
+BENCHMARKS = {benchmark["name"]: benchmark for benchmark in load_benchmarks()}
+
+def test_npcs_fill_their_budget_and_fit_their_benchmark():
+    """Test that every NPC spends exactly its budget, fits its benchmark and is a valid character file."""
+    schema = load_schema("character")
+    for data in generate_npcs(150, seed=11):
+        benchmark = BENCHMARKS[data["benchmark"]]
+        low, high = benchmark["point_range"]
+        assert point_total(data) == data["totalPoints"]
+        assert low <= data["totalPoints"] and (high is None or data["totalPoints"] <= high)
+        assert data["derived"] == calculate_derived_values(data)
+        assert benchmark_warnings(data, benchmark, data["derived"]) == []
+        assert validate(data, schema) == []
+
+def test_same_seed_same_npcs():
+    """Test that a seed reproduces the same NPCs, however the work is split."""
+    first = generate_npcs(12, seed=5)
+    assert generate_npcs(12, seed=5) == first
+    assert list(iter_npcs(12, seed=5, jobs=2, chunk_size=5)) == first
+    assert generate_npc(7, seed=5) == first[7]
+    assert generate_npcs(12, seed=6) != first
+    assert len({data["name"] for data in first}) == 12
+
+def test_constraints_and_weights():
+    """Test limiting the benchmarks and templates, and weighting choices out."""
+    options = NPCOptions(benchmarks=("Adventurer", "Heroic"), races=("dwarf",),
+                         weights={"benchmark/Heroic": 0, "defect/nemesis": 0})
+    npcs = generate_npcs(20, seed=1, options=options)
+    assert {data["benchmark"] for data in npcs} == {"Adventurer"}
+    assert {data["race"] for data in npcs} == {"Dwarf"}
+    # Templates bring their own defects; the rolled ones carry the catalog base_name
+    rolled = [defect for data in npcs for defect in data["defects"] if "base_name" in defect]
+    assert rolled and all(defect["key"] != "nemesis" for defect in rolled)
+
+    with pytest.raises(GenerationError, match="unknown benchmark"):
+        generate_npcs(1, options=NPCOptions(benchmarks=("Nope",)))
+    with pytest.raises(GenerationError, match="race template"):
+        generate_npcs(1, options=NPCOptions(races=("nope",)))
+
+def test_generate_command(tmp_path):
+    """Test writing NPC files from the command line, and the JSON lines output."""
+    out = io.StringIO()
+    assert main(["generate", "--count", "3", "--seed", "2", "--benchmark", "Heroic",
+                 "--output-dir", str(tmp_path), "--jobs", "1"], out=out) == 0
+    files = sorted(tmp_path.iterdir())
+    assert len(files) == 3 and "3 NPC(s) written" in out.getvalue()
+    assert all(json.loads(path.read_text())["benchmark"] == "Heroic" for path in files)
+
+    out = io.StringIO()
+    assert main(["generate", "-n", "2", "--seed", "2", "--benchmark", "Heroic", "-j", "1"], out=out) == 0
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [data["name"] for data in lines] == [data["name"] for data in generate_npcs(
+        2, seed=2, options=NPCOptions(benchmarks=("Heroic",)))]
+    assert main(["generate", "--weight", "dwarf", "-j", "1"], out=io.StringIO()) == 1
@@ -0,0 +1,75 @@
+import itertools
+
+import pytest
+
+from tools.optimizer import build_choices, optimize
+from tools.rules import calculate_derived_values, load_benchmarks, point_total
+
+def _benchmark(name):
+    return next(b for b in load_benchmarks() if b["name"] == name)
+
+def _stat_mods(choice):
+    from tools.catalog import get_catalog
+
+    return get_catalog().attributes_by_key[choice.key]["stat_mods"]
+
+def test_front_matches_brute_force():
+    """Test that the optimizer finds every Pareto-optimal build, each at its lowest cost."""
+    benchmark = _benchmark("Sub-Human")
+    budget, targets = 24, ("ACV", "EP")
+    choices = build_choices(benchmark)
+
+    best = {}
+    for levels in itertools.product(*(range(choice.low, choice.high + 1) for choice in choices)):
+        character = {"stats": {}, "attributes": [], "defects": []}
+        for choice, level in zip(choices, levels):
+            if choice.is_stat:
+                character["stats"][choice.name] = level
+            elif level:
+                character["attributes"].append({"key": choice.key, "level": level, "cost": level * choice.cost_per_level,
+                                                "stat_mods": _stat_mods(choice),
+                                                "user_input": {"stat_target": choice.stat_target}})
+        cost = point_total(character)
+        if cost <= budget:
+            derived = calculate_derived_values(character)
+            objectives = tuple(derived[target] for target in targets)
+            best[objectives] = min(cost, best.get(objectives, cost))
+    front = {objectives: cost for objectives, cost in best.items()
+             if not any(other != objectives and all(a >= b for a, b in zip(other, objectives)) for other in best)}
+
+    builds = optimize(budget, benchmark, targets, limit=None)
+    assert {tuple(build.derived[t] for t in targets): build.cp for build in builds} == front
+
+def test_builds_respect_the_benchmark_and_budget():
+    """Test stat and level limits, and that each build's character adds up to what it reports."""
+    benchmark = _benchmark("Adventurer")
+    builds = optimize(40, benchmark, ("HP", "EP"), limit=3)
+    assert len(builds) == 3
+    assert [build.derived["HP"] for build in builds] == sorted((build.derived["HP"] for build in builds), reverse=True)
+    for build in builds:
+        assert max(build.stats.values()) <= benchmark["max_stat"]
+        assert all(level <= benchmark["max_attribute_level"] for _, level in build.attributes)
+        character = build.to_character()
+        assert point_total(character) == build.cp <= 40
+        assert calculate_derived_values(character) == build.derived
+
+    within = optimize(60, benchmark, ("ACV",), within_ranges=True)
+    assert within and all(not build.warnings for build in within)
+
+def test_base_character_is_kept_and_paid_for():
+    """Test that a base character's attributes count toward the budget and the derived values."""
+    base = {"stats": {"Body": 4, "Mind": 4, "Soul": 4}, "defects": [],
+            "attributes": [{"name": "Attack Mastery", "key": "attack_mastery", "level": 2, "cost": 2,
+                            "stat_mods": {"derived": {"ACV": 1}}}]}
+    [build] = optimize(20, "Human", ("ACV",), base=base, limit=1)
+    character = build.to_character(base)
+    assert character["attributes"][0] is base["attributes"][0]
+    assert point_total(character) == build.cp <= 20
+    assert calculate_derived_values(character)["ACV"] == build.derived["ACV"]
+
+def test_bad_arguments():
+    """Test that unknown benchmarks and targets are rejected."""
+    with pytest.raises(ValueError):
+        optimize(20, "Nope", ("ACV",))
+    with pytest.raises(ValueError):
+        optimize(20, "Human", ("Armour Rating",))
@@ -0,0 +1,60 @@
+import json
+
+from benchmarks.synthetic import synthetic_character
+from tools import pdf_export
+from tools.besm_cli import main
+
+def _write_roster(directory, count):
+    paths = []
+    for index in range(count):
+        character = synthetic_character(20 + index * 15, seed=index)
+        character["name"] = f"Hero {index}"
+        path = directory / f"hero_{index}.json"
+        path.write_text(json.dumps(character))
+        paths.append(str(path))
+    return paths
+
+def test_batch_export_one_pdf_per_character(tmp_path):
+    """Test that the pooled batch export writes one PDF per file and reports bad files."""
+    paths = _write_roster(tmp_path, 3)
+    broken = tmp_path / "broken.json"
+    broken.write_text("{not json")
+    paths.append(str(broken))
+
+    results = list(pdf_export.export_characters_to_pdfs(paths, str(tmp_path / "pdfs"), jobs=2))
+    assert [source for source, _, _ in results] == paths
+    for _, output_path, error in results[:3]:
+        assert error is None
+        with open(output_path, "rb") as f:
+            assert f.read(5) == b"%PDF-"
+    assert results[3][1] is None and results[3][2]
+
+def test_campaign_book_contents_match_pages(tmp_path, monkeypatch):
+    """Test that each contents entry points at the page its character starts on."""
+    paths = _write_roster(tmp_path, 4)
+    contents, starts = [], []
+
+    original_toc = pdf_export._toc_story
+    def record_toc(entries, styles, first_page):
+        story = original_toc(entries, styles, first_page)
+        contents[:] = [int(row[3]) for row in story[-1]._cellvalues[1:]]
+        return story
+    monkeypatch.setattr(pdf_export, "_toc_story", record_toc)
+
+    original_draw = pdf_export._BookEntry.draw
+    def record_start(self):
+        starts.append(self.canv.getPageNumber())
+        original_draw(self)
+    monkeypatch.setattr(pdf_export._BookEntry, "draw", record_start)
+
+    output_path, failures = pdf_export.export_campaign_book(iter(paths), str(tmp_path / "book.pdf"), jobs=1)
+    assert failures == []
+    assert len(starts) == 4
+    assert contents == starts
+
+def test_cli_export_book(tmp_path, capsys):
+    """Test the besm export subcommand in campaign book mode."""
+    _write_roster(tmp_path, 2)
+    book = tmp_path / "book.pdf"
+    assert main(["export", str(tmp_path), "--book", str(book), "-j", "1"]) == 0
+    assert book.read_bytes().startswith(b"%PDF-")
@@ -0,0 +1,88 @@
+import json
+import os
+
+from PyQt5.QtCore import Qt
+
+from benchmarks.synthetic import synthetic_character
+from tools.pdf_export import prepare_export_data
+from tools.pdf_export_thread import BatchPdfExportThread, PdfExportThread
+
+def _write_roster(directory, count):
+    paths = []
+    for index in range(count):
+        path = directory / f"hero_{index}.json"
+        path.write_text(json.dumps(synthetic_character(20, seed=index)))
+        paths.append(str(path))
+    return paths
+
+def test_export_runs_off_thread_with_progress(besm_app, qtbot, tmp_path, monkeypatch):
+    """Test that the GUI export reports progress and finishes from a snapshot."""
+    shown = []
+    monkeypatch.setattr("common_ui.QMessageBox.information", lambda *args: shown.append(args[2]))
+    besm_app.character_data = synthetic_character(100)
+    path = str(tmp_path / "sheet.pdf")
+
+    besm_app.start_pdf_export(prepare_export_data(besm_app.character_data), path)
+    thread = besm_app.pdf_export_thread
+    progress = []
+    thread.progress.connect(lambda done, total: progress.append((done, total)))
+    # Editing the live character while exporting does not touch the snapshot
+    besm_app.character_data["attributes"].clear()
+
+    # The app drops (and deletes) the thread once it has finished
+    qtbot.waitUntil(lambda: besm_app.pdf_export_thread is None, timeout=30000)
+    assert os.path.exists(path)
+    assert progress and progress[-1][0] <= progress[-1][1]
+    assert shown and path in shown[-1]
+
+def test_cancel_stops_export_and_removes_file(qtbot, tmp_path):
+    """Test that cancelling stops the build and leaves no partial PDF."""
+    path = str(tmp_path / "cancelled.pdf")
+    thread = PdfExportThread(prepare_export_data(synthetic_character(1000)), path)
+    thread.progress.connect(lambda done, total: thread.cancel())
+
+    with qtbot.waitSignal(thread.cancelled, timeout=30000):
+        thread.start()
+    thread.wait()
+    assert not os.path.exists(path)
+
+def test_campaign_book_runs_off_thread_with_progress(besm_app, qtbot, tmp_path, monkeypatch):
+    """Test that the GUI builds a campaign book on a worker thread and reports every step."""
+    shown = []
+    monkeypatch.setattr("common_ui.QMessageBox.information", lambda *args: shown.append(args[2]))
+    paths = _write_roster(tmp_path, 3)
+    path = str(tmp_path / "book.pdf")
+
+    besm_app.start_batch_pdf_export(paths, path, book=True)
+    progress = []
+    besm_app.pdf_export_thread.progress.connect(lambda done, total: progress.append((done, total)))
+
+    qtbot.waitUntil(lambda: besm_app.pdf_export_thread is None, timeout=60000)
+    assert os.path.exists(path)
+    assert progress[-1] == (6, 6)
+    assert shown and path in shown[-1]
+
+def test_cancel_discards_campaign_book(qtbot, tmp_path):
+    """Test that cancelling a campaign book stops it and leaves no partial PDF."""
+    path = str(tmp_path / "book.pdf")
+    thread = BatchPdfExportThread(_write_roster(tmp_path, 3), path, book=True)
+    # Cancel once the first sheet is being written
+    thread.progress.connect(lambda done, total: done > 3 and thread.cancel(), Qt.DirectConnection)
+
+    with qtbot.waitSignal(thread.cancelled, timeout=60000):
+        thread.start()
+    thread.wait()
+    assert not os.path.exists(path)
+
+def test_cancel_keeps_pdfs_already_written(qtbot, tmp_path):
+    """Test that cancelling separate PDFs stops after the current file and reports what was written."""
+    output_dir = tmp_path / "pdfs"
+    thread = BatchPdfExportThread(_write_roster(tmp_path, 4), str(output_dir))
+    # Cancel from the worker itself, so it is set before the next file is read
+    thread.progress.connect(lambda done, total: thread.cancel(), Qt.DirectConnection)
+
+    with qtbot.waitSignal(thread.succeeded, timeout=60000) as blocker:
+        thread.start()
+    thread.wait()
+    output, exported, failures = blocker.args
+    assert (output, exported, failures) == (str(output_dir), 1, [])
@@ -0,0 +1,41 @@
+import copy
+import io
+
+import pytest
+
+from benchmarks.synthetic import synthetic_character
+from tools.pdf_export import PdfRenderer, SECTIONS, _new_document, build_character_story, prepare_export_data
+
+def _render(character, renderer):
+    output = io.BytesIO()
+    _new_document(output, invariant=1).build(build_character_story(character, renderer))
+    return output.getvalue()
+
+@pytest.mark.parametrize("size", [20, 200])
+def test_cached_sections_render_identically(size):
+    """Test that a sheet built from cached sections matches a fresh build byte for byte."""
+    character = synthetic_character(size)
+    character["companions"] = [{"name": "Pet", "level": 2, "cost": 4, "stats": {"Body": 3, "Mind": 2, "Soul": 2}}]
+    character = prepare_export_data(character)
+    renderer = PdfRenderer()
+
+    first = _render(character, renderer)
+    assert renderer.cache_hits == 0
+    # Headers pushed to the next page pick up layout state; the cache must not keep it
+    second = _render(character, renderer)
+    assert renderer.cache_hits == len(SECTIONS)
+    assert first == second == _render(character, PdfRenderer())
+
+def test_only_changed_sections_rebuild():
+    """Test that editing a defect rebuilds just the defect list and CP breakdown."""
+    character = synthetic_character(50)
+    renderer = PdfRenderer()
+    build_character_story(prepare_export_data(character), renderer)
+
+    edited = copy.deepcopy(character)
+    edited["defects"][0]["rank"] += 1
+    edited = prepare_export_data(edited)
+    misses = renderer.cache_misses
+    build_character_story(edited, renderer)
+    assert renderer.cache_misses - misses == 2
+    assert _render(edited, renderer) == _render(edited, PdfRenderer())
@@ -0,0 +1,48 @@
+import json
+
+from tools.perf_monitor import PerfMonitor, monitor, timed
+
+def test_disabled_monitor_records_nothing():
+    """Test that timed functions and spans are no-ops while disabled."""
+    @timed("noop")
+    def noop(value):
+        return value * 2
+
+    monitor.reset()
+    assert noop(2) == 4
+    with monitor.span("block"):
+        pass
+    assert monitor.snapshot() == {}
+
+def test_count_total_and_p95():
+    """Test that the collected stats add up."""
+    perf = PerfMonitor()
+    for ms in range(1, 101):
+        perf.record("action", ms / 1000)
+    stats = perf.snapshot()["action"]
+    assert stats["count"] == 100
+    assert stats["total_ms"] == 5050.0
+    assert stats["p95_ms"] == 96.0
+    assert stats["max_ms"] == 100.0
+
+def test_overlay_collects_hot_paths(besm_app, qtbot, tmp_path):
+    """Test that opening the overlay turns timing on for the main actions and dumps JSON."""
+    monitor.reset()
+    besm_app.update_point_total()
+    assert "update_point_total" not in monitor.snapshot()
+
+    besm_app.show_performance_overlay()
+    besm_app.starting_cp_input.setValue(besm_app.starting_cp_input.value() + 1)
+    besm_app.update_derived_values()
+    besm_app.performance_overlay.refresh()
+    actions = monitor.snapshot()
+    assert actions["update_point_total"]["count"] >= 1
+    assert "update_derived_values" in actions
+    assert besm_app.performance_overlay.table.rowCount() == len(actions)
+
+    path = tmp_path / "perf.json"
+    monitor.dump(str(path))
+    assert json.loads(path.read_text())["actions"]["update_point_total"]["count"] >= 1
+
+    besm_app.performance_overlay.close()
+    assert monitor.enabled is False
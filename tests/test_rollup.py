@@ -0,0 +1,149 @@
+from tools.rollup import (RollupTree, alternate_form_cost, companion_cost, item_cost, item_price, metamorphosis_cost,
+                          minion_cost, reconcile_children, updated)
+from tools.rules import calculate_derived_values, point_total
+
+def _entry(name, body=4, mind=4, soul=4, attrs=(), defects=(), **extra):
+    return dict({"name": name, "stats": {"Body": body, "Mind": mind, "Soul": soul},
+                 "attributes": [{"name": f"A{cost}", "cost": cost} for cost in attrs],
+                 "defects": [{"name": f"D{cost}", "cost": cost, "value": cost} for cost in defects]}, **extra)
+
+def _character():
+    return _entry("Patron", 6, 5, 4, attrs=(3,), defects=(1,),
+                  companions=[_entry("Hound", 3, 2, 2, attrs=(2,), defects=(1,), cp_budget=10)],
+                  minions=[_entry("Thug", 2, 2, 2, attrs=(1,), defects=(1,), cp=15)],
+                  items=[{"name": "Sword", "attributes": [{"cost": 5}], "defects": [{"cost": 2}]}],
+                  alternate_forms=[_entry("Wolf", 10, 4, 4, attrs=(2,), cp_budget=5)],
+                  metamorphosis=[{"name": "Curse", "attributes": [{"cost": 4}], "defects": [{"value": 1}], "cp": 5}])
+
+def test_cost_rules():
+    """Test each kind's cost rule against the arithmetic its editor dialog shows."""
+    companion = companion_cost(_entry("Hound", 3, 2, 2, attrs=(2,), defects=(1,), cp_budget=10))
+    assert (companion.stats, companion.spent, companion.remaining) == (7, 8, 2)
+    minion = minion_cost(_entry("Thug", 2, 2, 2, attrs=(1,), defects=(1,), cp=12))
+    assert (minion.spent, minion.over_budget) == (14, True)
+    form = alternate_form_cost(_entry("Wolf", 8, 4, 3, attrs=(2,), defects=(1,), cp_budget=5), {"stats": {"Body": 6, "Mind": 5, "Soul": 4}})
+    assert (form.stats, form.spent) == (2, 3)
+    assert alternate_form_cost(_entry("Wolf", 6, 4, 4), None).stats == 2
+    item = item_cost({"attributes": [{"cost": 1}], "defects": [{"cost": 4}]})
+    assert item.spent == 0 and item_price(7) == 3
+    assert metamorphosis_cost({"attributes": [{"cost": 4}], "defects": [{"value": 1}]}).spent == 3
+
+def test_tree_totals_match_a_rebuild():
+    """Test that edits, replacements and list changes keep every cached total equal to a fresh tree."""
+    character = _character()
+    tree = RollupTree(character)
+    assert tree.root.cost.spent == point_total(character)
+    assert tree.root.subtree_spent == point_total(character) + 8 + 14 + 3 + 6 + 3
+    assert [node.cost.spent for node in tree.over_budget()] == [6]  # the wolf: 4 stat points above the character + 2
+    hound = character["companions"][0]
+    assert tree.node(hound).derived == calculate_derived_values(hound)
+
+    def check():
+        fresh = RollupTree(character)
+        assert [(n.kind, n.cost, n.subtree_spent, n.subtree_over) for n in tree.walk()] == \
+               [(n.kind, n.cost, n.subtree_spent, n.subtree_over) for n in fresh.walk()]
+
+    hound["attributes"].append({"name": "Armour", "cost": 4})
+    tree.changed(hound)
+    check()
+    # Raising the character's stats makes the alternate form cheaper
+    character["stats"]["Body"] = 9
+    tree.changed(character)
+    check()
+    assert [node.data["name"] for node in tree.over_budget()] == ["Hound"]  # the armour, not the wolf
+
+    new_thug = _entry("Thug", 3, 3, 3, cp=15)
+    tree.replace(character["minions"][0], new_thug)
+    character["minions"][0] = new_thug
+    check()
+
+    kept = tree.node(hound)
+    character["items"].append({"name": "Shield", "attributes": [{"cost": 2}], "defects": []})
+    del character["metamorphosis"][0]
+    tree.sync()
+    check()
+    assert tree.node(hound) is kept
+
+def test_app_rollup_follows_the_character(besm_app):
+    """Test that the window keeps one rollup tree per character_data and rebuilds it on load."""
+    tree = besm_app.character_rollup()
+    assert besm_app.character_rollup() is tree
+    besm_app.character_data = _character()
+    assert besm_app.character_rollup().root.data is besm_app.character_data
+
+def test_reconcile_children_keeps_untouched_entries():
+    """Test that reconciling only adds, re-levels or drops the entries whose owner changed."""
+    def levelled(attr, current):
+        if not current:
+            return [{"name": attr["name"], "level": attr["level"], "parent_attribute_id": attr["id"], "attributes": []}]
+        return [updated(current[0], level=attr["level"])]
+
+    owners = [{"id": "a", "name": "A", "level": 1}, {"id": "b", "name": "B", "level": 2}]
+    entries = []
+    assert reconcile_children(entries, owners, levelled)
+    first, second = entries
+    first["attributes"].append({"name": "Armour"})
+    assert not reconcile_children(entries, owners, levelled)
+    assert entries[0] is first and entries[1] is second
+
+    owners[0]["level"] = 3
+    owners.pop(1)
+    owners.append({"name": "C", "level": 1})
+    assert reconcile_children(entries, owners, levelled)
+    assert entries[0] is not first and entries[0]["level"] == 3 and entries[0]["attributes"] is first["attributes"]
+    assert [entry["name"] for entry in entries] == ["A", "C"] and owners[1]["id"]
+
+    # An entry saved without its owner's id is adopted rather than replaced
+    legacy = [{"name": "Old", "level": 1}]
+    assert reconcile_children(legacy, [{"id": "x", "level": 1}], lambda attr, current: [updated(current[0], parent_attribute_id="x")])
+    assert legacy[0]["name"] == "Old" and legacy[0]["parent_attribute_id"] == "x"
+
+def test_companion_builds_survive_attribute_edits(besm_app, monkeypatch):
+    """Test that syncing keeps companion ids and builds, and skips the cards when nothing changed."""
+    from tabs import companions_tab
+    attr = {"id": "companion-attr", "name": "Companion", "base_name": "Companion", "level": 1, "cost": 2}
+    besm_app.character_data["attributes"].append(attr)
+    companions_tab.sync_companions_from_attributes(besm_app)
+    companion = besm_app.character_data["companions"][0]
+    companion["attributes"].append({"name": "Flight", "cost": 3})
+
+    renders = []
+    monkeypatch.setattr(companions_tab, "populate_companions_ui", lambda app: renders.append(app))
+    besm_app.companions_rendered = besm_app.character_data["companions"]
+    companions_tab.sync_companions_from_attributes(besm_app)
+    assert besm_app.character_data["companions"][0] is companion and renders == []
+
+    attr["level"] = 2
+    companions_tab.sync_companions_from_attributes(besm_app)
+    relevelled = besm_app.character_data["companions"][0]
+    assert (relevelled["id"], relevelled["name"], relevelled["cp_budget"]) == (companion["id"], "Companion (2 CP)", 20)
+    assert relevelled["attributes"] == [{"name": "Flight", "cost": 3}] and len(renders) == 1
+
+def test_point_total_updates_the_rollup(besm_app):
+    """Test that stat edits reach the rollup tree and over-budget entries show in the unspent CP tooltip."""
+    besm_app.character_data["companions"].append(_entry("Hound", 6, 6, 6, cp_budget=10))
+    besm_app.stat_spinners["Body"].setValue(besm_app.stat_spinners["Body"].value() + 2)
+    besm_app.update_point_total()
+    rollup = besm_app.character_rollup()
+    assert rollup.root.cost.spent == point_total(besm_app.character_data) == besm_app.character_data["totalPoints"]
+    assert rollup.root.subtree_over == 1
+    assert "Over their CP budget: Hound" in besm_app.unspent_cp_display.toolTip()
+
+def test_minions_ignore_unrelated_cp_changes(besm_app):
+    """Test that minion entries only take a new budget when their attribute is re-levelled."""
+    from tabs.minions_tab import sync_minions_from_attributes
+    attr = {"id": "minions-attr", "name": "Minions", "base_name": "Minions", "level": 1, "cost": 1}
+    besm_app.character_data["attributes"].append(attr)
+    besm_app.character_data["totalPoints"] = 50
+    sync_minions_from_attributes(besm_app)
+    minion = besm_app.character_data["minions"][0]
+    assert minion["cp"] == 10
+
+    besm_app.character_data["totalPoints"] = 80
+    sync_minions_from_attributes(besm_app)
+    assert besm_app.character_data["minions"][0] is minion
+
+    attr["level"] = 2
+    sync_minions_from_attributes(besm_app)
+    relevelled = besm_app.character_data["minions"][0]
+    assert (relevelled["id"], relevelled["cp"], relevelled["count"]) == (minion["id"], 16, 10)
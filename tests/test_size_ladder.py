@@ -0,0 +1,52 @@
+import pytest
+
+from tools.size_ladder import SizeModifier, get_size_ladder, parse_modifier
+
+@pytest.mark.parametrize("text, op, value, unit", [
+    ("x 25", "mul", 25, ""),
+    ("x 2.5 k", "mul", 2500, ""),
+    ("÷ 1,000", "div", 1000, ""),
+    ("÷ 5 M", "div", 5_000_000, ""),
+    ("+20", "add", 20, ""),
+    ("-12", "add", -12, ""),
+    ("+20 AR", "add", 20, "AR"),
+    ("+30 damage", "add", 30, "damage"),
+    ("—", None, 0, ""),
+])
+def test_parse_modifier(text, op, value, unit):
+    """Test that size display strings parse into numeric operators."""
+    modifier = parse_modifier(text)
+    assert (modifier.op, modifier.value, modifier.unit, modifier.text) == (op, value, unit, text)
+
+def test_modifier_apply_and_errors():
+    """Test applying parsed modifiers and rejecting unknown text."""
+    assert parse_modifier("x 5").apply(10) == 50
+    assert parse_modifier("÷ 4").apply(10) == 2.5
+    assert parse_modifier("-10").apply(10) == 0
+    assert SizeModifier(None, 0, "", "—").apply(10) == 10
+    with pytest.raises(ValueError):
+        parse_modifier("about twice")
+
+def test_ladder_indexes_sizes_by_rank_key_and_name():
+    """Test that the ladder covers both file layouts and resolves grants."""
+    ladder = get_size_ladder()
+    assert ladder.at_rank(0).key == "medium" and ladder.at_rank(-10).name == "Point"
+    assert ladder.at_rank(3) is ladder.find(name="MAMMOTH") is ladder.find(key="mammoth")
+    assert ladder.at_rank(99) is None
+    assert [size.rank for size in ladder] == sorted(size.rank for size in ladder)
+
+    huge = ladder.find(key="huge")
+    assert huge.modifiers["liftingCapacity"].apply(1) == 25
+    assert all(grant.record is not None for grant in huge.attributes + huge.defects)
+    assert huge.attributes[0].record["key"] == huge.attributes[0].key
+
+def test_apply_size_uses_the_ladder(besm_app):
+    """Test that a race's size info applies the matching size template."""
+    from templates.template_manager import apply_size_from_template
+
+    changes = {"id": "test", "name": "Test Race", "changes": []}
+    apply_size_from_template(besm_app, {"key": "large"}, changes)
+
+    assert changes["changes"][-1]["field"] == "size_template_applied"
+    superstrength = [a for a in besm_app.character_data["attributes"] if a.get("key") == "superstrength"]
+    assert superstrength and superstrength[0]["level"] == get_size_ladder().find(key="large").attributes[0].level
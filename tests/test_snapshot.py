@@ -0,0 +1,77 @@
+import copy
+import json
+
+import pytest
+
+from benchmarks.synthetic import synthetic_character
+from tools.catalog import get_catalog
+from tools.pdf_export import prepare_export_data
+from tools.snapshot import FrozenDict, FrozenList, freeze, thaw
+
+def test_freeze_is_read_only_and_json_compatible():
+    """Test that a frozen character reads like the original but cannot be changed."""
+    character = synthetic_character(20)
+    snapshot = freeze(character)
+
+    assert isinstance(snapshot, dict) and isinstance(snapshot["attributes"], list)
+    assert json.dumps(snapshot, sort_keys=True) == json.dumps(character, sort_keys=True)
+    with pytest.raises(TypeError):
+        snapshot["name"] = "Changed"
+    with pytest.raises(TypeError):
+        snapshot["attributes"].append({})
+    with pytest.raises(TypeError):
+        snapshot["stats"].update(Body=12)
+    assert copy.deepcopy(snapshot) is snapshot
+
+    thawed = thaw(snapshot)
+    thawed["attributes"][0]["level"] += 1
+    assert type(thawed) is dict and snapshot == character
+
+def test_freeze_shares_unchanged_subtrees_with_base():
+    """Test that a second snapshot only rebuilds the path to the edited value."""
+    character = synthetic_character(50)
+    first = freeze(character)
+    assert freeze(character, first) is first
+
+    character["defects"][3]["rank"] += 1
+    second = freeze(character, first)
+    assert second is not first and second["defects"] is not first["defects"]
+    assert second["defects"][3] is not first["defects"][3]
+    assert second["defects"][4] is first["defects"][4]
+    assert second["attributes"] is first["attributes"]
+    assert second["stats"] is first["stats"]
+
+def test_prepare_export_data_shares_a_frozen_snapshot():
+    """Test that export data fills missing fields without copying the rest."""
+    snapshot = freeze({"name": "Bare", "attributes": [{"name": "Flight", "cost": 4}]})
+    export_data = prepare_export_data(snapshot)
+
+    assert isinstance(export_data, FrozenDict)
+    assert export_data["stats"] == {"Body": 1, "Mind": 1, "Soul": 1}
+    assert export_data["defects"] == [] and export_data["skills"] == []
+    assert export_data["attributes"] is snapshot["attributes"]
+    assert prepare_export_data(export_data) is export_data
+
+def test_template_apply_shares_catalog_records(besm_app):
+    """Test that applied template attributes share frozen catalog values and undo data."""
+    from templates.template_manager import apply_template_to_character
+
+    template = {"key": "test_race", "race_name": "Test Race",
+                "attributes": [{"key": "absorption", "name": "Absorption", "level": 2}]}
+    catalog_record = get_catalog().attributes_by_key["absorption"]
+    before = copy.deepcopy(catalog_record)
+    assert apply_template_to_character(besm_app, template, "race")
+
+    attr = next(a for a in besm_app.character_data["attributes"] if a["key"] == "absorption")
+    assert attr["level"] == 2 and attr["cost"] == 2 * catalog_record["cost_per_level"]
+    assert isinstance(attr["levels"], FrozenDict)
+    assert attr["levels"] is get_catalog().frozen(catalog_record)["levels"]
+    assert catalog_record == before
+
+    change = besm_app.character_data["applied_templates"][-1]["changes"][-1]
+    assert isinstance(change["attribute_data"], FrozenDict)
+    assert change["attribute_data"]["levels"] is attr["levels"]
+    # Later edits to the live attribute do not leak into the undo record
+    attr["sources"].append("manual")
+    assert change["attribute_data"]["sources"] == attr["sources"][:1]
+    assert isinstance(change["attribute_data"]["sources"], FrozenList)
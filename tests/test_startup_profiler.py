@@ -0,0 +1,47 @@
+import sys
+import json
+import pytest
+from tools.startup_profiler import StartupProfiler, compare_reports, main
+
+def test_disabled_profiler_records_nothing():
+    """Test that laps are ignored unless profiling was requested."""
+    profiler = StartupProfiler()
+    assert profiler.start_from_argv(["besm_app.py"]) is False
+    profiler.lap("imports")
+    assert profiler.phases == []
+
+def test_profiler_times_phases_and_imports(tmp_path):
+    """Test that phases and first-time imports end up in the report."""
+    sys.modules.pop("tabnanny", None)
+    report_path = tmp_path / "profile.json"
+    profiler = StartupProfiler()
+    assert profiler.start_from_argv(["besm_app.py", f"--profile-startup={report_path}"])
+    try:
+        import tabnanny  # noqa: F401
+        profiler.lap("imports")
+        profiler.lap("tabs")
+    finally:
+        data = profiler.write_report()
+
+    assert [phase["name"] for phase in data["phases"]] == ["imports", "tabs"]
+    assert "tabnanny" in [entry["module"] for entry in data["imports"]]
+    assert json.loads(report_path.read_text())["total_ms"] == data["total_ms"]
+    # The import hook is removed again
+    import builtins
+    assert builtins.__import__ is not profiler._timed_import
+
+def test_compare_reports(tmp_path, capsys):
+    """Test comparing two reports and failing on a regression."""
+    base = {"total_ms": 100.0, "phases": [{"name": "imports", "ms": 100.0}],
+            "imports": [{"module": "reportlab", "inclusive_ms": 80.0, "self_ms": 80.0}]}
+    new = {"total_ms": 150.0, "phases": [{"name": "imports", "ms": 150.0}],
+           "imports": [{"module": "reportlab", "inclusive_ms": 130.0, "self_ms": 130.0}]}
+    lines = compare_reports(base, new)
+    assert any(line.startswith("imports") and "+50.0" in line for line in lines)
+    assert any(line.startswith("reportlab") for line in lines)
+
+    base_path, new_path = tmp_path / "base.json", tmp_path / "new.json"
+    base_path.write_text(json.dumps(base))
+    new_path.write_text(json.dumps(new))
+    assert main(["compare", str(base_path), str(new_path), "--fail-over", "10"]) == 1
+    assert main(["compare", str(base_path), str(new_path), "--fail-over", "60"]) == 0
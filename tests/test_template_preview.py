@@ -0,0 +1,60 @@
+import json
+import os
+
+import pytest
+
+from templates.template_effects import dry_run, impact_cache, lookups_for, template_impact
+from tools.rules import calculate_derived_values, point_total
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "templates")
+
+def _load(kind, name):
+    with open(os.path.join(TEMPLATE_PATH, kind, f"{name}.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+@pytest.mark.parametrize("kind, name, template_type", [
+    ("races", "dwarf", "race"),
+    ("races", "android_battle_maid", "race"),
+    ("sizes", "huge", "size"),
+    ("sizes", "tiny", "size"),
+])
+def test_preview_matches_applying(besm_app, kind, name, template_type):
+    """Test that a template's previewed impact is what applying it does."""
+    from templates.template_manager import apply_template_to_character
+
+    template = _load(kind, name)
+    before = besm_app.snapshot_character()
+    impact = template_impact(before, template, template_type, lookups=lookups_for(besm_app))
+    projected = dry_run(before, template, template_type, lookups_for(besm_app))
+
+    assert apply_template_to_character(besm_app, template, template_type)
+    after = besm_app.snapshot_character()
+    assert before["attributes"] == [] and before is not after
+    assert point_total(after) - point_total(before) == impact.cp_delta
+    assert projected["stats"] == after["stats"]
+    assert calculate_derived_values(projected) == calculate_derived_values(after)
+    assert sorted(a["name"] for a in projected["attributes"]) == sorted(a["name"] for a in after["attributes"])
+
+def test_dialog_fills_in_previews(besm_app, qtbot):
+    """Test that the template list shows each entry's CP change without applying anything."""
+    from templates.template_manager import TemplateDialog
+
+    impact_cache.entries.clear()
+    dialog = TemplateDialog(besm_app, "size")
+    qtbot.addWidget(dialog)
+    items = [item for items in dialog.preview_items.values() for item in items]
+    assert items and besm_app.character_data["attributes"] == []
+
+    qtbot.waitUntil(lambda: all(" CP" in item.text() for item in items), timeout=10000)
+    huge = dialog.preview_items["huge"][0]
+    expected = template_impact(besm_app.snapshot_character(), _load("sizes", "huge"), "size", lookups=lookups_for(besm_app))
+    assert huge.text().endswith("    " + expected.summary()) and "CP:" in huge.toolTip()
+
+    # Reopening on the unchanged character is served from the cache
+    hits = impact_cache.hits
+    second = TemplateDialog(besm_app, "size")
+    qtbot.addWidget(second)
+    assert impact_cache.hits - hits == len(second.templates["templates"])
+    assert second.preview_items["huge"][0].text() == huge.text()
+    dialog.reject()
+    second.reject()
@@ -0,0 +1,50 @@
+"""
+Batch helpers shared by the command line and the batch PDF export
+
+Character files are discovered lazily and fed to a process pool a few at a
+time, so memory stays flat no matter how many files a directory holds.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+
+def iter_character_files(paths):
+    """Yield character file paths, walking directories for *.json in sorted order"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(".json"):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def iter_results(func, paths, jobs):
+    """Run func over paths, yielding results in input order
+
+    At most a few files per worker are in flight, so huge directories are
+    streamed instead of being queued up front. Closing the generator early
+    (to cancel a batch) drops the queued files and only waits for the ones
+    already running.
+    """
+    if jobs <= 1:
+        for path in paths:
+            yield func(path)
+        return
+
+    window = deque()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        try:
+            for path in paths:
+                window.append(pool.submit(func, path))
+                if len(window) >= jobs * 4:
+                    yield window.popleft().result()
+            while window:
+                yield window.popleft().result()
+        finally:
+            for future in window:
+                future.cancel()
@@ -0,0 +1,491 @@
+"""
+Headless command line for BESM character files
+
+    python besm.py derive characters/aria.json
+    python besm.py validate characters/ --benchmark Adventurer
+    python besm.py summarize characters/ --format csv --output party.csv
+    python besm.py export characters/ --book campaign.pdf
+    python besm.py explore --benchmark Adventurer --max-cp 60 --sort DCV
+    python besm.py optimize --starting 50 --earned 10 --benchmark Adventurer --target ACV --target HP
+    python besm.py simulate characters/aria.json characters/rival.json --trials 100000 --seed 7
+    python besm.py encounter --party characters/party/ --group characters/warlord.json --minions high
+    python besm.py generate --count 500 --benchmark Adventurer --seed 7 --output-dir npcs/
+
+Directories are walked for *.json files and streamed through a process pool
+(--jobs, default one worker per CPU). Nothing here imports PyQt5.
+"""
+
+import os
+import sys
+import csv
+import json
+import argparse
+from functools import partial
+
+from tools.rules import (
+    STATS, DERIVED_KEYS, calculate_derived_values, point_total,
+    load_benchmarks, suggest_benchmark, benchmark_warnings
+)
+from tools.schema import load_schema, validate
+from tools.batch import iter_character_files, iter_results
+
+SUMMARY_FIELDS = ["file", "name", "race", "class", "cp", "benchmark"] + list(DERIVED_KEYS)
+
+
+def _find_benchmark(benchmarks, name):
+    for benchmark in benchmarks:
+        if benchmark["name"].lower() == str(name).lower():
+            return benchmark
+    return None
+
+
+def analyze_character(path, benchmark_name=None, check=False):
+    """Load one character file and compute its numbers
+
+    Returns a plain dict (safe to send back from a worker process) with the
+    stats, derived values, CP total, the benchmark used, and any errors and
+    warnings. ``check`` adds the schema and catalog checks used by validate.
+    """
+    result = {"file": path, "errors": [], "warnings": []}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        result["errors"].append(f"cannot read file: {e}")
+        return result
+
+    if check:
+        result["errors"].extend(validate(data, load_schema("character")))
+
+    if not isinstance(data, dict) or not isinstance(data.get("stats"), dict) \
+            or any(stat not in data["stats"] for stat in STATS):
+        if not result["errors"]:
+            result["errors"].append("not a character file (no Body/Mind/Soul stats)")
+        return result
+
+    try:
+        derived = calculate_derived_values(data)
+        total = point_total(data)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        result["errors"].append(f"cannot compute derived values: {e!r}")
+        return result
+
+    benchmarks = _benchmarks()
+    if benchmark_name:
+        benchmark = _find_benchmark(benchmarks, benchmark_name)
+        if benchmark is None:
+            result["errors"].append(f"unknown benchmark '{benchmark_name}'")
+    elif data.get("benchmark"):
+        benchmark = _find_benchmark(benchmarks, data["benchmark"])
+    else:
+        benchmark = suggest_benchmark(total, benchmarks)
+
+    result.update({
+        "name": data.get("name", ""),
+        "race": data.get("race", ""),
+        "class": data.get("class", ""),
+        "stats": {stat: data["stats"][stat] for stat in STATS},
+        "derived": derived,
+        "cp": total,
+        "benchmark": benchmark["name"] if benchmark else None,
+    })
+
+    if check:
+        result["warnings"].extend(benchmark_warnings(data, benchmark, derived))
+        stored = data.get("totalPoints")
+        if isinstance(stored, (int, float)) and stored != total:
+            result["warnings"].append(f"saved totalPoints {stored} differs from computed {total}")
+        result["warnings"].extend(_unknown_catalog_entries(data))
+    return result
+
+
+_BENCHMARKS = None
+
+
+def _benchmarks():
+    # Loaded once per worker process
+    global _BENCHMARKS
+    if _BENCHMARKS is None:
+        _BENCHMARKS = load_benchmarks()
+    return _BENCHMARKS
+
+
+def _unknown_catalog_entries(data):
+    from tools.catalog import get_catalog
+
+    catalog = get_catalog()
+    warnings = []
+    for key, known in (("attributes", catalog.attributes), ("defects", catalog.defects)):
+        for entry in data.get(key, []):
+            base_name = entry.get("base_name") if isinstance(entry, dict) else None
+            if base_name and base_name not in known:
+                warnings.append(f"{key[:-1]} '{base_name}' is not in the catalog")
+    return warnings
+
+
+def _print_problems(result, out):
+    for error in result["errors"]:
+        print(f"    error: {error}", file=out)
+    for warning in result["warnings"]:
+        print(f"    warning: {warning}", file=out)
+
+
+def cmd_derive(args, out):
+    failed = 0
+    func = partial(analyze_character, benchmark_name=args.benchmark)
+    for result in iter_results(func, iter_character_files(args.paths), args.jobs):
+        if result["errors"]:
+            failed += 1
+            print(f"{result['file']}: could not derive", file=sys.stderr)
+            _print_problems(result, sys.stderr)
+            continue
+        if args.format == "json":
+            print(json.dumps({key: result[key] for key in ("file", "name", "cp", "benchmark", "stats", "derived")}), file=out)
+            continue
+        print(f"{result['file']}: {result['name'] or 'Unnamed'} - {result['cp']} CP ({result['benchmark'] or 'no benchmark'})", file=out)
+        print("    " + "  ".join(f"{stat} {value}" for stat, value in result["stats"].items()), file=out)
+        print("    " + "  ".join(f"{key} {result['derived'][key]}" for key in DERIVED_KEYS), file=out)
+    return 1 if failed else 0
+
+
+def cmd_validate(args, out):
+    checked = failed = 0
+    func = partial(analyze_character, benchmark_name=args.benchmark, check=True)
+    for result in iter_results(func, iter_character_files(args.paths), args.jobs):
+        checked += 1
+        bad = result["errors"] or (args.strict and result["warnings"])
+        failed += 1 if bad else 0
+        if bad or result["warnings"]:
+            print(f"{'FAIL' if bad else 'WARN'} {result['file']}", file=out)
+            _print_problems(result, out)
+        elif not args.quiet:
+            print(f"OK   {result['file']}", file=out)
+    print(f"{checked} file(s) checked, {failed} failed", file=out)
+    return 1 if failed else 0
+
+
+def cmd_summarize(args, out):
+    if args.output:
+        out = open(args.output, "w", newline="", encoding="utf-8")
+    skipped = 0
+    try:
+        writer = None
+        if args.format == "csv":
+            writer = csv.DictWriter(out, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+        else:
+            out.write("[")
+        first = True
+        for result in iter_results(analyze_character, iter_character_files(args.paths), args.jobs):
+            if result["errors"]:
+                skipped += 1
+                print(f"skipping {result['file']}: {result['errors'][0]}", file=sys.stderr)
+                continue
+            row = {field: result.get(field) for field in SUMMARY_FIELDS[:6]}
+            row.update(result["derived"])
+            if writer:
+                writer.writerow(row)
+            else:
+                out.write(("\n  " if first else ",\n  ") + json.dumps(row))
+                first = False
+        if not writer:
+            out.write("\n]\n")
+    finally:
+        if args.output:
+            out.close()
+    return 1 if skipped else 0
+
+
+def cmd_export(args, out):
+    # reportlab is only needed here, keep the other subcommands light
+    from tools.pdf_export import export_characters_to_pdfs, export_campaign_book
+
+    paths = iter_character_files(args.paths)
+    if args.book:
+        output_path, failures = export_campaign_book(paths, args.book, args.jobs)
+        for path, error in failures:
+            print(f"skipping {path}: {error}", file=sys.stderr)
+        print(f"Campaign book written to {output_path}", file=out)
+        return 1 if failures else 0
+
+    exported = failed = 0
+    for source, output_path, error in export_characters_to_pdfs(paths, args.output_dir, args.jobs):
+        if error:
+            failed += 1
+            print(f"{source}: export failed: {error}", file=sys.stderr)
+        else:
+            exported += 1
+            print(f"{source} -> {output_path}", file=out)
+    print(f"{exported} PDF(s) written to {args.output_dir}, {failed} failed", file=out)
+    return 1 if failed else 0
+
+
+def cmd_explore(args, out):
+    from tools.explorer import CACHE_FILE, COLUMNS, explore
+
+    base = None
+    if args.base:
+        with open(args.base, "r", encoding="utf-8") as f:
+            base = json.load(f)
+    cache_path = CACHE_FILE if args.cache is None else args.cache or None
+    table = explore(base, cache_path=cache_path, jobs=args.jobs, rebuild=args.rebuild)
+    try:
+        indexes = table.query(fits=args.benchmark, cp_range=(args.min_cp, args.max_cp), sort_by=args.sort,
+                              descending=not args.ascending, limit=args.top or None,
+                              race=args.race, class_=args.class_, size=args.size)
+    except KeyError as e:
+        print(f"error: {e.args[0]}", file=sys.stderr)
+        return 1
+
+    fields = list(COLUMNS)[:-1]
+    if args.format == "csv":
+        writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(table.rows(indexes))
+        return 0
+    for row in table.rows(indexes):
+        combo = " / ".join(row[kind] or "-" for kind in ("race", "class", "size"))
+        fit = "fits" if row["fits"] else f"{row['warnings']} warning(s)"
+        print(f"{combo}: {row['cp']} CP ({row['benchmark'] or 'no benchmark'}, {fit})", file=out)
+        print("    " + "  ".join(f"{key} {row[key]}" for key in STATS + DERIVED_KEYS), file=out)
+    print(f"{len(indexes)} of {len(table)} combination(s) shown, {table.recomputed} computed, "
+          f"{len(table) - table.recomputed} reused", file=out)
+    return 0
+
+
+def cmd_optimize(args, out):
+    from tools.optimizer import optimize
+
+    base = None
+    if args.base:
+        with open(args.base, "r", encoding="utf-8") as f:
+            base = json.load(f)
+    budget = args.starting + args.earned
+    try:
+        builds = optimize(budget, args.benchmark, args.target, base=base,
+                          within_ranges=args.within_ranges, limit=args.limit or None)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if not builds:
+        print(f"No build fits {args.benchmark} within {budget} CP", file=out)
+        return 1
+    for build in builds:
+        if args.format == "json":
+            print(json.dumps({"cp": build.cp, "stats": build.stats,
+                              "attributes": [{"name": choice.label, "key": choice.key, "level": level}
+                                             for choice, level in build.attributes],
+                              "derived": build.derived, "warnings": list(build.warnings)}), file=out)
+            continue
+        print(f"{build.cp}/{budget} CP: {build.describe()}", file=out)
+        print("    " + "  ".join(f"{key} {build.derived[key]}" for key in DERIVED_KEYS), file=out)
+        for warning in build.warnings:
+            print(f"    warning: {warning}", file=out)
+    return 0
+
+
+def cmd_simulate(args, out):
+    from tools.combat import Combatant, simulate
+
+    combatants = []
+    for path in iter_character_files(args.paths):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                combatants.append(Combatant.from_character(json.load(f)))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"{path}: cannot read character: {e}", file=sys.stderr)
+            return 1
+    if len(combatants) < 2:
+        print("error: simulate needs at least two characters", file=sys.stderr)
+        return 1
+
+    for result in simulate(combatants, args.trials, args.seed, args.max_rounds):
+        if args.format == "json":
+            print(json.dumps({
+                "first": result.first.name, "second": result.second.name, "trials": result.trials,
+                "seed": result.seed, "wins": result.wins, "draws": result.draws,
+                "mean_rounds": result.mean_rounds, "rounds": dict(sorted(result.rounds.items())),
+                "damage": [dict(sorted(counts.items())) for counts in result.damage],
+            }), file=out)
+        else:
+            print(result.summary(), file=out)
+    return 0
+
+
+def _load_characters(paths):
+    characters = []
+    for path in iter_character_files(paths):
+        with open(path, "r", encoding="utf-8") as f:
+            characters.append(json.load(f))
+    return characters
+
+
+def cmd_encounter(args, out):
+    from tools.encounter import CACHE_DIR, analyze_encounter
+
+    try:
+        party = _load_characters(args.party)
+        group = _load_characters(args.group)
+        result = analyze_encounter(party, group, trials=args.trials, seed=args.seed, max_rounds=args.max_rounds,
+                                   minion_scale=args.minions, include_minions=not args.no_minions,
+                                   cache_dir=None if args.no_cache else CACHE_DIR)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if args.format == "json":
+        print(json.dumps(dict(result.to_dict(), cached=result.cached)), file=out)
+    else:
+        print(result.summary(), file=out)
+    return 0
+
+
+def _parse_weights(specs):
+    weights = {}
+    for spec in specs or []:
+        name, sep, value = spec.rpartition("=")
+        if not sep or "/" not in name:
+            raise ValueError(f"weight '{spec}' is not KIND/NAME=WEIGHT")
+        weights[name] = float(value)
+    return weights
+
+
+def cmd_generate(args, out):
+    from tools.npc import NPCOptions, GenerationError, iter_npcs, write_npc
+
+    try:
+        options = NPCOptions(benchmarks=tuple(args.benchmark or ()), races=tuple(args.race or ()),
+                             classes=tuple(args.class_ or ()), sizes=tuple(args.size or ()),
+                             weights=_parse_weights(args.weight), max_attributes=args.max_attributes,
+                             max_defects=args.max_defects)
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+        written = 0
+        for data in iter_npcs(args.count, args.seed, options, args.jobs):
+            if args.output_dir:
+                write_npc(data, args.output_dir)
+            else:
+                print(json.dumps(data), file=out)
+            written += 1
+    except (OSError, ValueError, GenerationError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if args.output_dir:
+        print(f"{written} NPC(s) written to {args.output_dir}", file=out)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="besm", description="Headless tools for BESM 4e character files")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(sub):
+        sub.add_argument("paths", nargs="+", help="Character files or directories")
+        sub.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                         help="Worker processes (default: one per CPU; 1 runs in-process)")
+
+    derive = subparsers.add_parser("derive", help="Print computed stats, derived values and CP")
+    add_common(derive)
+    derive.add_argument("--benchmark", help="Benchmark to report against (default: saved or suggested)")
+    derive.add_argument("--format", choices=["text", "json"], default="text",
+                        help="json prints one object per line")
+    derive.set_defaults(func=cmd_derive)
+
+    check = subparsers.add_parser("validate", help="Check files against the character schema and a benchmark")
+    add_common(check)
+    check.add_argument("--benchmark", help="Benchmark to check against (default: saved or suggested)")
+    check.add_argument("--strict", action="store_true", help="Treat warnings as failures")
+    check.add_argument("--quiet", "-q", action="store_true", help="Only list files with problems")
+    check.set_defaults(func=cmd_validate)
+
+    summarize = subparsers.add_parser("summarize", help="Write a CSV or JSON summary of name, race, class, CP and derived values")
+    add_common(summarize)
+    summarize.add_argument("--format", choices=["csv", "json"], default="csv")
+    summarize.add_argument("--output", "-o", help="Write to a file instead of stdout")
+    summarize.set_defaults(func=cmd_summarize)
+
+    export = subparsers.add_parser("export", help="Render PDFs, one per character or a combined campaign book")
+    add_common(export)
+    target = export.add_mutually_exclusive_group(required=True)
+    target.add_argument("--output-dir", "-o", help="Folder for one PDF per character")
+    target.add_argument("--book", metavar="PDF", help="Write a single campaign book with a table of contents")
+    export.set_defaults(func=cmd_export)
+
+    explore = subparsers.add_parser("explore", help="Rank race x class x size template combinations")
+    explore.add_argument("--base", help="Character file the templates are applied to (default: 4/4/4, nothing else)")
+    explore.add_argument("--benchmark", help="Only combinations that fit this benchmark")
+    explore.add_argument("--min-cp", type=int)
+    explore.add_argument("--max-cp", type=int)
+    explore.add_argument("--race")
+    explore.add_argument("--class", dest="class_")
+    explore.add_argument("--size")
+    explore.add_argument("--sort", choices=["cp"] + list(STATS + DERIVED_KEYS), default="cp")
+    explore.add_argument("--ascending", action="store_true", help="Lowest first (default: highest first)")
+    explore.add_argument("--top", type=int, default=20, help="Rows to show (0 for all)")
+    explore.add_argument("--format", choices=["text", "csv"], default="text")
+    explore.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                         help="Worker processes (default: one per CPU; 1 runs in-process)")
+    explore.add_argument("--cache", help="Results cache, reused for unchanged templates "
+                                         "(default: data/explorer_cache.zip; '' to disable)")
+    explore.add_argument("--rebuild", action="store_true", help="Ignore the cache and compute every combination")
+    explore.set_defaults(func=cmd_explore)
+
+    optimizer = subparsers.add_parser("optimize", help="Propose stats and attribute levels that maximise derived values")
+    optimizer.add_argument("--starting", type=int, required=True, help="Starting CP")
+    optimizer.add_argument("--earned", type=int, default=0, help="Earned CP")
+    optimizer.add_argument("--benchmark", required=True, help="Benchmark whose max stat and attribute level apply")
+    optimizer.add_argument("--target", action="append", required=True, choices=list(DERIVED_KEYS),
+                           help="Derived value to maximise (repeat for several)")
+    optimizer.add_argument("--base", help="Character file whose attributes and defects are kept")
+    optimizer.add_argument("--within-ranges", action="store_true",
+                           help="Drop builds outside the benchmark's CV, HP/EP and DM ranges")
+    optimizer.add_argument("--limit", type=int, default=5, help="Builds to show (0 for the whole front)")
+    optimizer.add_argument("--format", choices=["text", "json"], default="text")
+    optimizer.set_defaults(func=cmd_optimize)
+
+    duel = subparsers.add_parser("simulate", help="Monte Carlo duels between every pair of characters")
+    duel.add_argument("paths", nargs="+", help="Character files or directories (two or more characters)")
+    duel.add_argument("--trials", "-n", type=int, default=100_000, help="Fights per pair (default: 100000)")
+    duel.add_argument("--seed", type=int, default=0, help="Random seed; the same seed gives the same results")
+    duel.add_argument("--max-rounds", type=int, default=100, help="Fights still going after this many rounds are draws")
+    duel.add_argument("--format", choices=["text", "json"], default="text")
+    duel.set_defaults(func=cmd_simulate)
+
+    encounter = subparsers.add_parser("encounter", help="Balance a party against an opposing group and their minions")
+    encounter.add_argument("--party", nargs="+", required=True, help="Party character files or directories")
+    encounter.add_argument("--group", nargs="+", required=True, help="Opposing character files or directories")
+    encounter.add_argument("--minions", choices=["low", "mid", "high"], default="mid",
+                           help="Where in each minion entry's count range to take its numbers (default: mid)")
+    encounter.add_argument("--no-minions", action="store_true", help="Leave minions out")
+    encounter.add_argument("--trials", "-n", type=int, default=2000, help="Battles to simulate (default: 2000)")
+    encounter.add_argument("--seed", type=int, default=0)
+    encounter.add_argument("--max-rounds", type=int, default=50, help="Battles still going after this many rounds are draws")
+    encounter.add_argument("--no-cache", action="store_true", help="Do not read or write data/encounter_cache")
+    encounter.add_argument("--format", choices=["text", "json"], default="text")
+    encounter.set_defaults(func=cmd_encounter)
+
+    generate = subparsers.add_parser("generate", help="Roll random NPCs from the templates, catalog and benchmarks")
+    generate.add_argument("--count", "-n", type=int, default=10, help="NPCs to generate (default: 10)")
+    generate.add_argument("--seed", type=int, default=0, help="Random seed; the same seed gives the same NPCs")
+    generate.add_argument("--benchmark", action="append", help="Benchmark to pick from (repeat for several; default: all)")
+    generate.add_argument("--race", action="append", help="Race template to pick from (repeat for several; default: all)")
+    generate.add_argument("--class", dest="class_", action="append",
+                          help="Class template to pick from (repeat for several; default: all)")
+    generate.add_argument("--size", action="append", help="Size template to pick from (default: the race's own size)")
+    generate.add_argument("--weight", action="append", metavar="KIND/NAME=WEIGHT",
+                          help="Weight for a benchmark, race, class, size, attribute or defect, "
+                               "e.g. race/dwarf=3 or attribute/flight=0 (default: 1)")
+    generate.add_argument("--max-attributes", type=int, default=4, help="Attributes picked at random per NPC")
+    generate.add_argument("--max-defects", type=int, default=2, help="Most defects picked at random per NPC")
+    generate.add_argument("--output-dir", "-o", help="Folder for one character file per NPC "
+                                                     "(default: one JSON object per line on stdout)")
+    generate.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                          help="Worker processes (default: one per CPU; 1 runs in-process)")
+    generate.set_defaults(func=cmd_generate)
+    return parser
+
+
+def main(argv=None, out=None):
+    args = build_parser().parse_args(argv)
+    if hasattr(args, "jobs"):
+        args.jobs = max(1, args.jobs)
+    return args.func(args, out or sys.stdout)
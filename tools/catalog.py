@@ -0,0 +1,129 @@
+"""
+Game data catalog for BESM Character Generator
+
+Loads attributes, defects, enhancements and limiters once and precomputes the
+lookup tables the builder dialogs need, so switching the selected attribute or
+defect is a dictionary lookup instead of a scan over every enhancement and
+limiter.
+"""
+
+import os
+import json
+
+from tools.snapshot import freeze
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(BASE_PATH, "data")
+
+
+class Catalog:
+    """Read-only view of the game data with precomputed indexes.
+
+    Records are shared between every caller, so treat them as immutable.
+    frozen() gives a FrozenDict version of a record whose nested values can be
+    shared by every character that uses it (see tools/snapshot.py).
+    """
+
+    def __init__(self, data_path=DATA_PATH):
+        self.data_path = data_path
+
+        self.raw_attributes = self._load("attributes.json", "attributes")
+        self.raw_defects = self._load("defects.json", "defects")
+        # Nested arrays in the modifier files are skipped, same as the dialogs used to do
+        self.enhancements = [e for e in self._load("enhancements.json", "enhancements") if isinstance(e, dict)]
+        self.limiters = [l for l in self._load("limiters.json", "limiters") if isinstance(l, dict)]
+
+        # Name and key lookups
+        self.attributes = {attr["name"]: attr for attr in self.raw_attributes}
+        self.attributes_by_key = {attr["key"]: attr for attr in self.raw_attributes if "key" in attr}
+        self.defects = {defect["name"]: defect for defect in self.raw_defects}
+        self.defects_by_key = {defect["key"]: defect for defect in self.raw_defects if "key" in defect}
+        self.enhancements_by_name = {e["name"]: e for e in self.enhancements}
+        self.limiters_by_name = {l["name"]: l for l in self.limiters}
+
+        # Attribute key -> compatible modifiers (catalog order preserved)
+        self._universal_enhancements, self._enhancements_by_attr_key = self._index_compatible(self.enhancements)
+        self._universal_limiters, self._limiters_by_attr_key = self._index_compatible(self.limiters)
+
+        # Defect name -> applicable modifiers
+        self._enhancements_by_defect = self._index_applicable(self.enhancements)
+        self._limiters_by_defect = self._index_applicable(self.limiters)
+
+        # id(record) -> (record, frozen record); the record is kept so its id stays unique
+        self._frozen = {}
+
+    def _load(self, file_name, list_key):
+        with open(os.path.join(self.data_path, file_name), "r", encoding="utf-8") as f:
+            return json.load(f)[list_key]
+
+    def _index_compatible(self, modifiers):
+        """Build the attr_key -> [modifier] map for the ``compatible_with`` rule.
+
+        A modifier without ``compatible_with`` applies to every attribute; otherwise
+        the attribute key must appear in the list (case-insensitive).
+        """
+        universal = [m for m in modifiers if not m.get("compatible_with")]
+
+        keys = {key.lower() for key in self.attributes_by_key}
+        for modifier in modifiers:
+            keys.update(key.lower() for key in modifier.get("compatible_with") or [])
+
+        by_key = {}
+        for attr_key in keys:
+            by_key[attr_key] = [
+                m for m in modifiers
+                if not m.get("compatible_with")
+                or any(attr_key == key.lower() for key in m["compatible_with"])
+            ]
+        return universal, by_key
+
+    def _index_applicable(self, modifiers):
+        """Build the defect name -> [modifier] map for the ``applicable_to`` rule."""
+        by_defect = {}
+        for defect_name in self.defects:
+            by_defect[defect_name] = [
+                m for m in modifiers
+                if defect_name in m.get("applicable_to", []) or "All" in m.get("applicable_to", [])
+            ]
+        return by_defect
+
+    def compatible_enhancements(self, attr_key):
+        """Return the enhancements that can be applied to the attribute with this key."""
+        attr_key = (attr_key or "").lower()
+        if not attr_key:
+            return self._universal_enhancements
+        return self._enhancements_by_attr_key.get(attr_key, self._universal_enhancements)
+
+    def compatible_limiters(self, attr_key):
+        """Return the limiters that can be applied to the attribute with this key."""
+        attr_key = (attr_key or "").lower()
+        if not attr_key:
+            return self._universal_limiters
+        return self._limiters_by_attr_key.get(attr_key, self._universal_limiters)
+
+    def defect_enhancements(self, defect_name):
+        """Return the enhancements applicable to the named defect."""
+        return self._enhancements_by_defect.get(defect_name, [])
+
+    def defect_limiters(self, defect_name):
+        """Return the limiters applicable to the named defect."""
+        return self._limiters_by_defect.get(defect_name, [])
+
+    def frozen(self, record):
+        """Return an immutable copy of a catalog record, built once per record."""
+        cached = self._frozen.get(id(record))
+        if cached is None or cached[0] is not record:
+            cached = (record, freeze(record))
+            self._frozen[id(record)] = cached
+        return cached[1]
+
+
+_catalog = None
+
+
+def get_catalog():
+    """Return the shared Catalog, loading it on first use."""
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog()
+    return _catalog
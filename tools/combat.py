@@ -0,0 +1,215 @@
+"""
+Monte Carlo combat simulator for BESM Character Generator
+
+Duels between saved characters, using the derived values the app computes.
+Each round both sides attack at once with BESM 4e opposed checks:
+
+- the attacker rolls 2d6 + ACV, the defender 2d6 + DCV; the attack hits when
+  its total is higher
+- a hit does Damage Multiplier x the margin, plus the attacker's weapon
+  damage, minus the defender's Armour Rating (never below 0)
+- a hit of at least the defender's Shock Value costs them their next attack
+- a side is defeated at 0 HP; both falling in the same round (or reaching
+  max_rounds) is a draw
+
+The damage one attack does against a given defender only depends on the two
+dice totals, so its exact distribution is worked out once from the 2d6
+table. Fights then run in lockstep: every round, one random.choices call
+draws the damage of all the fights still going (the stdlib counterpart of a
+batched NumPy roll), so 10^5 fights take a second or so. A fixed seed gives
+the same results every run.
+"""
+
+import re
+import random
+import bisect
+from collections import Counter
+from dataclasses import dataclass
+from itertools import combinations
+
+from tools.rules import calculate_derived_values
+
+# Probability of each 2d6 total
+TWO_D6 = {total: (6 - abs(total - 7)) / 36 for total in range(2, 13)}
+
+# Armour Rating per level of the Armour attribute
+ARMOUR_PER_LEVEL = 5
+
+_NUMBER_RE = re.compile(r"^\s*(\d+)\s*$")
+
+
+def _plain_number(value):
+    # "25" counts; "10 vs Magic" and other conditional values do not
+    match = _NUMBER_RE.match(str(value))
+    return int(match.group(1)) if match else 0
+
+
+@dataclass(frozen=True, slots=True)
+class Combatant:
+    """What a character brings to a fight"""
+
+    name: str
+    acv: int
+    dcv: int
+    hp: int
+    dm: int
+    sv: int
+    armour: int = 0
+    weapon_damage: int = 0
+
+    @classmethod
+    def from_character(cls, data, name=None):
+        """Build from character data: derived values, Armour levels, and plain-number weapons and armour"""
+        derived = calculate_derived_values(data)
+        armour = sum(ARMOUR_PER_LEVEL * attr.get("level", 1) for attr in data.get("attributes", [])
+                     if attr.get("key") == "armour")
+        armour += max((_plain_number(item.get("protection", "")) for item in data.get("armor", [])), default=0)
+        weapon = max((_plain_number(item.get("damage", "")) for item in data.get("weapons", [])), default=0)
+        return cls(name or data.get("name") or "Unnamed", derived["ACV"], derived["DCV"], derived["HP"],
+                   derived["DM"], derived["SV"], armour, weapon)
+
+
+def damage_distribution(attacker, defender):
+    """Return {damage: probability} for one attack; 0 covers misses and hits stopped by armour"""
+    distribution = Counter()
+    for attack, p_attack in TWO_D6.items():
+        for defence, p_defence in TWO_D6.items():
+            margin = (attack + attacker.acv) - (defence + defender.dcv)
+            damage = 0
+            if margin > 0:
+                damage = max(0, attacker.dm * margin + attacker.weapon_damage - defender.armour)
+            distribution[damage] += p_attack * p_defence
+    return dict(sorted(distribution.items()))
+
+
+class DamageRoller:
+    """Draws batches of damage values from an exact distribution"""
+
+    def __init__(self, distribution):
+        self.values = list(distribution)
+        self.cum_weights = []
+        total = 0
+        for probability in distribution.values():
+            total += probability
+            self.cum_weights.append(total)
+        self.mean = sum(damage * p for damage, p in distribution.items())
+        self.no_damage = distribution.get(0, 0)
+
+    def roll(self, rng, count):
+        return rng.choices(self.values, cum_weights=self.cum_weights, k=count)
+
+
+@dataclass(slots=True)
+class DuelResult:
+    """Outcome counts for many fights between two combatants"""
+
+    first: Combatant
+    second: Combatant
+    trials: int
+    seed: object
+    wins: list          # [first, second]
+    draws: int
+    rounds: Counter     # rounds the fight lasted -> fights
+    damage: list        # per side, Counter of damage per attack made
+    exact_mean_damage: tuple
+
+    def win_probability(self, side):
+        return self.wins[side] / self.trials
+
+    @property
+    def draw_probability(self):
+        return self.draws / self.trials
+
+    @property
+    def mean_rounds(self):
+        return sum(rounds * count for rounds, count in self.rounds.items()) / self.trials
+
+    def rounds_percentile(self, fraction):
+        """Rounds within which ``fraction`` of the fights were over"""
+        ordered = sorted(self.rounds.items())
+        cumulative = []
+        total = 0
+        for _, count in ordered:
+            total += count
+            cumulative.append(total)
+        return ordered[bisect.bisect_left(cumulative, fraction * self.trials)][0]
+
+    def summary(self):
+        lines = [f"{self.first.name} vs {self.second.name}: {self.trials} fights (seed {self.seed})",
+                 f"    {self.first.name} wins {self.win_probability(0):.1%}, "
+                 f"{self.second.name} wins {self.win_probability(1):.1%}, draws {self.draw_probability:.1%}",
+                 f"    rounds: mean {self.mean_rounds:.2f}, median {self.rounds_percentile(0.5)}, "
+                 f"90% within {self.rounds_percentile(0.9)}"]
+        for side, combatant in enumerate((self.first, self.second)):
+            damage = self.damage[side]
+            attacks = sum(damage.values())
+            hits = attacks - damage.get(0, 0)
+            mean = sum(value * count for value, count in damage.items()) / attacks if attacks else 0
+            lines.append(f"    {combatant.name} per attack: {hits / attacks if attacks else 0:.1%} damaging, "
+                         f"mean damage {mean:.2f} (exact {self.exact_mean_damage[side]:.2f}), max {max(damage, default=0)}")
+        return "\n".join(lines)
+
+
+def simulate_duel(first, second, trials=100_000, seed=0, max_rounds=100):
+    """Fight ``trials`` duels between two Combatants and return a DuelResult"""
+    rng = random.Random(seed)
+    rollers = (DamageRoller(damage_distribution(first, second)), DamageRoller(damage_distribution(second, first)))
+    hp = ([first.hp] * trials, [second.hp] * trials)
+    shock = (second.sv, first.sv)  # the Shock Value each side's hits are measured against
+    # Fights where that side loses its next attack
+    stunned = (set(), set())
+    damage = [Counter(), Counter()]
+    rounds = Counter()
+    wins = [0, 0]
+    draws = 0
+
+    active = list(range(trials))
+    round_number = 0
+    while active and round_number < max_rounds:
+        round_number += 1
+        # One batch of attacks per side for every fight still going
+        rolls = (rollers[0].roll(rng, len(active)), rollers[1].roll(rng, len(active)))
+        # Attacks are simultaneous, so shocks from this round count from the next
+        skipping, stunned = stunned, (set(), set())
+        still_going = []
+        for side in (0, 1):
+            made = rolls[side]
+            skipped = skipping[side]
+            if skipped:
+                made = [0 if fight in skipped else value for fight, value in zip(active, made)]
+                damage[side].update(value for fight, value in zip(active, rolls[side]) if fight not in skipped)
+            else:
+                damage[side].update(made)
+            target_hp = hp[1 - side]
+            threshold = shock[side]
+            for fight, value in zip(active, made):
+                if value:
+                    target_hp[fight] -= value
+                    if value >= threshold:
+                        stunned[1 - side].add(fight)
+        first_hp, second_hp = hp
+        for fight in active:
+            first_down = first_hp[fight] <= 0
+            second_down = second_hp[fight] <= 0
+            if first_down or second_down:
+                rounds[round_number] += 1
+                if first_down and second_down:
+                    draws += 1
+                else:
+                    wins[1 if first_down else 0] += 1
+            else:
+                still_going.append(fight)
+        active = still_going
+
+    # Fights that hit the round limit are draws
+    if active:
+        rounds[round_number] += len(active)
+        draws += len(active)
+    return DuelResult(first, second, trials, seed, wins, draws, rounds, damage,
+                      (rollers[0].mean, rollers[1].mean))
+
+
+def simulate(combatants, trials=100_000, seed=0, max_rounds=100):
+    """Run a duel for every pair of combatants; each pair gets its own seed derived from ``seed``"""
+    return [simulate_duel(first, second, trials, f"{seed}:{i}:{j}", max_rounds)
+            for (i, first), (j, second) in combinations(enumerate(combatants), 2)]
@@ -0,0 +1,325 @@
+"""
+Encounter balance analyzer for BESM Character Generator
+
+Compares a party with an opposing group. Each side is a list of characters
+plus the minions they bring: every ``minions`` entry becomes a unit of
+identical combatants, its size picked from its count range ("6-10", "Up to
+5", or the Minions level table).
+
+For each side the analyzer reports offence, defence and endurance worked out
+exactly from the per-attack damage distributions in tools.combat:
+
+- offence: expected damage the side deals per round
+- defence: chance an incoming attack does no damage
+- endurance: total HP
+- rounds to win: the other side's endurance over this side's offence
+
+It also simulates the battle. Each round, every combatant still standing
+attacks a random standing enemy, and the combat.py rules apply
+(simultaneous attacks, Shock Value stuns). The result is win, draw and
+survivor odds.
+
+Participants are identified by a hash of their content. Results are cached
+in memory and in data/encounter_cache/ under a key built from those hashes
+and the settings, so asking the same what-if again (even from a new process)
+is instant.
+"""
+
+import os
+import sys
+import re
+import json
+import random
+import hashlib
+from collections import Counter
+from dataclasses import asdict, dataclass
+
+from tools.combat import Combatant, DamageRoller, damage_distribution
+from tools.rules import BASE_PATH
+
+CACHE_DIR = os.path.join(BASE_PATH, "data", "encounter_cache")
+FORMAT_VERSION = 1
+
+# Minions attribute level -> number of minions (low, high)
+MINION_COUNTS = {1: (1, 5), 2: (6, 10), 3: (11, 25), 4: (26, 50), 5: (51, 100), 6: (101, 200)}
+MINION_SCALES = ("low", "mid", "high")
+
+_RANGE_RE = re.compile(r"(\d+)\s*-\s*(\d+)")
+_UP_TO_RE = re.compile(r"up\s+to\s+(\d+)", re.IGNORECASE)
+_NUMBER_RE = re.compile(r"(\d+)")
+
+
+def content_hash(data):
+    """A stable hash of a character or minion's content"""
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def minion_count_range(minion):
+    """Return the (low, high) number of minions an entry stands for"""
+    count = minion.get("count")
+    if isinstance(count, int):
+        return count, count
+    text = str(count or "")
+    match = _RANGE_RE.search(text)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    match = _UP_TO_RE.search(text)
+    if match:
+        return 1, int(match.group(1))
+    match = _NUMBER_RE.search(text)
+    if match:
+        return int(match.group(1)), int(match.group(1))
+    return MINION_COUNTS.get(minion.get("level", 1), (1, 1))
+
+
+def scale_count(count_range, scale):
+    low, high = count_range
+    if scale == "low":
+        return low
+    if scale == "high":
+        return high
+    return (low + high) // 2
+
+
+def minion_character(minion):
+    """Character data for one minion; entries without stats spread their CP evenly over the stats"""
+    stats = minion.get("stats")
+    if not stats:
+        # 2 CP per stat level
+        level = max(1, int(minion.get("cp", 0) or 0) // 6)
+        stats = {"Body": level, "Mind": level, "Soul": level}
+    return {"name": minion.get("name", "Minions"), "stats": stats,
+            "attributes": minion.get("attributes", []), "defects": minion.get("defects", [])}
+
+
+@dataclass(frozen=True, slots=True)
+class Unit:
+    """``count`` identical combatants from one character or minion entry"""
+
+    key: str
+    combatant: Combatant
+    count: int
+
+
+def side_units(characters, minion_scale="mid", include_minions=True):
+    """Return the Units for a list of character dicts, their minions included
+
+    Units are sorted by key, so the order characters are listed in does not
+    change a seeded simulation.
+    """
+    units = []
+    for data in characters:
+        units.append(Unit(content_hash(data), Combatant.from_character(data), 1))
+        if not include_minions:
+            continue
+        for minion in data.get("minions", []):
+            count = scale_count(minion_count_range(minion), minion_scale)
+            if count > 0:
+                units.append(Unit(content_hash(minion), Combatant.from_character(minion_character(minion),
+                                                                                 name=minion.get("name")), count))
+    return sorted(units, key=lambda unit: unit.key)
+
+
+# (attacker key, defender key) -> DamageRoller, shared by every analysis in the process
+_rollers = {}
+
+
+def _roller(attacker, defender):
+    key = (attacker.key, defender.key)
+    roller = _rollers.get(key)
+    if roller is None:
+        roller = _rollers[key] = DamageRoller(damage_distribution(attacker.combatant, defender.combatant))
+    return roller
+
+
+@dataclass(frozen=True, slots=True)
+class SideMetrics:
+    combatants: int
+    offence: float
+    defence: float
+    endurance: int
+    rounds_to_win: float
+
+
+def side_metrics(units, enemies):
+    """Exact offence, defence and endurance for one side against the other"""
+    own = sum(unit.count for unit in units)
+    other = sum(unit.count for unit in enemies)
+    # Attacks land on enemies in proportion to their numbers
+    offence = sum(attacker.count * defender.count / other * _roller(attacker, defender).mean
+                  for attacker in units for defender in enemies) if other else 0.0
+    defence = sum(attacker.count * defender.count / (own * other) * _roller(attacker, defender).no_damage
+                  for attacker in enemies for defender in units) if own and other else 1.0
+    enemy_endurance = sum(unit.count * unit.combatant.hp for unit in enemies)
+    return SideMetrics(own, offence, defence, sum(unit.count * unit.combatant.hp for unit in units),
+                       enemy_endurance / offence if offence else float("inf"))
+
+
+class _Pool:
+    """Damage values for one attacker/defender pair, drawn from the RNG in batches"""
+
+    __slots__ = ("roller", "values", "index")
+
+    BATCH = 1024
+
+    def __init__(self, roller):
+        self.roller = roller
+        self.values = ()
+        self.index = 0
+
+    def next(self, rng):
+        if self.index >= len(self.values):
+            self.values = self.roller.roll(rng, self.BATCH)
+            self.index = 0
+        value = self.values[self.index]
+        self.index += 1
+        return value
+
+
+def simulate_battle(party, group, trials=2000, seed=0, max_rounds=50):
+    """Fight ``trials`` battles; returns (party wins, group wins, draws, rounds Counter, survivors per side)"""
+    rng = random.Random(seed)
+    sides = (party, group)
+    # Every combatant as an index into its side's units
+    members = tuple([i for i, unit in enumerate(units) for _ in range(unit.count)] for units in sides)
+    pools = tuple({(a, d): _Pool(_roller(attacker, defender))
+                   for a, attacker in enumerate(sides[side]) for d, defender in enumerate(sides[1 - side])}
+                  for side in (0, 1))
+    hp_start = tuple([sides[side][i].combatant.hp for i in members[side]] for side in (0, 1))
+    shock = tuple([sides[side][i].combatant.sv for i in members[side]] for side in (0, 1))
+
+    wins = [0, 0]
+    draws = 0
+    rounds = Counter()
+    survivors = [0, 0]
+    for _ in range(trials):
+        hp = (list(hp_start[0]), list(hp_start[1]))
+        stunned = (set(), set())
+        round_number = 0
+        standing = (list(range(len(hp[0]))), list(range(len(hp[1]))))
+        while standing[0] and standing[1] and round_number < max_rounds:
+            round_number += 1
+            skipping, stunned = stunned, (set(), set())
+            for side in (0, 1):
+                other = 1 - side
+                attackers = [fighter for fighter in standing[side] if fighter not in skipping[side]]
+                targets = rng.choices(standing[other], k=len(attackers))
+                own_members, other_members = members[side], members[other]
+                side_pools, target_hp, target_shock = pools[side], hp[other], shock[other]
+                for attacker, target in zip(attackers, targets):
+                    value = side_pools[(own_members[attacker], other_members[target])].next(rng)
+                    if value:
+                        target_hp[target] -= value
+                        if value >= target_shock[target]:
+                            stunned[other].add(target)
+            standing = ([f for f in standing[0] if hp[0][f] > 0], [f for f in standing[1] if hp[1][f] > 0])
+        rounds[round_number] += 1
+        survivors[0] += len(standing[0])
+        survivors[1] += len(standing[1])
+        if standing[0] and not standing[1]:
+            wins[0] += 1
+        elif standing[1] and not standing[0]:
+            wins[1] += 1
+        else:
+            draws += 1
+    return wins, draws, rounds, survivors
+
+
+@dataclass(slots=True)
+class EncounterResult:
+    party: SideMetrics
+    group: SideMetrics
+    trials: int
+    seed: int
+    party_wins: int
+    group_wins: int
+    draws: int
+    mean_rounds: float
+    party_survivors: float
+    group_survivors: float
+    cached: bool = False
+
+    def to_dict(self):
+        data = asdict(self)
+        data.pop("cached")
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        data["party"] = SideMetrics(**data["party"])
+        data["group"] = SideMetrics(**data["group"])
+        return cls(**data)
+
+    def summary(self):
+        lines = [f"Party wins {self.party_wins / self.trials:.1%}, group wins {self.group_wins / self.trials:.1%}, "
+                 f"draws {self.draws / self.trials:.1%} ({self.trials} battles, seed {self.seed}"
+                 f"{', cached' if self.cached else ''})",
+                 f"Mean rounds {self.mean_rounds:.2f}"]
+        for label, metrics, standing in (("Party", self.party, self.party_survivors),
+                                         ("Group", self.group, self.group_survivors)):
+            lines.append(f"{label}: {metrics.combatants} combatant(s), offence {metrics.offence:.1f}/round, "
+                         f"defence {metrics.defence:.0%}, endurance {metrics.endurance} HP, "
+                         f"~{metrics.rounds_to_win:.1f} rounds to win, {standing:.1f} left standing on average")
+        return "\n".join(lines)
+
+
+def encounter_key(party, group, trials, seed, max_rounds):
+    """Cache key from the participants' content hashes, their numbers and the settings"""
+    parts = [FORMAT_VERSION, trials, seed, max_rounds]
+    for units in (party, group):
+        parts.append(sorted((unit.key, unit.count) for unit in units))
+    return hashlib.sha1(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+# Results computed in this process, by encounter key
+_results = {}
+
+
+def analyze_encounter(party, group, trials=2000, seed=0, max_rounds=50, minion_scale="mid",
+                      include_minions=True, cache_dir=CACHE_DIR):
+    """Analyze a party against a group, both lists of character dicts
+
+    Returns an EncounterResult; ``result.cached`` is True when it came from
+    the memory or disk cache. Pass cache_dir=None to keep results in memory
+    only.
+    """
+    if minion_scale not in MINION_SCALES:
+        raise ValueError(f"minion_scale must be one of {', '.join(MINION_SCALES)}")
+    party_units = side_units(party, minion_scale, include_minions)
+    group_units = side_units(group, minion_scale, include_minions)
+    if not party_units or not group_units:
+        raise ValueError("both sides need at least one character")
+
+    key = encounter_key(party_units, group_units, trials, seed, max_rounds)
+    path = os.path.join(cache_dir, f"{key}.json") if cache_dir else None
+    data = _results.get(key)
+    if data is None and path and os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[DEBUG] Ignoring unreadable encounter cache {path}: {e}", file=sys.stderr)
+    if data is not None:
+        _results[key] = data
+        result = EncounterResult.from_dict(data)
+        result.cached = True
+        return result
+
+    wins, draws, rounds, survivors = simulate_battle(party_units, group_units, trials, seed, max_rounds)
+    result = EncounterResult(
+        party=side_metrics(party_units, group_units),
+        group=side_metrics(group_units, party_units),
+        trials=trials, seed=seed, party_wins=wins[0], group_wins=wins[1], draws=draws,
+        mean_rounds=sum(r * count for r, count in rounds.items()) / trials,
+        party_survivors=survivors[0] / trials, group_survivors=survivors[1] / trials,
+    )
+    data = result.to_dict()
+    _results[key] = data
+    if path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    return result
@@ -0,0 +1,359 @@
+"""
+Race x class x size explorer for BESM Character Generator
+
+Applies every race, class and size combination in data/templates to a base
+character without the GUI (the same dry run TemplateDialog previews use) and
+records the CP total, final stats, derived values and benchmark fit of each.
+Races are spread over a process pool.
+
+The results are kept as a ComboTable: one typed array per column, saved as a
+zip holding a meta.json and one raw binary file per column (the layout of a
+numpy .npz, without needing numpy). Loading it is a handful of frombytes
+calls, and filtering and sorting 10k rows takes milliseconds.
+
+Every template's fingerprint (a hash of its file, plus the size file its
+baseSize points at) is stored with the table, so after editing one template
+only the combinations that use it are computed again.
+
+    python besm.py explore --benchmark Adventurer --max-cp 60 --sort DCV
+"""
+
+import io
+import os
+import sys
+import json
+import zipfile
+import hashlib
+import contextlib
+from array import array
+from functools import partial
+
+from tools.catalog import get_catalog
+from tools.rules import (
+    STATS, DERIVED_KEYS, BENCHMARKS_FILE, calculate_derived_values, point_total,
+    load_benchmarks, suggest_benchmark, benchmark_warnings
+)
+from tools.size_ladder import TEMPLATES_PATH, BASE_PATH, load_size_ladder
+from tools.batch import iter_results
+
+CACHE_FILE = os.path.join(BASE_PATH, "data", "explorer_cache.zip")
+FORMAT_VERSION = 1
+
+# Template kind -> (index.json key, template type used by dry_run)
+KINDS = {"race": ("races", "race"), "class": ("classes", "class"), "size": ("sizes", "size")}
+
+# Column -> array typecode; race/class/size are indexes into ComboTable.names
+# (0 is "none"), benchmark indexes ComboTable.benchmarks (-1 is none) and fits
+# has bit n set when the combination sits inside benchmark n
+COLUMNS = dict(
+    [("race", "h"), ("class", "h"), ("size", "h"), ("cp", "i")]
+    + [(stat, "h") for stat in STATS]
+    + [(key, "i") for key in DERIVED_KEYS]
+    + [("benchmark", "b"), ("warnings", "H"), ("fits", "I")]
+)
+
+BASE_CHARACTER = {
+    "stats": {"Body": 4, "Mind": 4, "Soul": 4},
+    "attributes": [],
+    "defects": [],
+}
+
+
+def _hash_bytes(*parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def load_template_sources(templates_path=TEMPLATES_PATH):
+    """Return {kind: {name: (template, file bytes)}} for every template in index.json"""
+    with open(os.path.join(templates_path, "index.json"), "r", encoding="utf-8") as f:
+        index = json.load(f)
+    sources = {}
+    for kind, (index_key, _) in KINDS.items():
+        sources[kind] = {}
+        for name in index.get(index_key, []):
+            path = os.path.join(templates_path, index_key, f"{name}.json")
+            if os.path.exists(path):
+                raw = _read(path)
+                sources[kind][name] = (json.loads(raw), raw)
+    return sources
+
+
+def template_fingerprints(sources, ladder):
+    """Hash each template, including the size template its baseSize applies"""
+    from templates.template_effects import find_base_size
+
+    size_hashes = {}
+    for name, (template, raw) in sources["size"].items():
+        size_hashes[template.get("key") or name] = _hash_bytes(raw)
+    fingerprints = {}
+    for kind, templates in sources.items():
+        for name, (template, raw) in templates.items():
+            parts = [raw]
+            base_size = template.get("baseSize") if kind != "size" else None
+            if base_size:
+                size = find_base_size(base_size, ladder)
+                parts.append(size_hashes.get(size.key, size.key) if size else "")
+            fingerprints[f"{kind}/{name}"] = _hash_bytes(*parts)
+    return fingerprints
+
+
+def _engine_fingerprint(base_character):
+    # Anything that changes every row: the base character, catalog and benchmarks
+    base_path = os.path.join(BASE_PATH, "data")
+    return _hash_bytes(
+        FORMAT_VERSION,
+        json.dumps(base_character, sort_keys=True, default=str),
+        *(_read(os.path.join(base_path, name)) for name in ("attributes.json", "defects.json")),
+        _read(BENCHMARKS_FILE),
+    )
+
+
+def _engine_lookups():
+    from templates.template_effects import TemplateLookups
+
+    # What lookups_for(app) gives: the app resolves attributes through the
+    # catalog and builds defects from the template entry
+    catalog = get_catalog()
+    return TemplateLookups(catalog.attributes_by_key, catalog.attributes, {}, {})
+
+
+# Per-process ladder, rebuilt when the size templates change
+_ladder = (None, None)
+
+
+def _worker_ladder(templates_path, sizes_fingerprint):
+    global _ladder
+    if _ladder[0] != sizes_fingerprint:
+        _ladder = (sizes_fingerprint, load_size_ladder(templates_path))
+    return _ladder[1]
+
+
+def explore_race(unit, base_character, benchmarks, templates_path, sizes_fingerprint):
+    """Compute the rows for one race
+
+    ``unit`` is (race index, race template or None, [(class index, class
+    template or None, [(size index, size template or None), ...]), ...]).
+    Returns {column: list of values}. Runs in a worker process.
+    """
+    race_index, race_template, classes = unit
+    ladder = _worker_ladder(templates_path, sizes_fingerprint)
+    lookups = _engine_lookups()
+    # The apply code logs every defect it has to guess a cost for; once per
+    # combination that is thousands of lines
+    with contextlib.redirect_stdout(io.StringIO()):
+        return _explore_rows(race_index, race_template, classes, base_character, benchmarks, lookups, ladder)
+
+
+def _explore_rows(race_index, race_template, classes, base_character, benchmarks, lookups, ladder):
+    from templates.template_effects import dry_run
+
+    rows = {column: [] for column in COLUMNS}
+
+    # Each prefix is applied once and shared by everything built on it
+    with_race = dry_run(base_character, race_template, "race", lookups, ladder) if race_template else base_character
+    for class_index, class_template, sizes in classes:
+        with_class = dry_run(with_race, class_template, "class", lookups, ladder) if class_template else with_race
+        for size_index, size_template in sizes:
+            character = dry_run(with_class, size_template, "size", lookups, ladder) if size_template else with_class
+            derived = calculate_derived_values(character)
+            total = point_total(character)
+            # Point ranges do not overlap, so only the suggested benchmark can fit
+            suggested = suggest_benchmark(total, benchmarks)
+            bench_index = benchmarks.index(suggested) if suggested else -1
+            warning_count = len(benchmark_warnings(character, suggested, derived))
+            values = {"race": race_index, "class": class_index, "size": size_index, "cp": total,
+                      "benchmark": bench_index, "warnings": warning_count,
+                      "fits": 1 << bench_index if suggested and not warning_count else 0}
+            values.update((stat, character["stats"].get(stat, 0)) for stat in STATS)
+            values.update(derived)
+            for column in COLUMNS:
+                rows[column].append(values[column])
+    return rows
+
+
+class ComboTable:
+    """Explorer results, one typed array per column
+
+    ``names`` maps "race", "class" and "size" to the template names the index
+    columns refer to (index 0 is "" for none). ``fingerprints`` and
+    ``engine`` record what the rows were computed from.
+    """
+
+    def __init__(self, names, benchmarks, columns, fingerprints=None, engine=""):
+        self.names = names
+        self.benchmarks = benchmarks
+        self.columns = columns
+        self.fingerprints = fingerprints or {}
+        self.engine = engine
+        self.recomputed = 0
+
+    def __len__(self):
+        return len(self.columns["cp"])
+
+    def benchmark_bit(self, name):
+        for bit, benchmark in enumerate(self.benchmarks):
+            if benchmark.lower() == str(name).lower():
+                return 1 << bit
+        raise KeyError(f"unknown benchmark '{name}'")
+
+    def query(self, fits=None, cp_range=None, sort_by=None, descending=True, limit=None, **names):
+        """Return the row indexes matching every filter, optionally sorted
+
+        ``fits`` is a benchmark name the combination must sit inside,
+        ``cp_range`` a (min, max) pair (either may be None) and ``race``,
+        ``class_`` or ``size`` restrict to one template name.
+        """
+        indexes = range(len(self))
+        if fits is not None:
+            bit = self.benchmark_bit(fits)
+            column = self.columns["fits"]
+            indexes = [i for i in indexes if column[i] & bit]
+        if cp_range is not None:
+            low, high = cp_range
+            column = self.columns["cp"]
+            indexes = [i for i in indexes
+                       if (low is None or column[i] >= low) and (high is None or column[i] <= high)]
+        for kind, name in names.items():
+            kind = kind.rstrip("_")
+            if name is None:
+                continue
+            wanted = self.names[kind].index(name) if name in self.names[kind] else -2
+            column = self.columns[kind]
+            indexes = [i for i in indexes if column[i] == wanted]
+        indexes = list(indexes)
+        if sort_by:
+            column = self.columns[sort_by]
+            # Stable sort, so ties keep race/class/size order
+            indexes.sort(key=column.__getitem__, reverse=descending)
+        return indexes[:limit] if limit is not None else indexes
+
+    def row(self, index):
+        """Return one row as a dict with template and benchmark names"""
+        row = {column: values[index] for column, values in self.columns.items()}
+        for kind in KINDS:
+            row[kind] = self.names[kind][row[kind]]
+        row["benchmark"] = self.benchmarks[row["benchmark"]] if row["benchmark"] >= 0 else None
+        row["fits"] = [name for bit, name in enumerate(self.benchmarks) if row["fits"] & (1 << bit)]
+        return row
+
+    def rows(self, indexes):
+        return [self.row(i) for i in indexes]
+
+    def save(self, path):
+        """Write the table as meta.json plus one raw binary file per column"""
+        meta = {"version": FORMAT_VERSION, "byteorder": sys.byteorder, "rows": len(self),
+                "names": self.names, "benchmarks": self.benchmarks, "engine": self.engine,
+                "fingerprints": self.fingerprints, "columns": COLUMNS}
+        tmp_path = f"{path}.tmp"
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("meta.json", json.dumps(meta))
+            for column, values in self.columns.items():
+                archive.writestr(f"{column}.bin", values.tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a saved table; returns None if it is missing or from another version"""
+        try:
+            with zipfile.ZipFile(path) as archive:
+                meta = json.loads(archive.read("meta.json"))
+                if meta.get("version") != FORMAT_VERSION or meta.get("columns") != COLUMNS:
+                    return None
+                columns = {}
+                for column, typecode in COLUMNS.items():
+                    values = array(typecode)
+                    values.frombytes(archive.read(f"{column}.bin"))
+                    if meta["byteorder"] != sys.byteorder:
+                        values.byteswap()
+                    columns[column] = values
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            print(f"[DEBUG] Explorer cache {path} not used: {e}", file=sys.stderr)
+            return None
+        return cls(meta["names"], meta["benchmarks"], columns, meta["fingerprints"], meta["engine"])
+
+
+def explore(base_character=None, templates_path=TEMPLATES_PATH, cache_path=CACHE_FILE, jobs=1, rebuild=False):
+    """Return the ComboTable for every race x class x size combination
+
+    Rows whose templates (and the base character, catalog and benchmarks) are
+    unchanged since the table in ``cache_path`` was saved are reused; the rest
+    are computed over ``jobs`` worker processes. The updated table is saved
+    back unless ``cache_path`` is None. ``table.recomputed`` counts the rows
+    that were computed.
+    """
+    base_character = base_character or BASE_CHARACTER
+    sources = load_template_sources(templates_path)
+    ladder = load_size_ladder(templates_path)
+    fingerprints = template_fingerprints(sources, ladder)
+    engine = _engine_fingerprint(base_character)
+    benchmarks = load_benchmarks()
+    names = {kind: [""] + list(sources[kind]) for kind in KINDS}
+
+    old = None
+    if cache_path and not rebuild and os.path.exists(cache_path):
+        old = ComboTable.load(cache_path)
+        if old is not None and (old.engine != engine or old.benchmarks != [b["name"] for b in benchmarks]):
+            old = None
+
+    def fresh(kind, name):
+        # A template whose rows in the old table can be kept
+        key = f"{kind}/{name}"
+        return not name or (key in fingerprints and old.fingerprints.get(key) == fingerprints[key])
+
+    old_rows = {}
+    if old is not None:
+        races, classes, sizes = (old.names[kind] for kind in KINDS)
+        for i in range(len(old)):
+            combo = (races[old.columns["race"][i]], classes[old.columns["class"][i]], sizes[old.columns["size"][i]])
+            if all(fresh(kind, name) for kind, name in zip(KINDS, combo)):
+                old_rows[combo] = i
+
+    def template(kind, name):
+        return sources[kind][name][0] if name else None
+
+    # One unit per race, holding only the combinations that need computing
+    units = []
+    for race_index, race in enumerate(names["race"]):
+        classes = []
+        for class_index, class_name in enumerate(names["class"]):
+            sizes = [(size_index, template("size", size)) for size_index, size in enumerate(names["size"])
+                     if (race, class_name, size) not in old_rows]
+            if sizes:
+                classes.append((class_index, template("class", class_name), sizes))
+        if classes:
+            units.append((race_index, template("race", race), classes))
+
+    sizes_fingerprint = _hash_bytes(*(fingerprints[f"size/{name}"] for name in names["size"][1:]))
+    func = partial(explore_race, base_character=base_character, benchmarks=benchmarks,
+                   templates_path=templates_path, sizes_fingerprint=sizes_fingerprint)
+    computed = {}
+    for rows in iter_results(func, units, jobs):
+        for i in range(len(rows["cp"])):
+            computed[(rows["race"][i], rows["class"][i], rows["size"][i])] = {column: rows[column][i] for column in COLUMNS}
+
+    # Assemble in race, class, size order from reused and new rows
+    columns = {column: array(typecode) for column, typecode in COLUMNS.items()}
+    for race_index, race in enumerate(names["race"]):
+        for class_index, class_name in enumerate(names["class"]):
+            for size_index, size in enumerate(names["size"]):
+                values = computed.get((race_index, class_index, size_index))
+                if values is None:
+                    i = old_rows[(race, class_name, size)]
+                    values = {column: old.columns[column][i] for column in COLUMNS}
+                    values.update(race=race_index, **{"class": class_index}, size=size_index)
+                for column, value in values.items():
+                    columns[column].append(value)
+
+    table = ComboTable(names, [b["name"] for b in benchmarks], columns, fingerprints, engine)
+    table.recomputed = len(computed)
+    if cache_path:
+        table.save(cache_path)
+    return table
@@ -0,0 +1,84 @@
+"""
+Alternate forms as overlays on the base character
+
+A saved alternate form records only what differs from the character: its
+name, level and budget, its own attributes and defects, and ``stat_deltas``,
+the stat points it adds to (or takes from) the base stats. It carries no
+copy of the base stats or derived values, so a form is a few fields however
+large the sheet, and raising the character's Body raises every form's.
+
+Forms saved with full ``stats``/``derived`` copies still load: form_stats()
+reads them as they are, and encode_form() turns them into overlays.
+
+form_sheet() builds a form's effective stats and derived values on demand.
+The derivation is memoized by its inputs (the effective stats and the form's
+stat-modifying attributes and defects), so forms and states that come out
+the same share one derivation, and repeated reads after a base edit cost one
+derivation per distinct sheet. Metamorphosis entries hold only their own
+attributes and defects already; form_sheet() accepts them too, with the base
+stats unchanged.
+"""
+
+from tools.rules import STATS, character_stat_mods, derive_values
+
+FORM_STAT_RANGE = (1, 20)  # The form editor's stat spinners
+DEFAULT_STAT = 4
+SHEET_CACHE_SIZE = 4096
+
+# (effective stats, stat modifier signature) -> derived values
+_sheets = {}
+
+
+def stat_deltas(stats, base_stats):
+    """The stats that differ from ``base_stats``, as differences"""
+    deltas = {}
+    for stat in STATS:
+        if stat in stats:
+            delta = stats[stat] - base_stats.get(stat, DEFAULT_STAT)
+            if delta:
+                deltas[stat] = delta
+    return deltas
+
+
+def form_stats(form, base_stats):
+    """A form's effective stats on top of ``base_stats``"""
+    if "stats" in form:  # Saved before forms became overlays
+        return {stat: form["stats"].get(stat, base_stats.get(stat, DEFAULT_STAT)) for stat in STATS}
+    deltas = form.get("stat_deltas") or {}
+    low, high = FORM_STAT_RANGE
+    return {stat: min(high, max(low, base_stats.get(stat, DEFAULT_STAT) + deltas.get(stat, 0)))
+            for stat in STATS}
+
+
+def encode_form(form, base_stats):
+    """``form`` as an overlay on ``base_stats``: stat_deltas in place of stats, no derived
+
+    Returns ``form`` itself when it is one already.
+    """
+    if "stats" not in form and "derived" not in form:
+        return form
+    overlay = {key: value for key, value in form.items() if key not in ("stats", "derived", "stat_deltas")}
+    deltas = stat_deltas(form["stats"], base_stats) if "stats" in form else form.get("stat_deltas")
+    if deltas:
+        overlay["stat_deltas"] = deltas
+    return overlay
+
+
+def _mods_key(form):
+    """Everything about a form's attributes and defects that derive_values reads"""
+    attributes = tuple((repr(a["stat_mods"]), a.get("level", 1), a.get("key"), repr(a.get("user_input")))
+                       for a in form.get("attributes", []) if "stat_mods" in a)
+    defects = tuple((repr(d["stat_mods"]), d.get("rank", 1)) for d in form.get("defects", []) if "stat_mods" in d)
+    return attributes, defects
+
+
+def form_sheet(form, base_data):
+    """A form's effective sheet on top of the base character: {"stats": ..., "derived": ...}"""
+    stats = form_stats(form, base_data.get("stats") or {})
+    key = (tuple(stats[stat] for stat in STATS), _mods_key(form))
+    derived = _sheets.get(key)
+    if derived is None:
+        if len(_sheets) >= SHEET_CACHE_SIZE:
+            _sheets.clear()
+        derived = _sheets[key] = derive_values(stats, *character_stat_mods(form))
+    return {"stats": stats, "derived": dict(derived)}
@@ -0,0 +1,461 @@
+"""
+Random NPC generator for BESM Character Generator
+
+Rolls complete characters for mooks and rivals without the GUI. Each NPC
+gets a race, a class and optionally a size template, applied with the same
+dry run TemplateDialog previews use. It also gets a benchmark those
+templates fit, random defects and attributes from the catalog, and stats.
+The CP budget, picked inside the benchmark's point range, is filled exactly:
+
+- stats are brought inside the benchmark's CV, HP/EP and DM ranges, then
+  walk up (or down, when the templates cost more than the budget) without
+  leaving them, taking part of what is left at 2 CP a level
+- attributes take the rest; an odd point goes on a 1 CP/level attribute
+- every NPC is checked with benchmark_warnings, and rolled again if it breaks
+  a stat, attribute level or derived value limit
+
+Weights are keyed "kind/name", for example "race/dwarf", "class/ninja",
+"benchmark/Heroic", "attribute/armour" or "defect/achilles_heel". Anything
+not listed weighs 1, and a weight of 0 leaves it out.
+
+Every NPC is rolled from its own generator seeded with (seed, index). The
+same seed gives the same characters however many worker processes share the
+work, and NPCs are generated in chunks over a process pool.
+
+    python besm.py generate --count 500 --benchmark Adventurer --seed 7 --output-dir npcs/
+"""
+
+import io
+import os
+import re
+import json
+import uuid
+import random
+import contextlib
+from itertools import accumulate
+from dataclasses import dataclass, field
+from functools import partial
+
+from tools.catalog import get_catalog
+from tools.rules import (
+    STATS, STAT_RANGE, DERIVED_KEYS, DERIVED_RANGES, character_stat_mods, derive_values, point_total,
+    load_benchmarks, benchmark_warnings
+)
+from tools.explorer import KINDS, load_template_sources, _engine_lookups
+from tools.size_ladder import TEMPLATES_PATH
+from tools.batch import iter_results
+
+# NPCs per work unit sent to a worker process
+CHUNK_SIZE = 256
+
+# Template draws per attempt before giving up on finding a combination that fits a benchmark
+TEMPLATE_DRAWS = 1000
+
+# Width of the budget range for open-ended benchmarks (no point_range maximum)
+OPEN_RANGE = 49
+
+BASE_STATS = {"Body": 4, "Mind": 4, "Soul": 4}
+
+
+@dataclass(frozen=True, slots=True)
+class NPCOptions:
+    """What to generate; empty name tuples mean every benchmark, race or class
+
+    ``sizes`` is empty by default, so the race's own base size applies.
+    ``max_attributes`` is how many attributes are picked at random before any
+    odd point is topped up.
+    """
+
+    benchmarks: tuple = ()
+    races: tuple = ()
+    classes: tuple = ()
+    sizes: tuple = ()
+    weights: dict = field(default_factory=dict)
+    max_attributes: int = 4
+    max_defects: int = 2
+    attempts: int = 200
+    templates_path: str = TEMPLATES_PATH
+
+
+class GenerationError(ValueError):
+    """No NPC could be rolled within the options"""
+
+
+def _weighted(kind, names, weights):
+    """Return (names, weights) for the names with a positive weight"""
+    pairs = [(name, weights.get(f"{kind}/{name}", 1)) for name in names]
+    pairs = [(name, weight) for name, weight in pairs if weight > 0]
+    return [name for name, _ in pairs], [weight for _, weight in pairs]
+
+
+def _eligible_attribute(record):
+    # Attributes whose cost or effect needs the player's input cannot be rolled
+    cost = record.get("cost_per_level")
+    return isinstance(cost, int) and cost > 0 and not record.get("dynamic_cost") \
+        and not record.get("user_input_required")
+
+
+def _eligible_defect(record):
+    return record.get("cp_refund") is not None and not record.get("requires_description") \
+        and not record.get("is_custom")
+
+
+def _limit(benchmark, key, default):
+    try:
+        return int(benchmark[key])
+    except (KeyError, TypeError, ValueError):
+        return default
+
+
+class _Tables:
+    """Everything an NPC is rolled from, built once per process and options"""
+
+    def __init__(self, options):
+        catalog = get_catalog()
+        weights = options.weights
+        sources = load_template_sources(options.templates_path)
+
+        by_name = {benchmark["name"].lower(): benchmark for benchmark in load_benchmarks()}
+        unknown = [name for name in options.benchmarks if name.lower() not in by_name]
+        if unknown:
+            raise GenerationError(f"unknown benchmark(s): {', '.join(unknown)}")
+        names = [by_name[name.lower()]["name"] for name in options.benchmarks] or [b["name"] for b in by_name.values()]
+        names, self.benchmark_weights = _weighted("benchmark", names, weights)
+        self.benchmarks = [by_name[name.lower()] for name in names]
+        # Benchmark name -> [(derived key, low, high)]
+        self.ranges = {benchmark["name"]: [(key, *benchmark[range_key]) for key, range_key in DERIVED_RANGES
+                                           if benchmark.get(range_key)]
+                       for benchmark in self.benchmarks}
+
+        self.templates = {}
+        self.template_weights = {}
+        for kind, wanted in (("race", options.races), ("class", options.classes), ("size", options.sizes)):
+            available = sources[kind]
+            missing = [name for name in wanted if name not in available]
+            if missing:
+                raise GenerationError(f"unknown {kind} template(s): {', '.join(missing)}")
+            if kind == "size" and not wanted:
+                self.templates[kind], self.template_weights[kind] = [None], None
+                continue
+            names, kind_weights = _weighted(kind, wanted or sorted(available), weights)
+            self.templates[kind] = [(name, available[name][0]) for name in names]
+            self.template_weights[kind] = list(accumulate(kind_weights))
+        if not self.benchmarks or not all(self.templates.values()):
+            raise GenerationError("every benchmark, race or class is weighted out")
+
+        keys, attribute_weights = _weighted(
+            "attribute", [record["key"] for record in catalog.raw_attributes if _eligible_attribute(record)], weights)
+        self.attributes = [catalog.attributes_by_key[key] for key in keys]
+        self.attribute_weights = list(accumulate(attribute_weights))
+        self.one_point_attributes = [record for record in self.attributes if record["cost_per_level"] == 1]
+        keys, defect_weights = _weighted(
+            "defect", [record["key"] for record in catalog.raw_defects if _eligible_defect(record)], weights)
+        self.defects = [catalog.defects_by_key[key] for key in keys]
+        self.defect_weights = list(accumulate(defect_weights))
+        refunds = sorted((record["cp_refund"] * (record.get("max_rank") or 1) for record in self.defects), reverse=True)
+        self.max_refund = sum(refunds[:options.max_defects])
+
+        self.lookups = _engine_lookups()
+        # (race, class, size) -> (base character with those templates applied,
+        # the benchmarks it can fit, the least CP it can be built for)
+        self.templated = {}
+
+    def templated_character(self, race, class_, size):
+        from templates.template_effects import dry_run
+
+        key = (race[0], class_[0], size[0] if size else None)
+        cached = self.templated.get(key)
+        if cached is None:
+            character = {"stats": dict(BASE_STATS), "attributes": [], "defects": []}
+            # Templates log every defect they have to guess a cost for
+            with contextlib.redirect_stdout(io.StringIO()):
+                for kind, template in (("race", race), ("class", class_), ("size", size)):
+                    if template is not None:
+                        character = dry_run(character, template[1], kind, self.lookups)
+            # Template attributes are kept, so benchmarks with a lower max level
+            # are out, and so are those whose budget cannot pay for them even
+            # with every stat at its lowest and the largest defect refunds
+            top_level = max((attr.get("level", 0) for attr in character["attributes"]), default=0)
+            floor_cost = point_total(character) - self.max_refund \
+                - 2 * sum(stat - STAT_RANGE[0] for stat in character["stats"].values())
+            fits = [(benchmark, weight) for benchmark, weight in zip(self.benchmarks, self.benchmark_weights)
+                    if top_level <= _limit(benchmark, "max_attribute_level", top_level)
+                    and (benchmark["point_range"][1] is None or floor_cost <= benchmark["point_range"][1])]
+            # A few templates use level -1 placeholders the character schema rejects
+            if any(attr.get("level", 1) < 1 for attr in character["attributes"]):
+                fits = []
+            cached = self.templated[key] = (character, fits, floor_cost)
+        return cached
+
+
+# Options -> _Tables for this process
+_tables = {}
+
+
+def _tables_for(options):
+    key = repr(options)
+    tables = _tables.get(key)
+    if tables is None:
+        tables = _tables[key] = _Tables(options)
+    return tables
+
+
+def _template_label(kind, template):
+    name, data = template
+    data = data.get("data", data)
+    label = data.get(f"{kind}_name") or data.get("name") or name.replace("_", " ")
+    return label.title() if label.isupper() else label
+
+
+def _new_id(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _attribute(record, level, rng, catalog):
+    from templates.template_effects import build_attribute
+
+    attribute = build_attribute({"name": record["name"], "key": record["key"], "level": level}, catalog.attributes_by_key,
+                                catalog.attributes, catalog)
+    attribute.update(id=_new_id(rng), base_name=record["name"], effective_level=level, enhancements=[], limiters=[])
+    return attribute
+
+
+def _defect(record, rank, rng, catalog):
+    from templates.template_effects import build_defect
+
+    defect = build_defect({"name": record["name"], "key": record["key"], "rank": rank}, catalog.defects_by_key, catalog.defects, catalog)
+    # cp_refund is per rank, as the defect builder counts it
+    defect.update(id=_new_id(rng), base_name=record["name"], cost=-record["cp_refund"] * rank)
+    return defect
+
+
+def _pick(rng, records, cum_weights, taken):
+    """A weighted record whose key is not taken yet, or None"""
+    for _ in range(4):
+        record = rng.choices(records, cum_weights=cum_weights)[0]
+        if record["key"] not in taken:
+            return record
+    return None
+
+
+def _violation(stats, mods, ranges):
+    """How far outside the benchmark's derived value ranges these stats land"""
+    derived = derive_values(stats, *mods)
+    total = 0
+    for key, low, high in ranges:
+        value = derived[key]
+        if value < low:
+            total += low - value
+        elif high is not None and value > high:
+            total += value - high
+    return total
+
+
+def _stat_moves(stats, step, max_stat):
+    return [stat for stat in STATS if STAT_RANGE[0] <= stats[stat] + step <= max_stat]
+
+
+def _repair(stats, mods, ranges, max_stat):
+    """Move stats until they are inside the ranges; returns (levels moved, violation left)"""
+    moved = 0
+    current = _violation(stats, mods, ranges)
+    while current:
+        best = None
+        for step in (1, -1):
+            for stat in _stat_moves(stats, step, max_stat):
+                stats[stat] += step
+                violation = _violation(stats, mods, ranges)
+                stats[stat] -= step
+                if violation < current and (best is None or violation < best[0]):
+                    best = (violation, stat, step)
+        if best is None:
+            break
+        current, stat, step = best
+        stats[stat] += step
+        moved += step
+    return moved, current
+
+
+def _walk(stats, levels, mods, ranges, max_stat, rng):
+    """Move stats ``levels`` levels at random (down when negative) while staying in range; returns levels moved"""
+    step = 1 if levels > 0 else -1
+    moved = 0
+    # Derived values only grow with the stats, so a stat that cannot move
+    # this way now never can while the others move the same way
+    movable = _stat_moves(stats, step, max_stat)
+    while moved != levels and movable:
+        stat = rng.choice(movable)
+        stats[stat] += step
+        if _violation(stats, mods, ranges):
+            stats[stat] -= step
+            movable.remove(stat)
+            continue
+        moved += step
+        if not STAT_RANGE[0] <= stats[stat] + step <= max_stat:
+            movable.remove(stat)
+    return moved
+
+
+def _roll(tables, rng, options, catalog):
+    """One attempt at an NPC; returns (character, benchmark, template labels) or None when it does not fit"""
+    # Template combinations are cached, so drawing until one can fit a benchmark is cheap
+    for _ in range(TEMPLATE_DRAWS):
+        picks = {kind: rng.choices(tables.templates[kind], cum_weights=tables.template_weights[kind])[0]
+                 for kind in KINDS}
+        templated, fits, floor_cost = tables.templated_character(picks["race"], picks["class"], picks["size"])
+        if fits:
+            break
+    else:
+        return None
+    benchmark = rng.choices([b for b, _ in fits], weights=[w for _, w in fits])[0]
+    ranges = tables.ranges[benchmark["name"]]
+
+    low, high = benchmark["point_range"]
+    high = low + OPEN_RANGE if high is None else high
+    budget = rng.randint(max(low, min(floor_cost, high)), high)
+    max_stat = min(STAT_RANGE[1], _limit(benchmark, "max_stat", STAT_RANGE[1]))
+    max_level = _limit(benchmark, "max_attribute_level", 6)
+
+    stats = {stat: min(max_stat, templated["stats"][stat]) for stat in STATS}
+    # Template records are shared by every NPC with those templates; each gets its own copies
+    attributes = [dict(attr, id=_new_id(rng)) for attr in templated["attributes"]]
+    defects = [dict(defect, id=_new_id(rng)) for defect in templated["defects"]]
+    character = {"stats": stats, "attributes": attributes, "defects": defects}
+
+    taken = {defect.get("key") for defect in defects}
+    for _ in range(rng.randint(0, options.max_defects)):
+        record = _pick(rng, tables.defects, tables.defect_weights, taken)
+        if record is not None:
+            defects.append(_defect(record, rng.randint(1, record.get("max_rank") or 1), rng, catalog))
+            taken.add(record["key"])
+
+    # None of the attributes rolled below have stat_mods that the ranges check
+    mods = character_stat_mods(character)
+    moved, violation = _repair(stats, mods, ranges, max_stat)
+    if violation:
+        return None
+    remaining = budget - point_total(character)
+    if remaining < 0:
+        levels = -((1 - remaining) // 2)
+    else:
+        levels = int(remaining * rng.uniform(0.35, 0.8)) // 2
+    remaining -= 2 * _walk(stats, levels, mods, ranges, max_stat, rng)
+    if remaining < 0:
+        return None
+
+    taken = {attr.get("key") for attr in attributes}
+    added = []
+    picks_left = rng.randint(1, options.max_attributes)
+    while remaining > 0 and picks_left:
+        picks_left -= 1
+        record = _pick(rng, tables.attributes, tables.attribute_weights, taken)
+        top = min(max_level, remaining // record["cost_per_level"]) if record else 0
+        if top < 1:
+            continue
+        # The last pick takes as much as it can
+        attribute = _attribute(record, top if not picks_left else rng.randint(1, top), rng, catalog)
+        attributes.append(attribute)
+        added.append(attribute)
+        taken.add(record["key"])
+        remaining -= attribute["cost"]
+
+    # Whatever is left goes on 1 CP/level attributes, raised or bought
+    while remaining > 0:
+        raisable = [attr for attr in added if attr["cost_per_level"] == 1 and attr["level"] < max_level]
+        if raisable:
+            attribute = rng.choice(raisable)
+            levels = min(remaining, max_level - attribute["level"])
+            attribute["level"] += levels
+            attribute["effective_level"] = attribute["level"]
+            attribute["cost"] += levels
+        else:
+            record = _pick(rng, tables.one_point_attributes, None, taken)
+            if record is None:
+                return None
+            levels = min(remaining, max_level)
+            attribute = _attribute(record, levels, rng, catalog)
+            attributes.append(attribute)
+            added.append(attribute)
+            taken.add(record["key"])
+        remaining -= levels
+
+    derived = derive_values(stats, *character_stat_mods(character))
+    if benchmark_warnings(character, benchmark, derived):
+        return None
+    character["derived"] = derived
+    character["totalPoints"] = budget
+    labels = {kind: _template_label(kind, pick) if pick else "" for kind, pick in picks.items()}
+    return character, benchmark, labels
+
+
+def blank_character():
+    """An empty character in the save format, as File → New starts from"""
+    return {
+        "name": "", "player": "", "gm": "", "race": "", "class": "", "homeworld": "", "size": "",
+        "background": {"origin": "", "faction": "", "goals": "", "personality": "", "history": ""},
+        "stats": dict(BASE_STATS),
+        "derived": {key: 0 for key in DERIVED_KEYS},
+        "drama_points": {"current": 3, "max": 5},
+        "attributes": [], "defects": [], "skills": [], "weapons": [], "armor": [], "items": [],
+        "techniques": [], "templates": [], "alternate_forms": [], "metamorphosis": [], "companions": [],
+        "minions": [], "relationships": [], "notes": "", "custom_fields": {}, "custom_rules": [],
+        "saved_loadouts": [], "benchmark": None, "version": "1.0", "totalPoints": 0,
+    }
+
+
+def generate_npc(index, seed=0, options=None):
+    """Roll NPC number ``index`` of a seeded run; returns character data in the save format"""
+    options = options or NPCOptions()
+    tables = _tables_for(options)
+    catalog = get_catalog()
+    rng = random.Random(f"{seed}:{index}")
+    for _ in range(options.attempts):
+        rolled = _roll(tables, rng, options, catalog)
+        if rolled is not None:
+            break
+    else:
+        raise GenerationError(f"no NPC fit the options in {options.attempts} attempts (NPC {index + 1})")
+
+    character, benchmark, labels = rolled
+    data = blank_character()
+    data.update(character)
+    data.update({"name": " ".join(label for label in (labels["race"], labels["class"]) if label) + f" {index + 1}",
+                 "race": labels["race"], "class": labels["class"], "size": labels["size"],
+                 "benchmark": benchmark["name"], "notes": f"Generated NPC (seed {seed}, #{index + 1})"})
+    return data
+
+
+def _generate_chunk(bounds, seed, options):
+    start, stop = bounds
+    return [generate_npc(index, seed, options) for index in range(start, stop)]
+
+
+def iter_npcs(count, seed=0, options=None, jobs=1, chunk_size=CHUNK_SIZE):
+    """Yield ``count`` NPCs in order, generated in chunks over ``jobs`` worker processes"""
+    options = options or NPCOptions()
+    # Bad options fail here rather than in every worker
+    _tables_for(options)
+    chunks = [(start, min(count, start + chunk_size)) for start in range(0, count, chunk_size)]
+    for npcs in iter_results(partial(_generate_chunk, seed=seed, options=options), chunks, jobs):
+        yield from npcs
+
+
+def generate_npcs(count, seed=0, options=None, jobs=1):
+    """Return a list of ``count`` NPCs (see iter_npcs)"""
+    return list(iter_npcs(count, seed, options, jobs))
+
+
+_UNSAFE_RE = re.compile(r"[^A-Za-z0-9]+")
+
+
+def npc_file_name(data):
+    """File name for a generated NPC: its name in lower case, with underscores"""
+    return (_UNSAFE_RE.sub("_", data.get("name") or "npc").strip("_").lower() or "npc") + ".json"
+
+
+def write_npc(data, output_dir):
+    """Save an NPC into output_dir; returns the path"""
+    path = os.path.join(output_dir, npc_file_name(data))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
+    return path
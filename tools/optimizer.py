@@ -0,0 +1,246 @@
+"""
+Point-buy optimizer for BESM Character Generator
+
+Given a CP budget (starting + earned), a benchmark and the derived values to
+maximise, proposes Body/Mind/Soul values and levels of the catalog attributes
+that have stat_mods, within the benchmark's max_stat and max_attribute_level.
+Costs follow point_total (2 CP per stat level, cost_per_level x level for
+attributes) and derived values come from rules.derive_values.
+
+The search is exact. Choices are added one at a time, and partial builds are
+merged whenever they add up to the same modifiers (a Body of 6 from the stat
+or from Body 5 + Augmented 1 derive identically), keeping the cheapest.
+The distinct end states are then evaluated in one pass and reduced to the
+Pareto front over the targets (the cheapest build for each point on it).
+"""
+
+from dataclasses import dataclass
+
+from tools.catalog import get_catalog
+from tools.rules import (
+    STATS, STAT_RANGE, DERIVED_KEYS, collect_stat_mods, derive_values,
+    load_benchmarks, benchmark_warnings
+)
+
+# Offsets into a state's modifier tuple: the three stats, then the additive
+# derived modifiers, then the derived multipliers
+_ADD = len(STATS)
+_MUL = _ADD + len(DERIVED_KEYS)
+
+
+@dataclass(frozen=True, slots=True)
+class Choice:
+    """A stat or an attribute (with its stat_target, for Augmented) the optimizer buys levels of"""
+
+    name: str
+    key: str
+    stat_target: str
+    cost_per_level: int
+    low: int
+    high: int
+    effects: tuple  # per level from low: ((offset, amount), ...) to add or multiply in
+
+    @property
+    def is_stat(self):
+        return not self.key
+
+    @property
+    def label(self):
+        return f"{self.name} ({self.stat_target})" if self.stat_target else self.name
+
+
+@dataclass(frozen=True, slots=True)
+class Build:
+    """One proposed build: stats, attribute levels, and what they come to"""
+
+    stats: dict
+    attributes: tuple  # (Choice, level) for each attribute bought
+    cp: int
+    derived: dict
+    warnings: tuple
+
+    def describe(self):
+        parts = [" ".join(f"{stat} {self.stats[stat]}" for stat in STATS)]
+        parts.extend(f"{choice.label} {level}" for choice, level in self.attributes)
+        return ", ".join(parts)
+
+    def to_character(self, base=None):
+        """Return base (or a blank character) with these stats and the attributes added"""
+        from templates.template_effects import build_attribute
+
+        catalog = get_catalog()
+        character = dict(base or {"attributes": [], "defects": []})
+        character["stats"] = dict(self.stats)
+        attributes = list(character.get("attributes", []))
+        for choice, level in self.attributes:
+            entry = {"key": choice.key, "name": choice.name, "level": level}
+            if choice.stat_target:
+                entry["user_input"] = {"stat_target": choice.stat_target}
+            attributes.append(build_attribute(entry, catalog.attributes_by_key, catalog.attributes, catalog))
+        character["attributes"] = attributes
+        return character
+
+
+def _limit(benchmark, key, default):
+    value = benchmark.get(key)
+    return default if value is None else int(value)
+
+
+def _effect(attributes=(), defects=()):
+    """The sparse ((offset, amount), ...) adds and multiplies for some stat_mods"""
+    base_mods, derived_mods, multipliers = collect_stat_mods(attributes, defects)
+    adds = [(i, base_mods[stat]) for i, stat in enumerate(STATS) if base_mods[stat]]
+    adds.extend((_ADD + i, derived_mods[key]) for i, key in enumerate(DERIVED_KEYS) if derived_mods[key])
+    muls = tuple((_MUL + i, multipliers[key]) for i, key in enumerate(DERIVED_KEYS) if multipliers[key] != 1)
+    return tuple(adds), muls
+
+
+def build_choices(benchmark, catalog=None):
+    """Return the stat and attribute Choices a benchmark allows
+
+    Attributes are the catalog ones with stat_mods that change a stat or a
+    derived value; dynamic ones (Augmented) get one Choice per stat.
+    """
+    catalog = catalog or get_catalog()
+    max_stat = min(_limit(benchmark, "max_stat", STAT_RANGE[1]), STAT_RANGE[1])
+    max_level = _limit(benchmark, "max_attribute_level", STAT_RANGE[1])
+    low_stat = STAT_RANGE[0]
+
+    stats = [Choice(stat, "", "", 2, low_stat, max_stat,
+                    tuple((((i, level),), ()) for level in range(low_stat, max_stat + 1)))
+             for i, stat in enumerate(STATS)]
+    attributes = []
+    for attr in catalog.raw_attributes:
+        stat_mods = attr.get("stat_mods")
+        if not stat_mods:
+            continue
+        levels = [int(level) for level in attr.get("levels", {}) if str(level).isdigit()]
+        high = min(max_level, max(levels)) if levels else max_level
+        targets = STATS if stat_mods.get("dynamic") else ("",)
+        for target in targets:
+            user_input = {"stat_target": target} if target else None
+            # Level 0 is not buying it (multipliers are not scaled by level)
+            effects = (((), ()),) + tuple(_effect([(stat_mods, level, attr.get("key"), user_input)])
+                                           for level in range(1, high + 1))
+            # Attributes that only touch things outside the derived values (Armour Rating)
+            if any(adds or muls for adds, muls in effects):
+                attributes.append(Choice(attr["name"], attr.get("key", ""), target, attr.get("cost_per_level") or 0,
+                                         0, high, effects))
+
+    # Each stat is followed by the attributes that raise it, so partial builds
+    # with the same total in that stat merge before the next stat multiplies them
+    choices = []
+    for stat in stats:
+        choices.append(stat)
+        choices.extend(choice for choice in attributes if choice.stat_target == stat.name)
+    choices.extend(choice for choice in attributes if not choice.stat_target)
+    return choices
+
+
+def _apply(state, effect):
+    adds, muls = effect
+    if not (adds or muls):
+        return state
+    state = list(state)
+    for offset, amount in adds:
+        state[offset] += amount
+    for offset, factor in muls:
+        state[offset] *= factor
+    return tuple(state)
+
+
+_NO_BASE_MODS = dict.fromkeys(STATS, 0)
+
+
+def _derive(state):
+    # Base stat modifiers are already added into the stats
+    stats = dict(zip(STATS, state[:_ADD]))
+    derived_mods = dict(zip(DERIVED_KEYS, state[_ADD:_MUL]))
+    multipliers = dict(zip(DERIVED_KEYS, state[_MUL:]))
+    return derive_values(stats, _NO_BASE_MODS, derived_mods, multipliers)
+
+
+def _pareto(candidates):
+    """Keep the (objectives, cost, ...) entries no other entry beats on every objective"""
+    # Highest first and cheapest first on ties, so a dominating entry is always seen first
+    candidates = sorted(candidates, key=lambda c: (tuple(-v for v in c[0]), c[1]))
+    front = []
+    for candidate in candidates:
+        objectives = candidate[0]
+        if not any(all(a >= b for a, b in zip(kept[0], objectives)) for kept in front):
+            front.append(candidate)
+    return front
+
+
+def _spread(front, limit):
+    # Evenly spaced along the front, so both extremes are always included
+    if limit is None or len(front) <= limit:
+        return front
+    if limit == 1:
+        return front[:1]
+    step = (len(front) - 1) / (limit - 1)
+    return [front[round(i * step)] for i in range(limit)]
+
+
+def optimize(budget, benchmark, targets, base=None, within_ranges=False, limit=5, catalog=None):
+    """Return up to ``limit`` Pareto-optimal Builds maximising ``targets``
+
+    ``budget`` is the total CP (starting + earned), ``benchmark`` a
+    benchmarks.json entry or its name and ``targets`` derived value keys such
+    as ("ACV", "HP"). ``base`` is a character whose attributes and defects are
+    kept (and paid for); only its stats are replaced. With ``within_ranges``
+    builds outside the benchmark's CV, HP/EP and DM ranges are dropped.
+    Builds come back ordered by the first target, highest first.
+    """
+    if isinstance(benchmark, str):
+        name = benchmark
+        benchmark = next((b for b in load_benchmarks() if b["name"].lower() == name.lower()), None)
+        if benchmark is None:
+            raise ValueError(f"unknown benchmark '{name}'")
+    unknown = [target for target in targets if target not in DERIVED_KEYS]
+    if unknown or not targets:
+        raise ValueError(f"targets must be some of {', '.join(DERIVED_KEYS)}, not {unknown or 'nothing'}")
+
+    choices = build_choices(benchmark, catalog)
+    base = base or {"attributes": [], "defects": []}
+
+    # What the base character already has: its modifiers and its non-stat cost
+    kept_attributes = [(a["stat_mods"], a.get("level", 1), a.get("key"), a.get("user_input"))
+                       for a in base.get("attributes", []) if "stat_mods" in a]
+    kept_defects = [(d["stat_mods"], d.get("rank", 1)) for d in base.get("defects", []) if "stat_mods" in d]
+    kept_cost = sum(entry.get("cost", 0) for key in ("attributes", "defects", "weapons") for entry in base.get(key, []))
+    start = _apply((0,) * _MUL + (1,) * len(DERIVED_KEYS), _effect(kept_attributes, kept_defects))
+
+    # state -> (cost, CP on attributes, levels): the cheapest way to reach each
+    # set of modifiers, preferring plain stat levels at equal cost
+    states = {start: (kept_cost, 0, ())}
+    for choice in choices:
+        next_states = {}
+        for state, (cost, attr_cost, levels) in states.items():
+            for level, effect in enumerate(choice.effects, start=choice.low):
+                spent = level * choice.cost_per_level
+                if cost + spent > budget:
+                    break
+                reached = _apply(state, effect)
+                value = (cost + spent, attr_cost if choice.is_stat else attr_cost + spent, levels + (level,))
+                known = next_states.get(reached)
+                if known is None or value[:2] < known[:2]:
+                    next_states[reached] = value
+        states = next_states
+
+    candidates = []
+    for state, (cost, _, levels) in states.items():
+        derived = _derive(state)
+        if within_ranges and benchmark_warnings({"stats": {}}, benchmark, derived):
+            continue
+        candidates.append((tuple(derived[target] for target in targets), cost, levels, derived))
+
+    builds = []
+    for objectives, cost, levels, derived in _spread(_pareto(candidates), limit):
+        stats = {choice.name: level for choice, level in zip(choices, levels) if choice.is_stat}
+        attributes = tuple((choice, level) for choice, level in zip(choices, levels) if not choice.is_stat and level)
+        build = Build(stats, attributes, cost, derived, ())
+        character = build.to_character(base)
+        builds.append(Build(stats, attributes, cost, derived,
+                            tuple(benchmark_warnings(character, benchmark, derived))))
+    return builds
@@ -2,21 +2,201 @@
 PDF Export functionality for BESM Character Generator
 """
 
+import io
 import os
+import copy
+import json
+import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from functools import partial
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, HRFlowable
+from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, HRFlowable, Flowable
 
-def export_character_to_pdf(character_data, output_path=None):
+from tools.batch import iter_results
+from tools.forms import form_stats
+from tools.snapshot import freeze
+
+def prepare_export_data(character_data, base=None):
+    """Return a frozen snapshot of the character with the list/dict fields the exporter expects
+
+    Unchanged subtrees are shared with ``base`` (an earlier snapshot) or with
+    character_data itself when it is already frozen, instead of deep-copied.
+    """
+    export_data = freeze(character_data, base)
+
+    fixes = {}
+    # Ensure stats is a dictionary
+    if not isinstance(export_data.get("stats"), dict):
+        fixes["stats"] = {"Body": 1, "Mind": 1, "Soul": 1}
+
+    # Ensure attributes, defects and skills are lists
+    for key in ("attributes", "defects", "skills"):
+        if not isinstance(export_data.get(key), list):
+            fixes[key] = []
+    return export_data.replace(**fixes) if fixes else export_data
+
+def _new_document(output, doc_class=SimpleDocTemplate, **kwargs):
+    return doc_class(
+        output,
+        pagesize=letter,
+        rightMargin=0.5*inch,
+        leftMargin=0.5*inch,
+        topMargin=0.5*inch,
+        bottomMargin=0.5*inch,
+        **kwargs
+    )
+
+TABLE_STYLES = {
+    # Label column on the left (basic info, item details)
+    'label_table': [
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ],
+    'stats_table': [
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ],
+    # Header row (attribute, defect and skill lists)
+    'header_table': [
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ],
+    # Header and subtotal rows (CP breakdown)
+    'breakdown_table': [
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
+        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ],
+    'summary_table': [
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
+        ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ],
+    'contents_table': [
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('ALIGN', (-1, 0), (-1, -1), 'RIGHT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ],
+}
+
+# Built sections kept per renderer (one per process)
+SECTION_CACHE_SIZE = 256
+
+class PdfRenderer:
+    """Paragraph styles, table styles and fonts shared by every export.
+
+    Built once per process by get_renderer(); the styles are only read while
+    building stories, so single exports, batch workers and the campaign book
+    all reuse the same instance.
+
+    It also caches each sheet section's flowables by a hash of the data the
+    section reads. reportlab leaves layout state on flowables it has placed
+    (wrapped size, _postponed), so the cache keeps pristine originals and hands
+    out shallow copies that share the parsed paragraphs and table cells.
+    """
+
+    def __init__(self):
+        self.section_cache = OrderedDict()  # (section, data hash) -> flowables
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache_lock = threading.Lock()
+        self.styles = self._build_styles()
+        self.table_styles = {name: TableStyle(commands) for name, commands in TABLE_STYLES.items()}
+        # Load the fonts (and their width tables) the styles use up front
+        for name in ("Title", "SectionHeader", "Subheader", "Normal"):
+            pdfmetrics.getFont(self.styles[name].fontName)
+
+    def section(self, name, data_hash, build):
+        """Return fresh copies of a section's cached flowables, calling build() on a miss"""
+        key = (name, data_hash)
+        with self._cache_lock:
+            flowables = self.section_cache.get(key)
+            if flowables is not None:
+                self.section_cache.move_to_end(key)
+                self.cache_hits += 1
+
+        if flowables is None:
+            flowables = build()
+            with self._cache_lock:
+                self.cache_misses += 1
+                self.section_cache[key] = flowables
+                if len(self.section_cache) > SECTION_CACHE_SIZE:
+                    self.section_cache.popitem(last=False)
+        return [copy.copy(flowable) for flowable in flowables]
+
+    @staticmethod
+    def _build_styles():
+        styles = getSampleStyleSheet()
+        styles.add(ParagraphStyle(
+            name='SectionHeader',
+            parent=styles['Heading2'],
+            spaceAfter=6,
+            spaceBefore=12,
+            textColor=colors.darkblue
+        ))
+        styles.add(ParagraphStyle(
+            name='Subheader',
+            parent=styles['Heading3'],
+            spaceBefore=6,
+            textColor=colors.darkblue
+        ))
+        styles.add(ParagraphStyle(
+            name='Normal_Indent',
+            parent=styles['Normal'],
+            leftIndent=20
+        ))
+        return styles
+
+_renderer = None
+
+def get_renderer():
+    """Return the process-wide PdfRenderer, creating it on first use"""
+    global _renderer
+    if _renderer is None:
+        _renderer = PdfRenderer()
+    return _renderer
+
+class ExportCancelled(Exception):
+    """Raised from a progress callback to abandon an export"""
+
+def _attach_progress(doc, progress):
+    """Report (flowables done, flowables total) to progress while the document builds"""
+    state = {"total": 0}
+
+    def callback(kind, value):
+        if kind == "SIZE_EST":
+            state["total"] = value
+        elif kind == "PROGRESS":
+            progress(value, state["total"])
+
+    doc.setProgressCallBack(callback)
+
+def export_character_to_pdf(character_data, output_path=None, progress=None, renderer=None):
     """
     Export character data to a PDF file
     
     Args:
         character_data (dict): The character data dictionary
         output_path (str, optional): Path to save the PDF. If None, saves to desktop with character name
+        progress (callable, optional): Called with (done, total) flowables during layout;
+            raise ExportCancelled from it to stop the export
+        renderer (PdfRenderer, optional): Styles to use, defaults to get_renderer()
     
     Returns:
         str: Path to the saved PDF file
@@ -29,37 +209,22 @@ def export_character_to_pdf(character_data, output_path=None):
         output_path = os.path.join(desktop, f"{char_name}_{timestamp}.pdf")
     
     # Create the document
-    doc = SimpleDocTemplate(
-        output_path,
-        pagesize=letter,
-        rightMargin=0.5*inch,
-        leftMargin=0.5*inch,
-        topMargin=0.5*inch,
-        bottomMargin=0.5*inch
-    )
+    doc = _new_document(output_path)
+    if progress is not None:
+        _attach_progress(doc, progress)
+    try:
+        doc.build(build_character_story(character_data, renderer))
+    except ExportCancelled:
+        # Don't leave a half-written sheet behind
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
     
-    # Styles
-    styles = getSampleStyleSheet()
-    styles.add(ParagraphStyle(
-        name='SectionHeader',
-        parent=styles['Heading2'],
-        spaceAfter=6,
-        spaceBefore=12,
-        textColor=colors.darkblue
-    ))
-    styles.add(ParagraphStyle(
-        name='Subheader',
-        parent=styles['Heading3'],
-        spaceBefore=6,
-        textColor=colors.darkblue
-    ))
-    styles.add(ParagraphStyle(
-        name='Normal_Indent',
-        parent=styles['Normal'],
-        leftIndent=20
-    ))
-    
-    # Story (content elements)
+    return output_path
+
+def _basic_info_section(character_data, renderer):
+    """Title and character information table"""
+    styles = renderer.styles
     story = []
     
     # Title
@@ -86,17 +251,20 @@ def export_character_to_pdf(character_data, output_path=None):
     
     # Create table for basic info
     basic_table = Table(basic_info, colWidths=[2.5*inch, 4*inch])
-    basic_table.setStyle(TableStyle([
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-    ]))
+    basic_table.setStyle(renderer.table_styles['label_table'])
     story.append(basic_table)
     story.append(Spacer(1, 0.2*inch))
     
     # Horizontal line
     story.append(HRFlowable(width="100%", thickness=1, color=colors.darkblue))
     
+    return story
+
+def _stats_section(character_data, renderer):
+    """Stats with their derived values"""
+    styles = renderer.styles
+    story = []
+    
     # Stats
     story.append(Paragraph("Stats", styles['SectionHeader']))
     
@@ -128,19 +296,20 @@ def export_character_to_pdf(character_data, output_path=None):
     stats_data.append(["Combat Values", "", f"Combat Value: {cv}, Attack CV: {acv}, Defense CV: {dcv}, Damage Multiplier: {dm}"])
     
     stats_table = Table(stats_data, colWidths=[2*inch, 1.5*inch, 3.5*inch])
-    stats_table.setStyle(TableStyle([
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-        ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-    ]))
+    stats_table.setStyle(renderer.table_styles['stats_table'])
     story.append(stats_table)
     story.append(Spacer(1, 0.2*inch))
     
     # Horizontal line
     story.append(HRFlowable(width="100%", thickness=1, color=colors.darkblue))
     
+    return story
+
+def _attributes_section(character_data, renderer):
+    """Attribute list"""
+    styles = renderer.styles
+    story = []
+    
     # Attributes
     story.append(Paragraph("Attributes", styles['SectionHeader']))
     
@@ -157,11 +326,7 @@ def export_character_to_pdf(character_data, output_path=None):
             ])
         
         attr_table = Table(attr_data, colWidths=[2*inch, 0.75*inch, 0.75*inch, 3.5*inch])
-        attr_table.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
+        attr_table.setStyle(renderer.table_styles['header_table'])
         story.append(attr_table)
     else:
         story.append(Paragraph("No attributes selected.", styles['Normal']))
@@ -171,6 +336,13 @@ def export_character_to_pdf(character_data, output_path=None):
     # Horizontal line
     story.append(HRFlowable(width="100%", thickness=1, color=colors.darkblue))
     
+    return story
+
+def _defects_section(character_data, renderer):
+    """Defect list"""
+    styles = renderer.styles
+    story = []
+    
     # Defects
     story.append(Paragraph("Defects", styles['SectionHeader']))
     
@@ -187,11 +359,7 @@ def export_character_to_pdf(character_data, output_path=None):
             ])
         
         defect_table = Table(defect_data, colWidths=[2*inch, 0.75*inch, 0.75*inch, 3.5*inch])
-        defect_table.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
+        defect_table.setStyle(renderer.table_styles['header_table'])
         story.append(defect_table)
     else:
         story.append(Paragraph("No defects selected.", styles['Normal']))
@@ -201,6 +369,13 @@ def export_character_to_pdf(character_data, output_path=None):
     # Horizontal line
     story.append(HRFlowable(width="100%", thickness=1, color=colors.darkblue))
     
+    return story
+
+def _skills_section(character_data, renderer):
+    """Skill list"""
+    styles = renderer.styles
+    story = []
+    
     # Skills
     story.append(Paragraph("Skills", styles['SectionHeader']))
     
@@ -217,109 +392,103 @@ def export_character_to_pdf(character_data, output_path=None):
             ])
         
         skill_table = Table(skill_data, colWidths=[2*inch, 0.75*inch, 1.25*inch, 3*inch])
-        skill_table.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
+        skill_table.setStyle(renderer.table_styles['header_table'])
         story.append(skill_table)
     else:
         story.append(Paragraph("No skills selected.", styles['Normal']))
     
-    # Add special sections if they exist
-    special_sections = [
-        ("companions", "Companions"),
-        ("items", "Items"),
-        ("minions", "Minions"),
-        ("alternate_forms", "Alternate Forms"),
-        ("metamorphosis", "Metamorphosis")
-    ]
+    return story
+
+def _special_section(character_data, renderer, section_key, section_title):
+    """Companions, items, minions, alternate forms or metamorphosis, on a new page"""
+    styles = renderer.styles
+    story = []
+    if not character_data.get(section_key, []):
+        return story
     
-    for section_key, section_title in special_sections:
-        if character_data.get(section_key, []):
-            # Add page break for each special section
-            story.append(PageBreak())
-            story.append(Paragraph(section_title, styles['SectionHeader']))
-            
-            items = character_data.get(section_key, [])
-            for item in items:
-                story.append(Paragraph(item.get("name", "Unnamed"), styles['Subheader']))
-                
-                # Create a list of item details
-                details = []
-                
-                # Add common fields
-                if "level" in item:
-                    details.append(["Level", str(item.get("level", 0))])
-                if "cost" in item:
-                    details.append(["Cost", str(item.get("cost", 0)) + " CP"])
-                if "total_cp" in item:
-                    details.append(["Total CP", str(item.get("total_cp", 0))])
-                if "description" in item:
-                    details.append(["Description", item.get("description", "")])
-                
-                # Add section-specific fields
-                if section_key == "companions":
-                    # Add companion stats
-                    if "stats" in item:
-                        stats = item.get("stats", {})
-                        details.append(["Body", str(stats.get("Body", 0))])
-                        details.append(["Mind", str(stats.get("Mind", 0))])
-                        details.append(["Soul", str(stats.get("Soul", 0))])
-                
-                elif section_key == "minions":
-                    # Add minion count
-                    if "count" in item:
-                        details.append(["Count", str(item.get("count", 0))])
-                
-                # Create table for item details
-                if details:
-                    detail_table = Table(details, colWidths=[2.5*inch, 4.5*inch])
-                    detail_table.setStyle(TableStyle([
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ]))
-                    story.append(detail_table)
-                
-                # Add attributes and defects if they exist
-                if "attributes" in item and item["attributes"]:
-                    story.append(Paragraph("Attributes:", styles['Subheader']))
-                    attr_data = [["Name", "Level", "Cost"]]
-                    for attr in item["attributes"]:
-                        attr_data.append([
-                            attr.get("name", ""),
-                            str(attr.get("level", 0)),
-                            str(attr.get("cost", 0))
-                        ])
-                    attr_table = Table(attr_data, colWidths=[3.5*inch, 1.5*inch, 2*inch])
-                    attr_table.setStyle(TableStyle([
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ]))
-                    story.append(attr_table)
-                
-                if "defects" in item and item["defects"]:
-                    story.append(Paragraph("Defects:", styles['Subheader']))
-                    defect_data = [["Name", "Rank", "Value"]]
-                    for defect in item["defects"]:
-                        defect_data.append([
-                            defect.get("name", ""),
-                            str(defect.get("rank", 0)),
-                            str(defect.get("cost", 0))
-                        ])
-                    defect_table = Table(defect_data, colWidths=[3.5*inch, 1.5*inch, 2*inch])
-                    defect_table.setStyle(TableStyle([
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ]))
-                    story.append(defect_table)
-                
-                story.append(Spacer(1, 0.2*inch))
-                story.append(HRFlowable(width="100%", thickness=1, color=colors.grey))
-                story.append(Spacer(1, 0.2*inch))
+    # Add page break for each special section
+    story.append(PageBreak())
+    story.append(Paragraph(section_title, styles['SectionHeader']))
+
+    items = character_data.get(section_key, [])
+    for item in items:
+        story.append(Paragraph(item.get("name", "Unnamed"), styles['Subheader']))
+
+        # Create a list of item details
+        details = []
+
+        # Add common fields
+        if "level" in item:
+            details.append(["Level", str(item.get("level", 0))])
+        if "cost" in item:
+            details.append(["Cost", str(item.get("cost", 0)) + " CP"])
+        if "total_cp" in item:
+            details.append(["Total CP", str(item.get("total_cp", 0))])
+        if "description" in item:
+            details.append(["Description", item.get("description", "")])
+
+        # Add section-specific fields
+        if section_key == "companions":
+            # Add companion stats
+            if "stats" in item:
+                stats = item.get("stats", {})
+                details.append(["Body", str(stats.get("Body", 0))])
+                details.append(["Mind", str(stats.get("Mind", 0))])
+                details.append(["Soul", str(stats.get("Soul", 0))])
+
+        elif section_key == "minions":
+            # Add minion count
+            if "count" in item:
+                details.append(["Count", str(item.get("count", 0))])
+
+        elif section_key == "alternate_forms":
+            # Forms are overlays; show their stats on top of the character's
+            stats = form_stats(item, character_data.get("stats") or {})
+            details.extend([stat, str(stats[stat])] for stat in ("Body", "Mind", "Soul"))
+
+        # Create table for item details
+        if details:
+            detail_table = Table(details, colWidths=[2.5*inch, 4.5*inch])
+            detail_table.setStyle(renderer.table_styles['label_table'])
+            story.append(detail_table)
+
+        # Add attributes and defects if they exist
+        if "attributes" in item and item["attributes"]:
+            story.append(Paragraph("Attributes:", styles['Subheader']))
+            attr_data = [["Name", "Level", "Cost"]]
+            for attr in item["attributes"]:
+                attr_data.append([
+                    attr.get("name", ""),
+                    str(attr.get("level", 0)),
+                    str(attr.get("cost", 0))
+                ])
+            attr_table = Table(attr_data, colWidths=[3.5*inch, 1.5*inch, 2*inch])
+            attr_table.setStyle(renderer.table_styles['header_table'])
+            story.append(attr_table)
+
+        if "defects" in item and item["defects"]:
+            story.append(Paragraph("Defects:", styles['Subheader']))
+            defect_data = [["Name", "Rank", "Value"]]
+            for defect in item["defects"]:
+                defect_data.append([
+                    defect.get("name", ""),
+                    str(defect.get("rank", 0)),
+                    str(defect.get("cost", 0))
+                ])
+            defect_table = Table(defect_data, colWidths=[3.5*inch, 1.5*inch, 2*inch])
+            defect_table.setStyle(renderer.table_styles['header_table'])
+            story.append(defect_table)
+
+        story.append(Spacer(1, 0.2*inch))
+        story.append(HRFlowable(width="100%", thickness=1, color=colors.grey))
+        story.append(Spacer(1, 0.2*inch))
+    
+    return story
+
+def _cp_breakdown_section(character_data, renderer):
+    """Final page with the character point calculations"""
+    styles = renderer.styles
+    story = []
     
     # Add final page with CP calculations
     story.append(PageBreak())
@@ -354,13 +523,7 @@ def export_character_to_pdf(character_data, output_path=None):
     stats_breakdown.append(["Stats Subtotal", "", "", str(stat_cp)])
     
     stats_table = Table(stats_breakdown, colWidths=[2*inch, 1*inch, 1.5*inch, 1.5*inch])
-    stats_table.setStyle(TableStyle([
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
+    stats_table.setStyle(renderer.table_styles['breakdown_table'])
     story.append(stats_table)
     story.append(Spacer(1, 0.2*inch))
     
@@ -421,13 +584,7 @@ def export_character_to_pdf(character_data, output_path=None):
         attr_breakdown.append(["Attributes Subtotal", "", "", "", str(attr_cp)])
         
         attr_table = Table(attr_breakdown, colWidths=[2*inch, 0.75*inch, 1*inch, 2*inch, 1.25*inch])
-        attr_table.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        attr_table.setStyle(renderer.table_styles['breakdown_table'])
         story.append(attr_table)
         story.append(Spacer(1, 0.2*inch))
     
@@ -466,13 +623,7 @@ def export_character_to_pdf(character_data, output_path=None):
         defect_breakdown.append(["Defects Subtotal", "", "", str(defect_cp)])
         
         defect_table = Table(defect_breakdown, colWidths=[3*inch, 1*inch, 1.5*inch, 1.5*inch])
-        defect_table.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        defect_table.setStyle(renderer.table_styles['breakdown_table'])
         story.append(defect_table)
         story.append(Spacer(1, 0.2*inch))
     
@@ -511,13 +662,7 @@ def export_character_to_pdf(character_data, output_path=None):
         skill_breakdown.append(["Skills Subtotal", "", "", str(skill_cp)])
         
         skill_table = Table(skill_breakdown, colWidths=[3*inch, 1*inch, 1.5*inch, 1.5*inch])
-        skill_table.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        skill_table.setStyle(renderer.table_styles['breakdown_table'])
         story.append(skill_table)
         story.append(Spacer(1, 0.2*inch))
     
@@ -542,18 +687,219 @@ def export_character_to_pdf(character_data, output_path=None):
     summary.append(["Remaining CP", str(starting_cp - total_cp)])
     
     summary_table = Table(summary, colWidths=[4*inch, 3*inch])
-    summary_table.setStyle(TableStyle([
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-        ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
+    summary_table.setStyle(renderer.table_styles['summary_table'])
     story.append(summary_table)
     
-    # CP breakdown is now complete
-    
-    # Build the PDF
-    doc.build(story)
-    
-    return output_path
+    return story
+
+# Sheet sections in order: (name, character keys the section reads, builder)
+SECTIONS = [
+    ("basic_info", ("name", "player", "campaign", "totalPoints", "pointsSpent", "description"), _basic_info_section),
+    ("stats", ("stats",), _stats_section),
+    ("attributes", ("attributes",), _attributes_section),
+    ("defects", ("defects",), _defects_section),
+    ("skills", ("skills",), _skills_section),
+] + [
+    (key, (key, "stats") if key == "alternate_forms" else (key,),
+     partial(_special_section, section_key=key, section_title=title))
+    for key, title in [
+        ("companions", "Companions"),
+        ("items", "Items"),
+        ("minions", "Minions"),
+        ("alternate_forms", "Alternate Forms"),
+        ("metamorphosis", "Metamorphosis"),
+    ]
+] + [
+    ("cp_breakdown", ("stats", "attributes", "defects", "skills", "totalPoints"), _cp_breakdown_section),
+]
+
+def _section_hash(character_data, keys):
+    payload = json.dumps([character_data.get(key) for key in keys], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+def build_character_story(character_data, renderer=None):
+    """Return the list of flowables for one character sheet
+
+    Each section is looked up in the renderer's section cache by a hash of the
+    data it reads, so re-exporting after a small edit only rebuilds the
+    sections that changed.
+    """
+    renderer = renderer or get_renderer()
+    story = []
+    for name, keys, build_section in SECTIONS:
+        story.extend(renderer.section(name, _section_hash(character_data, keys),
+                                      lambda: build_section(character_data, renderer)))
+    return story
+
+def _load_character(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return prepare_export_data(json.load(f))
+
+def _unique_pdf_path(output_dir, source_path, used):
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    candidate, counter = stem, 1
+    while candidate in used:
+        counter += 1
+        candidate = f"{stem}_{counter}"
+    used.add(candidate)
+    return os.path.join(output_dir, f"{candidate}.pdf")
+
+def _export_file(job):
+    """Worker: render one character file to its own PDF"""
+    source_path, output_path = job
+    try:
+        export_character_to_pdf(_load_character(source_path), output_path)
+        return source_path, output_path, None
+    except Exception as e:
+        return source_path, None, f"{type(e).__name__}: {e}"
+
+def export_characters_to_pdfs(paths, output_dir, jobs=None):
+    """
+    Export each character file to <output_dir>/<file name>.pdf across a process pool
+
+    Args:
+        paths (iterable): Character JSON files (consumed lazily)
+        output_dir (str): Folder for the PDFs, created if missing
+        jobs (int, optional): Worker processes, defaults to one per CPU
+
+    Yields:
+        tuple: (source path, PDF path or None, error message or None) in input order
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    used = set()
+    job_iter = ((path, _unique_pdf_path(output_dir, path, used)) for path in paths)
+    yield from iter_results(_export_file, job_iter, jobs or os.cpu_count() or 1)
+
+class _BookEntry(Flowable):
+    """Zero-size marker that bookmarks the page a character starts on"""
+
+    def __init__(self, key, title):
+        super().__init__()
+        self.key = key
+        self.title = title
+
+    def wrap(self, available_width, available_height):
+        return 0, 0
+
+    def draw(self):
+        self.canv.bookmarkPage(self.key)
+        self.canv.addOutlineEntry(self.title, self.key, level=0)
+
+class _StreamingDocTemplate(SimpleDocTemplate):
+    """Pulls flowables from a generator as the build consumes them
+
+    filterFlowables runs before every flowable is laid out; topping the list
+    up there keeps only the character being rendered in memory.
+    """
+
+    def __init__(self, output, flowables, **kwargs):
+        super().__init__(output, **kwargs)
+        self._pending = iter(flowables)
+        self._story = None
+
+    def build(self, flowables, *args, **kwargs):
+        self._story = flowables
+        super().build(flowables, *args, **kwargs)
+
+    def filterFlowables(self, flowables):
+        # Also called on reportlab's internal "hanging" list; only feed the story
+        while flowables is self._story and len(flowables) < 2 and self._pending is not None:
+            try:
+                flowables.append(next(self._pending))
+            except StopIteration:
+                self._pending = None
+
+def _page_footer(canvas, doc):
+    canvas.saveState()
+    canvas.setFont("Helvetica", 8)
+    canvas.drawRightString(letter[0] - 0.5*inch, 0.3*inch, f"Page {doc.page}")
+    canvas.restoreState()
+
+def _count_pages(story):
+    doc = _new_document(io.BytesIO())
+    doc.build(story, onFirstPage=_page_footer, onLaterPages=_page_footer)
+    return doc.page
+
+def _measure_file(path):
+    """Worker: lay out one character sheet and return (name, race, class, page count)"""
+    try:
+        character = _load_character(path)
+        pages = _count_pages(build_character_story(character))
+        return path, character.get("name") or "Unnamed Character", character.get("race", ""), character.get("class", ""), pages, None
+    except Exception as e:
+        return path, None, None, None, 0, f"{type(e).__name__}: {e}"
+
+def _toc_story(entries, renderer, first_page):
+    styles = renderer.styles
+    story = [Paragraph("Campaign Book", styles['Title']),
+             Paragraph("Contents", styles['SectionHeader'])]
+    rows = [["Character", "Race", "Class", "Page"]]
+    page = first_page
+    for _, name, race, char_class, pages in entries:
+        rows.append([name, race or "", char_class or "", str(page)])
+        page += pages
+    table = Table(rows, colWidths=[2.75*inch, 1.75*inch, 1.75*inch, 0.75*inch], repeatRows=1)
+    table.setStyle(renderer.table_styles['contents_table'])
+    story.append(table)
+    return story
+
+def export_campaign_book(paths, output_path, jobs=None, progress=None):
+    """
+    Export many character files into one PDF with a table of contents
+
+    Pass one lays every sheet out in the process pool to learn its page count,
+    which fixes the contents page numbers without reportlab's two-pass
+    multiBuild. Pass two streams the sheets into the book one character at a
+    time, so memory does not grow with the roster.
+
+    Args:
+        paths (iterable): Character JSON files
+        output_path (str): Path of the combined PDF
+        jobs (int, optional): Worker processes, defaults to one per CPU
+        progress (callable, optional): Called with (done, total) steps, one per
+            sheet measured and one per sheet written (total is 0 while unknown);
+            raise ExportCancelled from it to stop the export
+
+    Returns:
+        tuple: (output path, list of (source path, error message) for skipped files)
+    """
+    report = progress or (lambda done, total: None)
+    total = 2 * len(paths) if hasattr(paths, "__len__") else 0
+    entries, failures = [], []
+    measured = iter_results(_measure_file, paths, jobs or os.cpu_count() or 1)
+    try:
+        for path, name, race, char_class, pages, error in measured:
+            if error:
+                failures.append((path, error))
+            else:
+                entries.append((path, name, race, char_class, pages))
+            report(len(entries) + len(failures), total)
+    finally:
+        # Drops the files still queued when the export is cancelled
+        measured.close()
+    done = len(entries) + len(failures)
+    total = done + len(entries)
+
+    renderer = get_renderer()
+    # The contents length decides where the first sheet starts; it only changes
+    # the page numbers, so laying it out once with placeholders is enough
+    toc_pages = _count_pages(_toc_story(entries, renderer, 1))
+
+    def flowables():
+        for index, (path, name, _, _, _) in enumerate(entries):
+            report(done + index, total)
+            story = build_character_story(_load_character(path), renderer)
+            yield PageBreak()
+            yield story[0]
+            yield _BookEntry(f"character_{index}", name)
+            yield from story[1:]
+
+    doc = _new_document(output_path, doc_class=_StreamingDocTemplate, flowables=flowables(), title="Campaign Book")
+    try:
+        doc.build(_toc_story(entries, renderer, toc_pages + 1), onFirstPage=_page_footer, onLaterPages=_page_footer)
+    except ExportCancelled:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+    report(total, total)
+    return output_path, failures
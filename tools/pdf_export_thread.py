@@ -0,0 +1,136 @@
+"""
+Background PDF export for BESM Character Generator
+
+Laying out a long sheet with reportlab takes long enough to freeze the window,
+so the GUI exports from a snapshot of the character on a QThread and follows
+along through signals. Batch exports (one PDF per file or a campaign book)
+run the same way.
+"""
+
+import threading
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from tools.perf_monitor import monitor
+
+
+class PdfExportThread(QThread):
+    """Exports one character snapshot to PDF off the GUI thread.
+
+    The snapshot is taken by the caller (see prepare_export_data), so the
+    character can keep being edited while the export runs.
+    """
+
+    progress = pyqtSignal(int, int)      # flowables done, flowables total
+    succeeded = pyqtSignal(str)          # output path
+    failed = pyqtSignal(str)             # error details
+    cancelled = pyqtSignal()
+
+    def __init__(self, snapshot, output_path, parent=None):
+        super().__init__(parent)
+        self.snapshot = snapshot
+        self.output_path = output_path
+        self._cancel = threading.Event()
+        self._last_percent = -1
+
+    def cancel(self):
+        """Ask the export to stop at the next flowable"""
+        self._cancel.set()
+
+    def _on_progress(self, done, total):
+        from tools.pdf_export import ExportCancelled
+
+        if self._cancel.is_set():
+            raise ExportCancelled()
+        # Only signal when the percentage moves, not for every flowable
+        percent = done * 100 // total if total else 0
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.progress.emit(done, total)
+
+    def run(self):
+        from tools.pdf_export import export_character_to_pdf, ExportCancelled
+
+        try:
+            with monitor.span("export_to_pdf"):
+                output_path = export_character_to_pdf(self.snapshot, self.output_path, progress=self._on_progress)
+        except ExportCancelled:
+            self.cancelled.emit()
+        except Exception:
+            import traceback
+            self.failed.emit(traceback.format_exc())
+        else:
+            self.succeeded.emit(output_path)
+
+
+class BatchPdfExportThread(QThread):
+    """Exports several character files off the GUI thread.
+
+    With ``book`` set the files become one campaign book at ``output_path``;
+    otherwise each gets its own PDF in the ``output_path`` folder. Cancelling a
+    book discards it, while cancelling separate PDFs keeps the ones already
+    written and reports them through succeeded.
+    """
+
+    progress = pyqtSignal(int, int)      # steps done, steps total (0 while unknown)
+    succeeded = pyqtSignal(str, int, list)  # output path or folder, characters exported, (path, error) failures
+    failed = pyqtSignal(str)             # error details
+    cancelled = pyqtSignal()
+
+    def __init__(self, paths, output_path, book=False, parent=None):
+        super().__init__(parent)
+        self.paths = list(paths)
+        self.output_path = output_path
+        self.book = book
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Ask the export to stop at the next character"""
+        self._cancel.set()
+
+    def _on_progress(self, done, total):
+        from tools.pdf_export import ExportCancelled
+
+        if self._cancel.is_set():
+            raise ExportCancelled()
+        self.progress.emit(done, total)
+
+    def _export_book(self):
+        from tools.pdf_export import export_campaign_book
+
+        with monitor.span("export_campaign_book"):
+            output_path, failures = export_campaign_book(self.paths, self.output_path, progress=self._on_progress)
+        return output_path, len(self.paths) - len(failures), failures
+
+    def _export_each(self):
+        from tools.pdf_export import export_characters_to_pdfs
+
+        exported, failures = 0, []
+        results = export_characters_to_pdfs(self.paths, self.output_path)
+        with monitor.span("export_characters_to_pdfs"):
+            try:
+                for source, _, error in results:
+                    if error:
+                        failures.append((source, error))
+                    else:
+                        exported += 1
+                    self.progress.emit(exported + len(failures), len(self.paths))
+                    if self._cancel.is_set():
+                        break
+            finally:
+                # Drops the files still queued once cancelled
+                results.close()
+        return self.output_path, exported, failures
+
+    def run(self):
+        from tools.pdf_export import ExportCancelled
+
+        try:
+            result = self._export_book() if self.book else self._export_each()
+        except ExportCancelled:
+            self.cancelled.emit()
+        except Exception:
+            import traceback
+            self.failed.emit(traceback.format_exc())
+        else:
+            self.succeeded.emit(*result)
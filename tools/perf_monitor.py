@@ -0,0 +1,140 @@
+"""
+Per-action timing for BESM Character Generator
+
+Hot paths are wrapped with @timed("name") or ``with monitor.span("name")``.
+While the monitor is disabled (the default) a wrapped call costs one attribute
+check and span() hands back a shared no-op context, so the hooks can stay in
+place permanently. Options -> Performance turns the monitor on and shows the
+live numbers; they can be dumped to JSON from there.
+"""
+
+import json
+import time
+import platform
+import functools
+from collections import deque
+from contextlib import nullcontext
+
+# Samples kept per action for the p95; count and total cover every call
+SAMPLE_WINDOW = 1000
+
+_NULL_SPAN = nullcontext()
+
+
+class ActionStats:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.samples.append(seconds)
+
+    def p95(self):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p95_ms": round(self.p95() * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class PerfMonitor:
+    """Collects count, total and p95 per action name while enabled"""
+
+    def __init__(self):
+        self.enabled = False
+        self.actions = {}  # action name -> ActionStats
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.actions = {}
+
+    def record(self, name, seconds):
+        stats = self.actions.get(name)
+        if stats is None:
+            stats = self.actions[name] = ActionStats()
+        stats.add(seconds)
+
+    def span(self, name):
+        """Context manager timing the enclosed block under ``name``"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def snapshot(self):
+        """Return {action: stats dict}, slowest total first"""
+        ordered = sorted(self.actions.items(), key=lambda item: item[1].total, reverse=True)
+        return {name: stats.as_dict() for name, stats in ordered}
+
+    def dump(self, path):
+        """Write the current numbers to a JSON file"""
+        data = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "actions": self.snapshot(),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        print(f"[PERF] Timings for {len(data['actions'])} actions written to {path}")
+        return data
+
+
+class _Span:
+    __slots__ = ("monitor", "name", "started")
+
+    def __init__(self, monitor, name):
+        self.monitor = monitor
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.monitor.record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+monitor = PerfMonitor()
+
+
+def timed(name=None):
+    """Decorator recording each call of the function under ``name`` (default: its __name__)
+
+    The wrapper forwards every argument, so connect signals that carry values
+    (valueChanged, clicked) through a lambda rather than straight to a timed slot.
+    """
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not monitor.enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                monitor.record(label, time.perf_counter() - started)
+        return wrapper
+    return decorate
@@ -0,0 +1,334 @@
+"""
+CP rollup tree for BESM Character Generator
+
+A character and the sub-characters it holds (companions, minions, items,
+alternate forms and metamorphosis entries, each with its own attributes,
+defects and budget) as a tree. Every node caches its CP breakdown, its
+derived values and two subtree totals: the CP spent under it and the number
+of nodes over budget.
+
+After an edit, changed() recomputes only the edited node and adds the
+difference to each of its ancestors, so one edit costs that node's own
+attributes plus the depth of the tree, however many other companions or items
+the character holds. Nodes whose cost depends on their parent (alternate
+forms only pay for stats above the character's) are recomputed with it.
+
+The cost rules are the ones the editor dialogs show, and the dialogs call
+them too:
+
+- character: point_total (2 CP per stat level, attributes, defects, weapons)
+- companion: 1 CP per stat point, attributes, minus defects, against cp_budget
+- minion: 2 CP per stat level, attributes and defects, against cp
+- alternate form: 1 CP per stat point above the character's, attributes,
+  minus defects, against cp_budget
+- item: attributes minus defects (never below 0); the item costs half that
+- metamorphosis: attributes minus defect values, against cp
+
+reconcile_children() keeps those lists in line with the attributes that own
+them (a Companion attribute owns its companion, an Item attribute its items)
+without regenerating the entries that did not change.
+"""
+
+import uuid
+from dataclasses import dataclass
+
+from tools.forms import form_sheet, form_stats
+from tools.rules import STATS, calculate_derived_values, point_total
+
+# Character data list -> the kind of node its entries become
+CHILD_KINDS = (
+    ("companions", "companion"),
+    ("minions", "minion"),
+    ("items", "item"),
+    ("alternate_forms", "alternate_form"),
+    ("metamorphosis", "metamorphosis"),
+)
+
+# Kinds whose cost depends on their parent's data
+PARENT_DEPENDENT = frozenset({"alternate_form"})
+
+
+@dataclass(frozen=True, slots=True)
+class Cost:
+    """CP breakdown of one node; budget is None when the node has none"""
+
+    stats: int
+    attributes: int
+    defects: int
+    spent: int
+    budget: int = None
+
+    @property
+    def remaining(self):
+        return None if self.budget is None else self.budget - self.spent
+
+    @property
+    def over_budget(self):
+        return self.budget is not None and self.spent > self.budget
+
+
+def _entry_costs(data, defect_field="cost"):
+    attributes = sum(attr.get("cost", 0) for attr in data.get("attributes", []))
+    defects = sum(defect.get(defect_field, 0) for defect in data.get("defects", []))
+    return attributes, defects
+
+
+def character_cost(data, parent=None, budget=None):
+    attributes, defects = _entry_costs(data)
+    stats = sum(data.get("stats", {}).get(stat, 0) * 2 for stat in STATS)
+    return Cost(stats, attributes, defects, point_total(data), budget)
+
+
+def companion_cost(data, parent=None):
+    attributes, defects = _entry_costs(data)
+    stats = sum(data.get("stats", {}).values())
+    return Cost(stats, attributes, defects, stats + attributes - defects, data.get("cp_budget", 10))
+
+
+def minion_cost(data, parent=None):
+    attributes, defects = _entry_costs(data)
+    stats = sum(value * 2 for value in data.get("stats", {}).values())
+    return Cost(stats, attributes, defects, stats + attributes + defects, data.get("cp"))
+
+
+def alternate_form_cost(data, parent=None):
+    """Only stat points above the parent character's base stats cost CP"""
+    base_stats = (parent or {}).get("stats") or {}
+    attributes, defects = _entry_costs(data)
+    stats = sum(max(0, value - base_stats.get(stat, 4)) for stat, value in form_stats(data, base_stats).items())
+    return Cost(stats, attributes, defects, stats + attributes - defects, data.get("cp_budget", 5))
+
+
+def item_cost(data, parent=None):
+    """``spent`` is the item's total CP; what it costs its owner is half that (see item_price)"""
+    attributes, defects = _entry_costs(data)
+    return Cost(0, attributes, defects, max(0, attributes - defects))
+
+
+def item_price(total_cp):
+    """CP an item costs: half its total, rounded down"""
+    return max(0, total_cp // 2)
+
+
+def metamorphosis_cost(data, parent=None):
+    attributes, defects = _entry_costs(data, "value")
+    return Cost(0, attributes, defects, attributes - defects, data.get("cp", 5))
+
+
+COST_RULES = {
+    "character": character_cost,
+    "companion": companion_cost,
+    "minion": minion_cost,
+    "item": item_cost,
+    "alternate_form": alternate_form_cost,
+    "metamorphosis": metamorphosis_cost,
+}
+
+
+class RollupNode:
+    """One character or sub-character, with its cached cost and subtree totals"""
+
+    __slots__ = ("kind", "data", "parent", "children", "cost", "derived", "subtree_spent", "subtree_over")
+
+    def __init__(self, kind, data, parent):
+        self.kind = kind
+        self.data = data
+        self.parent = parent
+        self.children = []
+        self.cost = None
+        self.derived = None
+        self.subtree_spent = 0
+        self.subtree_over = 0
+
+    def __repr__(self):
+        return f"RollupNode({self.kind}, {self.data.get('name', '')!r}, spent={self.cost.spent})"
+
+
+class RollupTree:
+    """The rollup tree of one character's data
+
+    Nodes are found by the identity of their data dict. Call changed() after
+    editing an entry in place, replace() after swapping it for a new dict (as
+    the editor dialogs return), and sync() after entries are added to or
+    removed from a list.
+    """
+
+    def __init__(self, character_data, budget=None):
+        self.budget = budget
+        self._nodes = {}
+        self.root = self._build("character", character_data, None)
+
+    # Building
+
+    def _build(self, kind, data, parent):
+        node = RollupNode(kind, data, parent)
+        self._nodes[id(data)] = node
+        for list_key, child_kind in CHILD_KINDS:
+            for child_data in data.get(list_key) or ():
+                if isinstance(child_data, dict):
+                    node.children.append(self._build(child_kind, child_data, node))
+        self._compute(node)
+        node.subtree_spent = node.cost.spent + sum(child.subtree_spent for child in node.children)
+        node.subtree_over = int(node.cost.over_budget) + sum(child.subtree_over for child in node.children)
+        return node
+
+    def _compute(self, node):
+        parent_data = node.parent.data if node.parent else None
+        if node.kind == "character":
+            node.cost = character_cost(node.data, budget=self.budget if node.parent is None else None)
+        else:
+            node.cost = COST_RULES[node.kind](node.data, parent_data)
+        if node.kind == "alternate_form":
+            node.derived = None  # An overlay on the parent; see sheet()
+            return
+        stats = node.data.get("stats")
+        node.derived = calculate_derived_values(node.data) \
+            if isinstance(stats, dict) and all(stat in stats for stat in STATS) else None
+
+    def _unindex(self, node):
+        self._nodes.pop(id(node.data), None)
+        for child in node.children:
+            self._unindex(child)
+
+    # Updating
+
+    def _propagate(self, node, spent_delta, over_delta):
+        while node is not None and (spent_delta or over_delta):
+            node.subtree_spent += spent_delta
+            node.subtree_over += over_delta
+            node = node.parent
+
+    def _recompute(self, node):
+        """Recompute one node's own cost and pass the difference up"""
+        old_spent, old_over = node.cost.spent, int(node.cost.over_budget)
+        self._compute(node)
+        self._propagate(node, node.cost.spent - old_spent, int(node.cost.over_budget) - old_over)
+
+    def node(self, data):
+        """The node for an entry's data dict, or None"""
+        return self._nodes.get(id(data))
+
+    def changed(self, data):
+        """Recompute after ``data`` (the character or any entry) was edited in place"""
+        node = self._nodes[id(data)]
+        self._recompute(node)
+        for child in node.children:
+            if child.kind in PARENT_DEPENDENT:
+                self._recompute(child)
+        return node
+
+    def replace(self, old, new):
+        """Point the node for ``old`` at ``new`` and recompute it and its own children"""
+        node = self._nodes.pop(id(old))
+        node.data = new
+        self._nodes[id(new)] = node
+        self._sync_node(node)
+        return self.changed(new)
+
+    def sync(self, data=None):
+        """Match the child nodes of ``data`` (default: the character) to its lists again
+
+        Entries still in the lists keep their nodes; new ones are built and
+        removed ones dropped. Only the synced node's totals are rebuilt.
+        """
+        node = self.root if data is None else self._nodes[id(data)]
+        self._sync_node(node)
+        return node
+
+    def _sync_node(self, node):
+        existing = {id(child.data): child for child in node.children}
+        children = []
+        for list_key, child_kind in CHILD_KINDS:
+            for child_data in node.data.get(list_key) or ():
+                if not isinstance(child_data, dict):
+                    continue
+                child = existing.pop(id(child_data), None)
+                if child is None or child.kind != child_kind:
+                    child = self._build(child_kind, child_data, node)
+                children.append(child)
+        for removed in existing.values():
+            self._unindex(removed)
+        node.children = children
+
+        old_spent, old_over = node.subtree_spent, node.subtree_over
+        node.subtree_spent = node.cost.spent + sum(child.subtree_spent for child in children)
+        node.subtree_over = int(node.cost.over_budget) + sum(child.subtree_over for child in children)
+        self._propagate(node.parent, node.subtree_spent - old_spent, node.subtree_over - old_over)
+
+    # Reading
+
+    def sheet(self, data):
+        """The effective stats and derived values of an entry
+
+        Alternate forms are built from their overlay on the parent's current
+        stats when asked for; form_sheet() memoizes them on those effective
+        stats, so they cannot fall behind the parent. Other entries return
+        their cached values.
+        """
+        node = self._nodes[id(data)]
+        if node.kind == "alternate_form":
+            return form_sheet(node.data, node.parent.data)
+        return {"stats": node.data.get("stats"), "derived": node.derived}
+
+    def walk(self, node=None):
+        """Yield every node, parents before their children"""
+        stack = [node or self.root]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def over_budget(self):
+        """Nodes spending more than their budget"""
+        if not self.root.subtree_over:
+            return []
+        return [node for node in self.walk() if node.cost.over_budget]
+
+
+# Reconciling sub-character lists with their owning attributes
+
+def updated(entry, **fields):
+    """``entry`` itself if it already has these field values, else a copy with them
+
+    The copy shares the entry's nested data (stats, attributes, defects).
+    """
+    if all(key in entry and entry[key] == value for key, value in fields.items()):
+        return entry
+    return dict(entry, **fields)
+
+
+def reconcile_children(entries, owners, update, owner_key="parent_attribute_id"):
+    """Bring ``entries`` in line with the attributes in ``owners``, in place
+
+    Entries are grouped by ``owner_key`` (the owning attribute's id).
+    ``update(attr, current)`` returns the entries an attribute should have,
+    given the ones it has now (empty for a new attribute); it keeps a dict by
+    returning it and touches one through updated(). Entries saved before they
+    recorded an owner are adopted in order by the owners that have none, and
+    entries whose owner is gone are dropped.
+
+    Returns whether the list changed; when it did not, the list and every
+    entry in it are left exactly as they were.
+    """
+    groups = {}
+    loose = []
+    for entry in entries:
+        owner = entry.get(owner_key)
+        if owner:
+            groups.setdefault(owner, []).append(entry)
+        else:
+            loose.append(entry)
+
+    result = []
+    for attr in owners:
+        if not attr.get("id"):
+            attr["id"] = str(uuid.uuid4())
+        current = groups.pop(attr["id"], None)
+        if current is None:
+            current = [loose.pop(0)] if loose else []
+        result.extend(update(attr, current))
+
+    if len(result) == len(entries) and all(new is old for new, old in zip(result, entries)):
+        return False
+    entries[:] = result
+    return True
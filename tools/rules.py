@@ -0,0 +1,237 @@
+"""
+Character rules for BESM Character Generator
+
+Pure functions for derived values, CP totals and benchmark checks. Nothing in
+here imports PyQt5, so the GUI and the headless ``besm`` command share the same
+numbers.
+"""
+
+import os
+import json
+import math
+
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS_FILE = os.path.join(BASE_PATH, "data", "benchmarks.json")
+
+STATS = ("Body", "Mind", "Soul")
+STAT_RANGE = (1, 12)  # Lowest and highest base stat the stat spinners allow
+DERIVED_KEYS = ("CV", "ACV", "DCV", "HP", "EP", "DM", "SV", "SP", "SCV", "SOP")
+# Derived value -> the benchmark range it has to stay inside
+DERIVED_RANGES = (("CV", "combat_value_range"), ("HP", "hp_ep_range"), ("EP", "hp_ep_range"),
+                  ("DM", "damage_multiplier_range"))
+
+
+def _add_stat_mods(stat_mods, scale, table_key, base_mods, derived_mods, multipliers):
+    """Add one attribute's or defect's stat_mods, scaled by its level or rank"""
+    # Apply base stat modifiers
+    if "base" in stat_mods:
+        for stat, value in stat_mods["base"].items():
+            if stat in base_mods:
+                base_mods[stat] += value * scale
+
+    # Apply direct derived value modifiers
+    if "derived" in stat_mods:
+        for key, value in stat_mods["derived"].items():
+            if key in derived_mods:
+                derived_mods[key] += value * scale
+
+    # Apply multipliers
+    if "multipliers" in stat_mods:
+        for key, value in stat_mods["multipliers"].items():
+            if key in multipliers:
+                multipliers[key] *= value
+
+    # Apply level/rank-based modifiers if present (flat, not scaled)
+    if table_key and table_key in stat_mods and str(scale) in stat_mods[table_key]:
+        _add_stat_mods(stat_mods[table_key][str(scale)], 1, None, base_mods, derived_mods, multipliers)
+
+
+def calculate_derived_values(character_data):
+    """Calculate derived values based on stats and modifiers from attributes/defects
+
+    Args:
+        character_data (dict): The character data to calculate derived values for
+
+    Returns:
+        dict: The updated derived values
+    """
+    # 1. Start with base stats
+    return derive_values(character_data["stats"], *character_stat_mods(character_data))
+
+
+def character_stat_mods(character_data):
+    """collect_stat_mods for every attribute and defect of a character that has modifiers"""
+    # The (stat_mods, level/rank, key, user_input) of each
+    attributes = [(a["stat_mods"], a.get("level", 1), a.get("key"), a.get("user_input"))
+                  for a in character_data.get("attributes", []) if "stat_mods" in a]
+    defects = [(d["stat_mods"], d.get("rank", 1)) for d in character_data.get("defects", []) if "stat_mods" in d]
+    return collect_stat_mods(attributes, defects)
+
+
+def collect_stat_mods(attributes, defects):
+    """Add up the stat_mods of attributes and defects
+
+    ``attributes`` holds (stat_mods, level, key, user_input) tuples and
+    ``defects`` (stat_mods, rank) tuples. Returns the (base_mods, derived_mods,
+    multipliers) dicts that derive_values takes.
+    """
+    # 2. Apply modifiers from attributes and defects
+    base_mods = {"Body": 0, "Mind": 0, "Soul": 0}
+
+    # Track direct modifiers to derived values
+    derived_mods = {
+        "CV": 0, "ACV": 0, "DCV": 0, "HP": 0, "EP": 0, 
+        "DM": 0, "SV": 0, "SP": 0, "SCV": 0, "SOP": 0
+    }
+
+    # Track multipliers for derived values
+    multipliers = {
+        "CV": 1, "ACV": 1, "DCV": 1, "HP": 1, "EP": 1, 
+        "DM": 1, "SV": 1, "SP": 1, "SCV": 1, "SOP": 1
+    }
+
+    # Process attributes
+    for stat_mods, level, key, user_input in attributes:
+        # Handle dynamic modifiers (like Augmented where the stat is chosen by the user)
+        if stat_mods.get("dynamic", False):
+            # For Augmented, we need to look at the user-selected stat
+            if key == "augmented" and user_input is not None:
+                target_stat = user_input.get("stat_target")
+                if target_stat in base_mods:
+                    base_mods[target_stat] += level
+        _add_stat_mods(stat_mods, level, "level_based", base_mods, derived_mods, multipliers)
+
+    # Process defects
+    for stat_mods, rank in defects:
+        _add_stat_mods(stat_mods, rank, "rank_based", base_mods, derived_mods, multipliers)
+    return base_mods, derived_mods, multipliers
+
+
+def derive_values(stats, base_mods, derived_mods, multipliers):
+    """Derived values from base stats and collected modifiers (see collect_stat_mods)"""
+    # 3. Calculate final stats
+    body = max(1, stats["Body"] + base_mods["Body"])  # Ensure minimum of 1
+    mind = max(1, stats["Mind"] + base_mods["Mind"])
+    soul = max(1, stats["Soul"] + base_mods["Soul"])
+
+    # 4. Calculate derived values
+    cv = math.floor((body + mind + soul) / 3)
+    acv = cv
+    dcv = cv
+    hp = body * 10
+    ep = mind * 10
+    sv = body * 2
+    dm = math.floor((body + soul) / 2)
+    sp = soul * 10
+    sop = mind * 10
+    scv = math.floor((mind + soul) / 2)
+
+    # 5. Apply direct modifiers to derived values
+    cv += derived_mods["CV"]
+    acv += derived_mods["ACV"] + derived_mods["CV"]  # CV mods affect both ACV and DCV
+    dcv += derived_mods["DCV"] + derived_mods["CV"]
+    hp += derived_mods["HP"]
+    ep += derived_mods["EP"]
+    sv += derived_mods["SV"]
+    dm += derived_mods["DM"]
+    sp += derived_mods["SP"]
+    sop += derived_mods["SOP"]
+    scv += derived_mods["SCV"]
+
+    # 6. Apply multipliers
+    cv = math.floor(cv * multipliers["CV"])
+    acv = math.floor(acv * multipliers["ACV"])
+    dcv = math.floor(dcv * multipliers["DCV"])
+    hp = math.floor(hp * multipliers["HP"])
+    ep = math.floor(ep * multipliers["EP"])
+    sv = math.floor(sv * multipliers["SV"])
+    dm = math.floor(dm * multipliers["DM"])
+    sp = math.floor(sp * multipliers["SP"])
+    sop = math.floor(sop * multipliers["SOP"])
+    scv = math.floor(scv * multipliers["SCV"])
+
+    # 7. Return the derived values
+    return {
+        "CV": cv,
+        "ACV": acv,
+        "DCV": dcv,
+        "HP": hp,
+        "EP": ep,
+        "SV": sv,
+        "DM": dm,
+        "SP": sp,
+        "SOP": sop,
+        "SCV": scv
+    }
+
+
+def point_total(character_data):
+    """Return the CP spent on stats (2 CP per level), attributes, defects and weapons"""
+    stats = character_data.get("stats", {})
+    total = sum(stats.get(stat, 0) * 2 for stat in STATS)
+    for key in ("attributes", "defects", "weapons"):
+        # Defect costs are already negative values
+        total += sum(entry.get("cost", 0) for entry in character_data.get(key, []))
+    return total
+
+
+def load_benchmarks(file_path=BENCHMARKS_FILE):
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f).get("benchmarks", [])
+
+
+def suggest_benchmark(total_cp, benchmarks):
+    """Return the benchmark whose point_range contains total_cp, or None"""
+    for benchmark in benchmarks:
+        pr_min, pr_max = benchmark["point_range"]
+        if pr_max is None:
+            if total_cp >= pr_min:
+                return benchmark
+        elif pr_min <= total_cp <= pr_max:
+            return benchmark
+    return None
+
+
+def _limit(benchmark, key):
+    try:
+        return int(benchmark[key])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _outside(value, range_):
+    low, high = range_
+    return value < low or (high is not None and value > high)
+
+
+def benchmark_warnings(character_data, benchmark, derived=None):
+    """Return the ways a character breaks a benchmark's limits
+
+    Stat and attribute level limits are always checked; the CV, HP/EP and DM
+    ranges are checked when ``derived`` values are passed in.
+    """
+    warnings = []
+    if not benchmark:
+        return warnings
+
+    max_stat = _limit(benchmark, "max_stat")
+    if max_stat is not None:
+        stats = character_data.get("stats", {})
+        for stat in STATS:
+            value = stats.get(stat, 0)
+            if value > max_stat:
+                warnings.append(f"{stat} exceeds benchmark max ({value} > {max_stat})")
+
+    max_attr = _limit(benchmark, "max_attribute_level")
+    if max_attr is not None:
+        for attr in character_data.get("attributes", []):
+            if attr.get("level", 0) > max_attr:
+                warnings.append(f"{attr.get('name', 'Unnamed')} level exceeds benchmark max")
+
+    if derived:
+        for key, range_key in DERIVED_RANGES:
+            range_ = benchmark.get(range_key)
+            if range_ and key in derived and _outside(derived[key], range_):
+                warnings.append(f"{key} {derived[key]} is outside the benchmark range {range_[0]}-{range_[1]}")
+    return warnings
@@ -0,0 +1,179 @@
+"""
+Size ladder for BESM Character Generator
+
+Compiles the size templates in data/templates/sizes once into a list indexed
+by size rank (-10 Point ... +10 Monumental). Each display modifier such as
+"x 25", "÷ 2.5 k", "+20" or "+20 AR" is parsed into a SizeModifier with a
+numeric operator and value, and the attribute and defect grants are resolved
+against the catalog, so size lookups and size maths need no file reads or
+string parsing.
+"""
+
+import os
+import re
+import json
+from dataclasses import dataclass
+
+from tools.catalog import get_catalog
+from tools.snapshot import freeze
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATES_PATH = os.path.join(BASE_PATH, "data", "templates")
+
+# "x 10 k", "÷ 1,000", "+60 AR", "-12" ("—" means no change)
+_MODIFIER_RE = re.compile(r"^([x×÷+-])\s*([\d.,]+)\s*([kM])?\b\s*(.*)$")
+_SUFFIXES = {None: 1, "k": 1_000, "M": 1_000_000}
+_OPERATORS = {"x": "mul", "×": "mul", "÷": "div", "+": "add", "-": "add"}
+
+
+@dataclass(frozen=True, slots=True)
+class SizeModifier:
+    """One parsed size modifier; ``op`` is "mul", "div", "add" or None (no change)"""
+
+    op: str
+    value: float
+    unit: str
+    text: str
+
+    def apply(self, base):
+        """Return base with this modifier applied"""
+        if self.op == "mul":
+            return base * self.value
+        if self.op == "div":
+            return base / self.value
+        if self.op == "add":
+            return base + self.value
+        return base
+
+
+def parse_modifier(text):
+    """Parse a size template display string into a SizeModifier
+
+    Raises ValueError for text that is not a multiplier, divisor, signed
+    number or dash.
+    """
+    stripped = str(text).strip()
+    if stripped in ("", "—", "–", "-"):
+        return SizeModifier(None, 0, "", text)
+    match = _MODIFIER_RE.match(stripped)
+    if not match:
+        raise ValueError(f"unrecognised size modifier {text!r}")
+    sign, number, suffix, unit = match.groups()
+    value = float(number.replace(",", "")) * _SUFFIXES[suffix]
+    if value.is_integer():
+        value = int(value)
+    if sign == "-":
+        value = -value
+    return SizeModifier(_OPERATORS[sign], value, unit.strip(), text)
+
+
+@dataclass(frozen=True, slots=True)
+class SizeGrant:
+    """An attribute or defect a size template adds, with its catalog record (None if unknown)"""
+
+    key: str
+    name: str
+    level: int
+    record: dict
+    entry: dict
+
+
+@dataclass(frozen=True, slots=True)
+class SizeTemplate:
+    key: str
+    name: str
+    rank: int
+    modifiers: dict
+    attributes: tuple
+    defects: tuple
+    template: dict
+
+
+class SizeLadder:
+    """Size templates indexed by rank, key and name"""
+
+    def __init__(self, templates, catalog=None):
+        catalog = catalog or get_catalog()
+        sizes = [self._compile(template, catalog) for template in templates]
+        self.sizes = sorted(sizes, key=lambda size: size.rank)
+        self.min_rank = self.sizes[0].rank if self.sizes else 0
+        self.max_rank = self.sizes[-1].rank if self.sizes else -1
+
+        # Ranks without a template (gaps in the data) stay None
+        self.by_rank = [None] * (self.max_rank - self.min_rank + 1)
+        for size in self.sizes:
+            self.by_rank[size.rank - self.min_rank] = size
+        self.by_key = {size.key: size for size in self.sizes if size.key}
+        self.by_name = {size.name.lower(): size for size in self.sizes if size.name}
+
+    @staticmethod
+    def _compile(template, catalog):
+        # Files use either name/rank or size_name/size_rank
+        name = template.get("name") or template.get("size_name") or ""
+        rank = template.get("size_rank", template.get("rank"))
+        if rank is None:
+            raise ValueError(f"size template {name or template.get('key')!r} has no rank")
+
+        def grants(entries, by_key, by_name, level_key):
+            result = []
+            for entry in entries or []:
+                entry_name = entry.get("custom_name", entry.get("name", ""))
+                key = entry.get("key", "")
+                record = by_key.get(key) if key else by_name.get(entry_name)
+                result.append(SizeGrant(key, entry_name, entry.get(level_key, entry.get("level", 1)),
+                                        catalog.frozen(record) if record else None, freeze(entry)))
+            return tuple(result)
+
+        return SizeTemplate(
+            key=template.get("key", ""),
+            name=name,
+            rank=int(rank),
+            modifiers={field: parse_modifier(text) for field, text in template.get("modifiers", {}).items()},
+            attributes=grants(template.get("attributes"), catalog.attributes_by_key, catalog.attributes, "level"),
+            defects=grants(template.get("defects"), catalog.defects_by_key, catalog.defects, "rank"),
+            template=freeze(template),
+        )
+
+    def __iter__(self):
+        return iter(self.sizes)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def at_rank(self, rank):
+        """Return the size template for a rank, or None"""
+        if rank is None or not self.min_rank <= rank <= self.max_rank:
+            return None
+        return self.by_rank[rank - self.min_rank]
+
+    def find(self, key=None, name=None, rank=None):
+        """Look a size up by key, then name (case-insensitive), then rank"""
+        if key and key in self.by_key:
+            return self.by_key[key]
+        if name and name.lower() in self.by_name:
+            return self.by_name[name.lower()]
+        return self.at_rank(rank)
+
+
+def load_size_ladder(templates_path=TEMPLATES_PATH, catalog=None):
+    """Compile the sizes listed in index.json"""
+    with open(os.path.join(templates_path, "index.json"), "r", encoding="utf-8") as f:
+        names = json.load(f).get("sizes", [])
+    templates = []
+    for name in names:
+        path = os.path.join(templates_path, "sizes", f"{name}.json")
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                templates.append(json.load(f))
+    return SizeLadder(templates, catalog)
+
+
+_ladder = None
+
+
+def get_size_ladder():
+    """Return the shared SizeLadder, compiling it on first use."""
+    global _ladder
+    if _ladder is None:
+        _ladder = load_size_ladder()
+    return _ladder
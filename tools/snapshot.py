@@ -0,0 +1,128 @@
+"""
+Immutable, structurally shared snapshots of character data
+
+freeze() turns the nested dicts and lists of a character into FrozenDict and
+FrozenList. Both subclass the built-in types, so anything that reads, indexes,
+iterates or json-dumps character data works on a snapshot unchanged; only the
+mutating methods raise TypeError.
+
+Frozen values are never copied again: freezing something that is already
+frozen returns it as is, and freezing with ``base`` (the previous snapshot)
+reuses every subtree whose contents did not change. Exports, template undo
+records and catalog records share those subtrees instead of deep-copying them.
+"""
+
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is immutable; build a new value with freeze() or replace()")
+
+
+class FrozenDict(dict):
+    """A dict that cannot be changed in place"""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = _immutable
+    clear = pop = popitem = setdefault = update = __ior__ = _immutable
+
+    def replace(self, **changes):
+        """Return a copy with some keys replaced, sharing every other value"""
+        merged = dict(self)
+        merged.update((key, freeze(value)) for key, value in changes.items())
+        return FrozenDict(merged)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __repr__(self):
+        return f"FrozenDict({dict.__repr__(self)})"
+
+
+class FrozenList(list):
+    """A list that cannot be changed in place"""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+    def __repr__(self):
+        return f"FrozenList({list.__repr__(self)})"
+
+
+_MISSING = object()
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+
+def freeze(value, base=None):
+    """Return an immutable version of value
+
+    ``base`` is an earlier snapshot of the same data; subtrees that are equal
+    to the matching part of ``base`` are returned from it rather than rebuilt,
+    so consecutive snapshots only allocate the parts that changed.
+    """
+    kind = type(value)
+    if kind in _SCALARS or kind is FrozenDict or kind is FrozenList:
+        return value
+
+    if isinstance(value, dict):
+        old_map = base if type(base) is FrozenDict else None
+        unchanged = old_map is not None and len(old_map) == len(value)
+        items = {}
+        for key, item in value.items():
+            old = old_map.get(key, _MISSING) if old_map is not None else _MISSING
+            if type(item) in _SCALARS:
+                # Inline scalar case: most of a character is strings and numbers
+                new = item
+                if unchanged and (type(old) is not type(item) or old != item):
+                    unchanged = False
+            else:
+                new = freeze(item, None if old is _MISSING else old)
+                if unchanged and new is not old:
+                    unchanged = False
+            items[key] = new
+        return old_map if unchanged else FrozenDict(items)
+
+    if isinstance(value, (list, tuple)):
+        old_list = base if type(base) is FrozenList else None
+        unchanged = old_list is not None and len(old_list) == len(value)
+        items = []
+        for index, item in enumerate(value):
+            old = old_list[index] if old_list is not None and index < len(old_list) else None
+            if type(item) in _SCALARS:
+                new = item
+                if unchanged and (type(old) is not type(item) or old != item):
+                    unchanged = False
+            else:
+                new = freeze(item, old)
+                if unchanged and new is not old:
+                    unchanged = False
+            items.append(new)
+        return old_list if unchanged else FrozenList(items)
+
+    # Anything else is left as is; character data is plain JSON
+    return value
+
+
+def thaw(value):
+    """Return plain, mutable dicts and lists for a (possibly frozen) value"""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
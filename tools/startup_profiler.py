@@ -0,0 +1,211 @@
+"""
+Startup profiler for BESM Character Generator
+
+Run the app with ``--profile-startup`` (or ``--profile-startup=report.json``)
+to record how long each startup phase takes and what every module import
+costs. The app writes the JSON report after the first paint and exits.
+
+Compare two reports with:
+
+    python -m tools.startup_profiler compare before.json after.json
+"""
+
+import sys
+import json
+import time
+import builtins
+import platform
+import importlib.util
+
+PROFILE_FLAG = "--profile-startup"
+DEFAULT_REPORT = "startup_profile.json"
+
+
+class StartupProfiler:
+    """Records phase laps and per-module import times.
+
+    Every method is a no-op until start() is called, so the hooks can stay in
+    the normal startup path.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.report_path = DEFAULT_REPORT
+        self.phases = []
+        self.imports = {}  # module -> [inclusive seconds, self seconds]
+        self._start = None
+        self._last_lap = None
+        self._import_stack = []
+        self._original_import = None
+
+    def start(self, report_path=DEFAULT_REPORT):
+        """Begin timing and install the import hook"""
+        self.enabled = True
+        self.report_path = report_path
+        self._start = self._last_lap = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def start_from_argv(self, argv):
+        """Start if argv contains --profile-startup[=path]; returns whether profiling is on"""
+        for arg in argv:
+            if arg == PROFILE_FLAG:
+                self.start()
+            elif arg.startswith(PROFILE_FLAG + "="):
+                self.start(arg.split("=", 1)[1] or DEFAULT_REPORT)
+        return self.enabled
+
+    def lap(self, phase):
+        """Record the time since the previous lap under the given phase name"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append({"name": phase, "ms": round((now - self._last_lap) * 1000, 3)})
+        self._last_lap = now
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        module_name = name
+        if level:
+            package = (globals or {}).get("__package__") or ""
+            try:
+                module_name = importlib.util.resolve_name("." * level + name, package)
+            except (ImportError, ValueError):
+                pass
+
+        # Only first-time imports cost anything worth recording
+        if module_name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        self._import_stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = self._import_stack.pop()
+            if self._import_stack:
+                self._import_stack[-1] += elapsed
+            totals = self.imports.setdefault(module_name, [0.0, 0.0])
+            totals[0] += elapsed
+            totals[1] += elapsed - children
+
+    def finish(self):
+        """Remove the import hook and return the report"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+        return self.report()
+
+    def report(self):
+        imports = [
+            {"module": module, "inclusive_ms": round(inclusive * 1000, 3), "self_ms": round(own * 1000, 3)}
+            for module, (inclusive, own) in self.imports.items()
+        ]
+        imports.sort(key=lambda entry: entry["inclusive_ms"], reverse=True)
+        return {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "total_ms": round(sum(phase["ms"] for phase in self.phases), 3),
+            "phases": self.phases,
+            "imports": imports,
+        }
+
+    def write_report(self, path=None):
+        """Finish profiling and write the JSON report"""
+        path = path or self.report_path
+        data = self.finish()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        print(f"[PROFILE] Startup took {data['total_ms']:.1f} ms, report written to {path}")
+        return data
+
+    def finish_after_first_paint(self, window, on_done=None):
+        """Record a first_paint lap once the window has painted, then write the report"""
+        if not self.enabled:
+            return
+        from PyQt5.QtCore import QObject, QEvent, QTimer
+        from PyQt5.QtWidgets import QApplication
+
+        profiler = self
+
+        class FirstPaintFilter(QObject):
+            def eventFilter(self, source, event):
+                if event.type() == QEvent.Paint and hasattr(source, "window") and source.window() is window:
+                    QApplication.instance().removeEventFilter(self)
+                    # Let the rest of the paint pass finish before stopping the clock
+                    QTimer.singleShot(0, done)
+                return False
+
+        def done():
+            profiler.lap("first_paint")
+            profiler.write_report()
+            if on_done:
+                on_done()
+
+        self._paint_filter = FirstPaintFilter()
+        QApplication.instance().installEventFilter(self._paint_filter)
+
+
+profiler = StartupProfiler()
+
+
+def load_report(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_reports(base, new, top=15):
+    """Return printable lines comparing two startup reports"""
+    def row(label, before, after):
+        delta = after - before
+        percent = (delta / before * 100) if before else 0.0
+        return f"{label:<40} {before:>10.1f} {after:>10.1f} {delta:>+10.1f} {percent:>+7.1f}%"
+
+    header = f"{'':<40} {'base ms':>10} {'new ms':>10} {'delta':>10} {'':>8}"
+    lines = ["Phases", header]
+
+    base_phases = {phase["name"]: phase["ms"] for phase in base.get("phases", [])}
+    new_phases = {phase["name"]: phase["ms"] for phase in new.get("phases", [])}
+    for name in list(base_phases) + [n for n in new_phases if n not in base_phases]:
+        lines.append(row(name, base_phases.get(name, 0.0), new_phases.get(name, 0.0)))
+    lines.append(row("total", base.get("total_ms", 0.0), new.get("total_ms", 0.0)))
+
+    base_imports = {entry["module"]: entry["self_ms"] for entry in base.get("imports", [])}
+    new_imports = {entry["module"]: entry["self_ms"] for entry in new.get("imports", [])}
+    changes = sorted(
+        set(base_imports) | set(new_imports),
+        key=lambda module: abs(new_imports.get(module, 0.0) - base_imports.get(module, 0.0)),
+        reverse=True,
+    )
+    lines += ["", f"Largest import changes (self time, top {top})", header]
+    for module in changes[:top]:
+        lines.append(row(module, base_imports.get(module, 0.0), new_imports.get(module, 0.0)))
+    return lines
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="BESM startup profile tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compare = subparsers.add_parser("compare", help="Compare two --profile-startup reports")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument("--top", type=int, default=15, help="Number of imports to list")
+    compare.add_argument("--fail-over", type=float, default=None, metavar="PERCENT",
+                         help="Exit with status 1 if total startup grew by more than PERCENT")
+    args = parser.parse_args(argv)
+
+    base, new = load_report(args.base), load_report(args.new)
+    print("\n".join(compare_reports(base, new, args.top)))
+
+    if args.fail_over is not None and base.get("total_ms"):
+        growth = (new["total_ms"] - base["total_ms"]) / base["total_ms"] * 100
+        if growth > args.fail_over:
+            print(f"Startup regressed by {growth:.1f}% (limit {args.fail_over}%)")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,9 @@ from PyQt5.QtCore import pyqtSignal, Qt
 from PyQt5.QtGui import QColor
 from PyQt5.QtWidgets import QGraphicsDropShadowEffect
 from tools.widgets import ClickableCard
+from tools.perf_monitor import timed
 
+@timed()
 def create_card_widget(title="", lines=None, on_click=None, on_remove=None, card_type="default", **kwargs):
     from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSizePolicy
     from PyQt5.QtCore import Qt